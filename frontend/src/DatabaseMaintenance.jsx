@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from "react";
 import axios from "axios";
-import { API_BASE_URL } from "./api";
+import { API_BASE_URL, subscribeToChanges } from "./api";
 import { showModal } from "./modal";
 
 function DatabaseMaintenance({ onBack }) {
@@ -12,6 +12,12 @@ function DatabaseMaintenance({ onBack }) {
     inspectDatabase();
   }, []);
 
+  // Any change to the data is reflected without a reload
+  useEffect(() => subscribeToChanges(
+    ["projects", "scans", "evidence", "resumes", "portfolios", "rankings"],
+    () => inspectDatabase({ quiet: true }),
+  ), []);
+
   const groupSkills = (skillsData = []) => {
     const map = {};
     skillsData.forEach(({ skill, project }) => {
@@ -21,8 +27,8 @@ function DatabaseMaintenance({ onBack }) {
     return map;
   };
 
-  const inspectDatabase = async () => {
-    setLoading(true);
+  const inspectDatabase = async ({ quiet = false } = {}) => {
+    if (!quiet) setLoading(true);
     try {
       const res = await axios.get(`${API_BASE_URL}/database/inspect`);
       setData(res.data);
@@ -845,6 +845,35 @@ function PortfolioPage({ onBack, showStars = true }) {
     }
   };
 
+  // Fetch every dashboard view (meta, heatmaps, timeline, showcase and per-project detail)
+  // with one bundle request. Returns the bundle so callers can read the showcase ranking.
+  const loadPortfolioBundle = async (portfolioIdValue, eligible) => {
+    const { data: bundle } = await axios.get(`${API_BASE_URL}/web/portfolio/${portfolioIdValue}/bundle`, {
+      params: {
+        timeline_granularity: 'month',
+        heatmap_granularity: 'day',
+        showcase_limit: MAX_FEATURED,
+        project_view_scope: 'project',
+      },
+    });
+
+    setPortfolioMeta(bundle.portfolio);
+    setHeatmapData(bundle.heatmap);
+    setTimelineData(bundle.timeline?.timeline || []);
+
+    // Project detail supplies llm_summary text for card footers
+    const detailMap = {};
+    const heatmaps = {};
+    eligible.forEach((p) => {
+      const id = p.id ?? p.project_id;
+      if (bundle.projects?.[id]) detailMap[id] = bundle.projects[id];
+      if (bundle.project_heatmaps?.[id]) heatmaps[`${id}:project`] = bundle.project_heatmaps[id];
+    });
+    setProjectDetails(detailMap);
+    setProjectHeatmaps(heatmaps);
+    return bundle;
+  };
+
   const handleGenerate = async () => {
     if (!username) {
       showToast('Please select a username.', 'error');
@@ -875,35 +904,12 @@ function PortfolioPage({ onBack, showStars = true }) {
       setPortfolioId(portfolio_id);
       setPortfolioIsSaved(false); // Temp row, not yet explicitly saved by user
 
-      // Retrieve all relevant data for the web portfolio (fetched in parallel)
-      const [metaRes, showcaseRes, heatmapRes, timelineRes] = await Promise.all([
-        axios.get(`${API_BASE_URL}/portfolios/${portfolio_id}`),
-        axios.get(`${API_BASE_URL}/web/portfolio/${portfolio_id}/showcase?limit=3`),
-        axios.get(`${API_BASE_URL}/web/portfolio/${portfolio_id}/heatmap?granularity=day`),
-        axios.get(`${API_BASE_URL}/web/portfolio/${portfolio_id}/timeline?granularity=month`),
-      ]);
-
-      setPortfolioMeta(metaRes.data);
-      setHeatmapData(heatmapRes.data);
-      setTimelineData(timelineRes.data.timeline || []);
-
-      // Fetch per-project detail in parallel to get llm_summary text for card footers.
-      // Failures are silently swallowed so they don't block portfolio generation.
-      const detailResults = await Promise.allSettled(
-        eligible.map((p) => axios.get(`${API_BASE_URL}/projects/${p.id ?? p.project_id}`))
-      );
-      const detailMap = {};
-      detailResults.forEach((result, i) => {
-        const id = eligible[i].id ?? eligible[i].project_id;
-        if (result.status === 'fulfilled') {
-          detailMap[id] = result.value.data ?? null;
-        }
-      });
-      setProjectDetails(detailMap);
+      // Retrieve all relevant data for the web portfolio in one request
+      const bundle = await loadPortfolioBundle(portfolio_id, eligible);
 
       // Auto-star the top 3 ranked projects that are in the "eligible" set
       const eligibleNames = new Set(eligible.map((p) => p.display_name ?? p.name));
-      const topThree = (showcaseRes.data.projects || [])
+      const topThree = (bundle.showcase?.projects || [])
         .filter((p) => eligibleNames.has(p.name ?? p.project ?? p.display_name))
         .slice(0, MAX_FEATURED)
         .map((p) => p.name ?? p.project ?? p.display_name);
@@ -917,10 +923,6 @@ function PortfolioPage({ onBack, showStars = true }) {
       const initialProjectId = initialProject ? (initialProject.id ?? initialProject.project_id) : null;
       setSelectedHeatmapProjectId(initialProjectId);
       setHeatmapViewScope('project');
-      setProjectHeatmaps({});
-      if (initialProject) {
-        await loadProjectHeatmap(portfolio_id, initialProject, 'project');
-      }
 
       // Transition to dashboard phase after all data is loaded
       setPhase('dashboard');
@@ -1026,26 +1028,7 @@ function PortfolioPage({ onBack, showStars = true }) {
       const portfolio_id = saved.id;
       setPortfolioId(portfolio_id);
 
-      const [metaRes, showcaseRes, heatmapRes, timelineRes] = await Promise.all([
-        axios.get(`${API_BASE_URL}/portfolios/${portfolio_id}`),
-        axios.get(`${API_BASE_URL}/web/portfolio/${portfolio_id}/showcase?limit=3`),
-        axios.get(`${API_BASE_URL}/web/portfolio/${portfolio_id}/heatmap?granularity=day`),
-        axios.get(`${API_BASE_URL}/web/portfolio/${portfolio_id}/timeline?granularity=month`),
-      ]);
-
-      setPortfolioMeta(metaRes.data);
-      setHeatmapData(heatmapRes.data);
-      setTimelineData(timelineRes.data.timeline || []);
-
-      const detailResults = await Promise.allSettled(
-        eligible.map((p) => axios.get(`${API_BASE_URL}/projects/${p.id ?? p.project_id}`))
-      );
-      const detailMap = {};
-      detailResults.forEach((result, i) => {
-        const id = eligible[i].id ?? eligible[i].project_id;
-        if (result.status === 'fulfilled') detailMap[id] = result.value.data ?? null;
-      });
-      setProjectDetails(detailMap);
+      const bundle = await loadPortfolioBundle(portfolio_id, eligible);
 
       const featuredNames = new Set(
         eligible
@@ -1053,7 +1036,7 @@ function PortfolioPage({ onBack, showStars = true }) {
           .map((p) => p.display_name ?? p.name)
       );
       if (featuredNames.size === 0) {
-        const top = (showcaseRes.data.projects || []).slice(0, MAX_FEATURED).map((p) => p.name ?? p.display_name);
+        const top = (bundle.showcase?.projects || []).slice(0, MAX_FEATURED).map((p) => p.name ?? p.display_name);
         top.forEach((n) => featuredNames.add(n));
       }
       setFeaturedIds(featuredNames);
@@ -1062,8 +1045,6 @@ function PortfolioPage({ onBack, showStars = true }) {
       const initialProjectId = initialProject ? (initialProject.id ?? initialProject.project_id) : null;
       setSelectedHeatmapProjectId(initialProjectId);
       setHeatmapViewScope('project');
-      setProjectHeatmaps({});
-      if (initialProject) await loadProjectHeatmap(portfolio_id, initialProject, 'project');
 
       setPortfolioIsSaved(true); // loaded from an existing saved record - do not delete on back
       setPhase('dashboard');
@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import axios from 'axios';
-import { API_BASE_URL } from './api';
+import { API_BASE_URL, subscribeToChanges } from './api';
 import { showModal } from './modal'; 
 
 function RankProjectsPage({ onBack }) {
@@ -192,6 +192,20 @@ function RankProjectsPage({ onBack }) {
     loadContributors();
   }, []);
 
+  // Saved rankings and the contributor list follow changes made elsewhere; the
+  // ranked list itself is only rerun on request so a custom order is kept
+  useEffect(() => subscribeToChanges(['rankings', 'scans'], (event) => {
+    if (event.topic !== 'scans') {
+      fetchSavedRankings();
+    }
+    if (event.topic !== 'rankings') {
+      axios.get(`${API_BASE_URL}/contributors`)
+        .then((response) => setContributorOptions(Array.isArray(response.data) ? response.data : []))
+        .catch(() => {});
+    }
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }), []);
+
   const topScore =
     projects.length > 0
       ? Number(mode === 'contributor' ? projects[0].score || 0 : projects[0].top_score || 0)
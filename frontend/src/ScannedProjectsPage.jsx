@@ -1,6 +1,6 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import axios from 'axios';
-import { API_BASE_URL } from './api';
+import { API_BASE_URL, subscribeToChanges } from './api';
 import { showModal } from './modal.js';
 
 function getThumbnailSrc(projectId, path) {
@@ -129,7 +129,7 @@ function ScannedProjectsPage({ onBack }) {
       setDetailsError('');
 
       try {
-        const response = await axios.get(`${API_BASE_URL}/projects/${selectedProjectId}`);
+        const response = await axios.get(`${API_BASE_URL}/projects/${selectedProjectId}?exclude=git_metrics,rank_score`);
         setSelectedProject(response.data);
       } catch (err) {
         setDetailsError(`Failed to load project details: ${err.message}`);
@@ -141,6 +141,28 @@ function ScannedProjectsPage({ onBack }) {
     loadProjectDetails();
   }, [selectedProjectId]);
 
+  // Latest selection for the change feed handler below
+  const liveState = useRef({});
+  liveState.current = { selectedProjectId, isEditing };
+
+  // Refetch quietly when projects change elsewhere (another window, a scan, the CLI)
+  useEffect(() => subscribeToChanges(['projects', 'scans', 'evidence'], (event) => {
+    if (event.topic !== 'evidence') {
+      axios.get(`${API_BASE_URL}/projects`)
+        .then((response) => setProjects(Array.isArray(response.data) ? response.data : []))
+        .catch(() => {});
+    }
+    const { selectedProjectId: projectId, isEditing: editing } = liveState.current;
+    if (projectId == null || editing) return;
+    // scans events list every project they touched; the others name one
+    const touched = event.project_ids || (event.project_id != null ? [event.project_id] : null);
+    if (touched == null || touched.includes(projectId)) {
+      axios.get(`${API_BASE_URL}/projects/${projectId}?exclude=git_metrics,rank_score`)
+        .then((response) => setSelectedProject(response.data))
+        .catch(() => {});
+    }
+  }), []);
+
    useEffect(() => {
     if (selectedProject && isEditing) {
       setEditCustomName(selectedProject.project?.custom_name || '');
@@ -153,7 +175,7 @@ function ScannedProjectsPage({ onBack }) {
 
   const refreshProjectData = async () => {
     const [detailsResponse, listResponse] = await Promise.all([
-      axios.get(`${API_BASE_URL}/projects/${selectedProjectId}`),
+      axios.get(`${API_BASE_URL}/projects/${selectedProjectId}?exclude=git_metrics,rank_score`),
       axios.get(`${API_BASE_URL}/projects`),
     ]);
     setSelectedProject(detailsResponse.data);
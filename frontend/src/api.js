@@ -1 +1,21 @@
-export const API_BASE_URL = 'http://127.0.0.1:8000';
\ No newline at end of file
+export const API_BASE_URL = 'http://127.0.0.1:8000';
+
+// Subscribes to the backend change feed (GET /events) and calls onChange with
+// each change event for one of `topics`. "database" events (clear, import,
+// writes from the CLI) are always delivered: they mean anything may have
+// changed. Returns a function that closes the stream.
+export function subscribeToChanges(topics, onChange) {
+  if (typeof EventSource === 'undefined') {
+    return () => {};
+  }
+  const source = new EventSource(`${API_BASE_URL}/events?topics=${encodeURIComponent(topics.join(','))}`);
+  const handleEvent = (message) => {
+    try {
+      onChange(JSON.parse(message.data));
+    } catch (err) {
+      console.error('Invalid change event:', err);
+    }
+  };
+  [...topics, 'database'].forEach((topic) => source.addEventListener(topic, handleEvent));
+  return () => source.close();
+}
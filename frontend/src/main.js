@@ -11,7 +11,7 @@ if (started) {
 
 const BACKEND_HEALTH_URL = 'http://127.0.0.1:8000/health';
 const BACKEND_STARTUP_TIMEOUT_MS = 15000;
-const BACKEND_STARTUP_POLL_INTERVAL_MS = 300;
+const BACKEND_STARTUP_POLL_INTERVAL_MS = 50;
 
 let backendProcess = null;
 
@@ -71,7 +71,9 @@ const startBackend = async () => {
 
   const backendCwd = resolveBackendCwd();
   const pythonCommand = process.env.BACKEND_PYTHON || (process.platform === 'win32' ? 'python' : 'python3');
-  const backendArgs = ['-m', 'uvicorn', 'src.api:app', '--port', '8000'];
+  // Open change-feed streams (GET /events) never finish on their own, so cap
+  // how long a shutdown waits for them
+  const backendArgs = ['-m', 'uvicorn', 'src.api:app', '--port', '8000', '--timeout-graceful-shutdown', '2'];
 
   backendProcess = spawn(pythonCommand, backendArgs, {
     cwd: backendCwd,
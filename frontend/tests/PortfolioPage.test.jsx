@@ -16,10 +16,47 @@ const mockProjects = (count) =>
     contributors: [{ name: 'alice' }, { name: 'bob' }],
   }));
 
+const projectScopeHeatmap = {
+  cells: [
+    { period: '2026-01-05', value: 3 },
+    { period: '2026-01-12', value: 5 },
+  ],
+  max_value: 5,
+  range_start: '2026-01-05',
+  range_end: '2026-01-12',
+  value_unit: 'commits',
+};
+
+const projectDetail = {
+  project: { name: 'project-detail' },
+  contributors: ['alice', 'bob'],
+  contributor_roles: { contributors: [] },
+  files_summary: { total_files: 0, extensions: {} },
+  git_metrics: {},
+  llm_summary: { text: 'summary' },
+};
+
 const mockAxios = (projectCount) => {
   const projects = mockProjects(projectCount);
   const ranked = projects.map((p) => ({ project: p.name }));
+  const portfolioMeta = {
+    id: 42,
+    included_project_ids: Array.from({ length: projectCount }, (_, i) => i + 1),
+    created_at: new Date().toISOString(),
+  };
   const getSpy = vi.spyOn(axios, 'get').mockImplementation((url, config = {}) => {
+    if (url.includes('/web/portfolio/') && url.includes('/bundle')) {
+      return Promise.resolve({
+        data: {
+          portfolio: portfolioMeta,
+          timeline: { timeline: [] },
+          heatmap: { cells: [], max_value: 0 },
+          showcase: { projects: [] },
+          project_heatmaps: Object.fromEntries(projects.map((p) => [p.id, projectScopeHeatmap])),
+          projects: Object.fromEntries(projects.map((p) => [p.id, projectDetail])),
+        },
+      });
+    }
     if (url.includes('/web/portfolio/') && url.includes('/heatmap/project')) {
       const scope = config?.params?.view_scope || 'project';
       if (scope === 'user') {
@@ -36,18 +73,7 @@ const mockAxios = (projectCount) => {
           },
         });
       }
-      return Promise.resolve({
-        data: {
-          cells: [
-            { period: '2026-01-05', value: 3 },
-            { period: '2026-01-12', value: 5 },
-          ],
-          max_value: 5,
-          range_start: '2026-01-05',
-          range_end: '2026-01-12',
-          value_unit: 'commits',
-        },
-      });
+      return Promise.resolve({ data: projectScopeHeatmap });
     }
     if (url.includes('/contributors')) return Promise.resolve({ data: ['alice', 'bob'] });
     if (url.includes('/rank-projects')) return Promise.resolve({ data: ranked });
@@ -60,24 +86,9 @@ const mockAxios = (projectCount) => {
     if (url.includes('/portfolios/all'))
       return Promise.resolve({ data: [] });
     if (url.includes('/portfolios/'))
-      return Promise.resolve({
-        data: {
-          id: 42,
-          included_project_ids: Array.from({ length: projectCount }, (_, i) => i + 1),
-          created_at: new Date().toISOString(),
-        },
-      });
+      return Promise.resolve({ data: portfolioMeta });
     if (/\/projects\/\d+/.test(url)) {
-      return Promise.resolve({
-        data: {
-          project: { name: 'project-detail' },
-          contributors: ['alice', 'bob'],
-          contributor_roles: { contributors: [] },
-          files_summary: { total_files: 0, extensions: {} },
-          git_metrics: {},
-          llm_summary: { text: 'summary' },
-        },
-      });
+      return Promise.resolve({ data: projectDetail });
     }
     return Promise.resolve({ data: projects });
   });
@@ -179,7 +190,7 @@ describe('PortfolioPage', () => {
     expect(await screen.findByText(/Portfolio Setup/i)).toBeInTheDocument();
   });
 
-  it('loads project heatmap with project scope by default', async () => {
+  it('loads every dashboard view with one bundle request using project scope', async () => {
     const { getSpy } = mockAxios(3);
     render(<PortfolioPage onBack={() => {}} />);
     await screen.findByRole('button', { name: /Generate Web Portfolio/i });
@@ -189,11 +200,16 @@ describe('PortfolioPage', () => {
     fireEvent.click(screen.getByRole('button', { name: /Generate Web Portfolio/i }));
     await screen.findByText(/Activity Heatmap/i);
 
-    const projectHeatmapCall = getSpy.mock.calls.find(([url]) =>
-      String(url).includes('/web/portfolio/42/heatmap/project')
+    const bundleCalls = getSpy.mock.calls.filter(([url]) =>
+      String(url).includes('/web/portfolio/42/bundle')
+    );
+    expect(bundleCalls).toHaveLength(1);
+    expect(bundleCalls[0]?.[1]?.params?.project_view_scope).toBe('project');
+    const perViewCall = getSpy.mock.calls.find(([url]) =>
+      /\/web\/portfolio\/42\/(timeline|heatmap|showcase)/.test(String(url))
+      || /\/projects\/\d+/.test(String(url))
     );
-    expect(projectHeatmapCall).toBeTruthy();
-    expect(projectHeatmapCall?.[1]?.params?.view_scope).toBe('project');
+    expect(perViewCall).toBeUndefined();
   });
 
   it('switches to per user heatmap and requests user scope', async () => {
@@ -1,9 +1,24 @@
+-- Drop views first
+DROP VIEW IF EXISTS scans_legacy;
+DROP VIEW IF EXISTS files_full;
+
 -- Drop dependent tables first
 DROP TABLE IF EXISTS file_contributors;
 DROP TABLE IF EXISTS file_languages;
 DROP TABLE IF EXISTS project_skills;
 DROP TABLE IF EXISTS project_evidence;
+DROP TABLE IF EXISTS project_stats;
+DROP TABLE IF EXISTS global_stats;
+DROP TABLE IF EXISTS importance_scores;
+DROP TABLE IF EXISTS project_importance;
+DROP TABLE IF EXISTS project_contributor_roles;
+DROP TABLE IF EXISTS commits;
+DROP TABLE IF EXISTS search_index;
+DROP TABLE IF EXISTS search_documents;
+DROP TABLE IF EXISTS scan_history;
+DROP TABLE IF EXISTS maintenance_state;
 DROP TABLE IF EXISTS files;
+DROP TABLE IF EXISTS path_dirs;
 DROP TABLE IF EXISTS resumes;
 DROP TABLE IF EXISTS portfolios;
 DROP TABLE IF EXISTS scans;
@@ -18,8 +33,17 @@ DROP TABLE IF EXISTS skills;
 CREATE TABLE scans (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     scanned_at TEXT DEFAULT CURRENT_TIMESTAMP,
-    project TEXT,
-    notes TEXT
+    project TEXT,                  -- legacy project name, kept in sync with projects.name
+    notes TEXT,
+    project_id INTEGER,            -- preferred join key into projects
+    root_path TEXT,                -- common prefix of this scan's file paths
+    FOREIGN KEY (project_id) REFERENCES projects(id)
+);
+
+-- Interned directory paths, relative to scans.root_path
+CREATE TABLE path_dirs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL UNIQUE
 );
 
 -- Table to store files and files metadata
@@ -27,20 +51,27 @@ CREATE TABLE files (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     scan_id INTEGER NOT NULL,
     file_name TEXT NOT NULL,
-    file_path TEXT NOT NULL,
-    file_extension TEXT,
+    file_path TEXT NOT NULL,       -- full path only for rows without dir_id; see files_full
+    file_extension TEXT,           -- lowercased, e.g. ".py"
     file_size INTEGER,
     created_at TEXT,
     modified_at TEXT,
     owner TEXT,
     metadata_json TEXT,  -- stores all other metadata (able to handle all file types)
-    FOREIGN KEY (scan_id) REFERENCES scans(id)
+    dir_id INTEGER,      -- scans.root_path || path_dirs.path || file_name is the full path
+    category TEXT,       -- code/test/docs/design/other, from contrib_metrics.classify_file
+    FOREIGN KEY (scan_id) REFERENCES scans(id),
+    FOREIGN KEY (dir_id) REFERENCES path_dirs(id)
 );
 
 -- Indexes for faster searching
-CREATE INDEX idx_file_path ON files (file_path);
-CREATE INDEX idx_file_name ON files (file_name);
+CREATE INDEX idx_files_dir_id ON files (dir_id);
 CREATE INDEX idx_files_scan_id ON files (scan_id);
+CREATE INDEX idx_files_scan_extension ON files (scan_id, file_extension);
+CREATE INDEX idx_files_scan_category ON files (scan_id, category);
+CREATE INDEX idx_scans_project_id ON scans (project_id);
+CREATE INDEX idx_scans_project ON scans (project);
+CREATE INDEX idx_scans_scanned_at ON scans (scanned_at);
 
 -- Projects table to group scans and files under a named project
 CREATE TABLE IF NOT EXISTS projects (
@@ -94,6 +125,7 @@ CREATE TABLE IF NOT EXISTS project_evidence (
 
 -- Index for faster searching by project_id
 CREATE INDEX IF NOT EXISTS idx_project_evidence_project_id ON project_evidence (project_id);
+CREATE INDEX IF NOT EXISTS idx_project_evidence_project_created ON project_evidence (project_id, created_at);
 
 -- Contributors (commit authors). We intentionally do not store emails to keep privacy.
 CREATE TABLE IF NOT EXISTS contributors (
@@ -137,6 +169,160 @@ CREATE TABLE IF NOT EXISTS project_skills (
     FOREIGN KEY (skill_id) REFERENCES skills(id)
 );
 
+-- Materialized per-project aggregates, refreshed in the same transaction as
+-- every scan save / project delete so read endpoints avoid re-counting files
+CREATE TABLE IF NOT EXISTS project_stats (
+    project_id INTEGER PRIMARY KEY,
+    scan_count INTEGER NOT NULL DEFAULT 0,
+    file_count INTEGER NOT NULL DEFAULT 0,
+    extensions_json TEXT NOT NULL DEFAULT '{}',  -- {".py": 12, ".md": 3}
+    categories_json TEXT NOT NULL DEFAULT '{}',  -- {"code": 12, "docs": 3}
+    contributor_count INTEGER NOT NULL DEFAULT 0,
+    top_contributor TEXT,
+    top_contributor_files INTEGER NOT NULL DEFAULT 0,
+    latest_scan_at TEXT,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+);
+
+-- Single-row global aggregates for the dashboard
+CREATE TABLE IF NOT EXISTS global_stats (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    project_count INTEGER NOT NULL DEFAULT 0,
+    scan_count INTEGER NOT NULL DEFAULT 0,
+    file_count INTEGER NOT NULL DEFAULT 0,
+    contributor_count INTEGER NOT NULL DEFAULT 0,
+    top_contributor TEXT,
+    top_contributor_files INTEGER NOT NULL DEFAULT 0,
+    latest_scan_at TEXT,
+    latest_project TEXT,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Contributor x project importance matrix, recomputed per project after each scan
+CREATE TABLE IF NOT EXISTS importance_scores (
+    project_id INTEGER NOT NULL,
+    contributor TEXT NOT NULL,     -- canonical username
+    contrib_files INTEGER NOT NULL DEFAULT 0,
+    total_files INTEGER NOT NULL DEFAULT 0,
+    contributors_count INTEGER NOT NULL DEFAULT 0,
+    score REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (project_id, contributor),
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+);
+
+-- Project-mode ranking row (top contributor's score per project)
+CREATE TABLE IF NOT EXISTS project_importance (
+    project_id INTEGER PRIMARY KEY,
+    total_files INTEGER NOT NULL DEFAULT 0,
+    contributors_count INTEGER NOT NULL DEFAULT 0,
+    top_contributor TEXT,
+    top_contrib_files INTEGER NOT NULL DEFAULT 0,
+    top_fraction REAL NOT NULL DEFAULT 0,
+    top_score REAL NOT NULL DEFAULT 0,
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_importance_scores_contributor ON importance_scores (contributor, score DESC);
+CREATE INDEX IF NOT EXISTS idx_project_importance_score ON project_importance (top_score DESC);
+
+-- Contributor roles inferred when a project is scanned; one row per contributor,
+-- role_json holds the full per-contributor analysis from detect_roles
+CREATE TABLE IF NOT EXISTS project_contributor_roles (
+    project_id INTEGER NOT NULL,
+    contributor TEXT NOT NULL,     -- canonical username
+    position INTEGER NOT NULL DEFAULT 0,
+    primary_role TEXT,
+    confidence REAL,
+    role_json TEXT NOT NULL,
+    PRIMARY KEY (project_id, contributor),
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+);
+
+-- One row per commit of a scanned git project; heatmaps and timelines group these by period
+CREATE TABLE IF NOT EXISTS commits (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_id INTEGER NOT NULL,
+    author_id INTEGER NOT NULL,    -- contributors.id of the canonical author
+    committed_at TEXT NOT NULL,    -- author-local 'YYYY-MM-DD HH:MM:SS'
+    files_changed INTEGER NOT NULL DEFAULT 0,
+    lines_added INTEGER NOT NULL DEFAULT 0,
+    lines_removed INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
+    FOREIGN KEY (author_id) REFERENCES contributors(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_commits_project_author_time ON commits (project_id, author_id, committed_at);
+CREATE INDEX IF NOT EXISTS idx_commits_project_time ON commits (project_id, committed_at);
+CREATE INDEX IF NOT EXISTS idx_commits_author_id ON commits (author_id);
+
+-- Full-text search documents: one row per project name, summary, file path,
+-- skill or evidence item (kind), indexed by the FTS5 table below
+CREATE TABLE IF NOT EXISTS search_documents (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,            -- project | summary | file | skill | evidence
+    ref_id INTEGER,                -- files.id / skills.id / project_evidence.id
+    content TEXT NOT NULL,
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_search_documents_project_kind ON search_documents (project_id, kind);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+    content,
+    content='search_documents',
+    content_rowid='id',
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN
+    INSERT INTO search_index (rowid, content) VALUES (new.id, new.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN
+    INSERT INTO search_index (search_index, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+
+-- Older scans of a project, each stored as a reverse delta against the next
+-- newer scan (see db_history); the live scan stays in scans/files
+CREATE TABLE IF NOT EXISTS scan_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_id INTEGER NOT NULL,
+    scan_id INTEGER,                            -- id the scan had while it was live
+    scanned_at TEXT,
+    notes TEXT,
+    file_count INTEGER NOT NULL DEFAULT 0,
+    total_size INTEGER NOT NULL DEFAULT 0,
+    contributor_count INTEGER NOT NULL DEFAULT 0,
+    delta_json TEXT NOT NULL,                   -- {"added", "removed", "changed", "project"}
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_scan_history_project ON scan_history (project_id, scanned_at);
+
+-- Counter bumped on every change to user-visible data, used for API response
+-- caching (see db_version). It survives re-initialisation, which bumps it; the
+-- triggers on the source tables are created by db_version.ensure_data_version.
+CREATE TABLE IF NOT EXISTS data_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    epoch TEXT NOT NULL,                  -- random per database file
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO data_version (id, epoch, version) VALUES (1, lower(hex(randomblob(8))), 0);
+UPDATE data_version SET version = version + 1 WHERE id = 1;
+
+-- Single-row bookkeeping for background maintenance (see db_maintenance)
+CREATE TABLE IF NOT EXISTS maintenance_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    pending INTEGER NOT NULL DEFAULT 0,   -- set by deletes/prunes, cleared by a maintenance pass
+    pending_reason TEXT,
+    requested_at TEXT,
+    last_run_at TEXT,
+    last_report_json TEXT                 -- what the last pass removed and reclaimed
+);
+
 -- Generated resumes linked to contributors
 CREATE TABLE IF NOT EXISTS resumes (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -145,11 +331,44 @@ CREATE TABLE IF NOT EXISTS resumes (
     resume_path TEXT NOT NULL,
     metadata_json TEXT,
     generated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    llm_used INTEGER NOT NULL DEFAULT 0,
     FOREIGN KEY (contributor_id) REFERENCES contributors(id)
 );
 
 CREATE INDEX IF NOT EXISTS idx_resumes_username ON resumes (username);
 CREATE INDEX IF NOT EXISTS idx_resumes_generated_at ON resumes (generated_at);
+CREATE INDEX IF NOT EXISTS idx_resumes_username_generated ON resumes (username, generated_at);
+
+-- llm_used mirrors bool(metadata_json.llm_summary) so listings need not parse the blob
+CREATE TRIGGER IF NOT EXISTS resumes_llm_used_insert AFTER INSERT ON resumes BEGIN
+    UPDATE resumes SET llm_used = CASE WHEN json_valid(NEW.metadata_json) THEN
+        CASE json_type(NEW.metadata_json, '$.llm_summary')
+            WHEN 'true' THEN 1
+            WHEN 'integer' THEN json_extract(NEW.metadata_json, '$.llm_summary') <> 0
+            WHEN 'real' THEN json_extract(NEW.metadata_json, '$.llm_summary') <> 0
+            WHEN 'text' THEN json_extract(NEW.metadata_json, '$.llm_summary') <> ''
+            WHEN 'array' THEN json_array_length(NEW.metadata_json, '$.llm_summary') > 0
+            WHEN 'object' THEN json_extract(NEW.metadata_json, '$.llm_summary') <> '{}'
+            ELSE 0
+        END
+    ELSE 0 END
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS resumes_llm_used_update AFTER UPDATE OF metadata_json ON resumes BEGIN
+    UPDATE resumes SET llm_used = CASE WHEN json_valid(NEW.metadata_json) THEN
+        CASE json_type(NEW.metadata_json, '$.llm_summary')
+            WHEN 'true' THEN 1
+            WHEN 'integer' THEN json_extract(NEW.metadata_json, '$.llm_summary') <> 0
+            WHEN 'real' THEN json_extract(NEW.metadata_json, '$.llm_summary') <> 0
+            WHEN 'text' THEN json_extract(NEW.metadata_json, '$.llm_summary') <> ''
+            WHEN 'array' THEN json_array_length(NEW.metadata_json, '$.llm_summary') > 0
+            WHEN 'object' THEN json_extract(NEW.metadata_json, '$.llm_summary') <> '{}'
+            ELSE 0
+        END
+    ELSE 0 END
+    WHERE id = NEW.id;
+END;
 
 -- Saved web portfolios
 CREATE TABLE IF NOT EXISTS portfolios (
@@ -174,3 +393,60 @@ CREATE INDEX IF NOT EXISTS idx_custom_ranking_items_rank ON custom_ranking_items
 CREATE INDEX IF NOT EXISTS idx_contributors_name ON contributors (name);
 CREATE INDEX IF NOT EXISTS idx_languages_name ON languages (name);
 CREATE INDEX IF NOT EXISTS idx_skills_name ON skills (name);
+CREATE INDEX IF NOT EXISTS idx_file_contributors_contributor_id ON file_contributors (contributor_id);
+CREATE INDEX IF NOT EXISTS idx_file_languages_language_id ON file_languages (language_id);
+CREATE INDEX IF NOT EXISTS idx_project_skills_skill_id ON project_skills (skill_id);
+
+-- Keep scans.project_id linked to projects when rows are written by name only,
+-- and keep the legacy scans.project text in sync when a project is renamed.
+CREATE TRIGGER IF NOT EXISTS trg_scans_link_project
+AFTER INSERT ON scans
+WHEN NEW.project_id IS NULL AND NEW.project IS NOT NULL
+BEGIN
+    UPDATE scans SET project_id = (SELECT id FROM projects WHERE name = NEW.project)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_projects_link_scans
+AFTER INSERT ON projects
+BEGIN
+    UPDATE scans SET project_id = NEW.id
+    WHERE project_id IS NULL AND project = NEW.name;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_projects_rename_scans
+AFTER UPDATE OF name ON projects
+BEGIN
+    UPDATE scans SET project = NEW.name WHERE project_id = NEW.id;
+END;
+
+-- Compatibility view exposing the pre-project_id shape of scans
+CREATE VIEW IF NOT EXISTS scans_legacy AS
+SELECT s.id, s.scanned_at, COALESCE(p.name, s.project) AS project, s.notes
+FROM scans s
+LEFT JOIN projects p ON p.id = s.project_id;
+
+-- Full file paths and metadata rebuilt from the compact storage above
+CREATE VIEW IF NOT EXISTS files_full AS
+SELECT f.id, f.scan_id, f.file_name,
+       CASE WHEN f.dir_id IS NULL THEN f.file_path
+            ELSE COALESCE(s.root_path, '') || d.path || f.file_name
+       END AS file_path,
+       f.file_extension, f.category, f.file_size, f.created_at, f.modified_at, f.owner,
+       CASE WHEN f.dir_id IS NULL THEN f.metadata_json
+            ELSE json_patch(
+                COALESCE(f.metadata_json, '{}'),
+                json_object(
+                    'owner', f.owner,
+                    'language', (
+                        SELECT l.name FROM file_languages fl
+                        JOIN languages l ON l.id = fl.language_id
+                        WHERE fl.file_id = f.id
+                        ORDER BY l.name LIMIT 1
+                    )
+                )
+            )
+       END AS metadata_json
+FROM files f
+LEFT JOIN scans s ON s.id = f.scan_id
+LEFT JOIN path_dirs d ON d.id = f.dir_id;
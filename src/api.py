@@ -4,19 +4,20 @@ import os
 import sys
 import re
 import sqlite3
-from io import BytesIO, StringIO
+from io import StringIO
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
-import subprocess
+from typing import Any, Dict, List, Optional, Tuple
 
 # Ensure local imports work when running via uvicorn from repo root.
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from fastapi import APIRouter, Body, FastAPI, HTTPException, Query
+from fastapi import APIRouter, Body, FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from project_evidence import add_evidence, delete_evidence, update_evidence, validate_evidence_type
 from pydantic import BaseModel, Field
+import asyncio
 import contextlib
 import queue
 import threading
@@ -27,6 +28,7 @@ import zipfile
 from config import load_config, save_config, config_path as default_config_path
 from cli_username_selection import get_candidate_usernames
 from db import get_connection, save_portfolio, update_portfolio, list_portfolios, list_all_portfolios, rename_portfolio, delete_portfolio, save_resume, delete_project_by_id
+from db_stats import importance_score, load_global_stats, load_project_stats, load_projects_stats, project_top_scores
 from generate_portfolio import aggregate_projects_for_portfolio
 from generate_resume import (
     collect_projects,
@@ -36,8 +38,21 @@ from generate_resume import (
 )
 from project_info_output import gather_project_info, output_project_info
 from rank_projects import rank_projects, rank_projects_by_importance, list_custom_rankings, get_custom_ranking, save_custom_ranking, delete_custom_ranking
-from contrib_metrics import canonical_username, classify_file
-from detect_roles import analyze_project_roles
+from contrib_metrics import canonical_username
+from db_commits import commit_activity_by_project, projects_with_commits
+from db_transfer import import_database, iter_export
+from db_version import bump_data_version, data_version, read_data_version
+from response_cache import ResponseCache
+from read_model import read_model
+from change_feed import TOPICS, change_feed, iter_event_stream
+from resume_pdf import PdfArtifactCache, PdfRenderer, content_digest
+from response_encoding import CompressionMiddleware, FastJSONResponse, RawJSON, iter_json_object
+from portfolio_export import THUMBNAIL_MAX_DIMENSION, export_project_entry, iter_portfolio_html, skills_timeline_rows, thumbnail_data_uri
+from db_history import history_activity, history_activity_by_project, history_series, load_retention_policy, reconstruct_scan
+from db_search import reindex_project, search_projects
+from keyset import decode_cursor, encode_cursor, newer_first_after
+from db_maintenance import MaintenanceScheduler, load_maintenance_status
+from detect_roles import load_project_roles, load_projects_roles
 from scan import (
     run_with_saved_settings,
     scan_with_clean_output,
@@ -48,20 +63,164 @@ from scan import (
 from inspect_db import inspect_connection
 from generate_portfolio import build_portfolio
 
-try:
-    from pypdf import PdfReader  # type: ignore
-except Exception:
-    PdfReader = None
+# Orphan cleanup, ANALYZE/optimize and incremental vacuum run here, off the
+# request path; deletes and scan prunes only flag the database as pending.
+maintenance_scheduler = MaintenanceScheduler(lambda: get_connection())
+# Rendered resume PDFs, keyed by resume ID and markdown content hash
+resume_pdf_cache = PdfArtifactCache()
+resume_pdf_renderer = PdfRenderer()
 
 
-app = FastAPI(title="MDA API")
+@contextlib.asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    maintenance_scheduler.start()
+    if read_model.enabled:
+        # Load in the background so /health does not wait for it
+        threading.Thread(target=_read_graph, name="read-model-load", daemon=True).start()
+    try:
+        yield
+    finally:
+        maintenance_scheduler.stop()
+        resume_pdf_renderer.shutdown()
+
+
+app = FastAPI(title="MDA API", lifespan=_lifespan, default_response_class=FastJSONResponse)
 web_router = APIRouter(prefix="/web/portfolio", tags=["web-portfolio"])
 
 
+@app.middleware("http")
+async def _note_request_activity(request, call_next):
+    # Background maintenance waits for the API to go idle
+    maintenance_scheduler.note_activity()
+    return await call_next(request)
+
+
+# Read endpoints the frontend polls. Their JSON depends only on the database,
+# so it is keyed on the data version (see db_version): an unchanged version
+# answers If-None-Match with 304, or replays the cached body. The history
+# series is left out: it also reports the retention policy from the config.
+_CACHEABLE_PATH_RE = re.compile(
+    r"^/(?:projects(?:/\d+(?:/(?:history/\d+|roles|git-metrics|rank))?)?"
+    r"|skills|contributors|rank-projects|stats/dashboard|search"
+    r"|web/portfolio/\d+/(?:timeline|heatmap|heatmap/project|showcase|bundle))$"
+)
+# Pagination headers of list endpoints, replayed with a cached body
+_PAGE_HEADERS = ("x-next-cursor", "link")
+response_cache = ResponseCache()
+
+
+def _db_path() -> str:
+    from db import DB_PATH
+    return os.environ.get("FILE_DATA_DB_PATH") or DB_PATH
+
+
+def _etag(version: Any) -> str:
+    epoch, counter = version
+    return f'W/"{epoch}-{counter}"'
+
+
+@app.middleware("http")
+async def _conditional_get(request, call_next):
+    if request.method != "GET" or not _CACHEABLE_PATH_RE.match(request.url.path):
+        return await call_next(request)
+
+    db_path = _db_path()
+    version = await run_in_threadpool(read_data_version, db_path)
+    if version is None:
+        return await call_next(request)
+
+    # Endpoints serving from the read model check it against this version
+    request.state.data_version = version
+    etag = _etag(version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    key = (db_path, request.url.path, str(request.query_params), version)
+    cached = response_cache.get(key)
+    if cached is not None:
+        body, (media_type, page_headers) = cached
+        return Response(content=body, media_type=media_type, headers={**headers, **page_headers})
+
+    response = await call_next(request)
+    if response.status_code != 200 or not response.headers.get("content-type", "").startswith("application/json"):
+        return response
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    page_headers = {name: response.headers[name] for name in _PAGE_HEADERS if name in response.headers}
+    response_cache.put(key, body, (response.headers["content-type"], page_headers))
+    return Response(content=body, media_type=response.headers["content-type"], headers={**headers, **page_headers})
+
+
+def _bump_after_write() -> None:
+    """
+    Bump the data version after a write that touched files next to the
+    database (scan output): triggers only see table changes. Called by the
+    scan handlers once their files are written.
+    """
+    try:
+        with get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            before = data_version(conn)
+            bump_data_version(conn)
+            after = data_version(conn)
+            conn.commit()
+        read_model.advance(before, after)
+        change_feed.advance(before, after)
+    except sqlite3.Error:
+        pass
+
+
+def _read_graph(request: Optional[Request] = None) -> Any:
+    """
+    The in-memory read model (see read_model) at the current data version, or
+    None to read from SQL: the model is disabled or the database has no version.
+    """
+    if not read_model.enabled:
+        return None
+    version = getattr(request.state, "data_version", None) if request is not None else None
+    try:
+        return read_model.graph(version or read_data_version(_db_path()), get_connection)
+    except sqlite3.Error:
+        return None
+
+
 @app.get("/health")
 def health() -> Dict[str, str]:
     return {"status": "ok"}
 
+
+@app.get("/events")
+async def stream_events(request: Request, topics: Optional[str] = Query(None)):
+    """
+    Server-sent change feed: one event per committed change, typed by topic
+    (see change_feed.TOPICS), so clients refetch only the views it touches.
+    ?topics=projects,scans narrows the stream; a reconnect resumes after the
+    Last-Event-ID header.
+    """
+    wanted = [topic.strip() for topic in topics.split(",") if topic.strip()] if topics else None
+    unknown = sorted(set(wanted or ()) - set(TOPICS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown topics: {', '.join(unknown)}")
+    try:
+        last_event_id = int(request.headers.get("last-event-id", ""))
+    except ValueError:
+        last_event_id = None
+
+    db_path = _db_path()
+
+    async def read_version():
+        return await run_in_threadpool(read_data_version, db_path)
+
+    return StreamingResponse(
+        iter_event_stream(change_feed, read_version, last_event_id=last_event_id, topics=wanted),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+# Gzip large JSON/HTML/text responses; inside CORS, outside the response cache
+# so cached bodies stay uncompressed.
+app.add_middleware(CompressionMiddleware)
+
 # Allow local frontend origins (Vite/Electron dev) to read API responses.
 app.add_middleware(
     CORSMiddleware,
@@ -73,6 +232,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "Link"],
 )
 
 
@@ -230,88 +390,11 @@ def _safe_pdf_filename(value: str) -> str:
     return cleaned.strip("_.") or "resume"
 
 
-def _render_resume_pdf_with_reportlab(markdown_text: str) -> bytes:
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib.styles import ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.lib import colors
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable
-    from io import BytesIO
-
-    buf = BytesIO()
-    doc = SimpleDocTemplate(
-        buf, pagesize=letter,
-        leftMargin=0.75*inch, rightMargin=0.75*inch,
-        topMargin=0.75*inch, bottomMargin=0.75*inch
-    )
-
-    dark = colors.HexColor("#111827")
-    mid = colors.HexColor("#334155")
-    body_color = colors.HexColor("#0f172a")
-    divider_color = colors.HexColor("#cbd5e1")
-
-    style_h1 = ParagraphStyle("h1", fontSize=24, fontName="Helvetica-Bold",
-                               textColor=dark, spaceAfter=10, leading=28)
-    style_h2 = ParagraphStyle("h2", fontSize=8.5, fontName="Helvetica-Bold",
-                               textColor=mid, spaceBefore=16, spaceAfter=2,
-                               letterSpacing=1.2)
-    style_h3 = ParagraphStyle("h3", fontSize=10.5, fontName="Helvetica-Bold",
-                               textColor=dark, spaceBefore=8, spaceAfter=2)
-    style_body = ParagraphStyle("body", fontSize=10, fontName="Helvetica",
-                                textColor=body_color, spaceAfter=3, leading=14)
-    style_bullet = ParagraphStyle("bullet", fontSize=10, fontName="Helvetica",
-                                  textColor=body_color, spaceAfter=2, leading=14,
-                                  leftIndent=14, firstLineIndent=0)
-    style_meta = ParagraphStyle("meta", fontSize=9, fontName="Helvetica-Oblique",
-                                textColor=mid, spaceBefore=8)
-
-    story = []
-    for line in markdown_text.splitlines():
-        stripped = line.strip()
-        if not stripped:
-            story.append(Spacer(1, 3))
-        elif stripped.startswith("# "):
-            story.append(Paragraph(stripped[2:], style_h1))
-        elif stripped.startswith("## "):
-            text = stripped[3:].upper()
-            story.append(Spacer(1, 2))
-            story.append(Paragraph(text, style_h2))
-            story.append(HRFlowable(width="100%", thickness=0.5,
-                                    color=divider_color, spaceAfter=5))
-        elif stripped.startswith("**") and stripped.endswith("**"):
-            story.append(Paragraph(stripped[2:-2], style_h3))
-        elif stripped.startswith("- "):
-            text = stripped[2:]
-            text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)
-            story.append(Paragraph(f"\u2022\u00a0{text}", style_bullet))
-        elif stripped.startswith("_") and stripped.endswith("_"):
-            story.append(Paragraph(f"<i>{stripped[1:-1]}</i>", style_meta))
-        else:
-            text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', stripped)
-            story.append(Paragraph(text, style_body))
-
-    doc.build(story)
-    return buf.getvalue()
-
-
-def _count_pdf_pages(pdf_bytes: bytes) -> int:
-    if PdfReader is not None:
-        reader = PdfReader(BytesIO(pdf_bytes))
-        return len(reader.pages)
-
-    # Fallback for environments where pypdf is unavailable.
-    page_tree_counts = [
-        int(match)
-        for match in re.findall(rb"/Count\s+(\d+)\s+/Kids\s*\[.*?\]\s*/Type\s*/Pages\b", pdf_bytes, re.DOTALL)
-    ]
-    if page_tree_counts:
-        return max(page_tree_counts)
-
-    page_markers = len(re.findall(rb"/Type\s*/Page\b", pdf_bytes))
-    return max(page_markers, 1)
+async def _render_resume_pdf(markdown_text: str, digest: str) -> Tuple[bytes, int]:
+    return await asyncio.wrap_future(resume_pdf_renderer.submit(markdown_text, digest))
 
 
-def _build_resume_pdf_payload(resume_id: int) -> Dict[str, Any]:
+def _load_resume_markdown(resume_id: int) -> Tuple[sqlite3.Row, str]:
     with get_connection() as conn:
         row = conn.execute(
             "SELECT id, username, resume_path, metadata_json, generated_at FROM resumes WHERE id = ?",
@@ -325,13 +408,21 @@ def _build_resume_pdf_payload(resume_id: int) -> Dict[str, Any]:
         raise HTTPException(status_code=404, detail="Resume file not found")
 
     with open(resume_path, "r", encoding="utf-8") as fh:
-        markdown_text = fh.read()
+        return row, fh.read()
+
+
+async def _build_resume_pdf_payload(resume_id: int) -> Dict[str, Any]:
+    row, markdown_text = await run_in_threadpool(_load_resume_markdown, resume_id)
 
-    pdf_bytes = _render_resume_pdf_with_reportlab(markdown_text)
+    digest = content_digest(markdown_text)
+    artifact = resume_pdf_cache.get(resume_id, digest)
+    if artifact is None:
+        artifact = await _render_resume_pdf(markdown_text, digest)
+        resume_pdf_cache.put(resume_id, digest, *artifact)
+    pdf_bytes, page_count = artifact
 
     username = row["username"] or "local"
     filename = _safe_pdf_filename(f"resume_{username}_{resume_id}.pdf")
-    page_count = _count_pdf_pages(pdf_bytes)
 
     return {
         "filename": filename,
@@ -340,14 +431,16 @@ def _build_resume_pdf_payload(resume_id: int) -> Dict[str, Any]:
     }
 
 
-def _load_portfolio_row_or_404(portfolio_id: int) -> Any:
-    with get_connection() as conn:
-        row = conn.execute(
-            """SELECT id, username, portfolio_name, display_name,
-                      included_project_ids, featured_project_ids, created_at
-               FROM portfolios WHERE id = ?""",
-            (portfolio_id,),
-        ).fetchone()
+def _load_portfolio_row_or_404(portfolio_id: int, conn: Any = None) -> Any:
+    if conn is None:
+        with get_connection() as conn:
+            return _load_portfolio_row_or_404(portfolio_id, conn)
+    row = conn.execute(
+        """SELECT id, username, portfolio_name, display_name,
+                  included_project_ids, featured_project_ids, created_at
+           FROM portfolios WHERE id = ?""",
+        (portfolio_id,),
+    ).fetchone()
     if not row:
         raise HTTPException(status_code=404, detail="Portfolio not found")
     return row
@@ -365,19 +458,26 @@ def _portfolio_row_to_dict(row: Any) -> Dict[str, Any]:
     }
 
 
-def _resolve_project_names_for_web(row: Any) -> List[str]:
-    """Resolve ordered project names from a portfolio row's included_project_ids."""
+def _resolve_projects_for_web(row: Any, conn: Any = None) -> List[Tuple[int, str]]:
+    """Resolve ordered (id, name) pairs from a portfolio row's included_project_ids."""
     included_ids = json.loads(row["included_project_ids"] or "[]")
     if not included_ids:
         return []
-    with get_connection() as conn:
-        placeholders = ",".join("?" for _ in included_ids)
-        rows = conn.execute(
-            f"SELECT id, name FROM projects WHERE id IN ({placeholders})",
-            included_ids,
-        ).fetchall()
+    if conn is None:
+        with get_connection() as conn:
+            return _resolve_projects_for_web(row, conn)
+    placeholders = ",".join("?" for _ in included_ids)
+    rows = conn.execute(
+        f"SELECT id, name FROM projects WHERE id IN ({placeholders})",
+        included_ids,
+    ).fetchall()
     id_to_name = {r["id"]: r["name"] for r in rows}
-    return [id_to_name[pid] for pid in included_ids if pid in id_to_name]
+    return [(pid, id_to_name[pid]) for pid in included_ids if pid in id_to_name]
+
+
+def _resolve_project_names_for_web(row: Any, conn: Any = None) -> List[str]:
+    """Resolve ordered project names from a portfolio row's included_project_ids."""
+    return [name for _, name in _resolve_projects_for_web(row, conn)]
 
 
 def _load_latest_project_summary(project_name: str) -> Optional[Dict[str, Any]]:
@@ -428,143 +528,6 @@ def _list_existing_contributors() -> List[str]:
     return [row["name"] for row in rows]
 
 
-def _collect_commit_cells_from_git_log(
-    project_path: Optional[str],
-    granularity: str,
-    target_username: Optional[str] = None,
-) -> List[Dict[str, Any]]:
-    """Collect commit activity cells directly from git log for a repository path."""
-    if not project_path or not os.path.isdir(project_path):
-        return []
-
-    target_canonical = canonical_username(target_username or "") if target_username else None
-    cmd = [
-        "git",
-        "log",
-        "--no-merges",
-        "--pretty=format:%an|%ae|%ad",
-        "--date=iso",
-    ]
-
-    try:
-        proc = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            cwd=project_path,
-        )
-    except Exception:
-        return []
-
-    if proc.returncode != 0:
-        return []
-
-    buckets: Dict[str, int] = {}
-    for line in proc.stdout.splitlines():
-        if not line or "|" not in line:
-            continue
-
-        parts = line.split("|", 2)
-        if len(parts) < 3:
-            continue
-
-        author_name = parts[0].strip()
-        author_email = parts[1].strip()
-        date_str = parts[2].strip()
-
-        if target_canonical and canonical_username(author_name, author_email) != target_canonical:
-            continue
-
-        try:
-            dt = datetime.fromisoformat(date_str)
-        except Exception:
-            try:
-                dt = datetime.strptime(date_str[:19], "%Y-%m-%d %H:%M:%S")
-            except Exception:
-                continue
-
-        if granularity == "day":
-            period = dt.date().isoformat()
-        elif granularity == "month":
-            period = f"{dt.year:04d}-{dt.month:02d}"
-        else:
-            year, week, _ = dt.isocalendar()
-            period = datetime.fromisocalendar(year, week, 1).date().isoformat()
-
-        buckets[period] = int(buckets.get(period, 0)) + 1
-
-    return [
-        {"period": period, "value": int(buckets[period])}
-        for period in sorted(buckets.keys())
-    ]
-
-
-def _compute_project_contributor_roles(conn: Any, project_name: str) -> Dict[str, Any]:
-    """Infer contributor roles for a project from per-file activity in all scans."""
-    if not project_name:
-        return {"contributors": [], "summary": {}}
-    blacklist = {"githubclassroombot", "unknown", "n/a", "none"}
-
-    rows = conn.execute(
-        """
-        SELECT c.name AS contributor_name, f.file_path
-        FROM scans s
-        JOIN files f ON f.scan_id = s.id
-        JOIN file_contributors fc ON fc.file_id = f.id
-        JOIN contributors c ON c.id = fc.contributor_id
-        WHERE s.project = ?
-          AND c.name IS NOT NULL
-          AND TRIM(c.name) <> ''
-        """,
-        (project_name,),
-    ).fetchall()
-
-    if not rows:
-        return {"contributors": [], "summary": {}}
-
-    contributors_data: Dict[str, Dict[str, Any]] = {}
-    for row in rows:
-        contributor_name = row["contributor_name"]
-        if not contributor_name or contributor_name.strip().lower() in blacklist:
-            continue
-        file_path = row["file_path"] or ""
-
-        if contributor_name not in contributors_data:
-            contributors_data[contributor_name] = {
-                "files_changed": set(),
-                "activity_by_category": {
-                    "code": 0,
-                    "test": 0,
-                    "docs": 0,
-                    "design": 0,
-                    "other": 0,
-                },
-            }
-
-        file_set = contributors_data[contributor_name]["files_changed"]
-        if file_path and file_path not in file_set:
-            file_set.add(file_path)
-            category = classify_file(file_path)
-            activity = contributors_data[contributor_name]["activity_by_category"]
-            activity[category] = activity.get(category, 0) + 1
-
-    normalized: Dict[str, Dict[str, Any]] = {}
-    for name, data in contributors_data.items():
-        files_changed = sorted(data["files_changed"])
-        file_count = len(files_changed)
-        normalized[name] = {
-            "files_changed": files_changed,
-            # Keep estimate strategy aligned with detect_roles DB loaders.
-            "commits": max(1, file_count),
-            "lines_added": file_count * 50,
-            "lines_removed": file_count * 10,
-            "activity_by_category": data["activity_by_category"],
-        }
-
-    return analyze_project_roles(normalized)
-
-
 @app.post("/privacy-consent")
 def update_privacy_consent(payload: PrivacyConsentRequest):
     # Persist consent in the user's config to mirror CLI behavior.
@@ -632,7 +595,14 @@ def upload_project(payload: ProjectUploadRequest):
     if payload.save_to_db:
         with get_connection() as conn:
             row = conn.execute(
-                "SELECT id FROM scans WHERE project = ? ORDER BY id DESC LIMIT 1",
+                """
+                SELECT s.id
+                FROM projects p
+                JOIN scans s ON s.project_id = p.id
+                WHERE p.name = ?
+                ORDER BY s.id DESC
+                LIMIT 1
+                """,
                 (project_name,),
             ).fetchone()
             scan_id = row["id"] if row else None
@@ -647,6 +617,7 @@ def upload_project(payload: ProjectUploadRequest):
         output_summary_path = json_path
     except Exception:
         output_summary_path = None
+    _bump_after_write()
 
     return {
         "project_name": project_name,
@@ -782,6 +753,7 @@ def stream_project_scan(payload: ProjectUploadRequest):
         except Exception as exc:
             q.put(f"SCAN_DONE::{json.dumps({'success': False, 'error': str(exc)})}")
         finally:
+            _bump_after_write()
             q.put(None)
 
     threading.Thread(target=run_scan, daemon=True).start()
@@ -796,64 +768,245 @@ def stream_project_scan(payload: ProjectUploadRequest):
     return StreamingResponse(generate(), media_type="text/plain; charset=utf-8")
 
 
+# List endpoints return bare arrays (the frontend depends on that). With
+# ?limit= they return one page and, when more rows exist, the cursor of the
+# next page in X-Next-Cursor (and a Link rel="next" URL); pass it back as ?after=.
+_PROJECT_FIELDS = ("id", "name", "custom_name", "repo_url", "created_at", "thumbnail_path", "latest_scan_at")
+_RESUME_FIELDS = ("id", "username", "generated_at", "llm_used")
+_PORTFOLIO_FIELDS = (
+    "id", "username", "portfolio_name", "display_name", "included_project_ids", "featured_project_ids", "created_at",
+)
+_PAGE_LIMIT = Query(None, ge=1, le=1000)
+
+
+def _parse_fields(fields: Optional[str], allowed) -> List[str]:
+    """Columns requested with ?fields=a,b (all of `allowed` when omitted), in `allowed` order."""
+    if not fields:
+        return list(allowed)
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return [name for name in allowed if name in requested]
+
+
+def _parse_after(after: Optional[str], key_size: int) -> Optional[list]:
+    if not after:
+        return None
+    try:
+        key = decode_cursor(after)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if len(key) != key_size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key
+
+
+def _prefix_pattern(prefix: str) -> str:
+    """LIKE pattern matching values that start with prefix (case-insensitive for ASCII)."""
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def _page(request: Request, response: Response, rows: list, limit: Optional[int], key_of) -> list:
+    """Trim a limit + 1 fetch to one page and advertise the next page's cursor."""
+    if limit is None or len(rows) <= limit:
+        return rows
+    rows = rows[:limit]
+    cursor = encode_cursor(key_of(rows[-1]))
+    response.headers["X-Next-Cursor"] = cursor
+    response.headers["Link"] = f'<{request.url.include_query_params(after=cursor)}>; rel="next"'
+    return rows
+
+
 @app.get("/projects")
-def list_projects():
+def list_projects(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = _PAGE_LIMIT,
+    after: Optional[str] = Query(None),
+    name_prefix: Optional[str] = Query(None),
+    since: Optional[str] = Query(None),
+    until: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+):
+    """Projects by id. since/until filter on the latest scan time; name_prefix matches name or custom_name."""
+    columns = _parse_fields(fields, _PROJECT_FIELDS)
+    key = _parse_after(after, 1)
+    graph = _read_graph(request)
+    if graph is not None:
+        rows = graph.list_projects(
+            after=key[0] if key else None,
+            name_prefix=name_prefix,
+            since=since,
+            until=until,
+            limit=limit + 1 if limit is not None else None,
+        )
+        rows = _page(request, response, rows, limit, lambda row: [row["id"]])
+        return [{name: row[name] for name in columns} for row in rows]
+    clauses, params = [], []
+    if key:
+        clauses.append("id > ?")
+        params.append(key[0])
+    if name_prefix:
+        clauses.append("(name LIKE ? ESCAPE '\\' OR custom_name LIKE ? ESCAPE '\\')")
+        params.extend([_prefix_pattern(name_prefix)] * 2)
+    if since:
+        clauses.append("latest_scan_at >= ?")
+        params.append(since)
+    if until:
+        clauses.append("latest_scan_at <= ?")
+        params.append(until)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    limit_sql = ""
+    if limit is not None:
+        limit_sql = "LIMIT ?"
+        params.append(limit + 1)
+    latest_scan = "NULL"
+    if "latest_scan_at" in columns or since or until:
+        latest_scan = "(SELECT MAX(scanned_at) FROM scans s WHERE s.project_id = p.id)"
     with get_connection() as conn:
         rows = conn.execute(
-            """
-            SELECT p.id, p.name, p.custom_name, p.repo_url, p.created_at, p.thumbnail_path,
-       (SELECT MAX(scanned_at) FROM scans s WHERE s.project = p.name) AS latest_scan_at
-FROM projects p
-ORDER BY p.id
-            """
+            f"""
+            SELECT * FROM (
+                SELECT p.id, p.name, p.custom_name, p.repo_url, p.created_at, p.thumbnail_path,
+                       {latest_scan} AS latest_scan_at
+                FROM projects p
+            )
+            {where}
+            ORDER BY id
+            {limit_sql}
+            """,
+            params,
         ).fetchall()
-    return [dict(row) for row in rows]
+    rows = _page(request, response, rows, limit, lambda row: [row["id"]])
+    return [{name: row[name] for name in columns} for row in rows]
 
 
-@app.get("/projects/{project_id}")
-def get_project(project_id: int):
+@app.get("/search")
+def search(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    """Full-text search over project names, summaries, file paths, skills and evidence."""
     with get_connection() as conn:
-        project = conn.execute(
-            "SELECT id, name, custom_name, repo_url, created_at, thumbnail_path FROM projects WHERE id = ?",
-            (project_id,),
-        ).fetchone()
+        found = search_projects(conn, q, limit=limit, offset=offset)
+    next_offset = offset + len(found["results"])
+    return {
+        "query": q,
+        "total": found["total"],
+        "limit": limit,
+        "offset": offset,
+        "next_offset": next_offset if next_offset < found["total"] else None,
+        "results": found["results"],
+    }
 
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
 
-        scans = conn.execute(
-            "SELECT id, scanned_at, notes FROM scans WHERE project = ? ORDER BY scanned_at DESC",
-            (project["name"],),
-        ).fetchall()
+# Optional parts of GET /projects/{project_id}; "project" is always returned.
+PROJECT_DETAIL_SECTIONS = (
+    "skills",
+    "languages",
+    "frameworks",
+    "contributors",
+    "contributor_roles",
+    "scans",
+    "files_summary",
+    "evidence",
+    "llm_summary",
+    "git_metrics",
+    "rank_score",
+)
 
-        scan_ids = [row["id"] for row in scans]
 
-        files_summary = {"total_files": 0, "extensions": {}}
-        languages: List[str] = []
-        contributors: List[str] = []
+def _parse_detail_sections(include: Optional[str], exclude: Optional[str]) -> set:
+    """Sections selected by ?include=a,b / ?exclude=c (all of them by default)."""
+    def names(value: Optional[str]) -> set:
+        requested = {name.strip() for name in (value or "").split(",") if name.strip()}
+        unknown = requested - set(PROJECT_DETAIL_SECTIONS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(sorted(unknown))}")
+        return requested
 
-        if scan_ids:
-            placeholders = ",".join("?" for _ in scan_ids)
+    selected = names(include) if include else set(PROJECT_DETAIL_SECTIONS)
+    return selected - names(exclude)
 
-            files_summary["total_files"] = conn.execute(
-                f"SELECT COUNT(*) AS total FROM files WHERE scan_id IN ({placeholders})",
-                scan_ids,
-            ).fetchone()["total"]
 
-            ext_rows = conn.execute(
-                f"""
-                SELECT file_extension, COUNT(*) AS count
-                FROM files
-                WHERE scan_id IN ({placeholders})
-                GROUP BY file_extension
-                """,
-                scan_ids,
-            ).fetchall()
+@app.get("/projects/{project_id}")
+def get_project(
+    project_id: int,
+    include: Optional[str] = Query(None),
+    exclude: Optional[str] = Query(None),
+):
+    sections = _parse_detail_sections(include, exclude)
+    # git_metrics is sent as stored instead of being parsed and re-encoded; it
+    # lists every changed file per author and dominates the response on big repos
+    return FastJSONResponse(_project_detail(project_id, raw_git_metrics=True, sections=sections))
 
-            files_summary["extensions"] = {
-                (row["file_extension"] or ""): row["count"] for row in ext_rows
-            }
 
+@app.get("/projects/{project_id}/roles")
+def get_project_roles(project_id: int):
+    return FastJSONResponse(_project_detail(project_id, sections={"contributor_roles"})["contributor_roles"])
+
+
+@app.get("/projects/{project_id}/git-metrics")
+def get_project_git_metrics(project_id: int):
+    detail = _project_detail(project_id, raw_git_metrics=True, sections={"git_metrics"})
+    return FastJSONResponse(detail["git_metrics"])
+
+
+@app.get("/projects/{project_id}/rank")
+def get_project_rank(project_id: int):
+    return {"project_id": project_id, "rank_score": _project_detail(project_id, sections={"rank_score"})["rank_score"]}
+
+
+def _project_detail(
+    project_id: int, raw_git_metrics: bool = False, sections: Optional[set] = None, conn: Any = None
+) -> Dict[str, Any]:
+    """
+    GET /projects/{project_id} payload, computing only the requested sections
+    (all of PROJECT_DETAIL_SECTIONS by default). raw_git_metrics leaves
+    git_metrics as a RawJSON fragment.
+    """
+    if conn is None:
+        with get_connection() as conn:
+            return _project_detail(project_id, raw_git_metrics, sections, conn)
+    if sections is None:
+        sections = set(PROJECT_DETAIL_SECTIONS)
+    detail: Dict[str, Any] = {}
+    project = conn.execute(
+        "SELECT id, name, custom_name, repo_url, created_at, thumbnail_path FROM projects WHERE id = ?",
+        (project_id,),
+    ).fetchone()
+
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    detail["project"] = dict(project)
+
+    scans = []
+    if sections & {"scans", "languages", "contributors", "files_summary"}:
+        scans = conn.execute(
+            "SELECT id, scanned_at, notes FROM scans WHERE project_id = ? ORDER BY scanned_at DESC",
+            (project_id,),
+        ).fetchall()
+
+    scan_ids = [row["id"] for row in scans]
+
+    files_summary = {"total_files": 0, "extensions": {}, "categories": {}}
+    languages: List[str] = []
+    contributors: List[str] = []
+
+    if scan_ids:
+        placeholders = ",".join("?" for _ in scan_ids)
+
+        if "files_summary" in sections:
+            project_stats = load_project_stats(conn, project_id)
+            if project_stats:
+                files_summary["total_files"] = project_stats["file_count"]
+                files_summary["extensions"] = project_stats["extensions"]
+                files_summary["categories"] = project_stats["categories"]
+
+        if "languages" in sections:
             languages_rows = conn.execute(
                 f"""
                 SELECT DISTINCT l.name
@@ -867,6 +1020,7 @@ def get_project(project_id: int):
 
             languages = [row["name"] for row in languages_rows]
 
+        if "contributors" in sections:
             contributor_rows = conn.execute(
                 f"""
                 SELECT DISTINCT c.name
@@ -884,6 +1038,7 @@ def get_project(project_id: int):
                 if row["name"] and row["name"].strip().lower() not in blacklist
             ]
 
+    if "skills" in sections:
         skill_rows = conn.execute(
             """
             SELECT s.name
@@ -894,7 +1049,29 @@ def get_project(project_id: int):
             """,
             (project_id,),
         ).fetchall()
+        detail["skills"] = [row["name"] for row in skill_rows]
+
+    if "languages" in sections:
+        detail["languages"] = languages
+
+    if "frameworks" in sections:
+        tech_row = conn.execute("SELECT tech_json FROM projects WHERE id = ?", (project_id,)).fetchone()
+        tech_summary = _parse_metadata(tech_row["tech_json"]) if tech_row else {}
+        detail["frameworks"] = tech_summary.get("high_confidence_frameworks") or tech_summary.get("frameworks") or []
+
+    if "contributors" in sections:
+        detail["contributors"] = contributors
+
+    if "contributor_roles" in sections:
+        detail["contributor_roles"] = load_project_roles(conn, project_id) or {"contributors": [], "summary": {}}
+
+    if "scans" in sections:
+        detail["scans"] = [dict(row) for row in scans]
 
+    if "files_summary" in sections:
+        detail["files_summary"] = files_summary
+
+    if "evidence" in sections:
         evidence_rows = conn.execute(
             """
             SELECT id, type, description, value, source, url, added_by_user, created_at
@@ -904,42 +1081,145 @@ def get_project(project_id: int):
             """,
             (project_id,),
         ).fetchall()
+        detail["evidence"] = [dict(row) for row in evidence_rows]
 
-        llm_summary = _load_llm_summary(project["name"])
-        contributor_roles = _compute_project_contributor_roles(conn, project["name"])
+    if "llm_summary" in sections:
+        detail["llm_summary"] = _load_llm_summary(project["name"])
 
+    if "git_metrics" in sections:
         git_metrics_row = conn.execute(
-            "SELECT git_metrics_json, tech_json FROM projects WHERE id = ?",
+            "SELECT CASE WHEN json_valid(git_metrics_json) THEN git_metrics_json END AS git_metrics_json FROM projects WHERE id = ?",
             (project_id,),
         ).fetchone()
-        git_metrics = _parse_metadata(git_metrics_row["git_metrics_json"]) if git_metrics_row else {}
-        tech_summary = _parse_metadata(git_metrics_row["tech_json"]) if git_metrics_row else {}
+        git_metrics_json = git_metrics_row["git_metrics_json"] if git_metrics_row else None
+        if raw_git_metrics:
+            detail["git_metrics"] = RawJSON(git_metrics_json) if git_metrics_json else {}
+        else:
+            detail["git_metrics"] = _parse_metadata(git_metrics_json)
 
-    # Look up this project's rank score from the project-mode importance ranking.
-    rank_score: Optional[float] = None
-    try:
-        all_ranked = rank_projects_by_importance(mode="project", contributor_name=None, limit=None)
-        for item in all_ranked:
-            if item.get("project") == project["name"]:
-                rank_score = item.get("top_score")
-                break
-    except Exception:
-        pass
+    if "rank_score" in sections:
+        # Single-cell lookup into the precomputed project-mode importance scores.
+        rank_score: Optional[float] = None
+        try:
+            rank_score = importance_score(conn, project_id)
+        except sqlite3.Error:
+            pass
+        detail["rank_score"] = rank_score
 
-    return {
-        "project": dict(project),
-        "skills": [row["name"] for row in skill_rows],
-        "languages": languages,
-        "frameworks": tech_summary.get("high_confidence_frameworks") or tech_summary.get("frameworks") or [],
-        "contributors": contributors,
-        "contributor_roles": contributor_roles,
-        "scans": [dict(row) for row in scans],
-        "files_summary": files_summary,
-        "evidence": [dict(row) for row in evidence_rows],
-        "llm_summary": llm_summary,
-        "git_metrics": git_metrics,
-        "rank_score": rank_score,
-    }
+    return detail
+
+
+def _load_project_details(conn: Any, project_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    GET /projects/{project_id} payloads (without scans) for several projects,
+    keyed by project id, using one query per section however many projects
+    there are. Used by the bundle and the HTML export.
+    """
+    if not project_ids:
+        return {}
+    ids = list(project_ids)
+    placeholders = ",".join("?" for _ in ids)
+    details: Dict[int, Dict[str, Any]] = {}
+    for row in conn.execute(
+        f"""
+        SELECT id, name, custom_name, repo_url, created_at, thumbnail_path, tech_json,
+               CASE WHEN json_valid(git_metrics_json) THEN git_metrics_json END AS git_metrics_json,
+               summary_text, summary_model, summary_updated_at
+        FROM projects WHERE id IN ({placeholders})
+        """,
+        ids,
+    ):
+        tech_summary = _parse_metadata(row["tech_json"])
+        details[row["id"]] = {
+            "project": {key: row[key] for key in ("id", "name", "custom_name", "repo_url", "created_at", "thumbnail_path")},
+            "skills": [],
+            "languages": [],
+            "frameworks": tech_summary.get("high_confidence_frameworks") or tech_summary.get("frameworks") or [],
+            "contributors": [],
+            "contributor_roles": None,
+            "files_summary": {"total_files": 0, "extensions": {}, "categories": {}},
+            "evidence": [],
+            "llm_summary": (
+                {"text": row["summary_text"], "model": row["summary_model"], "updated_at": row["summary_updated_at"]}
+                if row["summary_text"] else None
+            ),
+            "git_metrics": _parse_metadata(row["git_metrics_json"]),
+            "rank_score": None,
+        }
+    ids = [project_id for project_id in ids if project_id in details]
+    if not ids:
+        return {}
+    placeholders = ",".join("?" for _ in ids)
+
+    for row in conn.execute(
+        f"""
+        SELECT ps.project_id, s.name
+        FROM skills s
+        JOIN project_skills ps ON ps.skill_id = s.id
+        WHERE ps.project_id IN ({placeholders})
+        ORDER BY ps.project_id, s.name
+        """,
+        ids,
+    ):
+        details[row["project_id"]]["skills"].append(row["name"])
+
+    for row in conn.execute(
+        f"""
+        SELECT DISTINCT s.project_id, l.name
+        FROM scans s
+        JOIN files f ON f.scan_id = s.id
+        JOIN file_languages fl ON fl.file_id = f.id
+        JOIN languages l ON l.id = fl.language_id
+        WHERE s.project_id IN ({placeholders})
+        """,
+        ids,
+    ):
+        details[row["project_id"]]["languages"].append(row["name"])
+
+    blacklist = {"githubclassroombot", "unknown", "n/a", "none"}
+    for row in conn.execute(
+        f"""
+        SELECT DISTINCT s.project_id, c.name
+        FROM scans s
+        JOIN files f ON f.scan_id = s.id
+        JOIN file_contributors fc ON fc.file_id = f.id
+        JOIN contributors c ON c.id = fc.contributor_id
+        WHERE s.project_id IN ({placeholders})
+        """,
+        ids,
+    ):
+        if row["name"] and row["name"].strip().lower() not in blacklist:
+            details[row["project_id"]]["contributors"].append(row["name"])
+
+    for project_id, stats in load_projects_stats(conn, ids).items():
+        if stats["scan_count"]:
+            details[project_id]["files_summary"] = {
+                "total_files": stats["file_count"],
+                "extensions": stats["extensions"],
+                "categories": stats["categories"],
+            }
+
+    for row in conn.execute(
+        f"""
+        SELECT project_id, id, type, description, value, source, url, added_by_user, created_at
+        FROM project_evidence
+        WHERE project_id IN ({placeholders})
+        ORDER BY project_id, created_at DESC
+        """,
+        ids,
+    ):
+        entry = dict(row)
+        details[entry.pop("project_id")]["evidence"].append(entry)
+
+    roles = load_projects_roles(conn, ids)
+    try:
+        scores = project_top_scores(conn, ids)
+    except sqlite3.Error:
+        scores = {}
+    for project_id in ids:
+        details[project_id]["contributor_roles"] = roles.get(project_id) or {"contributors": [], "summary": {}}
+        details[project_id]["rank_score"] = scores.get(project_id)
+    return details
 
 
 @app.patch("/projects/{project_id}/evidence/{evidence_id}")
@@ -1026,28 +1306,105 @@ def remove_project_evidence(project_id: int, evidence_id: int):
 
     return {"message": "Evidence deleted successfully"}
 
+@app.get("/projects/{project_id}/history")
+def get_project_history(project_id: int):
+    """Growth series over the retained older scans of a project and its live scan."""
+    with get_connection() as conn:
+        if not conn.execute("SELECT 1 FROM projects WHERE id = ?", (project_id,)).fetchone():
+            raise HTTPException(status_code=404, detail="Project not found")
+        scans = history_series(conn, project_id)
+    return {"project_id": project_id, "retention": load_retention_policy(), "scans": scans}
+
+
+@app.get("/projects/{project_id}/history/{history_id}")
+def get_project_history_scan(project_id: int, history_id: int):
+    """A retained older scan of a project, rebuilt from the stored deltas."""
+    with get_connection() as conn:
+        snapshot = reconstruct_scan(conn, project_id, history_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Historical scan not found")
+    return snapshot
+
+
 @app.get("/skills")
-def list_skills():
+def list_skills(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = _PAGE_LIMIT,
+    after: Optional[str] = Query(None),
+    name_prefix: Optional[str] = Query(None),
+):
+    key = _parse_after(after, 1)
+    graph = _read_graph(request)
+    if graph is not None:
+        names = graph.list_skills(
+            after=key[0] if key else None,
+            name_prefix=name_prefix,
+            limit=limit + 1 if limit is not None else None,
+        )
+        return _page(request, response, names, limit, lambda name: [name])
+    clauses, params = [], []
+    if key:
+        clauses.append("name > ?")
+        params.append(key[0])
+    if name_prefix:
+        clauses.append("name LIKE ? ESCAPE '\\'")
+        params.append(_prefix_pattern(name_prefix))
+    sql = "SELECT name FROM skills"
+    if clauses:
+        sql += f" WHERE {' AND '.join(clauses)}"
+    sql += " ORDER BY name"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit + 1)
     with get_connection() as conn:
-        rows = conn.execute("SELECT name FROM skills ORDER BY name").fetchall()
+        rows = conn.execute(sql, params).fetchall()
+    rows = _page(request, response, rows, limit, lambda row: [row["name"]])
     return [row["name"] for row in rows]
 
 
 @app.get("/contributors")
-def list_contributors():
-    blacklist = {"githubclassroombot", "unknown", "n/a", "none"}
+def list_contributors(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = _PAGE_LIMIT,
+    after: Optional[str] = Query(None),
+    name_prefix: Optional[str] = Query(None),
+):
+    key = _parse_after(after, 1)
+    graph = _read_graph(request)
+    if graph is not None:
+        names = graph.list_contributors(
+            after=key[0] if key else None,
+            name_prefix=name_prefix,
+            limit=limit + 1 if limit is not None else None,
+        )
+        return _page(request, response, names, limit, lambda name: [name])
+    clauses = [
+        "name IS NOT NULL",
+        "TRIM(name) <> ''",
+        "LOWER(name) NOT IN ('githubclassroombot', 'unknown', 'n/a', 'none')",
+    ]
+    params = []
+    if key:
+        clauses.append("name > ?")
+        params.append(key[0])
+    if name_prefix:
+        clauses.append("name LIKE ? ESCAPE '\\'")
+        params.append(_prefix_pattern(name_prefix))
+    sql = f"SELECT DISTINCT name FROM contributors WHERE {' AND '.join(clauses)} ORDER BY name"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit + 1)
     with get_connection() as conn:
-        rows = conn.execute(
-            "SELECT DISTINCT name FROM contributors WHERE name IS NOT NULL AND TRIM(name) <> '' ORDER BY name COLLATE NOCASE"
-        ).fetchall()
-    return sorted(
-        row["name"] for row in rows
-        if row["name"].lower() not in blacklist
-    )
+        rows = conn.execute(sql, params).fetchall()
+    rows = _page(request, response, rows, limit, lambda row: [row["name"]])
+    return [row["name"] for row in rows]
 
 
 @app.get("/rank-projects")
 def get_rank_projects(
+    request: Request,
     mode: str = Query("project", pattern="^(project|contributor)$"),
     contributor_name: Optional[str] = Query(None),
     limit: Optional[int] = Query(None, ge=1, le=200),
@@ -1057,18 +1414,19 @@ def get_rank_projects(
     if mode == "contributor" and not (contributor_name and contributor_name.strip()):
         raise HTTPException(status_code=400, detail="contributor_name is required for contributor mode")
 
-    ranked = rank_projects_by_importance(
-        mode=mode,
-        contributor_name=(contributor_name.strip() if contributor_name else None),
-        limit=None,
-    )
-
-    # Attach creation/scan chronology metadata for each project.
-    timeline_by_project = {
-        item.get("project"): item
-        for item in rank_projects(order=chronological_order)
-        if item.get("project")
-    }
+    contributor_name = contributor_name.strip() if contributor_name else None
+    graph = _read_graph(request)
+    if graph is not None:
+        ranked = graph.ranking(mode=mode, contributor_name=contributor_name)
+        timeline_by_project = graph.chronology
+    else:
+        ranked = rank_projects_by_importance(mode=mode, contributor_name=contributor_name, limit=None)
+        # Attach creation/scan chronology metadata for each project.
+        timeline_by_project = {
+            item.get("project"): item
+            for item in rank_projects(order=chronological_order)
+            if item.get("project")
+        }
     for item in ranked:
         timeline = timeline_by_project.get(item.get("project"), {})
         item["created_at"] = timeline.get("created_at")
@@ -1139,8 +1497,8 @@ def get_resume(resume_id: int):
 
 
 @app.get("/resume/{resume_id}/pdf/info")
-def get_resume_pdf_info(resume_id: int):
-    payload = _build_resume_pdf_payload(resume_id)
+async def get_resume_pdf_info(resume_id: int):
+    payload = await _build_resume_pdf_payload(resume_id)
     return {
         "filename": payload["filename"],
         "page_count": payload["page_count"],
@@ -1149,8 +1507,8 @@ def get_resume_pdf_info(resume_id: int):
 
 
 @app.get("/resume/{resume_id}/pdf")
-def get_resume_pdf(resume_id: int):
-    payload = _build_resume_pdf_payload(resume_id)
+async def get_resume_pdf(resume_id: int):
+    payload = await _build_resume_pdf_payload(resume_id)
     headers = {
         "Content-Disposition": f'attachment; filename="{payload["filename"]}"',
         "Cache-Control": "no-store",
@@ -1159,39 +1517,51 @@ def get_resume_pdf(resume_id: int):
 
 
 @app.get("/resumes")
-def list_resumes(username: Optional[str] = Query(default=None)):
+def list_resumes(
+    request: Request,
+    response: Response,
+    username: Optional[str] = Query(default=None),
+    limit: Optional[int] = _PAGE_LIMIT,
+    after: Optional[str] = Query(None),
+    since: Optional[str] = Query(None),
+    until: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+):
+    """Resumes newest first. since/until filter on generated_at (inclusive)."""
+    columns = _parse_fields(fields, _RESUME_FIELDS)
+    key = _parse_after(after, 2)
     username_filter = (username or "").strip()
+    clauses, params = [], []
+    if username_filter:
+        clauses.append("username = ?")
+        params.append(username_filter)
+    if since:
+        clauses.append("generated_at >= ?")
+        params.append(since)
+    if until:
+        clauses.append("generated_at <= ?")
+        params.append(until)
+    if key:
+        clause, after_params = newer_first_after("generated_at", "id", key)
+        clauses.append(clause)
+        params.extend(after_params)
+    sql = "SELECT id, username, generated_at, llm_used FROM resumes"
+    if clauses:
+        sql += f" WHERE {' AND '.join(clauses)}"
+    sql += " ORDER BY generated_at DESC, id DESC"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit + 1)
     with get_connection() as conn:
-        if username_filter:
-            rows = conn.execute(
-                """
-                SELECT id, username, generated_at, metadata_json
-                FROM resumes
-                WHERE username = ?
-                ORDER BY generated_at DESC
-                """,
-                (username_filter,),
-            ).fetchall()
-        else:
-            rows = conn.execute(
-                """
-                SELECT id, username, generated_at, metadata_json
-                FROM resumes
-                ORDER BY generated_at DESC
-                """
-            ).fetchall()
+        rows = conn.execute(sql, params).fetchall()
 
+    rows = _page(request, response, rows, limit, lambda row: [row["generated_at"], row["id"]])
     items = []
     for row in rows:
-        metadata = _parse_metadata(row["metadata_json"])
-        items.append(
-            {
-                "id": row["id"],
-                "username": row["username"],
-                "generated_at": row["generated_at"],
-                "llm_used": bool(metadata.get("llm_summary")),
-            }
-        )
+        item = {name: row[name] for name in columns}
+        if "llm_used" in item:
+            item["llm_used"] = bool(item["llm_used"])
+        items.append(item)
     return items
 
 
@@ -1230,27 +1600,8 @@ def get_outputs_count():
 def get_dashboard_stats():
     """Comprehensive dashboard stats with insights."""
     with get_connection() as conn:
-        # Projects info
-        projects_count = conn.execute("SELECT COUNT(*) as count FROM projects").fetchone()["count"]
-        latest_scan = conn.execute(
-            "SELECT scanned_at, project FROM scans ORDER BY scanned_at DESC LIMIT 1"
-        ).fetchone()
-        
-        # Contributors info
-        contributors_count = conn.execute(
-            "SELECT COUNT(DISTINCT name) as count FROM contributors WHERE name IS NOT NULL AND TRIM(name) <> ''"
-        ).fetchone()["count"]
-        top_contributor = conn.execute(
-            """
-            SELECT c.name, COUNT(fc.file_id) as file_count
-            FROM contributors c
-            LEFT JOIN file_contributors fc ON c.id = fc.contributor_id
-            WHERE c.name IS NOT NULL AND TRIM(c.name) <> ''
-            GROUP BY c.id
-            ORDER BY file_count DESC
-            LIMIT 1
-            """
-        ).fetchone()
+        # Project and contributor totals are materialized on write (see db_stats)
+        stats = load_global_stats(conn)
 
         # Outputs info. Older local DBs may not yet have these tables/columns.
         resumes_count = 0
@@ -1283,14 +1634,14 @@ def get_dashboard_stats():
     
     return {
         "projects": {
-            "count": projects_count,
-            "latest_scan": latest_scan["scanned_at"] if latest_scan else None,
-            "latest_project": latest_scan["project"] if latest_scan else None,
+            "count": stats["project_count"],
+            "latest_scan": stats["latest_scan_at"],
+            "latest_project": stats["latest_project"],
         },
         "contributors": {
-            "count": contributors_count,
-            "top_contributor": top_contributor["name"] if top_contributor else None,
-            "top_contributor_files": top_contributor["file_count"] if top_contributor else 0,
+            "count": stats["contributor_count"],
+            "top_contributor": stats["top_contributor"],
+            "top_contributor_files": stats["top_contributor_files"],
         },
         "outputs": {
             "total": resumes_count + portfolios_count,
@@ -1367,6 +1718,7 @@ def edit_resume(resume_id: int, payload: ResumeEditRequest):
         os.makedirs(os.path.dirname(resume_path), exist_ok=True)
         with open(resume_path, "w", encoding="utf-8") as fh:
             fh.write(payload.content)
+        resume_pdf_cache.invalidate(resume_id)
 
         if payload.metadata is not None:
             conn.execute(
@@ -1374,6 +1726,7 @@ def edit_resume(resume_id: int, payload: ResumeEditRequest):
                 (json.dumps(payload.metadata), resume_id),
             )
             conn.commit()
+        change_feed.publish("resumes", conn, action="updated", resume_id=resume_id)
 
         updated = conn.execute(
             "SELECT id, username, resume_path, metadata_json, generated_at FROM resumes WHERE id = ?",
@@ -1394,6 +1747,8 @@ def delete_resume(resume_id: int):
             raise HTTPException(status_code=404, detail="Resume not found")
         conn.execute("DELETE FROM resumes WHERE id = ?", (resume_id,))
         conn.commit()
+        change_feed.publish("resumes", conn, action="deleted", resume_id=resume_id)
+    resume_pdf_cache.invalidate(resume_id)
     resume_path = row["resume_path"]
     if resume_path and os.path.isfile(resume_path):
         try:
@@ -1404,8 +1759,27 @@ def delete_resume(resume_id: int):
 
 
 @app.get("/portfolios/all")
-def get_all_portfolios():
-    return list_all_portfolios()
+def get_all_portfolios(
+    request: Request,
+    response: Response,
+    username: Optional[str] = Query(None),
+    limit: Optional[int] = _PAGE_LIMIT,
+    after: Optional[str] = Query(None),
+    since: Optional[str] = Query(None),
+    until: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+):
+    """Saved portfolios newest first. since/until filter on created_at (inclusive)."""
+    columns = _parse_fields(fields, _PORTFOLIO_FIELDS)
+    rows = list_all_portfolios(
+        username=(username or "").strip() or None,
+        since=since,
+        until=until,
+        after=_parse_after(after, 2),
+        limit=None if limit is None else limit + 1,
+    )
+    rows = _page(request, response, rows, limit, lambda row: [row["created_at"], row["id"]])
+    return [{name: row[name] for name in columns} for row in rows]
 
 
 @app.get("/portfolios")
@@ -1446,8 +1820,10 @@ def cleanup_temp_portfolios():
     This endpoint is called on PortfolioPage mount to delete orphaned temporary entries left by abrupt app closes
     """
     with get_connection() as conn:
-        conn.execute("DELETE FROM portfolios WHERE portfolio_name LIKE '__temp__%'")
+        deleted = conn.execute("DELETE FROM portfolios WHERE portfolio_name LIKE '__temp__%'").rowcount
         conn.commit()
+        if deleted:
+            change_feed.publish("portfolios", conn, action="deleted", portfolio_id=None)
 
 
 @app.put("/portfolios/{portfolio_id}")
@@ -1542,9 +1918,13 @@ def get_web_timeline(
     portfolio_id: int,
     granularity: str = Query("month", pattern="^(week|month)$"),
 ):
-    row = _load_portfolio_row_or_404(portfolio_id)
-    project_names = _resolve_project_names_for_web(row)
+    with get_connection() as conn:
+        row = _load_portfolio_row_or_404(portfolio_id, conn)
+        return _timeline_view(conn, row, _resolve_project_names_for_web(row, conn), granularity)
+
 
+def _timeline_view(conn: Any, row: Any, project_names: List[str], granularity: str) -> Dict[str, Any]:
+    portfolio_id = row["id"]
     if not project_names:
         return {
             "portfolio_id": portfolio_id,
@@ -1555,23 +1935,22 @@ def get_web_timeline(
 
     bucket = "%Y-W%W" if granularity == "week" else "%Y-%m"
     placeholders = ",".join("?" for _ in project_names)
-    with get_connection() as conn:
-        rows = conn.execute(
-            f"""
-            SELECT strftime('{bucket}', s.scanned_at) AS period,
-                   sk.name AS skill,
-                   COUNT(*) AS occurrences,
-                   COUNT(DISTINCT p.id) AS project_count
-            FROM scans s
-            JOIN projects p ON p.name = s.project
-            JOIN project_skills ps ON ps.project_id = p.id
-            JOIN skills sk ON sk.id = ps.skill_id
-            WHERE p.name IN ({placeholders})
-            GROUP BY period, sk.name
-            ORDER BY period ASC, sk.name ASC
-            """,
-            project_names,
-        ).fetchall()
+    rows = conn.execute(
+        f"""
+        SELECT strftime('{bucket}', s.scanned_at) AS period,
+               sk.name AS skill,
+               COUNT(*) AS occurrences,
+               COUNT(DISTINCT p.id) AS project_count
+        FROM scans s
+        JOIN projects p ON p.id = s.project_id
+        JOIN project_skills ps ON ps.project_id = p.id
+        JOIN skills sk ON sk.id = ps.skill_id
+        WHERE p.name IN ({placeholders})
+        GROUP BY period, sk.name
+        ORDER BY period ASC, sk.name ASC
+        """,
+        project_names,
+    ).fetchall()
 
     grouped: Dict[str, List[Dict[str, Any]]] = {}
     for item in rows:
@@ -1595,15 +1974,39 @@ def get_web_timeline(
     }
 
 
+def _activity_cells(conn: Any, rows: List[Any], project_ids: List[int], period_expr: str, metric: str) -> List[Dict[str, Any]]:
+    """Heatmap cells from live-scan rows, plus retained scan history for the scans/files metrics."""
+    history = history_activity(conn, project_ids, period_expr, metric) if metric in ("scans", "files") else {}
+    return _merge_activity_cells(rows, history)
+
+
+def _merge_activity_cells(rows: List[Any], history: Dict[str, int]) -> List[Dict[str, Any]]:
+    values: Dict[str, int] = {}
+    for item in rows:
+        values[item["period"]] = values.get(item["period"], 0) + int(item["value"] or 0)
+    for period, value in history.items():
+        values[period] = values.get(period, 0) + value
+    return [{"period": period, "value": values[period]} for period in sorted(values, key=lambda p: (p is not None, p or ""))]
+
+
 @web_router.get("/{portfolio_id}/heatmap")
 def get_web_heatmap(
     portfolio_id: int,
     granularity: str = Query("day", pattern="^(day|week|month)$"),
-    metric: str = Query("files", pattern="^(scans|files)$"),
+    metric: str = Query("files", pattern="^(scans|files|commits)$"),
 ):
-    row = _load_portfolio_row_or_404(portfolio_id)
-    project_names = _resolve_project_names_for_web(row)
+    return FastJSONResponse(_portfolio_heatmap(portfolio_id, granularity, metric))
+
+
+def _portfolio_heatmap(portfolio_id: int, granularity: str, metric: str) -> Dict[str, Any]:
+    with get_connection() as conn:
+        row = _load_portfolio_row_or_404(portfolio_id, conn)
+        return _portfolio_heatmap_view(conn, row, _resolve_projects_for_web(row, conn), granularity, metric)
 
+
+def _portfolio_heatmap_view(conn: Any, row: Any, projects: List[Tuple[int, str]], granularity: str, metric: str) -> Dict[str, Any]:
+    portfolio_id = row["id"]
+    project_names = [name for _, name in projects]
     if not project_names:
         return {
             "portfolio_id": portfolio_id,
@@ -1620,34 +2023,49 @@ def get_web_heatmap(
     }
     bucket = bucket_map[granularity]
     placeholders = ",".join("?" for _ in project_names)
-    with get_connection() as conn:
-        if metric == "scans":
-            rows = conn.execute(
-                f"""
-                SELECT strftime('{bucket}', s.scanned_at) AS period,
-                       COUNT(*) AS value
-                FROM scans s
-                WHERE s.project IN ({placeholders})
-                GROUP BY period
-                ORDER BY period ASC
-                """,
-                project_names,
-            ).fetchall()
-        else:
-            rows = conn.execute(
-                f"""
-                SELECT strftime('{bucket}', s.scanned_at) AS period,
-                       COUNT(f.id) AS value
-                FROM scans s
-                JOIN files f ON f.scan_id = s.id
-                WHERE s.project IN ({placeholders})
-                GROUP BY period
-                ORDER BY period ASC
-                """,
-                project_names,
-            ).fetchall()
+    if metric == "scans":
+        rows = conn.execute(
+            f"""
+            SELECT strftime('{bucket}', s.scanned_at) AS period,
+                   COUNT(*) AS value
+            FROM projects p
+            JOIN scans s ON s.project_id = p.id
+            WHERE p.name IN ({placeholders})
+            GROUP BY period
+            ORDER BY period ASC
+            """,
+            project_names,
+        ).fetchall()
+    elif metric == "commits":
+        rows = conn.execute(
+            f"""
+            SELECT strftime('{bucket}', c.committed_at) AS period,
+                   COUNT(*) AS value
+            FROM projects p
+            JOIN commits c ON c.project_id = p.id
+            WHERE p.name IN ({placeholders})
+            GROUP BY period
+            ORDER BY period ASC
+            """,
+            project_names,
+        ).fetchall()
+    else:
+        rows = conn.execute(
+            f"""
+            SELECT strftime('{bucket}', s.scanned_at) AS period,
+                   COUNT(f.id) AS value
+            FROM projects p
+            JOIN scans s ON s.project_id = p.id
+            JOIN files f ON f.scan_id = s.id
+            WHERE p.name IN ({placeholders})
+            GROUP BY period
+            ORDER BY period ASC
+            """,
+            project_names,
+        ).fetchall()
+    project_ids = [project_id for project_id, _ in projects]
+    cells = _activity_cells(conn, rows, project_ids, f"strftime('{bucket}', s.scanned_at)", metric)
 
-    cells = [{"period": item["period"], "value": int(item["value"] or 0)} for item in rows]
     return {
         "portfolio_id": portfolio_id,
         "granularity": granularity,
@@ -1665,240 +2083,311 @@ def get_web_project_heatmap(
     metric: str = Query("contrib_files", pattern="^(scans|files|contrib_files)$"),
     view_scope: str = Query("project", pattern="^(project|user)$"),
 ):
-    row = _load_portfolio_row_or_404(portfolio_id)
-    allowed_projects = set(_resolve_project_names_for_web(row))
+    return FastJSONResponse(_project_heatmap(portfolio_id, project_id, granularity, metric, view_scope))
+
+
+def _project_heatmap(portfolio_id: int, project_id: int, granularity: str, metric: str, view_scope: str) -> Dict[str, Any]:
     with get_connection() as conn:
-        project_row = conn.execute(
-            "SELECT id, name, git_metrics_json, created_at, project_path FROM projects WHERE id = ?",
-            (project_id,),
-        ).fetchone()
+        row = _load_portfolio_row_or_404(portfolio_id, conn)
+        allowed_projects = set(_resolve_project_names_for_web(row, conn))
+        return _project_heatmap_view(conn, row, allowed_projects, project_id, granularity, metric, view_scope)
 
-        if not project_row:
-            raise HTTPException(status_code=404, detail="Project not found")
 
-        project_name = project_row["name"]
-        if project_name not in allowed_projects:
-            raise HTTPException(status_code=403, detail="Project is not available in this portfolio")
+def _project_heatmap_view(
+    conn: Any,
+    row: Any,
+    allowed_projects: set,
+    project_id: int,
+    granularity: str,
+    metric: str,
+    view_scope: str,
+) -> Dict[str, Any]:
+    project_row = conn.execute(
+        "SELECT id, name, git_metrics_json, created_at FROM projects WHERE id = ?",
+        (project_id,),
+    ).fetchone()
 
-        period_expr_map = {
-            "day": "date(s.scanned_at)",
-            # Normalize each timestamp to the Monday of its week.
-            "week": "date(s.scanned_at, '-' || ((CAST(strftime('%w', s.scanned_at) AS INTEGER) + 6) % 7) || ' days')",
-            "month": "strftime('%Y-%m', s.scanned_at)",
-        }
-        period_expr = period_expr_map[granularity]
+    if not project_row:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    if project_row["name"] not in allowed_projects:
+        raise HTTPException(status_code=403, detail="Project is not available in this portfolio")
+
+    return _project_heatmap_views(conn, row, [project_row], granularity, metric, view_scope)[project_row["id"]]
+
+
+def _project_heatmaps(
+    conn: Any,
+    row: Any,
+    project_ids: List[int],
+    granularity: str,
+    metric: str,
+    view_scope: str,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    GET /heatmap/project payloads for several projects of the portfolio, keyed
+    by project id. Used by the bundle and the HTML export; callers pass
+    projects already resolved for the portfolio, unknown ids are left out.
+    """
+    if not project_ids:
+        return {}
+    placeholders = ",".join("?" for _ in project_ids)
+    project_rows = conn.execute(
+        f"SELECT id, name, git_metrics_json, created_at FROM projects WHERE id IN ({placeholders})",
+        list(project_ids),
+    ).fetchall()
+    return _project_heatmap_views(conn, row, project_rows, granularity, metric, view_scope)
+
+
+def _project_heatmap_views(
+    conn: Any,
+    row: Any,
+    project_rows: List[Any],
+    granularity: str,
+    metric: str,
+    view_scope: str,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Project heatmaps for project_rows (id, name, git_metrics_json, created_at),
+    keyed by project id. Each step runs one query for all projects, grouped
+    by project_id.
+    """
+    portfolio_id = row["id"]
+    if not project_rows:
+        return {}
+    project_ids = [project_row["id"] for project_row in project_rows]
+    placeholders = ",".join("?" for _ in project_ids)
+
+    period_expr_map = {
+        "day": "date(s.scanned_at)",
+        # Normalize each timestamp to the Monday of its week.
+        "week": "date(s.scanned_at, '-' || ((CAST(strftime('%w', s.scanned_at) AS INTEGER) + 6) % 7) || ' days')",
+        "month": "strftime('%Y-%m', s.scanned_at)",
+    }
+    period_expr = period_expr_map[granularity]
 
-        git_metrics = None
+    git_metrics: Dict[int, Any] = {}
+    ranges: Dict[int, List[Optional[str]]] = {}
+    for project_row in project_rows:
+        metrics = None
         if project_row["git_metrics_json"]:
             try:
-                git_metrics = json.loads(project_row["git_metrics_json"])
+                metrics = json.loads(project_row["git_metrics_json"])
             except Exception:
-                git_metrics = None
+                metrics = None
+        git_metrics[project_row["id"]] = metrics
 
         range_start = None
         range_end = None
-        if isinstance(git_metrics, dict):
-            project_start_raw = git_metrics.get("project_start")
-            project_end_raw = git_metrics.get("project_end")
+        if isinstance(metrics, dict):
+            project_start_raw = metrics.get("project_start")
+            project_end_raw = metrics.get("project_end")
             if isinstance(project_start_raw, str) and len(project_start_raw) >= 10:
                 range_start = project_start_raw[:10]
             if isinstance(project_end_raw, str) and len(project_end_raw) >= 10:
                 range_end = project_end_raw[:10]
+        ranges[project_row["id"]] = [range_start, range_end]
 
-        if not range_start or not range_end:
-            duration_row = conn.execute(
-                """
-                SELECT MIN(date(scanned_at)) AS range_start,
-                       MAX(date(scanned_at)) AS range_end
-                FROM scans
-                WHERE project = ?
-                """,
-                (project_name,),
-            ).fetchone()
-            if duration_row:
-                range_start = range_start or duration_row["range_start"]
-                range_end = range_end or duration_row["range_end"]
-
+    missing = [project_id for project_id, (start, end) in ranges.items() if not start or not end]
+    if missing:
+        missing_placeholders = ",".join("?" for _ in missing)
+        for duration_row in conn.execute(
+            f"""
+            SELECT project_id, MIN(day) AS range_start, MAX(day) AS range_end
+            FROM (
+                SELECT project_id, MIN(date(scanned_at)) AS day FROM scans
+                WHERE project_id IN ({missing_placeholders}) GROUP BY project_id
+                UNION ALL
+                SELECT project_id, MAX(date(scanned_at)) FROM scans
+                WHERE project_id IN ({missing_placeholders}) GROUP BY project_id
+                UNION ALL
+                SELECT project_id, MIN(date(scanned_at)) FROM scan_history
+                WHERE project_id IN ({missing_placeholders}) GROUP BY project_id
+            )
+            GROUP BY project_id
+            """,
+            missing * 3,
+        ):
+            bounds = ranges[duration_row["project_id"]]
+            bounds[0] = bounds[0] or duration_row["range_start"]
+            bounds[1] = bounds[1] or duration_row["range_end"]
+
+    for project_row in project_rows:
+        bounds = ranges[project_row["id"]]
         project_created = None
         if isinstance(project_row["created_at"], str) and len(project_row["created_at"]) >= 10:
             project_created = project_row["created_at"][:10]
 
-        if project_created and (not range_start or project_created < range_start):
-            range_start = project_created
+        if project_created and (not bounds[0] or project_created < bounds[0]):
+            bounds[0] = project_created
 
-        if range_start and not range_end:
-            range_end = datetime.now(timezone.utc).date().isoformat()
+        if bounds[0] and not bounds[1]:
+            bounds[1] = datetime.now(timezone.utc).date().isoformat()
 
-        if range_start and range_end and range_end < range_start:
-            range_end = range_start
+        if bounds[0] and bounds[1] and bounds[1] < bounds[0]:
+            bounds[1] = bounds[0]
 
-        # For project-wide weekly contribution heatmaps, prefer repository activity from git metrics.
-        # This captures the full project history even when there is only one DB scan.
-        if metric == "contrib_files" and granularity == "week":
-            if view_scope == "project":
-                week_cells: List[Dict[str, Any]] = []
-                if isinstance(git_metrics, dict):
-                    commits_per_week = git_metrics.get("commits_per_week") or {}
-                    if isinstance(commits_per_week, dict):
-                        for key, value in commits_per_week.items():
-                            try:
-                                year_str, week_str = key.split("-W", 1)
-                                year = int(year_str)
-                                week = int(week_str)
-                                monday = datetime.fromisocalendar(year, week, 1).date().isoformat()
-                                week_cells.append({"period": monday, "value": int(value or 0)})
-                            except Exception:
-                                continue
-
-                if not week_cells:
-                    week_cells = _collect_commit_cells_from_git_log(project_row["project_path"], "week")
-
-                week_cells.sort(key=lambda item: item["period"])
-                return {
-                    "portfolio_id": portfolio_id,
-                    "project_id": project_row["id"],
-                    "project_name": project_name,
-                    "granularity": granularity,
-                    "metric": metric,
-                    "view_scope": view_scope,
-                    "range_start": range_start,
-                    "range_end": range_end,
-                    "value_unit": "commits",
-                    "cells": week_cells,
-                    "max_value": max((cell["value"] for cell in week_cells), default=0),
-                }
-
-            # Per-user weekly heatmap should also be commit-based.
-            # Prefer precomputed per-author weekly stats when available; otherwise derive from git log.
-            user_week_cells: List[Dict[str, Any]] = []
-            if isinstance(git_metrics, dict):
-                commits_per_week_per_author = git_metrics.get("commits_per_week_per_author") or {}
-                if isinstance(commits_per_week_per_author, dict):
-                    user_key = canonical_username(row["username"])
-                    author_weekly = commits_per_week_per_author.get(user_key) or {}
-                    if isinstance(author_weekly, dict):
-                        for key, value in author_weekly.items():
-                            try:
-                                year_str, week_str = key.split("-W", 1)
-                                year = int(year_str)
-                                week = int(week_str)
-                                monday = datetime.fromisocalendar(year, week, 1).date().isoformat()
-                                user_week_cells.append({"period": monday, "value": int(value or 0)})
-                            except Exception:
-                                continue
-
-            if not user_week_cells:
-                user_week_cells = _collect_commit_cells_from_git_log(
-                    project_row["project_path"],
-                    "week",
-                    target_username=row["username"],
-                )
-
-            user_week_cells.sort(key=lambda item: item["period"])
-            return {
-                "portfolio_id": portfolio_id,
-                "project_id": project_row["id"],
-                "project_name": project_name,
-                "granularity": granularity,
-                "metric": metric,
-                "view_scope": view_scope,
-                "range_start": range_start,
-                "range_end": range_end,
-                "value_unit": "commits",
-                "cells": user_week_cells,
-                "max_value": max((cell["value"] for cell in user_week_cells), default=0),
-            }
+    def view(project_row: Any, value_unit: str, cells: List[Dict[str, Any]]) -> Dict[str, Any]:
+        range_start, range_end = ranges[project_row["id"]]
+        return {
+            "portfolio_id": portfolio_id,
+            "project_id": project_row["id"],
+            "project_name": project_row["name"],
+            "granularity": granularity,
+            "metric": metric,
+            "view_scope": view_scope,
+            "range_start": range_start,
+            "range_end": range_end,
+            "value_unit": value_unit,
+            "cells": cells,
+            "max_value": max((cell["value"] for cell in cells), default=0),
+        }
 
-        if metric == "scans":
+    views: Dict[int, Dict[str, Any]] = {}
+    remaining = list(project_rows)
+    if metric == "contrib_files":
+        # Contribution heatmaps count commits from the commits table filled at scan time.
+        # This covers the full repository history at any granularity, even with one DB scan.
+        with_commits = projects_with_commits(conn, project_ids)
+        if with_commits:
+            author = row["username"] if view_scope == "user" else None
+            activity = commit_activity_by_project(conn, with_commits, granularity, author=author)
+            for project_row in remaining:
+                if project_row["id"] in with_commits:
+                    views[project_row["id"]] = view(project_row, "commits", activity.get(project_row["id"], []))
+            remaining = [project_row for project_row in remaining if project_row["id"] not in views]
+
+        # Projects scanned before commits were stored only have weekly counts in git metrics.
+        if granularity == "week":
+            for project_row in remaining:
+                metrics = git_metrics[project_row["id"]]
+                if not isinstance(metrics, dict):
+                    continue
+                if view_scope == "project":
+                    weekly = metrics.get("commits_per_week") or {}
+                else:
+                    per_author = metrics.get("commits_per_week_per_author") or {}
+                    weekly = per_author.get(canonical_username(row["username"])) if isinstance(per_author, dict) else None
+                week_cells: List[Dict[str, Any]] = []
+                if isinstance(weekly, dict):
+                    for key, value in weekly.items():
+                        try:
+                            year_str, week_str = key.split("-W", 1)
+                            monday = datetime.fromisocalendar(int(year_str), int(week_str), 1).date().isoformat()
+                            week_cells.append({"period": monday, "value": int(value or 0)})
+                        except Exception:
+                            continue
+                if week_cells:
+                    week_cells.sort(key=lambda item: item["period"])
+                    views[project_row["id"]] = view(project_row, "commits", week_cells)
+            remaining = [project_row for project_row in remaining if project_row["id"] not in views]
+
+    if not remaining:
+        return views
+    remaining_ids = [project_row["id"] for project_row in remaining]
+    placeholders = ",".join("?" for _ in remaining_ids)
+
+    if metric == "scans":
+        rows = conn.execute(
+            f"""
+            SELECT s.project_id AS project_id,
+                   {period_expr} AS period,
+                   COUNT(*) AS value
+            FROM scans s
+            WHERE s.project_id IN ({placeholders})
+            GROUP BY s.project_id, period
+            ORDER BY period ASC
+            """,
+            remaining_ids,
+        ).fetchall()
+    elif metric == "files":
+        rows = conn.execute(
+            f"""
+            SELECT s.project_id AS project_id,
+                   {period_expr} AS period,
+                   COUNT(f.id) AS value
+            FROM scans s
+            JOIN files f ON f.scan_id = s.id
+            WHERE s.project_id IN ({placeholders})
+            GROUP BY s.project_id, period
+            ORDER BY period ASC
+            """,
+            remaining_ids,
+        ).fetchall()
+    else:
+        if view_scope == "user":
+            # Fallback metric: files linked to the portfolio owner over time.
             rows = conn.execute(
                 f"""
-                  SELECT {period_expr} AS period,
-                       COUNT(*) AS value
+                SELECT s.project_id AS project_id,
+                       {period_expr} AS period,
+                       COUNT(fc.file_id) AS value
                 FROM scans s
-                WHERE s.project = ?
-                GROUP BY period
+                JOIN files f ON f.scan_id = s.id
+                JOIN file_contributors fc ON fc.file_id = f.id
+                JOIN contributors c ON c.id = fc.contributor_id
+                WHERE s.project_id IN ({placeholders})
+                  AND LOWER(c.name) = LOWER(?)
+                GROUP BY s.project_id, period
                 ORDER BY period ASC
                 """,
-                (project_name,),
+                [*remaining_ids, row["username"]],
             ).fetchall()
-        elif metric == "files":
+        else:
+            # Fallback metric: all contributor-file links over time.
             rows = conn.execute(
                 f"""
-                  SELECT {period_expr} AS period,
-                       COUNT(f.id) AS value
+                SELECT s.project_id AS project_id,
+                       {period_expr} AS period,
+                       COUNT(fc.file_id) AS value
                 FROM scans s
                 JOIN files f ON f.scan_id = s.id
-                WHERE s.project = ?
-                GROUP BY period
+                JOIN file_contributors fc ON fc.file_id = f.id
+                WHERE s.project_id IN ({placeholders})
+                GROUP BY s.project_id, period
                 ORDER BY period ASC
                 """,
-                (project_name,),
+                remaining_ids,
             ).fetchall()
-        else:
-            if view_scope == "user":
-                # Fallback metric: files linked to the portfolio owner over time.
-                rows = conn.execute(
-                    f"""
-                    SELECT {period_expr} AS period,
-                           COUNT(fc.file_id) AS value
-                    FROM scans s
-                    JOIN files f ON f.scan_id = s.id
-                    JOIN file_contributors fc ON fc.file_id = f.id
-                    JOIN contributors c ON c.id = fc.contributor_id
-                    WHERE s.project = ?
-                      AND LOWER(c.name) = LOWER(?)
-                    GROUP BY period
-                    ORDER BY period ASC
-                    """,
-                    (project_name, row["username"]),
-                ).fetchall()
-            else:
-                # Fallback metric: all contributor-file links over time.
-                rows = conn.execute(
-                    f"""
-                    SELECT {period_expr} AS period,
-                           COUNT(fc.file_id) AS value
-                    FROM scans s
-                    JOIN files f ON f.scan_id = s.id
-                    JOIN file_contributors fc ON fc.file_id = f.id
-                    WHERE s.project = ?
-                    GROUP BY period
-                    ORDER BY period ASC
-                    """,
-                    (project_name,),
-                ).fetchall()
 
-    cells = [{"period": item["period"], "value": int(item["value"] or 0)} for item in rows]
-    return {
-        "portfolio_id": portfolio_id,
-        "project_id": project_row["id"],
-        "project_name": project_name,
-        "granularity": granularity,
-        "metric": metric,
-        "view_scope": view_scope,
-        "range_start": range_start,
-        "range_end": range_end,
-        "value_unit": "contrib_files",
-        "cells": cells,
-        "max_value": max((cell["value"] for cell in cells), default=0),
-    }
+    rows_by_project: Dict[int, List[Any]] = {}
+    for item in rows:
+        rows_by_project.setdefault(item["project_id"], []).append(item)
+    history = history_activity_by_project(conn, remaining_ids, period_expr, metric) if metric in ("scans", "files") else {}
+    for project_row in remaining:
+        cells = _merge_activity_cells(rows_by_project.get(project_row["id"], []), history.get(project_row["id"], {}))
+        views[project_row["id"]] = view(project_row, "contrib_files", cells)
+    return views
 
 
 @web_router.get("/{portfolio_id}/showcase")
 def get_web_showcase(
+    request: Request,
     portfolio_id: int,
     limit: int = Query(3, ge=1, le=3),
 ):
-    row = _load_portfolio_row_or_404(portfolio_id)
+    graph = _read_graph(request)
+    with get_connection() as conn:
+        row = _load_portfolio_row_or_404(portfolio_id, conn)
+        return _showcase_view(conn, row, _resolve_project_names_for_web(row, conn), limit, graph)
+
+
+def _showcase_view(conn: Any, row: Any, project_names: List[str], limit: int, graph: Any = None) -> Dict[str, Any]:
+    """The portfolio owner's top projects; project data comes from the read model when one is given."""
     username = row["username"]
-    allowed_projects = set(_resolve_project_names_for_web(row))
+    allowed_projects = set(project_names)
 
-    ranked = rank_projects_by_importance(mode="contributor", contributor_name=username, limit=None)
+    if graph is not None:
+        ranked = graph.ranking(mode="contributor", contributor_name=username)
+    else:
+        ranked = rank_projects_by_importance(mode="contributor", contributor_name=username, limit=None)
     ranked = [item for item in ranked if item.get("project") in allowed_projects]
 
     featured_project_ids = json.loads(row["featured_project_ids"] or "[]")
     if featured_project_ids:
-        with get_connection() as conn:
+        if graph is not None:
+            selected_rows = [graph.projects_by_id[pid] for pid in featured_project_ids if pid in graph.projects_by_id]
+        else:
             placeholders = ",".join("?" for _ in featured_project_ids)
             selected_rows = conn.execute(
                 f"SELECT id, name FROM projects WHERE id IN ({placeholders})",
@@ -1915,1006 +2404,186 @@ def get_web_showcase(
 
     top = ranked[:limit]
     projects_payload = []
-    with get_connection() as conn:
-        for item in top:
-            name = item["project"]
-            project_row = conn.execute(
-                "SELECT id, name, thumbnail_path FROM projects WHERE name = ?",
-                (name,),
-            ).fetchone()
-            if not project_row:
-                continue
-
-            evidence_rows = conn.execute(
-                """
-                SELECT id, type, description, value, source, url, created_at
+    if top and graph is not None:
+        project_rows = {item["project"]: graph.projects_by_name[item["project"]] for item in top
+                        if item["project"] in graph.projects_by_name}
+        evidence, evolution = graph.evidence, graph.evolution
+    elif top:
+        # One query per table for all showcased projects rather than one per project
+        names = [item["project"] for item in top]
+        placeholders = ",".join("?" for _ in names)
+        project_rows = {
+            item["name"]: item
+            for item in conn.execute(
+                f"SELECT id, name, thumbnail_path FROM projects WHERE name IN ({placeholders})",
+                names,
+            )
+        }
+        project_ids = [item["id"] for item in project_rows.values()]
+        id_placeholders = ",".join("?" for _ in project_ids)
+        evidence: Dict[int, List[Dict[str, Any]]] = {}
+        for item in conn.execute(
+            f"""
+            SELECT project_id, id, type, description, value, source, url, created_at
+            FROM (
+                SELECT *, ROW_NUMBER() OVER (PARTITION BY project_id ORDER BY created_at DESC, id DESC) AS rn
                 FROM project_evidence
-                WHERE project_id = ?
-                ORDER BY created_at DESC
-                LIMIT 3
-                """,
-                (project_row["id"],),
-            ).fetchall()
-            scan_rows = conn.execute(
-                """
-                SELECT id, scanned_at, notes
-                FROM scans
-                WHERE project = ?
-                ORDER BY scanned_at ASC
-                """,
-                (name,),
-            ).fetchall()
-            projects_payload.append(
-                {
-                    "project_id": project_row["id"],
-                    "name": project_row["name"],
-                    "thumbnail_path": project_row["thumbnail_path"],
-                    "score": round(float(item.get("score") or 0.0), 4),
-                    "contrib_files": int(item.get("contrib_files") or 0),
-                    "total_files": int(item.get("total_files") or 0),
-                    "role": "collaborative" if int(item.get("contributors_count") or 0) > 1 else "individual",
-                    "evidence": [dict(row_item) for row_item in evidence_rows],
-                    "evolution": [dict(row_item) for row_item in scan_rows],
-                }
+                WHERE project_id IN ({id_placeholders})
             )
+            WHERE rn <= 3
+            ORDER BY project_id, rn
+            """,
+            project_ids,
+        ):
+            entry = dict(item)
+            evidence.setdefault(entry.pop("project_id"), []).append(entry)
+        # older scans kept as history come first, marked by history_id
+        evolution: Dict[int, List[Dict[str, Any]]] = {}
+        for item in conn.execute(
+            f"""
+            SELECT project_id, id AS history_id, scanned_at, notes
+            FROM scan_history
+            WHERE project_id IN ({id_placeholders})
+            ORDER BY project_id, id ASC
+            """,
+            project_ids,
+        ):
+            entry = dict(item)
+            evolution.setdefault(entry.pop("project_id"), []).append({"id": None, **entry})
+        for item in conn.execute(
+            f"""
+            SELECT project_id, id, scanned_at, notes
+            FROM scans
+            WHERE project_id IN ({id_placeholders})
+            ORDER BY project_id, scanned_at ASC
+            """,
+            project_ids,
+        ):
+            entry = dict(item)
+            evolution.setdefault(entry.pop("project_id"), []).append(entry)
+
+    for item in top:
+        project_row = project_rows.get(item["project"])
+        if not project_row:
+            continue
+        projects_payload.append(
+            {
+                "project_id": project_row["id"],
+                "name": project_row["name"],
+                "thumbnail_path": project_row["thumbnail_path"],
+                "score": round(float(item.get("score") or 0.0), 4),
+                "contrib_files": int(item.get("contrib_files") or 0),
+                "total_files": int(item.get("total_files") or 0),
+                "role": "collaborative" if int(item.get("contributors_count") or 0) > 1 else "individual",
+                "evidence": evidence.get(project_row["id"], []),
+                "evolution": evolution.get(project_row["id"], []),
+            }
+        )
 
     return {
-        "portfolio_id": portfolio_id,
+        "portfolio_id": row["id"],
         "username": username,
         "projects": projects_payload,
     }
 
-# Web Portfolio HTML export
-# A self-contained and interactive snapshot of the portfolio, embedded with all necessary data and assets)
-@web_router.get("/{portfolio_id}/export-html")
-def export_web_portfolio_html(portfolio_id: int):
-    """Generate a self-contained HTML export of the web portfolio."""
-    import base64
-
-    row = _load_portfolio_row_or_404(portfolio_id)
-    username = row["username"]
-    display_name = row["display_name"] or username
-    portfolio_name = row["portfolio_name"] or "Portfolio"
-    included_ids = json.loads(row["included_project_ids"] or "[]")
-    featured_ids = set(json.loads(row["featured_project_ids"] or "[]"))
-    created_at = row["created_at"] or ""
-    created_label = created_at[:10] if created_at else ""
-
-    # Retrieve per-project detail (same as GET /projects/{id})
-    project_details = {}
-    project_rows_ordered = []
-    if included_ids:
-        with get_connection() as conn:
-            placeholders = ",".join("?" for _ in included_ids)
-            p_rows = conn.execute(
-                f"SELECT id, name, custom_name, repo_url, thumbnail_path FROM projects WHERE id IN ({placeholders})",
-                included_ids,
-            ).fetchall()
-        id_to_row = {r["id"]: dict(r) for r in p_rows}
-        project_rows_ordered = [id_to_row[pid] for pid in included_ids if pid in id_to_row]
-
-    for p in project_rows_ordered:
-        pid = p["id"]
-        try:
-            detail = get_project(pid)
-        except Exception:
-            detail = {}
-        project_details[pid] = detail
 
-    # Encode thumbnails as base64 data URIs
-    def encode_thumbnail(thumbnail_path):
-        if not thumbnail_path or not os.path.isfile(thumbnail_path):
-            return None
-        try:
-            mt = mimetypes.guess_type(thumbnail_path)[0] or "image/png"
-            with open(thumbnail_path, "rb") as f:
-                b64 = base64.b64encode(f.read()).decode("ascii")
-            return f"data:{mt};base64,{b64}"
-        except Exception:
-            return None
-
-    # Build project data payload for the HTML template
-    projects_for_export = []
-    for p in project_rows_ordered:
-        pid = p["id"]
-        name = p["custom_name"] or p["name"]
-        detail = project_details.get(pid, {})
-        thumb_path = p["thumbnail_path"]
-        thumb_data_uri = encode_thumbnail(thumb_path)
-        is_featured = pid in featured_ids
-
-        git = detail.get("git_metrics") or {}
-        llm_summary = (detail.get("llm_summary") or {}).get("text") or None
-        languages = detail.get("languages") or []
-        frameworks = detail.get("frameworks") or []
-        skills = detail.get("skills") or []
-        contributors = detail.get("contributors") or []
-        files_summary = detail.get("files_summary") or {}
-        evidence = detail.get("evidence") or []
-        rank_score = detail.get("rank_score")
-
-        all_roles = (detail.get("contributor_roles") or {}).get("contributors") or []
-        user_role = next((c for c in all_roles if (c.get("name") or "").lower() == username.lower()), None)
-
-        total_commits = git.get("total_commits")
-        duration_days = git.get("duration_days")
-        project_start = (str(git.get("project_start") or "")[:10]) or None
-        project_end = (str(git.get("project_end") or "")[:10]) or None
-        lines_added_per_author = git.get("lines_added_per_author") or {}
-        lines_removed_per_author = git.get("lines_removed_per_author") or {}
-        commits_per_author = git.get("commits_per_author") or {}
-        lines_added = lines_added_per_author.get(username)
-        lines_removed = lines_removed_per_author.get(username)
-        total_lines_added = sum(v or 0 for v in lines_added_per_author.values()) or None
-        user_commits = commits_per_author.get(username)
-        all_authors = sorted(commits_per_author.items(), key=lambda x: -(x[1] or 0))
-        user_rank = next((i for i, (n, _) in enumerate(all_authors) if n.lower() == username.lower()), -1)
-        commit_pct = f"{(user_commits / total_commits * 100):.1f}" if total_commits and user_commits is not None else None
-        avg_commits_per_week = f"{(user_commits / max(1, (duration_days or 1) / 7)):.1f}" if duration_days and user_commits is not None else None
-
-        breakdown = (user_role or {}).get("contribution_breakdown") or {}
-        breakdown_entries = sorted([(k, v) for k, v in breakdown.items() if v > 0], key=lambda x: -x[1])
-        ext_entries = sorted(
-            [(ext, cnt) for ext, cnt in (files_summary.get("extensions") or {}).items() if ext],
-            key=lambda x: -x[1]
-        )[:6]
-
-        repo_url = p.get("repo_url") or (detail.get("project") or {}).get("repo_url") or None
-
-        projects_for_export.append({
-            "id": pid,
-            "name": name,
-            "is_featured": is_featured,
-            "is_collaborative": len(contributors) > 1,
-            "thumb": thumb_data_uri,
-            "repo_url": repo_url,
-            "llm_summary": llm_summary,
-            "languages": languages,
-            "frameworks": frameworks,
-            "skills": skills,
-            "contributors": contributors,
-            "ext_entries": ext_entries,
-            "evidence": evidence,
-            "total_commits": total_commits,
-            "total_lines_added": total_lines_added,
-            "total_files": files_summary.get("total_files") or 0,
-            "duration_days": duration_days,
-            "project_start": project_start,
-            "project_end": project_end,
-            "user_commits": user_commits,
-            "commit_pct": commit_pct,
-            "avg_commits_per_week": avg_commits_per_week,
-            "lines_added": lines_added,
-            "lines_removed": lines_removed,
-            "user_rank": user_rank,
-            "all_authors_count": len(all_authors),
-            "rank_score": rank_score,
-            "user_role": user_role,
-            "breakdown_entries": breakdown_entries,
+@web_router.get("/{portfolio_id}/bundle")
+def get_web_bundle(
+    request: Request,
+    portfolio_id: int,
+    timeline_granularity: str = Query("month", pattern="^(week|month)$"),
+    heatmap_granularity: str = Query("day", pattern="^(day|week|month)$"),
+    heatmap_metric: str = Query("files", pattern="^(scans|files|commits)$"),
+    project_granularity: str = Query("week", pattern="^(day|week|month)$"),
+    project_metric: str = Query("contrib_files", pattern="^(scans|files|contrib_files)$"),
+    project_view_scope: str = Query("project", pattern="^(project|user)$"),
+    showcase_limit: int = Query(3, ge=1, le=3),
+):
+    """
+    Everything the web portfolio page loads on open, in one response: the
+    portfolio, timeline, heatmap, showcase, and per-project heatmaps and
+    details (keyed by project id, details without scans). The portfolio and
+    its project set are resolved once and every view shares one connection.
+    """
+    graph = _read_graph(request)
+    with get_connection() as conn:
+        row = _load_portfolio_row_or_404(portfolio_id, conn)
+        projects = _resolve_projects_for_web(row, conn)
+        project_ids = [project_id for project_id, _ in projects]
+        project_names = [name for _, name in projects]
+        heatmaps = _project_heatmaps(conn, row, project_ids, project_granularity, project_metric, project_view_scope)
+        details = _load_project_details(conn, project_ids)
+        return FastJSONResponse({
+            "portfolio": _portfolio_row_to_dict(row),
+            "timeline": _timeline_view(conn, row, project_names, timeline_granularity),
+            "heatmap": _portfolio_heatmap_view(conn, row, projects, heatmap_granularity, heatmap_metric),
+            "showcase": _showcase_view(conn, row, project_names, showcase_limit, graph),
+            "project_heatmaps": {
+                project_id: heatmaps[project_id] for project_id in project_ids if project_id in heatmaps
+            },
+            "projects": {
+                project_id: details[project_id] for project_id in project_ids if project_id in details
+            },
         })
 
-    # Retrieve heatmap data for each project (both user-scope and project-scope)
-    heatmap_user = {}
-    heatmap_project = {}
-    for p in project_rows_ordered:
-        pid = p["id"]
-        for scope, store in (("user", heatmap_user), ("project", heatmap_project)):
+# Web Portfolio HTML export
+# A self-contained and interactive snapshot of the portfolio, embedded with all necessary data and assets)
+@web_router.get("/{portfolio_id}/export-html")
+def export_web_portfolio_html(
+    portfolio_id: int,
+    thumbnail_max: int = Query(THUMBNAIL_MAX_DIMENSION, ge=0, le=4096),
+):
+    """
+    Generate a self-contained HTML export of the web portfolio. Project data is
+    loaded with a fixed number of queries, thumbnails larger than thumbnail_max
+    pixels are downscaled (0 embeds them unchanged), and the page is streamed.
+    """
+    with get_connection() as conn:
+        row = _load_portfolio_row_or_404(portfolio_id, conn)
+        username = row["username"]
+        display_name = row["display_name"] or username
+        featured_ids = set(json.loads(row["featured_project_ids"] or "[]"))
+        created_at = row["created_at"] or ""
+        created_label = created_at[:10] if created_at else ""
+
+        included = _resolve_projects_for_web(row, conn)
+        details = _load_project_details(conn, [pid for pid, _ in included])
+        project_rows_ordered = [details[pid]["project"] for pid, _ in included if pid in details]
+
+        # Heatmap data for each project (both user-scope and project-scope)
+        heatmaps: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        for scope in ("user", "project"):
             try:
-                hdata = get_web_project_heatmap(
-                    portfolio_id=portfolio_id,
-                    project_id=pid,
-                    granularity="week",
-                    metric="contrib_files",
-                    view_scope=scope,
+                heatmaps[scope] = _project_heatmaps(
+                    conn, row, [p["id"] for p in project_rows_ordered], granularity="week", metric="contrib_files", view_scope=scope
                 )
-                store[pid] = hdata
-            except Exception:
-                store[pid] = {"cells": [], "max_value": 0}
-
-    header_summary = f"{len(projects_for_export)} projects | Generated on {created_label}"
-
-    # Build skills timeline data
-    MAX_TIMELINE_SKILLS = 10
-    skill_entries = []
-    for p in project_rows_ordered:
-        pid = p["id"]
-        detail = project_details.get(pid, {})
-        git = detail.get("git_metrics") or {}
-        start_raw = git.get("project_start") or (detail.get("project") or {}).get("created_at") or None
-        date_str = str(start_raw)[:10] if start_raw else None
-        if not date_str or len(date_str) < 10:
-            continue
-        skills_list = detail.get("skills") or []
-        name = (p.get("custom_name") or p.get("name") or "")
-        for skill in skills_list:
-            if skill:
-                skill_entries.append({"skill": skill, "projectId": pid, "projectName": name, "date": date_str})
-
-    skill_project_counts: dict = {}
-    for e in skill_entries:
-        skill_project_counts.setdefault(e["skill"], set()).add(e["projectId"])
-    top_skills = sorted(skill_project_counts.keys(), key=lambda s: (-len(skill_project_counts[s]), s))[:MAX_TIMELINE_SKILLS]
-    top_skill_set = set(top_skills)
-    filtered_entries = [e for e in skill_entries if e["skill"] in top_skill_set]
-    all_dates = [e["date"] for e in filtered_entries]
-    min_date_str = min(all_dates) if all_dates else None
-    max_date_str = max(all_dates) if all_dates else None
-
-    skills_timeline_rows = []
-    for skill in top_skills:
-        dots = sorted([e for e in filtered_entries if e["skill"] == skill], key=lambda e: e["date"])
-        skills_timeline_rows.append({"skill": skill, "dots": [{"projectName": d["projectName"], "date": d["date"]} for d in dots]})
-    if skills_timeline_rows:
-        skills_timeline_rows.sort(key=lambda r: r["dots"][0]["date"])
-
-    # Escape helper for inserting into HTML
-    def h(val):
-        if val is None:
-            return ""
-        return str(val).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
-
-    def js_str(val):
-        """JSON-encode a Python value for safe inline JS embedding."""
-        return json.dumps(val)
-
-    # Build Featured Projects HTML
-    def build_project_card_html(proj, extra_class=""):
-        name = h(proj["name"])
-        pid = proj["id"]
-        thumb = proj["thumb"]
-        summary = h(proj["llm_summary"]) if proj["llm_summary"] else "No summary available."
-        thumb_html = (
-            f'<img src="{thumb}" alt="{name} thumbnail" />'
-            if thumb
-            else '<span class="project-card-no-thumb">No thumbnail</span>'
-        )
-        return f"""
-        <div class="project-card-16-9 {extra_class}" onclick="openModal({pid})" style="cursor:pointer">
-          <div class="project-card-header">
-            <span class="project-card-name">{name}</span>
-          </div>
-          <div class="project-card-image">{thumb_html}</div>
-          <div class="project-card-footer">
-            <p class="project-card-summary">{summary}</p>
-          </div>
-        </div>"""
-
-    featured_cards_html = "".join(
-        build_project_card_html(p, "featured")
-        for p in projects_for_export if p["is_featured"]
-    ) or '<p class="tile-placeholder-text" style="margin:0">No featured projects.</p>'
-
-    all_cards_html = "".join(
-        build_project_card_html(p, "all-projects")
-        for p in projects_for_export
-    )
-
-    # Build heatmap HTML for each project (first included project shown by default)
-    def build_heatmap_html_for_project(proj, scope="user"):
-        pid = proj["id"]
-        hdata = (heatmap_user if scope == "user" else heatmap_project).get(pid, {})
-        cells = hdata.get("cells") or []
-        max_val = hdata.get("max_value") or 1
-        range_start = hdata.get("range_start") or ""
-        range_end = hdata.get("range_end") or ""
-
-        # Build weekly heatmap entries
-        from datetime import timedelta
-        import datetime as _dt
-
-        def parse_iso(s):
-            try:
-                y, m, d = int(s[:4]), int(s[5:7]), int(s[8:10])
-                return _dt.date(y, m, d)
             except Exception:
-                return None
-
-        def start_of_week_monday(d):
-            return d - _dt.timedelta(days=(d.weekday()))
-
-        values_by_week = {c["period"]: c["value"] for c in cells if c.get("period")}
-        sorted_periods = sorted(values_by_week.keys())
-        first_cell = parse_iso(sorted_periods[0]) if sorted_periods else None
-        last_cell = parse_iso(sorted_periods[-1]) if sorted_periods else None
-        start_date = parse_iso(range_start) or first_cell
-        end_date = parse_iso(range_end) or last_cell
-        if not start_date or not end_date:
-            return '<p class="tile-placeholder-text">No heatmap data available for this project.</p>'
-
-        week_entries = []
-        cursor = start_of_week_monday(start_date)
-        end_week = start_of_week_monday(end_date)
-        while cursor <= end_week:
-            iso = cursor.isoformat()
-            week_entries.append({"period": iso, "value": values_by_week.get(iso, 0)})
-            cursor += _dt.timedelta(days=7)
-
-        if not week_entries:
-            return '<p class="tile-placeholder-text">No heatmap data available for this project.</p>'
-
-        total_val = sum(e["value"] for e in week_entries)
-        active_weeks = sum(1 for e in week_entries if e["value"] > 0)
-        consistency_pct = round(active_weeks / len(week_entries) * 100) if week_entries else 0
-        avg_active = round((total_val / active_weeks) * 10) / 10 if active_weeks > 0 else 0
-
-        def cell_color(value, mx):
-            if not value or value <= 0 or mx <= 0:
-                return "rgba(241, 245, 249, 0.08)"
-            ratio = min(1, value / mx)
-            alpha = 0.22 + (ratio * 0.78)
-            return f"rgba(74, 222, 128, {alpha:.3f})"
-
-        def fmt_week(iso):
-            d = parse_iso(iso)
-            if not d:
-                return iso
-            return d.strftime("%b %-d") if os.name != "nt" else d.strftime("%b %d").lstrip("0") or d.strftime("%b %d")
-
-        cells_html = "".join(
-            f'<span class="heatmap-cell heatmap-cell--week" '
-            f'title="Week of {e["period"]}: {e["value"]} commit(s)" '
-            f'style="background-color:{cell_color(e["value"], max_val)}"></span>'
-            for e in week_entries
+                heatmaps[scope] = {}
+            for p in project_rows_ordered:
+                heatmaps[scope].setdefault(p["id"], {"cells": [], "max_value": 0})
+
+    projects_for_export = [
+        export_project_entry(
+            p,
+            details[p["id"]],
+            username,
+            featured=p["id"] in featured_ids,
+            thumb=thumbnail_data_uri(p["thumbnail_path"], thumbnail_max),
         )
-        labels_html = "".join(
-            f'<span class="heatmap-week-label">{h(fmt_week(e["period"])) if i % 6 == 0 or i == len(week_entries) - 1 else ""}</span>'
-            for i, e in enumerate(week_entries)
-        )
-        legend1 = cell_color(1, max_val)
-        legend2 = cell_color(max(1, max_val // 2), max_val)
-        legend3 = cell_color(max_val, max_val)
-
-        # Format ISO date for display
-        def safe_fmt(iso):
-            d = parse_iso(iso)
-            if not d:
-                return iso
-            return d.strftime("%b %d")
-
-        return f"""
-        <div class="heatmap-summary-grid">
-          <div class="heatmap-stat"><span class="heatmap-stat-label">Total</span><span class="heatmap-stat-value">{total_val} commit(s)</span></div>
-          <div class="heatmap-stat"><span class="heatmap-stat-label">Active Weeks</span><span class="heatmap-stat-value">{active_weeks}/{len(week_entries)}</span></div>
-          <div class="heatmap-stat"><span class="heatmap-stat-label">Consistency</span><span class="heatmap-stat-value">{consistency_pct}%</span></div>
-          <div class="heatmap-stat"><span class="heatmap-stat-label">Peak Week</span><span class="heatmap-stat-value">{max_val} commit(s)</span></div>
-        </div>
-        <div class="heatmap-scroll-wrap" aria-label="Project contribution heatmap">
-          <div class="heatmap-scroll-content">
-            <div class="project-heatmap-grid">{cells_html}</div>
-            <div class="project-heatmap-weeks" aria-hidden="true">{labels_html}</div>
-          </div>
-        </div>
-        <div class="heatmap-legend" aria-hidden="true">
-          <span class="heatmap-legend-text">Less</span>
-          <span class="heatmap-legend-swatch" style="background-color:{legend1}"></span>
-          <span class="heatmap-legend-swatch" style="background-color:{legend2}"></span>
-          <span class="heatmap-legend-swatch" style="background-color:{legend3}"></span>
-          <span class="heatmap-legend-text">More</span>
-        </div>
-        <div class="heatmap-meta">
-          <span>{h(proj["name"])}</span>
-          <span>Duration: {h(safe_fmt(range_start)) if range_start else "N/A"} - {h(safe_fmt(range_end)) if range_end else "N/A"}</span>
-          <span>Avg active week: {avg_active} commit(s)</span>
-        </div>"""
-
-    # Build heatmap sections per project (one set per scope, JS toggles between them)
-    heatmap_panels_html = ""
-    for i, proj in enumerate(projects_for_export):
-        pid = proj["id"]
-        display = "block" if i == 0 else "none"
-        # user-scope panels (default visible)
-        inner_user = build_heatmap_html_for_project(proj, scope="user")
-        heatmap_panels_html += f'<div id="heatmap-user-{pid}" class="heatmap-panel" style="display:{display}">{inner_user}</div>\n'
-        # project-scope panels (hidden by default)
-        inner_proj = build_heatmap_html_for_project(proj, scope="project")
-        heatmap_panels_html += f'<div id="heatmap-project-{pid}" class="heatmap-panel" style="display:none">{inner_proj}</div>\n'
-
-    heatmap_selector_options = "".join(
-        f'<option value="{p["id"]}">{h(p["name"])}</option>'
-        for p in projects_for_export
-    )
-
-    # Build Skills Timeline SVG
-    DOT_R = 5
-    ROW_H = 28
-    AXIS_H = 20
-    CHART_W = 600
-    ROW_COLORS = [
-        "rgba(74,222,128,0.85)", "rgba(52,211,153,0.85)", "rgba(34,197,94,0.85)",
-        "rgba(16,185,129,0.85)", "rgba(5,150,105,0.85)", "rgba(74,222,128,0.65)",
-        "rgba(52,211,153,0.65)", "rgba(34,197,94,0.65)", "rgba(16,185,129,0.65)",
-        "rgba(5,150,105,0.65)",
+        for p in project_rows_ordered
     ]
-
-    skills_timeline_html = '<p class="tile-placeholder-text">No skill or date data available.</p>'
-    if skills_timeline_rows and min_date_str and max_date_str:
-        import datetime as _dt2
-
-        def parse_iso2(s):
-            try:
-                return _dt2.date(int(s[:4]), int(s[5:7]), int(s[8:10]))
-            except Exception:
-                return None
-
-        min_d = parse_iso2(min_date_str)
-        today = _dt2.date.today()
-        max_d = today
-        span_days = max((max_d - min_d).days, 1)
-
-        def date_to_x(d):
-            return ((d - min_d).days / span_days) * CHART_W
-
-        svg_h = len(skills_timeline_rows) * ROW_H + AXIS_H
-        tick_count = 4
-        ticks = []
-        for i in range(tick_count + 1):
-            td = min_d + _dt2.timedelta(days=int(span_days * i / tick_count))
-            x = date_to_x(td)
-            label = td.strftime("%b '%y")
-            ticks.append((x, label))
-
-        label_col_html = "".join(
-            f'<div class="skills-timeline-label" style="height:{ROW_H}px;background:{"rgba(255,255,255,0.015)" if ri % 2 == 0 else "transparent"}">{h(row["skill"])}</div>'
-            for ri, row in enumerate(skills_timeline_rows)
-        )
-
-        svg_rows = ""
-        for ri, row in enumerate(skills_timeline_rows):
-            cy = ri * ROW_H + ROW_H // 2
-            color = ROW_COLORS[ri % len(ROW_COLORS)]
-            row_bg = f'<rect x="0" y="{ri * ROW_H}" width="{CHART_W}" height="{ROW_H}" fill="{"rgba(255,255,255,0.015)" if ri % 2 == 0 else "transparent"}" />'
-            track = f'<line x1="0" y1="{cy}" x2="{CHART_W}" y2="{cy}" stroke="rgba(255,255,255,0.1)" stroke-width="1" stroke-dasharray="3 3" />'
-            dots = ""
-            for dot in row["dots"]:
-                d = parse_iso2(dot["date"])
-                if not d:
-                    continue
-                cx = date_to_x(d)
-                label_text = h(f'{dot["projectName"]} | {d.strftime("%b %Y")}')
-                dots += f'<circle cx="{cx:.1f}" cy="{cy}" r="{DOT_R}" fill="{color}" stroke="rgba(0,0,0,0.3)" stroke-width="1"><title>{label_text}</title></circle>'
-            svg_rows += row_bg + track + dots
-
-        axis_labels = "".join(
-            f'<text x="{x:.1f}" y="{len(skills_timeline_rows) * ROW_H + 14}" text-anchor="middle" font-size="10" fill="rgba(255,255,255,0.35)" font-family="inherit">{h(label)}</text>'
-            for x, label in ticks
-        )
-
-        skills_timeline_html = f"""
-        <div class="skills-timeline-wrap">
-          <div class="skills-timeline-body">
-            <div class="skills-timeline-labels" style="height:{len(skills_timeline_rows) * ROW_H}px">{label_col_html}</div>
-            <div class="skills-timeline-chart" style="flex:1 1 0;min-width:0;overflow:visible">
-              <svg width="100%" viewBox="0 0 {CHART_W} {svg_h}" style="display:block;overflow:visible">
-                {svg_rows}{axis_labels}
-              </svg>
-            </div>
-          </div>
-        </div>
-        <div class="heatmap-summary-grid" style="margin-top:0.65rem">
-          <div class="heatmap-stat"><span class="heatmap-stat-label">Number of Skills Detected</span><span class="heatmap-stat-value">{len(skills_timeline_rows)}</span></div>
-          <div class="heatmap-stat"><span class="heatmap-stat-label">Span</span><span class="heatmap-stat-value">{round(span_days / 30)}mo</span></div>
-          <div class="heatmap-stat"><span class="heatmap-stat-label">Earliest Skill</span><span class="heatmap-stat-value">{min_d.strftime("%b %Y") if min_d else "-"}</span></div>
-          <div class="heatmap-stat"><span class="heatmap-stat-label">Projects with Skills</span><span class="heatmap-stat-value">{len(projects_for_export)}</span></div>
-        </div>"""
-
-    # Build project modal data as a JS object
-    modal_data_js = js_str({str(p["id"]): p for p in projects_for_export})
-
-    def build_modal_js():
-        """Returns the vanilla JS for modal open/close and heatmap switching."""
-        return r"""
-const MODAL_DATA = """ + modal_data_js + r""";
-
-function fmt(n) { return n != null ? Number(n).toLocaleString() : null; }
-
-function escHtml(s) {
-  if (s == null) return '';
-  return String(s).replace(/&/g,'&amp;').replace(/</g,'&lt;').replace(/>/g,'&gt;').replace(/"/g,'&quot;');
-}
-
-function chip(text, count) {
-  return `<span class="detail-chip">${escHtml(text)}${count != null ? `<span class="chip-count">×${count}</span>` : ''}</span>`;
-}
-
-function metricTile(value, label) {
-  return `<div class="metric-tile"><span class="metric-tile-value">${escHtml(String(value))}</span><span class="metric-tile-label">${escHtml(label)}</span></div>`;
-}
-
-function openModal(pid) {
-  const p = MODAL_DATA[String(pid)];
-  if (!p) return;
-  const name = escHtml(p.name || '(unnamed)');
-  const collab = p.is_collaborative ? 'Collaborative' : 'Individual';
-
-  let html = `<div class="detail-card-header" style="margin-bottom:1rem">
-    <div>
-      <span class="panel-eyebrow">Project · ${collab}</span>
-      <h3 style="margin:0">${name}</h3>`;
-  if (p.project_start || p.project_end) {
-    html += `<span class="modal-date-range">${escHtml(p.project_start || '?')} → ${escHtml(p.project_end || 'present')}</span>`;
-  }
-  html += `</div><button type="button" class="hero-action-button" onclick="closeModal()">✕ Close</button></div>`;
-
-  // Thumbnail
-  if (p.thumb) {
-    html += `<div style="position:relative;width:100%;aspect-ratio:16/9;margin-bottom:1rem;overflow:hidden">
-      <img src="${p.thumb}" alt="${name} thumbnail" style="position:absolute;inset:0;width:100%;height:100%;object-fit:contain" />
-    </div>`;
-  }
-
-  // LLM Summary
-  if (p.llm_summary) {
-    html += `<div class="modal-section"><span class="panel-eyebrow">About</span><p class="modal-section-body">${escHtml(p.llm_summary)}</p></div>`;
-  }
-
-  // Languages & Frameworks
-  const langs = (p.languages || []).concat(p.frameworks || []);
-  const exts = p.ext_entries || [];
-  if (langs.length || exts.length) {
-    html += `<div class="detail-grid modal-grid-row">`;
-    if (langs.length) {
-      html += `<article class="detail-card"><div class="detail-card-header"><span class="panel-eyebrow">Languages &amp; Frameworks</span></div><div class="chip-cloud">${langs.map(l => chip(l)).join('')}</div></article>`;
-    }
-    if (exts.length) {
-      html += `<article class="detail-card"><div class="detail-card-header"><span class="panel-eyebrow">File Breakdown</span></div><div class="chip-cloud">${exts.map(([ext,cnt]) => chip(ext, cnt)).join('')}</div></article>`;
-    }
-    html += `</div>`;
-  }
-
-  // Skills
-  if ((p.skills || []).length) {
-    html += `<article class="detail-card modal-full-row"><div class="detail-card-header"><span class="panel-eyebrow">Skills</span></div><div class="chip-cloud">${p.skills.map(s => chip(s)).join('')}</div></article>`;
-  }
-
-  // Project Metrics
-  const hasProjMetrics = p.total_commits != null || p.total_lines_added != null || p.total_files > 0 || p.duration_days != null;
-  if (hasProjMetrics) {
-    html += `<span class="modal-tiles-heading">Project Metrics</span><div class="modal-metric-tiles">`;
-    if (p.total_commits != null) html += metricTile(fmt(p.total_commits), 'Total Commits');
-    if (p.total_lines_added != null) html += metricTile(fmt(p.total_lines_added), 'Lines of Code');
-    if (p.total_files > 0) html += metricTile(fmt(p.total_files), 'Files');
-    if (p.duration_days != null) html += metricTile(fmt(p.duration_days), 'Days Active');
-    html += `</div>`;
-  }
-
-  // User Metrics
-  const displayName = """ + js_str(display_name) + r""";
-  const hasUserMetrics = p.user_commits != null || p.lines_added != null || p.lines_removed != null || p.user_rank >= 0 || p.rank_score != null;
-  if (hasUserMetrics) {
-    html += `<span class="modal-tiles-heading">${escHtml(displayName)}'s Metrics</span><div class="modal-metric-tiles modal-metric-tiles--2x2">`;
-    if (p.user_commits != null) {
-      html += `<div class="metric-tile metric-tile--multi">
-        <div class="metric-col"><span class="metric-col-value">${fmt(p.user_commits)}</span><span class="metric-col-label">Total</span><span class="metric-col-sub">commits</span></div>`;
-      if (p.commit_pct != null) html += `<div class="metric-col"><span class="metric-col-value">${escHtml(p.commit_pct)}%</span><span class="metric-col-label">Share</span><span class="metric-col-sub">of project</span></div>`;
-      if (p.avg_commits_per_week != null) html += `<div class="metric-col"><span class="metric-col-value">${escHtml(p.avg_commits_per_week)}</span><span class="metric-col-label">Avg</span><span class="metric-col-sub">per week</span></div>`;
-      html += `</div>`;
-    }
-    if (p.lines_added != null || p.lines_removed != null) {
-      html += `<div class="metric-tile metric-tile--multi">
-        <div class="metric-col"><span class="metric-col-value metric-col-value--added">+${fmt(p.lines_added ?? 0)}</span><span class="metric-col-label">Added</span><span class="metric-col-sub">lines</span></div>
-        <div class="metric-col"><span class="metric-col-value metric-col-value--removed">-${fmt(p.lines_removed ?? 0)}</span><span class="metric-col-label">Removed</span><span class="metric-col-sub">lines</span></div>
-      </div>`;
-    }
-    if (p.user_rank >= 0 && p.all_authors_count > 1) {
-      html += metricTile(`#${p.user_rank + 1}`, `Contributor Rank of ${p.all_authors_count}`);
-    }
-    if (p.rank_score != null) {
-      html += metricTile(`${Math.round(p.rank_score * 100)}/100`, 'Rank Score');
-    }
-    html += `</div>`;
-  }
-
-  // User Role
-  const role = p.user_role;
-  if (role) {
-    html += `<div class="modal-section"><span class="panel-eyebrow">${escHtml(displayName)}'s Role</span>
-      <p class="modal-section-body modal-section-body--primary">${escHtml(role.primary_role)}${role.role_description ? ` - ${escHtml(role.role_description)}` : ''}</p>
-      <p class="modal-section-body">Confidence: ${Math.round((role.confidence || 0) * 100)}%</p>`;
-    if ((role.secondary_roles || []).length) {
-      html += `<p class="modal-section-body" style="color:var(--text-secondary)">Also: ${role.secondary_roles.map(escHtml).join(', ')}</p>`;
-    }
-    if ((p.breakdown_entries || []).length) {
-      html += `<div class="chip-cloud modal-chip-cloud-gap">${p.breakdown_entries.map(([cat, pct]) => `<span class="detail-chip">${escHtml(cat)}<span class="chip-count">${Math.round(pct)}%</span></span>`).join('')}</div>`;
-    }
-    html += `</div>`;
-  }
-
-  // Evidence
-  if ((p.evidence || []).length) {
-    html += `<div class="modal-section"><span class="panel-eyebrow">Evidence of Success</span><div class="modal-evidence-list">`;
-    for (const ev of p.evidence) {
-      html += `<div class="modal-evidence-item">
-        <p class="modal-section-body modal-section-body--primary"><span class="modal-evidence-type">${escHtml(ev.type)}</span>${ev.description ? ` - ${escHtml(ev.description)}` : ''}</p>
-        ${ev.value ? `<p class="modal-section-body">${escHtml(ev.value)}</p>` : ''}
-        ${ev.url ? `<a class="modal-section-body modal-evidence-link" href="${escHtml(ev.url)}" target="_blank" rel="noreferrer">${escHtml(ev.source || ev.url)}</a>` : ''}
-      </div>`;
-    }
-    html += `</div></div>`;
-  }
-
-  // Actions
-  html += `<div class="modal-actions">`;
-  if (p.repo_url) {
-    html += `<a class="hero-action-button" href="${escHtml(p.repo_url)}" target="_blank" rel="noreferrer">Open Repository</a>`;
-  }
-  html += `<button type="button" class="hero-action-button" onclick="closeModal()">Close</button></div>`;
-
-  document.getElementById('modal-body').innerHTML = html;
-  document.getElementById('project-modal').style.display = 'flex';
-  document.body.style.overflow = 'hidden';
-}
-
-function closeModal() {
-  document.getElementById('project-modal').style.display = 'none';
-  document.body.style.overflow = '';
-}
-
-document.addEventListener('keydown', function(e) {
-  if (e.key === 'Escape') closeModal();
-});
-
-var _heatmapScope = 'user';
-var _heatmapPid = null;
-
-function switchHeatmap(pid) {
-  _heatmapPid = pid;
-  document.querySelectorAll('[id^="heatmap-user-"],[id^="heatmap-project-"]').forEach(el => el.style.display = 'none');
-  const panel = document.getElementById('heatmap-' + _heatmapScope + '-' + pid);
-  if (panel) panel.style.display = 'block';
-}
-
-function setHeatmapScope(scope) {
-  _heatmapScope = scope;
-  // Update button active states
-  document.getElementById('scope-btn-user').classList.toggle('scope-btn--active', scope === 'user');
-  document.getElementById('scope-btn-project').classList.toggle('scope-btn--active', scope === 'project');
-  // Show the correct panel for the currently selected project
-  const select = document.querySelector('.heatmap-toolbar select');
-  const pid = _heatmapPid || (select ? select.value : null);
-  if (pid) switchHeatmap(pid);
-}
-
-// Project search
-document.addEventListener('DOMContentLoaded', function() {
-  const searchInput = document.getElementById('project-search');
-  if (!searchInput) return;
-  searchInput.addEventListener('input', function() {
-    const q = this.value.toLowerCase();
-    document.querySelectorAll('#all-projects-grid .project-card-16-9').forEach(function(card) {
-      const name = (card.querySelector('.project-card-name') || {}).textContent || '';
-      card.style.display = name.toLowerCase().includes(q) ? '' : 'none';
-    });
-  });
-});
-"""
-
-    js_code = build_modal_js()
-
-    # Build the full HTML document
-    safe_portfolio_name = (portfolio_name or "portfolio").replace('"', '').replace("'", "")
-    html_doc = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8" />
-<meta name="viewport" content="width=device-width, initial-scale=1.0" />
-<title>{h(display_name)} - Portfolio</title>
-<link rel="preconnect" href="https://fonts.googleapis.com" />
-<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin />
-<link href="https://fonts.googleapis.com/css2?family=DM+Sans:wght@400;500;600;700&family=DM+Mono:wght@400;500&display=swap" rel="stylesheet" />
-
-<style>
-/* ----- Variables ----- */
-:root {{
-  --bg-surface:     rgba(255,255,255,0.04);
-  --bg-surface-md:  rgba(255,255,255,0.07);
-  --bg-surface-hi:  rgba(255,255,255,0.10);
-  --border:         rgba(255,255,255,0.08);
-  --border-md:      rgba(255,255,255,0.13);
-  --text-primary:   #f1f5f9;
-  --text-secondary: rgba(241,245,249,0.55);
-  --text-muted:     rgba(241,245,249,0.32);
-  --accent-green:   #4ade80;
-  --accent-cyan:    #22d3ee;
-  --accent-red:     #f87171;
-  --radius-sm:      8px;
-  --radius-md:      12px;
-  --radius-lg:      16px;
-  --shadow-sm:      0 2px 8px rgba(0,0,0,0.3);
-  --shadow-md:      0 6px 20px rgba(0,0,0,0.4);
-  --shadow-lg:      0 12px 40px rgba(0,0,0,0.5);
-}}
-
-/* ----- Reset & Base ----- */
-*, *::before, *::after {{ box-sizing: border-box; }}
-html {{ scroll-behavior: smooth; }}
-body {{
-  font-family: 'DM Sans','Inter',-apple-system,BlinkMacSystemFont,sans-serif;
-  margin: 0;
-  padding: 1.75rem;
-  background: radial-gradient(circle at center,#0a5948,#08271f 80%);
-  background-attachment: fixed;
-  color: var(--text-primary);
-  min-height: 100vh;
-  -webkit-font-smoothing: antialiased;
-}}
-h1,h2,h3,h4,h5 {{ color: var(--text-primary); letter-spacing: -0.02em; }}
-p {{ color: var(--text-secondary); line-height: 1.6; }}
-a {{ color: var(--accent-cyan); }}
-::-webkit-scrollbar {{ width: 6px; height: 6px; }}
-::-webkit-scrollbar-track {{ background: transparent; }}
-::-webkit-scrollbar-thumb {{ background: rgba(255,255,255,0.12); border-radius: 99px; }}
-input, select {{
-  font-family: inherit;
-  font-size: 0.88rem;
-  background: var(--bg-surface);
-  border: 1px solid var(--border-md);
-  border-radius: var(--radius-sm);
-  color: var(--text-primary);
-  padding: 0.5rem 0.75rem;
-  outline: none;
-}}
-select option {{ background: #1a2535; color: var(--text-primary); }}
-button {{
-  font-family: inherit;
-  font-size: 0.88rem;
-  font-weight: 600;
-  padding: 0.6rem 1.1rem;
-  border: 1px solid var(--border-md);
-  border-radius: var(--radius-sm);
-  background: linear-gradient(135deg,var(--accent-green),var(--accent-cyan));
-  color: #0f172a;
-  cursor: pointer;
-  margin: 0.2rem;
-  box-shadow: 0 2px 12px rgba(74,222,128,0.2);
-  transition: transform 0.15s ease,box-shadow 0.15s ease,opacity 0.15s ease;
-  letter-spacing: 0.01em;
-}}
-button:hover {{ transform: translateY(-1px); box-shadow: 0 6px 20px rgba(74,222,128,0.3); opacity: 0.92; }}
-button:active {{ transform: translateY(0); }}
-
-/* ----- Layout ----- */
-.page-shell {{ max-width: 76rem; margin: 0 auto; text-align: center; }}
-.portfolio-page {{ display: flex; flex-direction: column; gap: 1.5rem; text-align: left; }}
-.portfolio-dashboard {{ display: grid; gap: 1.5rem; }}
-
-/* ----- Portfolio header & tiles ----- */
-.portfolio-header {{
-  background: var(--bg-surface);
-  border: 1px solid var(--border);
-  border-radius: var(--radius-lg);
-  padding: 1.5rem 2rem;
-  box-shadow: var(--shadow-sm);
-}}
-.portfolio-dashboard-name {{ font-size: 1.5rem; font-weight: 700; color: var(--text-primary); margin: 0 0 0.5rem; letter-spacing: -0.02em; }}
-.portfolio-header-summary {{ margin: 0; font-size: 0.88rem; color: var(--text-secondary); }}
-
-.portfolio-tile {{
-  background: var(--bg-surface);
-  border: 1px solid var(--border);
-  border-radius: var(--radius-lg);
-  padding: 1.2rem;
-  box-shadow: var(--shadow-sm);
-  min-width: 0;
-  max-width: 100%;
-}}
-.tile-heading {{ margin: 0 0 0.8rem; font-size: 0.75rem; font-weight: 700; letter-spacing: 0.09em; text-transform: uppercase; color: var(--text-muted); }}
-.tile-placeholder-text {{ color: var(--text-muted); font-size: 0.88rem; margin: 0 0 0.5rem; }}
-
-/* ----- Hero action button ----- */
-.hero-action-button {{
-  display: inline-flex;
-  align-items: center;
-  justify-content: center;
-  min-height: 2.65rem;
-  padding: 0.55rem 1rem;
-  background: var(--bg-surface-md);
-  border: 1px solid var(--border);
-  border-radius: var(--radius-sm);
-  color: var(--text-secondary);
-  font-size: 0.85rem;
-  font-weight: 600;
-  cursor: pointer;
-  text-decoration: none;
-  box-shadow: none;
-  transition: background 0.15s ease,border-color 0.15s ease,transform 0.15s ease;
-}}
-.hero-action-button:hover {{ background: var(--bg-surface-hi); border-color: var(--border-md); transform: translateY(-1px); box-shadow: none; }}
-
-/* ----- Heatmap ----- */
-.heatmap-toolbar {{ display: flex; align-items: center; justify-content: space-between; gap: 0.7rem; flex-wrap: wrap; margin-bottom: 0.7rem; }}
-.portfolio-form-label {{ display: flex; flex-direction: column; gap: 0.4rem; font-weight: 600; font-size: 0.88rem; color: var(--text-secondary); }}
-
-.heatmap-panel {{ min-height: 188px; background: linear-gradient(180deg,rgba(255,255,255,0.04),rgba(255,255,255,0.02)); border: 1px solid var(--border); border-radius: var(--radius-sm); padding: 0.75rem; max-width: 100%; overflow: hidden; }}
-.heatmap-scroll-wrap {{ overflow-x: auto; overflow-y: hidden; max-width: 100%; }}
-.heatmap-scroll-content {{ width: max-content; min-width: 100%; }}
-
-.heatmap-summary-grid {{ display: grid; grid-template-columns: repeat(4,minmax(0,1fr)); gap: 0.45rem; margin-bottom: 0.65rem; }}
-.heatmap-stat {{ background: rgba(255,255,255,0.04); border: 1px solid rgba(255,255,255,0.08); border-radius: 8px; padding: 0.4rem 0.48rem; display: grid; gap: 0.15rem; }}
-.heatmap-stat-label {{ font-size: 0.66rem; color: var(--text-muted); text-transform: uppercase; letter-spacing: 0.06em; }}
-.heatmap-stat-value {{ font-size: 0.78rem; color: var(--text-primary); font-weight: 700; line-height: 1.1; }}
-
-.project-heatmap-grid {{ display: grid; grid-template-rows: 18px; grid-auto-flow: column; grid-auto-columns: 26px; gap: 4px; overflow: visible; padding: 0.2rem; }}
-.heatmap-cell {{ width: 26px; height: 18px; border-radius: 2px; border: 1px solid rgba(255,255,255,0.06); background: rgba(241,245,249,0.08); }}
-.heatmap-cell--week {{ border-radius: 3px; }}
-.project-heatmap-weeks {{ display: grid; grid-template-rows: 16px; grid-auto-flow: column; grid-auto-columns: 26px; gap: 4px; overflow: visible; margin-top: 0.42rem; padding: 0 0.2rem; }}
-.heatmap-week-label {{ font-size: 0.62rem; line-height: 1; color: var(--text-muted); white-space: nowrap; }}
-
-.heatmap-legend {{ display: flex; align-items: center; gap: 0.35rem; margin-top: 0.45rem; }}
-.heatmap-legend-swatch {{ width: 14px; height: 10px; border-radius: 3px; border: 1px solid rgba(255,255,255,0.08); }}
-.heatmap-legend-text {{ font-size: 0.68rem; color: var(--text-muted); }}
-.heatmap-meta {{ display: flex; justify-content: flex-start; flex-wrap: wrap; gap: 0.6rem; margin-top: 0.7rem; font-size: 0.78rem; color: var(--text-secondary); }}
-
-.heatmap-scope-toggle {{ display: flex; border: 1px solid var(--border-md); border-radius: var(--radius-sm); overflow: hidden; flex-shrink: 0; align-self: flex-end; }}
-.scope-btn {{ font-family: inherit; font-size: 0.8rem; font-weight: 600; padding: 0.38rem 0.85rem; border: none; border-radius: 0; background: transparent; color: var(--text-secondary); cursor: pointer; margin: 0; box-shadow: none; transition: background 0.15s,color 0.15s; letter-spacing: 0.01em; }}
-.scope-btn + .scope-btn {{ border-left: 1px solid var(--border-md); }}
-.scope-btn--active {{ background: var(--bg-surface-hi); color: var(--text-primary); }}
-.scope-btn:hover:not(.scope-btn--active) {{ background: var(--bg-surface-md); color: var(--text-primary); }}
-
-/* ----- Skills timeline ----- */
-.skills-timeline-wrap {{ display: flex; flex-direction: column; gap: 0; }}
-.skills-timeline-body {{ display: flex; align-items: flex-start; background: linear-gradient(180deg,rgba(255,255,255,0.04),rgba(255,255,255,0.02)); border-radius: 8px; border: 1px solid rgba(255,255,255,0.07); padding: 0.5rem 0.75rem 0.5rem 0.5rem; overflow: hidden; }}
-.skills-timeline-labels {{ flex-shrink: 0; display: flex; flex-direction: column; padding-right: 0.5rem; }}
-.skills-timeline-label {{ display: flex; align-items: center; font-size: 11px; color: rgba(255,255,255,0.65); white-space: nowrap; padding: 0 6px 0 2px; user-select: none; }}
-.skills-timeline-chart {{ flex: 1 1 0; min-width: 0; overflow: visible; }}
-
-/* ----- Project cards ----- */
-.featured-card-container {{ display: flex; flex-direction: row; justify-content: center; gap: 0.9rem; margin-top: 0.8rem; }}
-.all-projects-card-container {{ display: flex; flex-direction: row; flex-wrap: wrap; justify-content: center; gap: 0.9rem; margin-top: 0.8rem; }}
-.all-projects-header {{ display: flex; justify-content: space-between; align-items: center; flex-wrap: wrap; gap: 0.6rem; margin-bottom: 0.5rem; }}
-.all-projects-search {{ display: flex; gap: 0.5rem; align-items: center; }}
-.all-projects-search input {{ width: 180px; }}
-
-.project-card-16-9 {{ display: flex; flex-direction: column; border: 1px solid var(--border); border-radius: var(--radius-md); background: var(--bg-surface-md); overflow: hidden; cursor: pointer; transition: transform 0.18s ease,box-shadow 0.18s ease,border-color 0.18s ease; }}
-.project-card-16-9.featured {{ flex: 0 0 calc((100% - 1.8rem) / 3); }}
-.project-card-16-9.all-projects {{ flex: 0 0 calc((100% - 2.7rem) / 4); }}
-.project-card-16-9:hover {{ transform: translateY(-3px); box-shadow: var(--shadow-md); border-color: var(--border-md); }}
-.project-card-header {{ display: flex; align-items: center; justify-content: space-between; padding: 0.45rem 0.6rem 0.45rem 0.7rem; background: var(--bg-surface-hi); border-bottom: 1px solid var(--border); min-height: 2rem; gap: 0.4rem; }}
-.project-card-name {{ font-weight: 700; font-size: 0.82rem; color: var(--text-primary); line-height: 1.25; word-break: break-word; flex: 1; min-width: 0; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }}
-.project-card-image {{ position: relative; width: 100%; aspect-ratio: 16/9; background: var(--bg-surface-md); overflow: hidden; flex-shrink: 0; }}
-.project-card-image img {{ position: absolute; inset: 0; width: 100%; height: 100%; object-fit: cover; display: block; }}
-.project-card-no-thumb {{ position: absolute; inset: 0; display: flex; align-items: center; justify-content: center; color: var(--text-muted); font-size: 0.75rem; letter-spacing: 0.04em; opacity: 0.5; }}
-.project-card-footer {{ padding: 0.4rem 0.7rem 0.5rem; background: var(--bg-surface-md); border-top: 1px solid var(--border); min-height: 2.2rem; }}
-.project-card-summary {{ font-size: 0.72rem; color: var(--text-secondary); line-height: 1.4; display: -webkit-box; -webkit-line-clamp: 2; line-clamp: 2; -webkit-box-orient: vertical; overflow: hidden; }}
-
-/* ----- Modal ----- */
-.modal-overlay {{ position: fixed; inset: 0; background: rgba(0,0,0,0.75); backdrop-filter: blur(6px); display: flex; align-items: center; justify-content: center; z-index: 9999; }}
-.modal-overlay::before {{ content: ""; position: absolute; inset: 0; background: radial-gradient(circle at center,rgba(74,222,128,0.08),transparent 60%); pointer-events: none; }}
-.modal-card {{ width: 720px; max-width: 95vw; max-height: 85vh; overflow-y: auto; background: radial-gradient(circle at center,#0a5948,#08271f 80%); border: 1px solid rgba(74,222,128,0.18); border-radius: var(--radius-lg); padding: 1.3rem; box-shadow: var(--shadow-lg); position: relative; text-align: left; }}
-.modal-actions {{ display: flex; justify-content: flex-end; gap: 0.5rem; }}
-
-.panel-eyebrow {{ display: inline-block; font-size: 0.72rem; font-weight: 700; letter-spacing: 0.1em; text-transform: uppercase; color: var(--text-muted); }}
-.modal-section {{ padding: 1rem; border-radius: var(--radius-md); background: linear-gradient(135deg,rgba(74,222,128,0.06),rgba(34,211,238,0.06)),rgba(255,255,255,0.03); border: 1px solid rgba(74,222,128,0.12); margin-bottom: 0.9rem; }}
-.modal-section .panel-eyebrow {{ display: block; margin-bottom: 0.5rem; }}
-.modal-section-body {{ margin: 0.25rem 0 0; font-size: 0.84rem; color: var(--text-primary); line-height: 1.55; }}
-.modal-section-body--primary {{ color: var(--text-primary); }}
-.modal-date-range {{ display: block; margin-top: 0.2rem; font-size: 0.78rem; color: var(--text-muted); letter-spacing: 0.02em; }}
-.modal-grid-row, .modal-full-row {{ margin-bottom: 0.9rem; }}
-.modal-grid-row .detail-card, .modal-full-row.detail-card {{ background: linear-gradient(135deg,rgba(74,222,128,0.06),rgba(34,211,238,0.06)),rgba(255,255,255,0.03); border-color: rgba(74,222,128,0.12); border-radius: var(--radius-md); }}
-
-.modal-tiles-heading {{ display: block; font-size: 0.72rem; letter-spacing: 0.08em; text-transform: uppercase; color: var(--text-muted); margin-top: 0.9rem; margin-bottom: 0.5rem; }}
-.modal-metric-tiles {{ display: grid; grid-template-columns: repeat(4,1fr); gap: 0.6rem; margin-bottom: 0.9rem; }}
-.modal-metric-tiles--2x2 {{ grid-template-columns: repeat(2,1fr); grid-auto-rows: 1fr; }}
-
-.metric-tile {{ display: flex; flex-direction: column; align-items: center; justify-content: center; align-self: stretch; padding: 1rem; border-radius: var(--radius-md); background: linear-gradient(135deg,rgba(74,222,128,0.06),rgba(34,211,238,0.06)),rgba(255,255,255,0.03); border: 1px solid rgba(74,222,128,0.12); text-align: center; gap: 0.25rem; }}
-.metric-tile-value {{ font-size: 1.15rem; font-weight: 700; color: var(--accent-green); line-height: 1.1; }}
-.metric-tile-label {{ font-size: 0.72rem; font-weight: 600; letter-spacing: 0.05em; text-transform: uppercase; color: var(--text-primary); margin-top: 0.2rem; }}
-.metric-tile--multi {{ flex-direction: row; align-items: stretch; gap: 0; padding: 0; overflow: hidden; }}
-.metric-col {{ display: flex; flex-direction: column; align-items: center; justify-content: center; flex: 1; padding: 0.75rem 0.4rem; gap: 0.1rem; border-right: 1px solid rgba(74,222,128,0.1); }}
-.metric-col:last-child {{ border-right: none; }}
-.metric-col-value {{ font-size: 1.15rem; font-weight: 700; color: var(--accent-green); line-height: 1.1; }}
-.metric-col-value--added {{ color: var(--accent-green); }}
-.metric-col-value--removed {{ color: var(--accent-red); }}
-.metric-col-label {{ font-size: 0.72rem; font-weight: 600; letter-spacing: 0.05em; text-transform: uppercase; color: var(--text-primary); margin-top: 0.2rem; }}
-.metric-col-sub {{ font-size: 0.68rem; color: var(--text-primary); opacity: 0.7; }}
-
-.chip-cloud {{ display: flex; flex-wrap: wrap; gap: 0.55rem; }}
-.detail-chip {{ display: inline-flex; align-items: center; padding: 0.45rem 0.72rem; border-radius: 999px; background: rgba(34,211,238,0.1); border: 1px solid rgba(34,211,238,0.16); color: var(--text-primary); font-size: 0.82rem; }}
-.chip-count {{ margin-left: 0.3rem; opacity: 0.55; font-size: 0.78rem; }}
-.modal-chip-cloud-gap {{ margin-top: 0.5rem; }}
-
-.detail-card {{ background: rgba(255,255,255,0.03); border: 1px solid var(--border); border-radius: var(--radius-lg); padding: 1rem; }}
-.detail-card-header {{ display: flex; justify-content: space-between; align-items: start; gap: 0.8rem; margin-bottom: 0.85rem; }}
-.detail-grid {{ display: grid; grid-template-columns: minmax(0,1.35fr) minmax(280px,0.8fr); gap: 0.9rem; }}
-
-.modal-evidence-list {{ display: grid; gap: 0.6rem; margin-top: 0.5rem; }}
-.modal-evidence-item {{ padding: 1rem; border-radius: var(--radius-md); background: linear-gradient(135deg,rgba(74,222,128,0.06),rgba(34,211,238,0.06)),rgba(255,255,255,0.03); border: 1px solid rgba(74,222,128,0.12); }}
-.modal-evidence-type {{ font-size: 0.78rem; font-weight: 700; letter-spacing: 0.05em; text-transform: uppercase; color: var(--text-muted); }}
-.modal-evidence-link {{ color: var(--accent-green); text-decoration: none; display: block; }}
-.modal-evidence-link:hover {{ text-decoration: underline; }}
-
-/* ----- Responsive ----- */
-@media (max-width: 900px) {{
-  .project-card-16-9.featured {{ flex: 0 0 calc((100% - 0.9rem) / 2); }}
-  .project-card-16-9.all-projects {{ flex: 0 0 calc((100% - 0.9rem) / 2); }}
-  .heatmap-summary-grid {{ grid-template-columns: repeat(2,minmax(0,1fr)); }}
-}}
-@media (max-width: 540px) {{
-  .featured-card-container {{ flex-direction: column; }}
-  .all-projects-card-container {{ flex-direction: column; }}
-  .project-card-16-9.featured, .project-card-16-9.all-projects {{ flex: 1 1 auto; }}
-}}
-@media (max-width: 520px) {{
-  .modal-metric-tiles {{ grid-template-columns: repeat(2,1fr); }}
-}}
-</style>
-
-</head>
-<body>
-<div class="page-shell portfolio-page">
-  <div class="portfolio-dashboard">
-
-    <!-- Header tile -->
-    <section class="portfolio-header">
-      <p class="portfolio-dashboard-name">{h(display_name)}</p>
-      <p class="portfolio-header-summary">{h(header_summary)}</p>
-    </section>
-
-    <!-- Activity Heatmap -->
-    <section class="portfolio-tile">
-      <h3 class="tile-heading">Activity Heatmap</h3>
-      <div class="heatmap-toolbar">
-        <label class="portfolio-form-label" style="margin:0">
-          Project
-          <select onchange="switchHeatmap(this.value)">
-            {heatmap_selector_options}
-          </select>
-        </label>
-        <div class="heatmap-scope-toggle" id="heatmap-scope-toggle">
-          <button type="button" class="scope-btn scope-btn--active" id="scope-btn-user" onclick="setHeatmapScope('user')">{h(display_name)}</button>
-          <button type="button" class="scope-btn" id="scope-btn-project" onclick="setHeatmapScope('project')">Project-wide</button>
-        </div>
-      </div>
-      {heatmap_panels_html}
-    </section>
-
-    <!-- Skills Timeline -->
-    <section class="portfolio-tile">
-      <h3 class="tile-heading">Skills Timeline</h3>
-      {skills_timeline_html}
-    </section>
-
-    <!-- Featured Projects -->
-    <section class="portfolio-tile">
-      <h3 class="tile-heading">Featured Projects</h3>
-      <div class="featured-card-container">
-        {featured_cards_html}
-      </div>
-    </section>
-
-    <!-- All Projects -->
-    <section class="portfolio-tile">
-      <div class="all-projects-header">
-        <h3 class="tile-heading">All Projects</h3>
-        <div class="all-projects-search">
-          <input type="text" id="project-search" placeholder="Search projects..." />
-        </div>
-      </div>
-      <div class="all-projects-card-container" id="all-projects-grid">
-        {all_cards_html}
-      </div>
-    </section>
-
-  </div>
-</div>
-
-<!-- Project Detail Modal -->
-<div id="project-modal" class="modal-overlay" style="display:none" onclick="if(event.target===this)closeModal()" role="dialog" aria-modal="true">
-  <div class="modal-card" onclick="event.stopPropagation()">
-    <div id="modal-body"></div>
-  </div>
-</div>
-
-<script>
-{js_code}
-</script>
-</body>
-</html>"""
+    header_summary = f"{len(projects_for_export)} projects | Generated on {created_label}"
 
     safe_filename = f"portfolio-{(display_name or 'export').replace(' ', '-')}.html"
-    from fastapi.responses import Response
-    return Response(
-        content=html_doc.encode("utf-8"),
-        media_type="text/html",
+    return StreamingResponse(
+        iter_portfolio_html(
+            display_name,
+            header_summary,
+            projects_for_export,
+            heatmaps,
+            skills_timeline_rows(project_rows_ordered, details),
+        ),
+        media_type="text/html; charset=utf-8",
         headers={"Content-Disposition": f'attachment; filename="{safe_filename}"'},
     )
 
@@ -2937,15 +2606,110 @@ def patch_web_customize(portfolio_id: int, payload: WebPortfolioCustomizeRequest
                 (json.dumps(updates["selected_project_ids"]), portfolio_id),
             )
         conn.commit()
+        change_feed.publish("portfolios", conn, action="updated", portfolio_id=portfolio_id)
 
     updated_row = _load_portfolio_row_or_404(portfolio_id)
     return _portfolio_row_to_dict(updated_row)
 
-from inspect_db import inspect_database_json
+from inspect_db import DEFAULT_PAGE_SIZE, INSPECT_SECTIONS, MAX_PAGE_SIZE, inspect_section, iter_database_overview, iter_section_ndjson
+
+@app.get("/database/maintenance")
+def get_database_maintenance():
+    """Report whether maintenance is pending and what the last pass reclaimed."""
+    with get_connection() as conn:
+        return load_maintenance_status(conn)
+
+
+@app.post("/database/maintenance")
+def run_database_maintenance(full_vacuum: bool = Query(False)):
+    """
+    Run a maintenance pass now and return its report. ?full_vacuum=true also
+    rewrites the database with a full VACUUM (converting databases created
+    before incremental auto_vacuum), which the background pass never does.
+    """
+    return maintenance_scheduler.run_now(full_vacuum=full_vacuum)
+
+
+@app.get("/database/read-model")
+def get_read_model_status(verify: bool = Query(False)):
+    """
+    State of the in-memory read model. With ?verify=true the snapshot is also
+    compared against a fresh load from SQL and differing sections are listed.
+    """
+    status = {
+        "enabled": read_model.enabled,
+        "loaded": read_model.version is not None,
+        "version": list(read_model.version) if read_model.version else None,
+        "loads": read_model.loads,
+        "deltas": read_model.deltas,
+    }
+    if verify and read_model.enabled:
+        status.update(read_model.verify(get_connection))
+    return status
+
 
 @app.get("/database/inspect")
 def api_inspect_database():
-    return inspect_database_json()
+    # Streamed a section at a time as each one is read
+    return StreamingResponse(iter_json_object(iter_database_overview()), media_type="application/json")
+
+@app.get("/database/inspect/{section}")
+def api_inspect_database_section(
+    section: str,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+):
+    """Page through one inspector section, or stream it from cursor to the end as NDJSON."""
+    if section not in INSPECT_SECTIONS:
+        raise HTTPException(status_code=404, detail=f"Unknown section '{section}'")
+    try:
+        if format == "ndjson":
+            return StreamingResponse(iter_section_ndjson(section, cursor=cursor), media_type="application/x-ndjson")
+        return inspect_section(section, cursor=cursor, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@app.get("/database/export")
+def api_export_database(
+    format: str = Query("ndjson", pattern="^(ndjson|sqlite)$"),
+    gzip: bool = Query(False),
+):
+    """Stream a consistent snapshot of the whole database as NDJSON or a SQLite file."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    filename = f"file_data_{stamp}.{'ndjson' if format == 'ndjson' else 'db'}" + (".gz" if gzip else "")
+    if gzip:
+        media_type = "application/gzip"
+    else:
+        media_type = "application/x-ndjson" if format == "ndjson" else "application/vnd.sqlite3"
+    return StreamingResponse(
+        iter_export(format, compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@app.post("/database/import")
+async def api_import_database(request: Request):
+    """Replace the database with an export sent as the raw request body."""
+    # Spool the body to disk as it arrives so large exports stay out of memory
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        try:
+            result = await run_in_threadpool(import_database, spool)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+    await run_in_threadpool(_publish_import)
+    return result
+
+
+def _publish_import() -> None:
+    # Through a connection, so the import's new data version is not reported twice
+    with get_connection() as conn:
+        change_feed.publish("database", conn, action="imported")
+
 
 @app.delete("/database/clear")
 def clear_database():
@@ -2957,9 +2721,12 @@ def clear_database():
     # Disable FK checks
     cur.execute("PRAGMA foreign_keys = OFF;")
 
+    # The FTS5 search tables are emptied through the search_documents triggers;
+    # data_version keeps counting so cached responses are not served afterwards.
     tables = cur.execute("""
         SELECT name FROM sqlite_master
-        WHERE type='table' AND name NOT LIKE 'sqlite_%';
+        WHERE type='table' AND name NOT LIKE 'sqlite_%' AND name NOT LIKE 'search_index%'
+          AND name != 'data_version';
     """).fetchall()
 
     for (table,) in tables:
@@ -2969,6 +2736,7 @@ def clear_database():
     cur.execute("DELETE FROM sqlite_sequence;")
 
     conn.commit()
+    change_feed.publish("database", conn, action="cleared")
 
     # Re-enable FK checks
     cur.execute("PRAGMA foreign_keys = ON;")
@@ -3030,7 +2798,9 @@ def update_project(project_id: int, payload: ProjectEditRequest):
                 project_id,
             ),
         )
+        reindex_project(conn, project_id, kinds=("project", "summary"))
         conn.commit()
+        change_feed.publish("projects", conn, action="updated", project_id=project_id)
 
         updated = conn.execute(
             """
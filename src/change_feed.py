@@ -0,0 +1,215 @@
+# src/change_feed.py
+import asyncio
+import json
+import sqlite3
+import threading
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from db_version import data_version
+
+# In-process change feed behind GET /events (server-sent events). Write paths
+# publish a small typed invalidation event after they commit, so clients
+# refetch only the views a change touches instead of re-reading whole lists.
+# Writers in another process (the CLI, ad-hoc SQL) cannot publish here; they
+# still bump the data version (see db_version), and the stream turns a
+# version change that no event accounts for into a "database" event.
+
+TOPICS = ("projects", "scans", "evidence", "resumes", "portfolios", "rankings", "maintenance", "database")
+HISTORY_SIZE = 256
+QUEUE_SIZE = 64
+# Seconds between data-version checks while a stream is idle
+VERSION_CHECK_INTERVAL = 2.0
+# Comment line sent to keep idle connections (and proxies) open
+HEARTBEAT_INTERVAL = 15.0
+
+
+class Subscription:
+    """One stream's queue of events, fed from any thread."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int = QUEUE_SIZE):
+        self._loop = loop
+        self._queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize)
+        self.closed = False
+
+    def deliver(self, event: Dict[str, Any]) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The stream's event loop is gone
+            self.closed = True
+
+    def _put(self, event: Dict[str, Any]) -> None:
+        if self._queue.full():
+            # The client fell behind: replace its backlog with one resync
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            event = {"id": event["id"], "topic": "database", "action": "resync"}
+        self._queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Next event, or None after `timeout` seconds without one."""
+        if not self._queue.empty():
+            return self._queue.get_nowait()
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ChangeFeed:
+    """
+    Numbered invalidation events with a short replay history. publish() is
+    safe to call from any thread; subscribe() is called on the event loop that
+    reads the subscription.
+    """
+
+    def __init__(self, history: int = HISTORY_SIZE):
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._history: deque = deque(maxlen=history)
+        self._subscribers: List[Subscription] = []
+        # Data version the published events account for (None: not known yet)
+        self.version: Optional[Tuple[str, int]] = None
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    def publish(self, topic: str, conn: Optional[sqlite3.Connection] = None, **fields: Any) -> Dict[str, Any]:
+        """
+        Record a change to `topic`. Pass the connection that just committed it
+        so the data version it produced is not reported again as an outside write.
+        """
+        version = None
+        if conn is not None:
+            try:
+                version = data_version(conn)
+            except sqlite3.Error:
+                pass
+        with self._lock:
+            self._last_id += 1
+            event = {"id": self._last_id, "topic": topic, **fields}
+            self._history.append(event)
+            if _is_newer(version, self.version):
+                # Publishers race: one that read an older version must not move it back
+                self.version = version
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.deliver(event)
+        return event
+
+    def advance(self, before: Optional[Tuple[str, int]], after: Optional[Tuple[str, int]]) -> None:
+        """Carry the known version over a bump that changed no data (see api._bump_after_write)."""
+        with self._lock:
+            if self.version is not None and self.version == before:
+                self.version = after
+
+    def check_version(self, version: Optional[Tuple[str, int]]) -> Optional[Dict[str, Any]]:
+        """Publish a "database" event if `version` moved past the last one accounted for."""
+        if version is None:
+            return None
+        with self._lock:
+            known = self.version
+            if not _is_newer(version, known):
+                # Already accounted for, or read before a publish that moved past it
+                return None
+            self.version = version
+        if known is None:
+            return None
+        action = "replaced" if known[0] != version[0] else "changed"
+        return self.publish("database", action=action)
+
+    def events_since(self, last_id: int) -> Optional[List[Dict[str, Any]]]:
+        """Events after `last_id`, or None if some of them already left the history."""
+        with self._lock:
+            return self._since(last_id)
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        """
+        Register a stream. With `last_event_id` (a reconnect) the events it
+        missed are queued first, or a resync event if they are no longer held.
+        """
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            if last_event_id is not None and last_event_id < self._last_id:
+                missed = self._since(last_event_id)
+                if missed is None or len(missed) >= QUEUE_SIZE:
+                    missed = [{"id": self._last_id, "topic": "database", "action": "resync"}]
+                for event in missed:
+                    subscription._put(event)
+            self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.closed = True
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def _since(self, last_id: int) -> Optional[List[Dict[str, Any]]]:
+        if last_id >= self._last_id:
+            return []
+        if not self._history or self._history[0]["id"] > last_id + 1:
+            return None
+        return [event for event in self._history if event["id"] > last_id]
+
+
+def _is_newer(version: Optional[Tuple[str, int]], known: Optional[Tuple[str, int]]) -> bool:
+    """Whether `version` is past `known`: a higher count, or another database (epoch) altogether."""
+    if version is None:
+        return False
+    if known is None or version[0] != known[0]:
+        return True
+    return version[1] > known[1]
+
+
+def format_event(event: Dict[str, Any]) -> bytes:
+    """One server-sent event: the topic as the event type, the whole event as JSON data."""
+    return f"id: {event['id']}\nevent: {event['topic']}\ndata: {json.dumps(event)}\n\n".encode("utf-8")
+
+
+async def iter_event_stream(
+    feed: ChangeFeed,
+    read_version: Callable[[], Awaitable[Optional[Tuple[str, int]]]],
+    last_event_id: Optional[int] = None,
+    topics: Optional[Iterable[str]] = None,
+    check_interval: float = VERSION_CHECK_INTERVAL,
+    heartbeat_interval: float = HEARTBEAT_INTERVAL,
+) -> AsyncIterator[bytes]:
+    """
+    Body of GET /events. Only events of `topics` (default: all) are sent;
+    "database" events always are, since they invalidate everything. Between
+    events the data version is checked every `check_interval` seconds
+    (catching writes from other processes) and a comment line is sent every
+    `heartbeat_interval` seconds.
+    """
+    wanted = set(topics) | {"database"} if topics else None
+    subscription = feed.subscribe(last_event_id)
+    try:
+        # Tell EventSource how soon to reconnect; the first check sets the
+        # version baseline if nothing has been published yet
+        yield f"retry: {int(check_interval * 1000)}\n\n".encode("utf-8")
+        feed.check_version(await read_version())
+        idle = 0.0
+        while not subscription.closed:
+            event = await subscription.get(timeout=check_interval)
+            if event is not None:
+                if wanted is None or event["topic"] in wanted:
+                    idle = 0.0
+                    yield format_event(event)
+                continue
+            feed.check_version(await read_version())
+            idle += check_interval
+            if idle >= heartbeat_interval:
+                idle = 0.0
+                yield b": keep-alive\n\n"
+    finally:
+        feed.unsubscribe(subscription)
+
+
+change_feed = ChangeFeed()
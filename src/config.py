@@ -11,7 +11,14 @@ DEFAULTS = {
     "llm_resume_consent": False,
     "show_collaboration": False,
     "show_contribution_metrics": False,
-    "show_contribution_summary": False
+    "show_contribution_summary": False,
+    # Older scans kept per project as deltas (0 disables history), and the
+    # age in days past which they are dropped (None keeps them regardless)
+    "scan_history_keep": 10,
+    "scan_history_max_age_days": None,
+    # Serve project, skill, contributor and ranking reads from an in-memory
+    # copy of the project graph (see read_model); read at API startup
+    "read_model": False
 }
 
 # Guards against invalid file_type inputs and normalizes/formats them properly
@@ -15,6 +15,7 @@ import os
 import subprocess
 import datetime
 from collections import defaultdict, Counter
+from functools import lru_cache
 from typing import Dict, List
 import re
 
@@ -27,8 +28,16 @@ CATEGORY_MAP = {
 }
 
 
+FILE_CATEGORIES = ('code', 'test', 'docs', 'design', 'other')
+
+
+@lru_cache(maxsize=16384)
 def classify_file(path: str) -> str:
-    """Return a category for a file path: 'test', 'code', 'docs', 'design', or 'other'."""
+    """Return a category for a file path: 'test', 'code', 'docs', 'design', or 'other'.
+
+    Scanned files have this stored in files.category; the cache covers git log
+    paths, which repeat across commits.
+    """
     p = path.replace('\\', '/')
     fname = os.path.basename(p)
     lower = fname.lower()
@@ -85,8 +94,23 @@ def canonical_username(name: str, email: str = "") -> str:
 
 
 
+class RepoMetrics(dict):
+    """Metrics dict returned by analyze_repo().
+
+    Behaves exactly like the plain metrics dict; the per-commit rows travel
+    alongside as ``commit_log`` so they can be written to the commits table
+    without ending up in git_metrics_json or API payloads. Each entry is
+    (committed_at, author, files_changed, lines_added, lines_removed), with
+    committed_at in the author's local time as 'YYYY-MM-DD HH:MM:SS'.
+    """
+
+    def __init__(self, *args, commit_log=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.commit_log = commit_log if commit_log is not None else []
+
+
 def analyze_repo(path: str) -> Dict:
-    """Analyze the git repo at `path` and return a metrics dict."""
+    """Analyze the git repo at `path` and return a metrics dict (a RepoMetrics)."""
     repo_root = os.path.abspath(path)
     lines = _run_git_log(repo_root)
 
@@ -105,6 +129,8 @@ def analyze_repo(path: str) -> Dict:
     current_date = None
     in_commit = False
     touched_categories = set()
+    commit_log = []
+    current_commit = None
 
     for line in lines:
         if line.startswith('--GIT-COMMIT--'):
@@ -112,6 +138,9 @@ def analyze_repo(path: str) -> Dict:
             if touched_categories and current_author:
                 for c in touched_categories:
                     activity_counts_per_category[c] += 1
+            if current_commit:
+                commit_log.append(tuple(current_commit))
+                current_commit = None
             in_commit = True
             touched_categories = set()
             continue
@@ -142,6 +171,7 @@ def analyze_repo(path: str) -> Dict:
                 if current_author not in commits_per_week_per_author:
                     commits_per_week_per_author[current_author] = Counter()
                 commits_per_week_per_author[current_author][week_key] += 1
+                current_commit = [dt.strftime('%Y-%m-%d %H:%M:%S'), current_author, 0, 0, 0]
                 in_commit = False
             continue
 
@@ -160,6 +190,10 @@ def analyze_repo(path: str) -> Dict:
             lines_added_per_author[current_author] += a
             lines_removed_per_author[current_author] += r
             files_changed_per_author[current_author].add(fpath)
+            if current_commit:
+                current_commit[2] += 1
+                current_commit[3] += a
+                current_commit[4] += r
 
             category = classify_file(fpath)
             touched_categories.add(category)
@@ -173,8 +207,10 @@ def analyze_repo(path: str) -> Dict:
     if touched_categories and current_author:
         for c in touched_categories:
             activity_counts_per_category[c] += 1
+    if current_commit:
+        commit_log.append(tuple(current_commit))
 
-    return {
+    return RepoMetrics({
         'repo_root': repo_root,
         'project_start': project_start,
         'project_end': project_end,
@@ -187,7 +223,7 @@ def analyze_repo(path: str) -> Dict:
         'commits_per_week': dict(commits_per_week),
         'commits_per_week_per_author': {a: dict(w) for a, w in commits_per_week_per_author.items()},
         'files_changed_per_author': {a: sorted(list(f)) for a, f in files_changed_per_author.items()},
-    }
+    }, commit_log=commit_log)
 
 
 def pretty_print_metrics(metrics: Dict) -> None:
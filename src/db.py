@@ -5,9 +5,18 @@ import json
 import shutil
 from typing import Optional
 from collections import Counter
-from db_maintenance import prune_old_project_scans
+from db_maintenance import prune_old_project_scans, request_maintenance
+from db_stats import ensure_stats, refresh_global_stats, refresh_importance_scores, refresh_project_stats
+from detect_roles import ensure_project_roles, save_project_roles
+from db_commits import replace_project_commits
+from db_history import apply_retention, load_retention_policy, project_state, record_superseded_scans
+from db_version import data_version, ensure_data_version
+from db_search import ensure_search_index, reindex_project
+from keyset import newer_first_after
+from read_model import read_model
+from change_feed import change_feed
 from datetime import datetime
-from contrib_metrics import canonical_username
+from contrib_metrics import canonical_username, classify_file
 
 _DEFAULT_DB_PATH = os.path.abspath(
     os.path.join(os.path.dirname(__file__), '..', 'file_data.db')
@@ -16,6 +25,9 @@ _DEFAULT_DB_PATH = os.path.abspath(
 # Module-level alias retained for external callers that read db.DB_PATH directly
 DB_PATH = _DEFAULT_DB_PATH
 
+# Database files whose derived tables this process has already backfilled
+_BACKFILLED_PATHS = set()
+
 
 def get_connection():
     """Return a connection to the SQLite database."""
@@ -28,8 +40,21 @@ def get_connection():
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
     _ensure_schema(conn)
+    if db_path not in _BACKFILLED_PATHS:
+        backfill_derived_data(conn)
+        _BACKFILLED_PATHS.add(db_path)
     return conn
 
+def backfill_derived_data(conn):
+    """
+    Fill in derived rows that older databases lack (materialized stats, search
+    documents, contributor roles) and commit. get_connection runs this once per database file, so read paths
+    only read; call it again after replacing the file's contents.
+    """
+    ensure_stats(conn)
+    ensure_search_index(conn)
+    ensure_project_roles(conn)
+
 def init_db():
     """Initialize the database using init_db.sql."""
     sql_path = os.path.join(os.path.dirname(__file__), '..', 'init_db.sql')
@@ -103,6 +128,244 @@ def _ensure_table_column(conn, table_name: str, column_name: str, column_type: s
     if column_name not in cols:
         cur.execute(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}")
         conn.commit()
+
+
+def _ensure_scans_project_link(conn):
+    """Ensure scans carry an integer project_id linked to projects.id.
+
+    Older databases only stored the project name in scans.project. The column is
+    added and backfilled once; triggers then keep new rows linked when callers
+    still write by name, and keep scans.project in sync when a project is renamed.
+    """
+    cur = conn.cursor()
+    cur.execute("PRAGMA table_info(scans)")
+    cols = {row['name'] for row in cur.fetchall()}
+    if 'project_id' not in cols:
+        cur.execute("ALTER TABLE scans ADD COLUMN project_id INTEGER REFERENCES projects(id)")
+        cur.execute(
+            """
+            UPDATE scans
+            SET project_id = (SELECT p.id FROM projects p WHERE p.name = scans.project)
+            WHERE project_id IS NULL AND project IS NOT NULL
+            """
+        )
+
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_scans_link_project
+        AFTER INSERT ON scans
+        WHEN NEW.project_id IS NULL AND NEW.project IS NOT NULL
+        BEGIN
+            UPDATE scans SET project_id = (SELECT id FROM projects WHERE name = NEW.project)
+            WHERE id = NEW.id;
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_projects_link_scans
+        AFTER INSERT ON projects
+        BEGIN
+            UPDATE scans SET project_id = NEW.id
+            WHERE project_id IS NULL AND project = NEW.name;
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_projects_rename_scans
+        AFTER UPDATE OF name ON projects
+        BEGIN
+            UPDATE scans SET project = NEW.name WHERE project_id = NEW.id;
+        END
+    """)
+
+    # Compatibility view for callers that still expect the name-keyed scans shape.
+    cur.execute("""
+        CREATE VIEW IF NOT EXISTS scans_legacy AS
+        SELECT s.id, s.scanned_at, COALESCE(p.name, s.project) AS project, s.notes
+        FROM scans s
+        LEFT JOIN projects p ON p.id = s.project_id
+    """)
+    conn.commit()
+
+
+def _ensure_compact_paths(conn):
+    """Ensure the columns behind compact file paths and the files_full view exist.
+
+    New scans store their common root once in scans.root_path and each file as a
+    path_dirs entry plus file_name; files.file_path is left empty for those rows.
+    Rows written before this (dir_id IS NULL) keep their full file_path, and
+    files_full rebuilds the old file_path / metadata_json columns for both.
+    """
+    _ensure_table_column(conn, "scans", "root_path", "TEXT")
+    _ensure_table_column(conn, "files", "dir_id", "INTEGER REFERENCES path_dirs(id)")
+    view_cols = {row['name'] for row in conn.execute("PRAGMA table_info(files_full)")}
+    if view_cols and 'category' not in view_cols:
+        conn.execute("DROP VIEW files_full")
+    conn.execute("""
+        CREATE VIEW IF NOT EXISTS files_full AS
+        SELECT f.id, f.scan_id, f.file_name,
+               CASE WHEN f.dir_id IS NULL THEN f.file_path
+                    ELSE COALESCE(s.root_path, '') || d.path || f.file_name
+               END AS file_path,
+               f.file_extension, f.category, f.file_size, f.created_at, f.modified_at, f.owner,
+               CASE WHEN f.dir_id IS NULL THEN f.metadata_json
+                    ELSE json_patch(
+                        COALESCE(f.metadata_json, '{}'),
+                        json_object(
+                            'owner', f.owner,
+                            'language', (
+                                SELECT l.name FROM file_languages fl
+                                JOIN languages l ON l.id = fl.language_id
+                                WHERE fl.file_id = f.id
+                                ORDER BY l.name LIMIT 1
+                            )
+                        )
+                    )
+               END AS metadata_json
+        FROM files f
+        LEFT JOIN scans s ON s.id = f.scan_id
+        LEFT JOIN path_dirs d ON d.id = f.dir_id
+    """)
+    conn.commit()
+
+
+def _ensure_file_facts(conn):
+    """Ensure files.category exists, classifying rows saved before it did.
+
+    save_scan stores classify_file()'s category and a lowercased extension per
+    file so role analysis and breakdowns can group in SQL. The backfill runs
+    once, when the column is added; cached project_stats rows are dropped so
+    they are rebuilt with the category breakdown.
+    """
+    if not _table_exists(conn, "files"):
+        return
+    cols = {row['name'] for row in conn.execute("PRAGMA table_info(files)")}
+    if 'category' in cols:
+        return
+    conn.execute("ALTER TABLE files ADD COLUMN category TEXT")
+    scan_cols = {row['name'] for row in conn.execute("PRAGMA table_info(scans)")}
+    if 'dir_id' in cols and 'root_path' in scan_cols:
+        path_sql = """
+            SELECT f.id, CASE WHEN f.dir_id IS NULL THEN f.file_path
+                              ELSE COALESCE(s.root_path, '') || d.path || f.file_name END
+            FROM files f
+            LEFT JOIN scans s ON s.id = f.scan_id
+            LEFT JOIN path_dirs d ON d.id = f.dir_id
+        """
+    else:
+        path_sql = "SELECT id, file_path FROM files"
+    conn.executemany(
+        "UPDATE files SET category = ? WHERE id = ?",
+        [(classify_file(path or ''), file_id) for file_id, path in conn.execute(path_sql).fetchall()],
+    )
+    conn.execute("UPDATE files SET file_extension = LOWER(file_extension) WHERE file_extension <> LOWER(file_extension)")
+    if _table_exists(conn, "project_stats"):
+        conn.execute("DELETE FROM project_stats")
+    conn.commit()
+
+
+# Truthiness of metadata_json's llm_summary, matching bool(metadata.get("llm_summary")).
+_LLM_USED_SQL = """
+    CASE WHEN json_valid({col}) THEN
+        CASE json_type({col}, '$.llm_summary')
+            WHEN 'true' THEN 1
+            WHEN 'integer' THEN json_extract({col}, '$.llm_summary') <> 0
+            WHEN 'real' THEN json_extract({col}, '$.llm_summary') <> 0
+            WHEN 'text' THEN json_extract({col}, '$.llm_summary') <> ''
+            WHEN 'array' THEN json_array_length({col}, '$.llm_summary') > 0
+            WHEN 'object' THEN json_extract({col}, '$.llm_summary') <> '{{}}'
+            ELSE 0
+        END
+    ELSE 0 END
+"""
+
+
+def _ensure_resume_llm_flag(conn):
+    """Ensure resumes.llm_used exists and is kept in step with metadata_json.
+
+    GET /resumes used to parse every row's metadata blob just to report one
+    flag. Triggers set the column on insert and on metadata edits, so any
+    writer (save_resume, the edit endpoint, raw SQL) keeps it correct; the
+    backfill runs once, when the column is added.
+    """
+    if not _table_exists(conn, "resumes"):
+        return
+    cols = {row['name'] for row in conn.execute("PRAGMA table_info(resumes)")}
+    if 'llm_used' not in cols:
+        conn.execute("ALTER TABLE resumes ADD COLUMN llm_used INTEGER NOT NULL DEFAULT 0")
+        conn.execute(f"UPDATE resumes SET llm_used = {_LLM_USED_SQL.format(col='metadata_json')}")
+    flag = _LLM_USED_SQL.format(col='NEW.metadata_json')
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS resumes_llm_used_insert AFTER INSERT ON resumes BEGIN
+            UPDATE resumes SET llm_used = {flag} WHERE id = NEW.id;
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS resumes_llm_used_update AFTER UPDATE OF metadata_json ON resumes BEGIN
+            UPDATE resumes SET llm_used = {flag} WHERE id = NEW.id;
+        END
+    """)
+    conn.commit()
+
+
+# Commit authors are kept by canonical name rather than as contributors rows:
+# they include bots and anonymous commits that are not people in the scan.
+_COMMITS_SQL = """
+    CREATE TABLE IF NOT EXISTS commits (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        project_id INTEGER NOT NULL,
+        author TEXT NOT NULL,
+        committed_at TEXT NOT NULL,
+        files_changed INTEGER NOT NULL DEFAULT 0,
+        lines_added INTEGER NOT NULL DEFAULT 0,
+        lines_removed INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+    )
+"""
+
+
+def _ensure_commit_authors(conn):
+    """Ensure commits store the author's name instead of a contributors link.
+
+    Older tables (author_id) are rebuilt with the linked names, and a
+    maintenance pass is requested so the contributors rows that only commits
+    referenced are collected.
+    """
+    cols = {row['name'] for row in conn.execute("PRAGMA table_info(commits)")}
+    if 'author_id' not in cols:
+        return
+    conn.execute("ALTER TABLE commits RENAME TO commits_by_author_id")
+    conn.execute(_COMMITS_SQL)
+    conn.execute("""
+        INSERT INTO commits (id, project_id, author, committed_at, files_changed, lines_added, lines_removed)
+        SELECT c.id, c.project_id, COALESCE(a.name, ''), c.committed_at, c.files_changed, c.lines_added, c.lines_removed
+        FROM commits_by_author_id c
+        LEFT JOIN contributors a ON a.id = c.author_id
+    """)
+    conn.execute("DROP TABLE commits_by_author_id")
+    request_maintenance(conn, "commit authors unlinked from contributors")
+    conn.commit()
+
+
+def _split_scan_paths(display_paths):
+    """Split a scan's display paths into a shared root and per-file directories.
+
+    Returns (root, dirs) where dirs[i] is the directory of display_paths[i]
+    relative to root (ending in its separator, or ''), or None when the path
+    does not end in its file name and must be stored whole. Zip members
+    ('archive.zip:dir/file.py') split on ':' as well as '/' and '\\'.
+    """
+    prefixes = []
+    for display, file_name in display_paths:
+        if file_name and display.endswith(file_name):
+            prefixes.append(display[:len(display) - len(file_name)])
+        else:
+            prefixes.append(None)
+
+    known = [p for p in prefixes if p is not None]
+    root = os.path.commonprefix(known) if known else ""
+    cut = max(root.rfind("/"), root.rfind("\\"), root.rfind(":"))
+    root = root[:cut + 1]
+    return root, [None if p is None else p[len(root):] for p in prefixes]
+
+
 def get_project_display_name(project_name: str):
     if not project_name:
         return None
@@ -155,12 +418,22 @@ def set_project_display_name(project_name: str, custom_name: Optional[str]):
     try:
         _ensure_projects_custom_name_column(conn)
         cur = conn.cursor()
+        cur.execute('BEGIN')
+        before = data_version(conn)
         cur.execute(
             "UPDATE projects SET custom_name = ? WHERE name = ?",
             (custom, project_name),
         )
+        updated = cur.rowcount
+        row = cur.execute("SELECT id FROM projects WHERE name = ?", (project_name,)).fetchone()
+        if row:
+            reindex_project(conn, row["id"], kinds=("project",))
+        after = data_version(conn)
         conn.commit()
-        return cur.rowcount
+        read_model.note_write(conn, [row["id"]] if row else [], (before, after))
+        if updated:
+            change_feed.publish("projects", conn, action="updated", project_id=row["id"] if row else None)
+        return updated
     finally:
         conn.close()
 
@@ -173,6 +446,32 @@ def set_project_display_name(project_name: str, custom_name: Optional[str]):
         
 
 
+def _lookup_id(cur, ids: dict, table: str, value: str, column: str = "name") -> int:
+    """Return the id of value in a lookup table (languages, skills, contributors,
+    path_dirs), inserting it if missing. ids caches (table, value) -> id across
+    the scans written on one connection."""
+    key = (table, value)
+    if key not in ids:
+        cur.execute(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", (value,))
+        cur.execute(f"SELECT id FROM {table} WHERE {column} = ?", (value,))
+        ids[key] = cur.fetchone()[0]
+    return ids[key]
+
+
+def _prepare_scan_columns(conn, with_thumbnail: bool = False):
+    """Add the project columns save_scan writes to databases that predate them."""
+    if with_thumbnail:
+        _ensure_projects_thumbnail_column(conn)
+    _ensure_projects_custom_name_column(conn)
+    _ensure_projects_column(conn, "project_path", "TEXT")
+    _ensure_projects_column(conn, "git_metrics_json", "TEXT")
+    _ensure_projects_column(conn, "tech_json", "TEXT")
+    _ensure_projects_column(conn, "summary_text", "TEXT")
+    _ensure_projects_column(conn, "summary_model", "TEXT")
+    _ensure_projects_column(conn, "summary_input_hash", "TEXT")
+    _ensure_projects_column(conn, "summary_updated_at", "TEXT")
+
+
 def save_scan(scan_source: str, files_found: list, project: str = None, notes: str = None,
               detected_languages: list = None, detected_skills: list = None, contributors: list = None,
               file_metadata: dict = None, project_created_at: str = None, project_repo_url: str = None,
@@ -194,212 +493,487 @@ def save_scan(scan_source: str, files_found: list, project: str = None, notes: s
     cur = conn.cursor()
 
     try:
-        if project_thumbnail_path is not None:
-            _ensure_projects_thumbnail_column(conn)
-           
-        _ensure_projects_custom_name_column(conn)
-        _ensure_projects_column(conn, "project_path", "TEXT")
-        _ensure_projects_column(conn, "git_metrics_json", "TEXT")
-        _ensure_projects_column(conn, "tech_json", "TEXT")
-        _ensure_projects_column(conn, "summary_text", "TEXT")
-        _ensure_projects_column(conn, "summary_model", "TEXT")
-        _ensure_projects_column(conn, "summary_input_hash", "TEXT")
-        _ensure_projects_column(conn, "summary_updated_at", "TEXT")
-           
+        _prepare_scan_columns(conn, with_thumbnail=project_thumbnail_path is not None)
+        history_policy = load_retention_policy()
         cur.execute('BEGIN')
+        before = data_version(conn)
+        scan_id = _write_scan(
+            conn, {}, scan_source, files_found, project=project, notes=notes,
+            detected_languages=detected_languages, detected_skills=detected_skills, contributors=contributors,
+            file_metadata=file_metadata, project_created_at=project_created_at, project_repo_url=project_repo_url,
+            project_thumbnail_path=project_thumbnail_path, git_metrics=git_metrics, tech_summary=tech_summary,
+            summary_text=summary_text, summary_input_hash=summary_input_hash, summary_model=summary_model,
+            summary_updated_at=summary_updated_at, history_policy=history_policy,
+        )
+        refresh_global_stats(conn)
+        project_ids = _scan_project_ids(conn, [scan_id])
+        after = data_version(conn)
 
-        project_name = project or os.path.basename(scan_source)
+        conn.commit()
+        read_model.note_write(conn, project_ids, (before, after))
+        change_feed.publish("scans", conn, action="saved", scan_ids=[scan_id], projects=[project], project_ids=project_ids)
+        return scan_id
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
 
-        # create scan
-        cur.execute(
-            "INSERT INTO scans (project, notes) VALUES (?, ?)",
-            (project_name, notes)
-        )
-        scan_id = cur.lastrowid
-
-        #  keep ONLY the newest scan's data for this project
-        prune_old_project_scans(conn, project_name, keep_scan_id=scan_id)
-
-
-        # link or create project row, and persist project-level metadata
-        project_id = None
-        project_key = project_name
-        if project_key:
-            # create row if missing; include repo_url/created_at when present
-            if project_repo_url is not None or project_created_at is not None or project_thumbnail_path is not None:
-                # Try to insert with provided metadata; INSERT OR IGNORE will skip if exists
-                cur.execute(
-                    "INSERT OR IGNORE INTO projects (name, repo_url, created_at, thumbnail_path, project_path) VALUES (?, ?, ?, ?, ?)",
-                    (project_key, project_repo_url, project_created_at, project_thumbnail_path, scan_source),
-                )
-            else:
-                cur.execute("INSERT OR IGNORE INTO projects (name, project_path) VALUES (?, ?)", (project_key, scan_source))
-
-            # If the row existed but metadata fields are empty, update them non-destructively
-            if project_repo_url is not None or project_created_at is not None:
-                cur.execute(
-                    "UPDATE projects SET repo_url = COALESCE(repo_url, ?), created_at = COALESCE(created_at, ?) WHERE name = ?",
-                    (project_repo_url, project_created_at, project_key),
-                )
-            if project_thumbnail_path is not None:
-                cur.execute(
-                    "UPDATE projects SET thumbnail_path = ? WHERE name = ?",
-                    (project_thumbnail_path, project_key),
-                )
-            if scan_source:
-                cur.execute(
-                    "UPDATE projects SET project_path = ? WHERE name = ?",
-                    (scan_source, project_key),
-                )
-
-            if git_metrics is not None:
-                cur.execute(
-                    "UPDATE projects SET git_metrics_json = ? WHERE name = ?",
-                    (json.dumps(git_metrics, default=str), project_key),
-                )
-            if tech_summary is not None:
-                cur.execute(
-                    "UPDATE projects SET tech_json = ? WHERE name = ?",
-                    (json.dumps(tech_summary, default=str), project_key),
-                )
-            if summary_text is not None:
-                cur.execute(
-                    """
-                    UPDATE projects
-                    SET summary_text = ?, summary_model = ?, summary_input_hash = ?, summary_updated_at = ?
-                    WHERE name = ?
-                    """,
-                    (summary_text, summary_model, summary_input_hash, summary_updated_at, project_key),
-                )
-
-            cur.execute("SELECT id FROM projects WHERE name = ?", (project_key,))
-            r = cur.fetchone()
-            project_id = r['id'] if r else None
-
-        # insert files (batch). file_metadata is a mapping of file_path -> dict
-        file_rows = []
-        for item in files_found:
-            if isinstance(item, tuple):
-                display, size, mtime = item
-                file_path = display
-                file_name = os.path.basename(display.split(':')[-1])
-                file_extension = os.path.splitext(file_name)[1]
-                file_size = int(size or 0)
-                modified_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(mtime)) if mtime else None
-                created_at = None
-            else:
-                file_path = item
-                file_name = os.path.basename(item)
-                file_extension = os.path.splitext(file_name)[1]
-                try:
-                    file_size = os.path.getsize(item)
-                    created_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(os.path.getctime(item)))
-                    modified_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(os.path.getmtime(item)))
-                except Exception:
-                    file_size = None
-                    created_at = None
-                    modified_at = None
-
-            # pull owner/metadata if provided
-            meta = {}
-            if file_metadata and file_path in file_metadata:
-                # copy only serializable fields
+
+def save_scans(scans: list, chunk_size: int = 25, listing_fallback: bool = False) -> list:
+    """Persist several scans (e.g. every project of one upload) over one connection.
+
+    scans is a list of save_scan keyword-argument dicts. Lookup ids are shared
+    across the batch and each scan is written inside its own SAVEPOINT, so one
+    failing project is rolled back alone; the transaction is committed every
+    chunk_size scans. With listing_fallback, a scan that fails is retried in
+    the same savepoint with only its file listing (source, files, project).
+    Returns a list aligned with scans holding the scan_id, or the exception
+    that scan raised.
+    """
+    results = []
+    if not scans:
+        return results
+
+    conn = get_connection()
+    conn.execute('PRAGMA foreign_keys = ON')
+    cur = conn.cursor()
+    ids = {}
+    history_policy = load_retention_policy()
+    # (before, after) data versions of each chunk's transaction
+    versions = []
+    try:
+        _prepare_scan_columns(conn, with_thumbnail=any(s.get("project_thumbnail_path") is not None for s in scans))
+        for start in range(0, len(scans), max(1, chunk_size)):
+            cur.execute('BEGIN')
+            chunk_before = data_version(conn)
+            for kwargs in scans[start:start + chunk_size]:
+                cur.execute('SAVEPOINT save_scan')
                 try:
-                    meta = dict(file_metadata[file_path])
-                except Exception:
-                    meta = {}
+                    results.append(_write_scan(conn, ids, history_policy=history_policy, **kwargs))
+                    cur.execute('RELEASE save_scan')
+                except Exception as exc:
+                    cur.execute('ROLLBACK TO save_scan')
+                    # ids inserted inside the rolled-back savepoint no longer exist
+                    ids.clear()
+                    if listing_fallback:
+                        try:
+                            results.append(_write_scan(
+                                conn, ids, kwargs["scan_source"], kwargs["files_found"],
+                                project=kwargs.get("project"), history_policy=history_policy,
+                            ))
+                            cur.execute('RELEASE save_scan')
+                            continue
+                        except Exception as fallback_exc:
+                            cur.execute('ROLLBACK TO save_scan')
+                            ids.clear()
+                            exc = fallback_exc
+                    cur.execute('RELEASE save_scan')
+                    results.append(exc)
+            refresh_global_stats(conn)
+            versions.append((chunk_before, data_version(conn)))
+            conn.commit()
+        saved = [(scan_id, kwargs.get("project")) for scan_id, kwargs in zip(results, scans) if not isinstance(scan_id, Exception)]
+        # The chunks cover one span of versions only if no other write landed between them
+        contiguous = all(prev[1] == nxt[0] for prev, nxt in zip(versions, versions[1:]))
+        project_ids = _scan_project_ids(conn, [scan_id for scan_id, _ in saved])
+        read_model.note_write(conn, project_ids, (versions[0][0], versions[-1][1]) if contiguous else None)
+        if saved:
+            change_feed.publish(
+                "scans", conn, action="saved", scan_ids=[scan_id for scan_id, _ in saved],
+                projects=[project for _, project in saved], project_ids=project_ids,
+            )
+        return results
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
 
-            owner_val = meta.get('owner') if isinstance(meta, dict) else None
-            file_rows.append((scan_id, file_name, file_path, file_extension, file_size, created_at, modified_at, owner_val, json.dumps(meta)))
 
-        cur.executemany(
-            "INSERT INTO files (scan_id, file_name, file_path, file_extension, file_size, created_at, modified_at, owner, metadata_json) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-            file_rows
-        )
+def _scan_project_ids(conn, scan_ids: list) -> list:
+    """Distinct project ids of scan_ids (for read_model.note_write and scans events)."""
+    if not scan_ids:
+        return []
+    placeholders = ",".join("?" for _ in scan_ids)
+    rows = conn.execute(
+        f"SELECT DISTINCT project_id FROM scans WHERE id IN ({placeholders}) AND project_id IS NOT NULL",
+        scan_ids,
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def _write_scan(conn, ids: dict, scan_source: str, files_found: list, project: str = None, notes: str = None,
+                detected_languages: list = None, detected_skills: list = None, contributors: list = None,
+                file_metadata: dict = None, project_created_at: str = None, project_repo_url: str = None,
+                project_thumbnail_path: str = None, git_metrics: dict = None, tech_summary: dict = None,
+                summary_text: str = None, summary_input_hash: str = None, summary_model: str = None,
+                summary_updated_at: str = None, history_policy: dict = None):
+    """Write one scan inside the caller's transaction (see save_scan / save_scans). Returns scan_id.
+
+    history_policy is the scan history retention policy (see db_history);
+    when omitted it is read from the user config.
+    """
+    cur = conn.cursor()
+    project_name = project or os.path.basename(scan_source)
+    if history_policy is None:
+        history_policy = load_retention_policy()
+
+    # project state before this scan updates it, kept with the superseded scan's history
+    cur.execute("SELECT id FROM projects WHERE name = ?", (project_name,))
+    existing = cur.fetchone()
+    previous_state = project_state(conn, existing['id']) if existing else None
+
+    # link or create project row, and persist project-level metadata
+    project_id = None
+    project_key = project_name
+    if project_key:
+        # create row if missing; include repo_url/created_at when present
+        if project_repo_url is not None or project_created_at is not None or project_thumbnail_path is not None:
+            # Try to insert with provided metadata; INSERT OR IGNORE will skip if exists
+            cur.execute(
+                "INSERT OR IGNORE INTO projects (name, repo_url, created_at, thumbnail_path, project_path) VALUES (?, ?, ?, ?, ?)",
+                (project_key, project_repo_url, project_created_at, project_thumbnail_path, scan_source),
+            )
+        else:
+            cur.execute("INSERT OR IGNORE INTO projects (name, project_path) VALUES (?, ?)", (project_key, scan_source))
+
+        # If the row existed but metadata fields are empty, update them non-destructively
+        if project_repo_url is not None or project_created_at is not None:
+            cur.execute(
+                "UPDATE projects SET repo_url = COALESCE(repo_url, ?), created_at = COALESCE(created_at, ?) WHERE name = ?",
+                (project_repo_url, project_created_at, project_key),
+            )
+        if project_thumbnail_path is not None:
+            cur.execute(
+                "UPDATE projects SET thumbnail_path = ? WHERE name = ?",
+                (project_thumbnail_path, project_key),
+            )
+        if scan_source:
+            cur.execute(
+                "UPDATE projects SET project_path = ? WHERE name = ?",
+                (scan_source, project_key),
+            )
+
+        if git_metrics is not None:
+            cur.execute(
+                "UPDATE projects SET git_metrics_json = ? WHERE name = ?",
+                (json.dumps(git_metrics, default=str), project_key),
+            )
+        if tech_summary is not None:
+            cur.execute(
+                "UPDATE projects SET tech_json = ? WHERE name = ?",
+                (json.dumps(tech_summary, default=str), project_key),
+            )
+        if summary_text is not None:
+            cur.execute(
+                """
+                UPDATE projects
+                SET summary_text = ?, summary_model = ?, summary_input_hash = ?, summary_updated_at = ?
+                WHERE name = ?
+                """,
+                (summary_text, summary_model, summary_input_hash, summary_updated_at, project_key),
+            )
 
-        # Fetch inserted file ids to use for linking (simple approach: query files for this scan)
-        cur.execute("SELECT id, file_path FROM files WHERE scan_id = ?", (scan_id,))
-        file_id_map = {row['file_path']: row['id'] for row in cur.fetchall()}
+        cur.execute("SELECT id FROM projects WHERE name = ?", (project_key,))
+        r = cur.fetchone()
+        project_id = r['id'] if r else None
 
-        # Languages: prefer per-file language from file_metadata; fall back to detected_languages at project-level
-        if file_metadata:
+    # create scan linked to its project by id
+    cur.execute(
+        "INSERT INTO scans (project, project_id, notes) VALUES (?, ?, ?)",
+        (project_name, project_id, notes)
+    )
+    scan_id = cur.lastrowid
+
+    # insert files (batch). file_metadata is a mapping of file_path -> dict
+    file_rows = []
+    for item in files_found:
+        if isinstance(item, tuple):
+            display, size, mtime = item
+            file_path = display
+            file_name = os.path.basename(display.split(':')[-1])
+            file_extension = os.path.splitext(file_name)[1].lower()
+            file_size = int(size or 0)
+            modified_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(mtime)) if mtime else None
+            created_at = None
+        else:
+            file_path = item
+            file_name = os.path.basename(item)
+            file_extension = os.path.splitext(file_name)[1].lower()
+            try:
+                file_size = os.path.getsize(item)
+                created_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(os.path.getctime(item)))
+                modified_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(os.path.getmtime(item)))
+            except Exception:
+                file_size = None
+                created_at = None
+                modified_at = None
+
+        # pull owner/metadata if provided
+        meta = {}
+        if file_metadata and file_path in file_metadata:
+            # copy only serializable fields
+            try:
+                meta = dict(file_metadata[file_path])
+            except Exception:
+                meta = {}
+
+        owner_val = meta.get('owner') if isinstance(meta, dict) else None
+        # owner has its own column and language lives in file_languages; keep only the rest
+        extra = {k: v for k, v in meta.items() if k not in ('owner', 'language')} if isinstance(meta, dict) else {}
+        file_rows.append((file_name, file_path, file_extension, classify_file(file_path), file_size, created_at,
+                          modified_at, owner_val, json.dumps(extra, default=str) if extra else None))
+
+    # store the scan root once and each file as an interned directory + file name
+    root_path, rel_dirs = _split_scan_paths([(row[1], row[0]) for row in file_rows])
+    cur.execute("UPDATE scans SET root_path = ? WHERE id = ?", (root_path, scan_id))
+    dir_ids = {}
+    for rel_dir in set(d for d in rel_dirs if d is not None):
+        dir_ids[rel_dir] = _lookup_id(cur, ids, "path_dirs", rel_dir, column="path")
+
+    cur.executemany(
+        "INSERT INTO files (scan_id, file_name, file_path, dir_id, file_extension, category, file_size, created_at, modified_at, owner, metadata_json) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (scan_id, row[0], '' if rel_dir is not None else row[1], dir_ids.get(rel_dir)) + row[2:]
+            for row, rel_dir in zip(file_rows, rel_dirs)
+        ]
+    )
+
+    # Fetch inserted file ids (in insertion order) to use for linking
+    cur.execute("SELECT id FROM files WHERE scan_id = ? ORDER BY id", (scan_id,))
+    file_id_map = {row[1]: r['id'] for row, r in zip(file_rows, cur.fetchall())}
+    # path -> (category, extension), reused by role detection instead of re-classifying
+    file_facts = {row[1]: (row[3], row[2]) for row in file_rows}
+
+    # Languages: prefer per-file language from file_metadata; fall back to detected_languages at project-level
+    if file_metadata:
+        for fp, fid in file_id_map.items():
+            meta = file_metadata.get(fp) or {}
+            lang = meta.get('language') if isinstance(meta, dict) else None
+            if lang:
+                lang_id = _lookup_id(cur, ids, "languages", lang)
+                cur.execute("INSERT OR IGNORE INTO file_languages (file_id, language_id) VALUES (?, ?)", (fid, lang_id))
+    elif detected_languages:
+        for lang in detected_languages:
+            if not lang:
+                continue
+            lang_id = _lookup_id(cur, ids, "languages", lang)
             for fp, fid in file_id_map.items():
-                meta = file_metadata.get(fp) or {}
-                lang = meta.get('language') if isinstance(meta, dict) else None
-                if lang:
-                    cur.execute("INSERT OR IGNORE INTO languages (name) VALUES (?)", (lang,))
-                    cur.execute("SELECT id FROM languages WHERE name = ?", (lang,))
-                    lang_id = cur.fetchone()['id']
-                    cur.execute("INSERT OR IGNORE INTO file_languages (file_id, language_id) VALUES (?, ?)", (fid, lang_id))
-        elif detected_languages:
-            for lang in detected_languages:
-                if not lang:
-                    continue
-                cur.execute("INSERT OR IGNORE INTO languages (name) VALUES (?)", (lang,))
-                cur.execute("SELECT id FROM languages WHERE name = ?", (lang,))
-                lang_id = cur.fetchone()['id']
-                for fp, fid in file_id_map.items():
-                    cur.execute("INSERT OR IGNORE INTO file_languages (file_id, language_id) VALUES (?, ?)", (fid, lang_id))
-
-        # Skills (project-level)
-        if detected_skills and project_id:
-            for skill in detected_skills:
-                if not skill:
+                cur.execute("INSERT OR IGNORE INTO file_languages (file_id, language_id) VALUES (?, ?)", (fid, lang_id))
+
+    # Skills (project-level)
+    if detected_skills and project_id:
+        for skill in detected_skills:
+            if not skill:
+                continue
+            skill_id = _lookup_id(cur, ids, "skills", skill)
+            cur.execute("INSERT OR IGNORE INTO project_skills (project_id, skill_id) VALUES (?, ?)", (project_id, skill_id))
+
+    # Contributors: if file-level owner metadata exists, parse & link per-file; else fall back to project-wide contributors
+    def _parse_owner_string(s: str):
+        # Expected formats: 'individual (Name)' or 'collaborative (A, B)'
+        if not s or s == 'unknown':
+            return []
+        if s.startswith('individual (') and s.endswith(')'):
+            return [s[len('individual ('):-1].strip()]
+        if s.startswith('collaborative (') and s.endswith(')'):
+            inner = s[len('collaborative ('):-1]
+            return [p.strip() for p in inner.split(',') if p.strip()]
+        # fallback: return the whole string as a single name (cleaned)
+        return [s.strip()]
+
+    # contributor -> file paths linked in this scan, for role detection below
+    files_by_contributor = {}
+    linked_any_contributor = False
+    if file_metadata:
+        for fp, fid in file_id_map.items():
+            meta = file_metadata.get(fp) or {}
+            owner_val = meta.get('owner') if isinstance(meta, dict) else None
+            names = [_normalize_contributor_name(n) for n in _parse_owner_string(owner_val)]
+            for name in names:
+                if not name:
                     continue
-                cur.execute("INSERT OR IGNORE INTO skills (name) VALUES (?)", (skill,))
-                cur.execute("SELECT id FROM skills WHERE name = ?", (skill,))
-                skill_id = cur.fetchone()['id']
-                cur.execute("INSERT OR IGNORE INTO project_skills (project_id, skill_id) VALUES (?, ?)", (project_id, skill_id))
-
-        # Contributors: if file-level owner metadata exists, parse & link per-file; else fall back to project-wide contributors
-        def _parse_owner_string(s: str):
-            # Expected formats: 'individual (Name)' or 'collaborative (A, B)'
-            if not s or s == 'unknown':
-                return []
-            if s.startswith('individual (') and s.endswith(')'):
-                return [s[len('individual ('):-1].strip()]
-            if s.startswith('collaborative (') and s.endswith(')'):
-                inner = s[len('collaborative ('):-1]
-                return [p.strip() for p in inner.split(',') if p.strip()]
-            # fallback: return the whole string as a single name (cleaned)
-            return [s.strip()]
-
-        linked_any_contributor = False
-        if file_metadata:
+                contrib_id = _lookup_id(cur, ids, "contributors", name)
+                cur.execute("INSERT OR IGNORE INTO file_contributors (file_id, contributor_id) VALUES (?, ?)", (fid, contrib_id))
+                files_by_contributor.setdefault(name, []).append(fp)
+                linked_any_contributor = True
+    if not linked_any_contributor and contributors:
+        for contrib in contributors:
+            contrib = _normalize_contributor_name(contrib)
+            if not contrib:
+                continue
+            contrib_id = _lookup_id(cur, ids, "contributors", contrib)
             for fp, fid in file_id_map.items():
-                meta = file_metadata.get(fp) or {}
-                owner_val = meta.get('owner') if isinstance(meta, dict) else None
-                names = [_normalize_contributor_name(n) for n in _parse_owner_string(owner_val)]
-                for name in names:
-                    if not name:
-                        continue
-                    cur.execute("INSERT OR IGNORE INTO contributors (name) VALUES (?)", (name,))
-                    cur.execute("SELECT id FROM contributors WHERE name = ?", (name,))
-                    contrib_id = cur.fetchone()['id']
-                    cur.execute("INSERT OR IGNORE INTO file_contributors (file_id, contributor_id) VALUES (?, ?)", (fid, contrib_id))
-                    linked_any_contributor = True
-        if not linked_any_contributor and contributors:
-            for contrib in contributors:
-                contrib = _normalize_contributor_name(contrib)
-                if not contrib:
-                    continue
-                cur.execute("INSERT OR IGNORE INTO contributors (name) VALUES (?)", (contrib,))
-                cur.execute("SELECT id FROM contributors WHERE name = ?", (contrib,))
-                contrib_id = cur.fetchone()['id']
-                for fp, fid in file_id_map.items():
-                    cur.execute("INSERT OR IGNORE INTO file_contributors (file_id, contributor_id) VALUES (?, ?)", (fid, contrib_id))
+                cur.execute("INSERT OR IGNORE INTO file_contributors (file_id, contributor_id) VALUES (?, ?)", (fid, contrib_id))
+            files_by_contributor.setdefault(contrib, []).extend(file_id_map)
+
+    # Keep ONLY the newest scan's data for this project; the scans it replaces
+    # are kept in scan_history as deltas against it, within the retention policy
+    if project_id and previous_state is not None and history_policy.get("keep") != 0:
+        cur.execute("SELECT id FROM scans WHERE project_id = ? AND id != ?", (project_id, scan_id))
+        old_scan_ids = [r['id'] for r in cur.fetchall()]
+        record_superseded_scans(conn, project_id, scan_id, old_scan_ids, previous_state)
+    if project_id:
+        apply_retention(conn, project_id, history_policy.get("keep"), history_policy.get("max_age_days"))
+    if prune_old_project_scans(conn, project_name, keep_scan_id=scan_id, project_id=project_id):
+        request_maintenance(conn, "old scans pruned")
+
+    # Keep the materialized aggregates in step with this scan. Older scans of
+    # the project were pruned above, so this scan's links are the whole project.
+    if project_id:
+        save_project_roles(conn, project_id, files_by_contributor, file_facts=file_facts)
+        commit_log = getattr(git_metrics, "commit_log", None)
+        if commit_log is not None:
+            replace_project_commits(conn, project_id, commit_log)
+        reindex_project(conn, project_id)
+    refresh_project_stats(conn, project_id)
+    refresh_importance_scores(conn, project_id)
+    return scan_id
+
+
+_PENDING = object()
+
+
+class LazyRecord(dict):
+    """A dict where some values are computed by a loader the first time they are read.
+
+    Used for heavy JSON columns (git metrics carry every per-author file list) so
+    callers that never look at them do not pay for ``json.loads``. Lazy keys are
+    present from the start, so ``len``, ``in`` and iteration are exact; reading a
+    value, ``items()``, ``json.dumps``, copying or pickling resolves it.
+    """
 
-        conn.commit()
-        return scan_id
+    __slots__ = ("_loaders",)
+
+    def __init__(self, values=None, loaders=None):
+        # Lazy keys already present in values keep their position
+        super().__init__(values or {})
+        self._loaders = dict(loaders or {})
+        for key in self._loaders:
+            dict.__setitem__(self, key, _PENDING)
+
+    def _resolve(self, key):
+        value = dict.__getitem__(self, key)
+        if value is _PENDING:
+            value = self._loaders.pop(key)()
+            dict.__setitem__(self, key, value)
+        return value
+
+    def _resolve_all(self):
+        for key in list(self._loaders):
+            if dict.__contains__(self, key):
+                self._resolve(key)
+        return self
+
+    def __getitem__(self, key):
+        return self._resolve(key)
+
+    def get(self, key, default=None):
+        return self._resolve(key) if dict.__contains__(self, key) else default
+
+    def __iter__(self):
+        # Overriding __iter__ makes dict(record) and {**record} go through
+        # keys()/__getitem__ instead of copying the raw placeholders.
+        return dict.__iter__(self)
+
+    def __reduce__(self):
+        return (dict, (dict(self.items()),))
+
+
+def _resolving(name):
+    method = getattr(dict, name)
+
+    def wrapper(self, *args, **kwargs):
+        return method(self._resolve_all(), *args, **kwargs)
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in ("items", "values", "copy", "pop", "popitem", "setdefault", "__repr__", "__eq__", "__ne__", "__or__"):
+    setattr(LazyRecord, _name, _resolving(_name))
+
+
+def _parse_json_object(text):
+    if not text:
+        return {}
+    try:
+        value = json.loads(text)
     except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
+        return {}
+    return value if isinstance(value, dict) else {}
+
+
+def _contributions_from_git_metrics(git_metrics):
+    commits_per_author = git_metrics.get("commits_per_author") or {}
+    files_changed_per_author = git_metrics.get("files_changed_per_author") or {}
+    return {
+        author: {
+            "commits": commits or 0,
+            "files": files_changed_per_author.get(author, []) or [],
+        }
+        for author, commits in commits_per_author.items()
+    }
+
+
+def _aggregate_author_counts(git_metrics_list):
+    commits_counter = Counter()
+    lines_counter = Counter()
+    for git_metrics in git_metrics_list:
+        for author, count in (git_metrics.get("commits_per_author") or {}).items():
+            if isinstance(count, int):
+                commits_counter[author] += count
+        for author, count in (git_metrics.get("lines_added_per_author") or {}).items():
+            if isinstance(count, int):
+                lines_counter[author] += count
+    return {
+        "commits_per_author": dict(commits_counter),
+        "lines_added_per_author": dict(lines_counter),
+    }
+
+
+# Every per-project key load_projects_for_generation can produce (project_name is always included)
+GENERATION_FIELDS = (
+    "project_path",
+    "languages",
+    "frameworks",
+    "skills",
+    "summary_text",
+    "summary_model",
+    "high_confidence_languages",
+    "medium_confidence_languages",
+    "low_confidence_languages",
+    "high_confidence_frameworks",
+    "medium_confidence_frameworks",
+    "low_confidence_frameworks",
+    "contributions",
+    "git_metrics",
+)
 
+_TECH_FIELDS = {
+    "languages",
+    "frameworks",
+    "high_confidence_languages",
+    "medium_confidence_languages",
+    "low_confidence_languages",
+    "high_confidence_frameworks",
+    "medium_confidence_frameworks",
+    "low_confidence_frameworks",
+}
 
-def load_projects_for_generation():
-    """Load project data from the DB in the same structure used by resume/portfolio generators."""
+
+def load_projects_for_generation(fields=None):
+    """Load project data from the DB in the same structure used by resume/portfolio generators.
+
+    - fields: optional iterable of keys from GENERATION_FIELDS to include; defaults to all.
+      Queries for fields that are not requested are skipped entirely.
+
+    Rows are fetched in a fixed number of queries regardless of project count, and
+    git_metrics / contributions are parsed lazily from JSON on first access.
+    Returns (projects, root_repo_jsons).
+    """
+    wanted = set(GENERATION_FIELDS if fields is None else fields)
     conn = get_connection()
     conn.row_factory = sqlite3.Row
     cur = conn.cursor()
@@ -408,144 +982,153 @@ def load_projects_for_generation():
         project_cols = {row['name'] for row in cur.fetchall()}
 
         select_cols = ["id", "name"]
-        if "project_path" in project_cols:
-            select_cols.append("project_path")
-        if "git_metrics_json" in project_cols:
-            select_cols.append("git_metrics_json")
-        if "tech_json" in project_cols:
-            select_cols.append("tech_json")
-        if "summary_text" in project_cols:
-            select_cols.append("summary_text")
-        if "summary_model" in project_cols:
-            select_cols.append("summary_model")
+        for col in ("project_path", "git_metrics_json", "tech_json", "summary_text", "summary_model"):
+            if col in project_cols:
+                select_cols.append(col)
 
         cur.execute(f"SELECT {', '.join(select_cols)} FROM projects ORDER BY name COLLATE NOCASE")
         project_rows = cur.fetchall()
 
-        projects = {}
-        commits_counter = Counter()
-        lines_counter = Counter()
-
-        for row in project_rows:
-            project_id = row["id"]
-            project_name = row["name"]
-            project_path = row["project_path"] if "project_path" in row.keys() else None
-
-            tech_summary = {}
-            if "tech_json" in row.keys() and row["tech_json"]:
-                try:
-                    tech_summary = json.loads(row["tech_json"])
-                except Exception:
-                    tech_summary = {}
-
-            git_metrics = None
-            if "git_metrics_json" in row.keys() and row["git_metrics_json"]:
-                try:
-                    git_metrics = json.loads(row["git_metrics_json"])
-                except Exception:
-                    git_metrics = None
-
-            # Skills (project-level)
+        # Skills (project-level), one query for every project
+        skills_by_project = {}
+        if "skills" in wanted:
             cur.execute(
                 """
-                SELECT s.name
+                SELECT ps.project_id, s.name
                 FROM project_skills ps
                 JOIN skills s ON s.id = ps.skill_id
-                WHERE ps.project_id = ?
                 ORDER BY s.name COLLATE NOCASE
-                """,
-                (project_id,),
+                """
             )
-            skills = [r["name"] for r in cur.fetchall()]
+            for r in cur.fetchall():
+                skills_by_project.setdefault(r["project_id"], []).append(r["name"])
+
+        tech_by_project = {}
+        if wanted & _TECH_FIELDS:
+            tech_by_project = {
+                row["id"]: _parse_json_object(row["tech_json"] if "tech_json" in row.keys() else None)
+                for row in project_rows
+            }
 
-            # Find latest scan_id for this project (pruning keeps only the newest)
+        def _git_text(row):
+            return row["git_metrics_json"] if "git_metrics_json" in row.keys() else None
+
+        # Latest scan per project (pruning keeps only the newest); only needed for the fallbacks
+        needs_language_fallback = [
+            row["id"] for row in project_rows
+            if "languages" in wanted
+            and not tech_by_project.get(row["id"], {}).get("languages")
+            and not tech_by_project.get(row["id"], {}).get("frameworks")
+        ]
+        needs_owner_fallback = [
+            row["id"] for row in project_rows
+            if "contributions" in wanted and not _git_text(row)
+        ]
+        latest_scan = {}
+        if needs_language_fallback or needs_owner_fallback:
             cur.execute(
-                "SELECT id FROM scans WHERE project = ? ORDER BY scanned_at DESC, id DESC LIMIT 1",
-                (project_name,),
+                """
+                SELECT p.id AS project_id,
+                       (SELECT s.id FROM scans s
+                        WHERE s.project_id = p.id
+                        ORDER BY s.scanned_at DESC, s.id DESC
+                        LIMIT 1) AS scan_id
+                FROM projects p
+                """
             )
-            scan_row = cur.fetchone()
-            scan_id = scan_row["id"] if scan_row else None
-
-            # Languages/frameworks (fallback to file_languages if tech summary missing)
-            languages = tech_summary.get("languages") or []
-            frameworks = tech_summary.get("frameworks") or []
-            if (not languages and not frameworks) and scan_id:
-                cur.execute(
-                    """
-                    SELECT DISTINCT l.name
-                    FROM file_languages fl
-                    JOIN languages l ON l.id = fl.language_id
-                    JOIN files f ON f.id = fl.file_id
-                    WHERE f.scan_id = ?
-                    ORDER BY l.name COLLATE NOCASE
-                    """,
-                    (scan_id,),
-                )
-                languages = [r["name"] for r in cur.fetchall()]
-
-            contributions = {}
-            if isinstance(git_metrics, dict):
-                commits_per_author = git_metrics.get("commits_per_author") or {}
-                files_changed_per_author = git_metrics.get("files_changed_per_author") or {}
-                lines_added_per_author = git_metrics.get("lines_added_per_author") or {}
-                for author, commits in commits_per_author.items():
-                    contributions[author] = {
-                        "commits": commits or 0,
-                        "files": files_changed_per_author.get(author, []) or [],
-                    }
-                for author, count in commits_per_author.items():
-                    if isinstance(count, int):
-                        commits_counter[author] += count
-                for author, count in lines_added_per_author.items():
-                    if isinstance(count, int):
-                        lines_counter[author] += count
-            elif scan_id:
-                # Fallback for non-git projects: build contributions from file ownership
-                cur.execute(
-                    """
-                    SELECT f.file_path, c.name
-                    FROM files f
-                    JOIN file_contributors fc ON fc.file_id = f.id
-                    JOIN contributors c ON c.id = fc.contributor_id
-                    WHERE f.scan_id = ?
-                    """,
-                    (scan_id,),
-                )
-                for row_fc in cur.fetchall():
-                    name = canonical_username(row_fc["name"])
-                    if not name:
-                        continue
-                    contributions.setdefault(name, {"commits": 0, "files": []})
-                    contributions[name]["files"].append(row_fc["file_path"])
-
-            projects[project_name] = {
-                "project_name": project_name,
-                "project_path": project_path,
-                "languages": languages,
-                "frameworks": frameworks,
-                "skills": skills,
-                "summary_text": row["summary_text"] if "summary_text" in row.keys() else None,
-                "summary_model": row["summary_model"] if "summary_model" in row.keys() else None,
-                "high_confidence_languages": tech_summary.get("high_confidence_languages", []),
-                "medium_confidence_languages": tech_summary.get("medium_confidence_languages", []),
-                "low_confidence_languages": tech_summary.get("low_confidence_languages", []),
-                "high_confidence_frameworks": tech_summary.get("high_confidence_frameworks", []),
-                "medium_confidence_frameworks": tech_summary.get("medium_confidence_frameworks", []),
-                "low_confidence_frameworks": tech_summary.get("low_confidence_frameworks", []),
-                "contributions": contributions,
-                "git_metrics": git_metrics or {},
-            }
+            latest_scan = {r["project_id"]: r["scan_id"] for r in cur.fetchall() if r["scan_id"]}
 
-        root_repo_jsons = {
-            "db_aggregate": {
-                "commits_per_author": dict(commits_counter),
-                "lines_added_per_author": dict(lines_counter),
-            }
-        }
-        return projects, root_repo_jsons
+        # Languages fallback to file_languages if the tech summary is missing
+        languages_by_scan = {}
+        fallback_scans = [latest_scan[pid] for pid in needs_language_fallback if pid in latest_scan]
+        if fallback_scans:
+            placeholders = ",".join("?" for _ in fallback_scans)
+            cur.execute(
+                f"""
+                SELECT DISTINCT f.scan_id, l.name
+                FROM file_languages fl
+                JOIN languages l ON l.id = fl.language_id
+                JOIN files f ON f.id = fl.file_id
+                WHERE f.scan_id IN ({placeholders})
+                ORDER BY l.name COLLATE NOCASE
+                """,
+                fallback_scans,
+            )
+            for r in cur.fetchall():
+                languages_by_scan.setdefault(r["scan_id"], []).append(r["name"])
+
+        # Fallback for non-git projects: build contributions from file ownership
+        owners_by_scan = {}
+        owner_scans = [latest_scan[pid] for pid in needs_owner_fallback if pid in latest_scan]
+        if owner_scans:
+            placeholders = ",".join("?" for _ in owner_scans)
+            cur.execute(
+                f"""
+                SELECT f.scan_id, f.file_path, c.name
+                FROM files_full f
+                JOIN file_contributors fc ON fc.file_id = f.id
+                JOIN contributors c ON c.id = fc.contributor_id
+                WHERE f.scan_id IN ({placeholders})
+                """,
+                owner_scans,
+            )
+            for r in cur.fetchall():
+                name = canonical_username(r["name"])
+                if not name:
+                    continue
+                contributions = owners_by_scan.setdefault(r["scan_id"], {})
+                contributions.setdefault(name, {"commits": 0, "files": []})
+                contributions[name]["files"].append(r["file_path"])
     finally:
         conn.close()
 
+    projects = {}
+    git_records = []
+    for row in project_rows:
+        project_id = row["id"]
+        project_name = row["name"]
+        tech_summary = tech_by_project.get(project_id, {})
+        git_text = _git_text(row)
+
+        # git_metrics_json is parsed at most once, on first read of git_metrics or contributions
+        git = LazyRecord({"metrics": None}, {"metrics": lambda text=git_text: _parse_json_object(text)})
+        loaders = {"git_metrics": lambda g=git: g["metrics"]}
+        if git_text:
+            git_records.append(git)
+            loaders["contributions"] = lambda g=git: _contributions_from_git_metrics(g["metrics"])
+
+        languages = tech_summary.get("languages") or []
+        if project_id in needs_language_fallback:
+            languages = languages_by_scan.get(latest_scan.get(project_id), [])
+
+        values = {
+            "project_name": project_name,
+            "project_path": row["project_path"] if "project_path" in row.keys() else None,
+            "languages": languages,
+            "frameworks": tech_summary.get("frameworks") or [],
+            "skills": skills_by_project.get(project_id, []),
+            "summary_text": row["summary_text"] if "summary_text" in row.keys() else None,
+            "summary_model": row["summary_model"] if "summary_model" in row.keys() else None,
+            "high_confidence_languages": tech_summary.get("high_confidence_languages", []),
+            "medium_confidence_languages": tech_summary.get("medium_confidence_languages", []),
+            "low_confidence_languages": tech_summary.get("low_confidence_languages", []),
+            "high_confidence_frameworks": tech_summary.get("high_confidence_frameworks", []),
+            "medium_confidence_frameworks": tech_summary.get("medium_confidence_frameworks", []),
+            "low_confidence_frameworks": tech_summary.get("low_confidence_frameworks", []),
+            "contributions": owners_by_scan.get(latest_scan.get(project_id), {}),
+            "git_metrics": None,
+        }
+        projects[project_name] = LazyRecord(
+            {k: v for k, v in values.items() if k == "project_name" or k in wanted},
+            {k: loader for k, loader in loaders.items() if k in wanted},
+        )
+
+    root_repo_jsons = LazyRecord(
+        {"db_aggregate": None},
+        {"db_aggregate": lambda: _aggregate_author_counts([g["metrics"] for g in git_records])},
+    )
+    return projects, root_repo_jsons
+
 
 def save_resume(username: str, resume_path: str, metadata: dict = None, generated_at: str = None):
     """Persist a generated resume into the DB.
@@ -567,6 +1150,9 @@ def save_resume(username: str, resume_path: str, metadata: dict = None, generate
         cur.execute('BEGIN')
         # Ensure contributor exists for this username
         cur.execute("INSERT OR IGNORE INTO contributors (name) VALUES (?)", (username,))
+        if cur.rowcount:
+            # A new contributor changes the dashboard's contributor count
+            refresh_global_stats(conn)
         cur.execute("SELECT id FROM contributors WHERE name = ?", (username,))
         contrib_row = cur.fetchone()
         contrib_id = contrib_row['id'] if contrib_row else None
@@ -583,6 +1169,7 @@ def save_resume(username: str, resume_path: str, metadata: dict = None, generate
         )
         resume_id = cur.lastrowid
         conn.commit()
+        change_feed.publish("resumes", conn, action="created", resume_id=resume_id)
         return resume_id
     except Exception:
         conn.rollback()
@@ -619,6 +1206,9 @@ def save_portfolio(
     try:
         cur.execute('BEGIN')
         cur.execute("INSERT OR IGNORE INTO contributors (name) VALUES (?)", (username,))
+        if cur.rowcount:
+            # A new contributor changes the dashboard's contributor count
+            refresh_global_stats(conn)
         cur.execute("SELECT id FROM contributors WHERE name = ?", (username,))
         contrib_row = cur.fetchone()
         contrib_id = contrib_row['id'] if contrib_row else None
@@ -644,6 +1234,7 @@ def save_portfolio(
         )
         portfolio_id = cur.lastrowid
         conn.commit()
+        change_feed.publish("portfolios", conn, action="created", portfolio_id=portfolio_id)
         return portfolio_id
     except Exception:
         conn.rollback()
@@ -652,18 +1243,45 @@ def save_portfolio(
         conn.close()
 
 
-def list_all_portfolios() -> list:
-    """Return all saved (non-temp) portfolios across every contributor, newest first"""
+def list_all_portfolios(
+    username: str = None,
+    since: str = None,
+    until: str = None,
+    after: list = None,
+    limit: int = None,
+) -> list:
+    """Return saved (non-temp) portfolios across every contributor, newest first.
+
+    Optional filters: username, a created_at range (since/until, inclusive) and
+    a keyset position `after` = [created_at, id] of the last row already seen.
+    """
+    clauses = ["portfolio_name NOT LIKE '__temp__%'"]
+    params = []
+    if username:
+        clauses.append("username = ?")
+        params.append(username)
+    if since:
+        clauses.append("created_at >= ?")
+        params.append(since)
+    if until:
+        clauses.append("created_at <= ?")
+        params.append(until)
+    if after:
+        clause, after_params = newer_first_after("created_at", "id", after)
+        clauses.append(clause)
+        params.extend(after_params)
+    sql = f"""
+        SELECT id, username, portfolio_name, display_name,
+               included_project_ids, featured_project_ids, created_at
+        FROM portfolios
+        WHERE {' AND '.join(clauses)}
+        ORDER BY created_at DESC, id DESC
+    """
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
     with get_connection() as conn:
-        rows = conn.execute(
-            """
-            SELECT id, username, portfolio_name, display_name,
-                   included_project_ids, featured_project_ids, created_at
-            FROM portfolios
-            WHERE portfolio_name NOT LIKE '__temp__%'
-            ORDER BY created_at DESC
-            """,
-        ).fetchall()
+        rows = conn.execute(sql, params).fetchall()
     result = []
     for row in rows:
         result.append({
@@ -715,9 +1333,12 @@ def rename_portfolio(portfolio_id: int, portfolio_name: str) -> bool:
             (portfolio_name, portfolio_id),
         )
         conn.commit()
-        return conn.execute(
+        renamed = conn.execute(
             "SELECT changes()"
         ).fetchone()[0] > 0
+        if renamed:
+            change_feed.publish("portfolios", conn, action="updated", portfolio_id=portfolio_id)
+        return renamed
 
 
 def update_portfolio(
@@ -751,7 +1372,10 @@ def update_portfolio(
             ),
         )
         conn.commit()
-        return conn.execute("SELECT changes()").fetchone()[0] > 0
+        updated = conn.execute("SELECT changes()").fetchone()[0] > 0
+        if updated:
+            change_feed.publish("portfolios", conn, action="updated", portfolio_id=portfolio_id)
+        return updated
 
 
 def delete_portfolio(portfolio_id: int):
@@ -772,6 +1396,8 @@ def delete_portfolio(portfolio_id: int):
         cur.execute("DELETE FROM portfolios WHERE id = ?", (portfolio_id,))
         deleted = cur.rowcount > 0
         conn.commit()
+        if deleted:
+            change_feed.publish("portfolios", conn, action="deleted", portfolio_id=portfolio_id)
         return deleted
     except Exception:
         conn.rollback()
@@ -782,15 +1408,20 @@ def delete_portfolio(portfolio_id: int):
 def clear_database():
     """
     Deletes ALL data from every table (schema remains).
+    The materialized stats tables are emptied too; they are rebuilt on the next read.
     """
     conn = get_connection()
     cur = conn.cursor()
 
     cur.execute("PRAGMA foreign_keys = OFF;")
 
+    # The FTS5 table and its shadow tables are emptied through the
+    # search_documents triggers, never directly. data_version keeps counting
+    # (the deletes bump it) so cached responses are not served afterwards.
     tables = cur.execute("""
         SELECT name FROM sqlite_master
-        WHERE type='table' AND name NOT LIKE 'sqlite_%';
+        WHERE type='table' AND name NOT LIKE 'sqlite_%' AND name NOT LIKE 'search_index%'
+          AND name != 'data_version';
     """).fetchall()
 
     for (table,) in tables:
@@ -801,6 +1432,8 @@ def clear_database():
 
     cur.execute("PRAGMA foreign_keys = ON;")
     conn.commit()
+    read_model.note_write(conn)
+    change_feed.publish("database", conn, action="cleared")
     conn.close()
 
     _clear_output_directory()
@@ -813,14 +1446,14 @@ def delete_project_by_id(project_id):
     cur = conn.cursor()
 
     try:
-        # Find project name (used by scans table)
-        cur.execute("SELECT name FROM projects WHERE id = ?", (project_id,))
+        cur.execute("SELECT id FROM projects WHERE id = ?", (project_id,))
         row = cur.fetchone()
         if not row:
             print("Project not found.")
             return False  # return False if project doesn't exist
 
-        project_name = row["name"]
+        cur.execute('BEGIN')
+        before = data_version(conn)
 
         # --- DELETE IN DEPENDENCY ORDER ---
 
@@ -830,26 +1463,26 @@ def delete_project_by_id(project_id):
             WHERE file_id IN (
                 SELECT f.id FROM files f
                 JOIN scans s ON f.scan_id = s.id
-                WHERE s.project = ?
+                WHERE s.project_id = ?
             )
-        """, (project_name,))
+        """, (project_id,))
 
         cur.execute("""
             DELETE FROM file_languages
             WHERE file_id IN (
                 SELECT f.id FROM files f
                 JOIN scans s ON f.scan_id = s.id
-                WHERE s.project = ?
+                WHERE s.project_id = ?
             )
-        """, (project_name,))
+        """, (project_id,))
 
         # Files
         cur.execute("""
             DELETE FROM files
             WHERE scan_id IN (
-                SELECT id FROM scans WHERE project = ?
+                SELECT id FROM scans WHERE project_id = ?
             )
-        """, (project_name,))
+        """, (project_id,))
 
         # Project skills
         cur.execute("""
@@ -863,11 +1496,41 @@ def delete_project_by_id(project_id):
             WHERE project_id = ?
         """, (project_id,))
 
+        # Materialized stats
+        cur.execute("""
+            DELETE FROM project_stats
+            WHERE project_id = ?
+        """, (project_id,))
+        cur.execute("""
+            DELETE FROM importance_scores
+            WHERE project_id = ?
+        """, (project_id,))
+        cur.execute("""
+            DELETE FROM project_importance
+            WHERE project_id = ?
+        """, (project_id,))
+        cur.execute("""
+            DELETE FROM project_contributor_roles
+            WHERE project_id = ?
+        """, (project_id,))
+        cur.execute("""
+            DELETE FROM commits
+            WHERE project_id = ?
+        """, (project_id,))
+        cur.execute("""
+            DELETE FROM search_documents
+            WHERE project_id = ?
+        """, (project_id,))
+        cur.execute("""
+            DELETE FROM scan_history
+            WHERE project_id = ?
+        """, (project_id,))
+
         # Scans
         cur.execute("""
             DELETE FROM scans
-            WHERE project = ?
-        """, (project_name,))
+            WHERE project_id = ?
+        """, (project_id,))
 
         # Finally: project
         cur.execute("""
@@ -875,25 +1538,16 @@ def delete_project_by_id(project_id):
             WHERE id = ?
         """, (project_id,))
 
-        # Remove orphaned contributors no longer linked to any files
-        cur.execute("""
-            DELETE FROM contributors
-            WHERE id NOT IN (
-                SELECT DISTINCT contributor_id
-                FROM file_contributors
-            )
-        """)
+        # Orphaned contributors/languages are removed by the background
+        # maintenance pass (db_maintenance.collect_orphans), not inline.
+        request_maintenance(conn, "project deleted")
+
+        refresh_global_stats(conn)
+        after = data_version(conn)
 
-        # Cleanup orphaned languages no longer linked to any files.
-        cur.execute("""
-            DELETE FROM languages
-            WHERE id NOT IN (
-                SELECT DISTINCT language_id
-                FROM file_languages
-            )
-        """)       
-    
         conn.commit()
+        read_model.note_write(conn, [project_id], (before, after))
+        change_feed.publish("projects", conn, action="deleted", project_id=project_id)
         return True
 
     except Exception as e:
@@ -928,7 +1582,11 @@ def _clear_output_directory():
 def _ensure_schema(conn):
     """Ensure the database schema exists and matches init_db.sql (non-destructive)."""
     cur = conn.cursor()
-    
+
+    # Only takes effect for a brand-new file; older databases are converted on
+    # request (POST /database/maintenance?full_vacuum=true, see db_maintenance).
+    cur.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
     # --- Core tables ---
     cur.execute("PRAGMA foreign_keys = ON")
 
@@ -938,7 +1596,10 @@ def _ensure_schema(conn):
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             scanned_at TEXT DEFAULT CURRENT_TIMESTAMP,
             project TEXT,
-            notes TEXT
+            notes TEXT,
+            project_id INTEGER,
+            root_path TEXT,
+            FOREIGN KEY (project_id) REFERENCES projects(id)
         )
     """)
 
@@ -972,7 +1633,18 @@ def _ensure_schema(conn):
             modified_at TEXT,
             owner TEXT,
             metadata_json TEXT,
-            FOREIGN KEY (scan_id) REFERENCES scans(id)
+            dir_id INTEGER,
+            category TEXT,
+            FOREIGN KEY (scan_id) REFERENCES scans(id),
+            FOREIGN KEY (dir_id) REFERENCES path_dirs(id)
+        )
+    """)
+
+    # Interned directory paths, relative to scans.root_path (see _split_scan_paths)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS path_dirs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path TEXT NOT NULL UNIQUE
         )
     """)
 
@@ -1074,6 +1746,7 @@ def _ensure_schema(conn):
             resume_path TEXT NOT NULL,
             metadata_json TEXT,
             generated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            llm_used INTEGER NOT NULL DEFAULT 0,
             FOREIGN KEY (contributor_id) REFERENCES contributors(id)
         )
     """)
@@ -1092,26 +1765,193 @@ def _ensure_schema(conn):
         )
     """)
 
+    # --- Materialized aggregates (maintained by save_scan / delete_project_by_id / clear_database) ---
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS project_stats (
+            project_id INTEGER PRIMARY KEY,
+            scan_count INTEGER NOT NULL DEFAULT 0,
+            file_count INTEGER NOT NULL DEFAULT 0,
+            extensions_json TEXT NOT NULL DEFAULT '{}',
+            categories_json TEXT NOT NULL DEFAULT '{}',
+            contributor_count INTEGER NOT NULL DEFAULT 0,
+            top_contributor TEXT,
+            top_contributor_files INTEGER NOT NULL DEFAULT 0,
+            latest_scan_at TEXT,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        )
+    """)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS global_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            project_count INTEGER NOT NULL DEFAULT 0,
+            scan_count INTEGER NOT NULL DEFAULT 0,
+            file_count INTEGER NOT NULL DEFAULT 0,
+            contributor_count INTEGER NOT NULL DEFAULT 0,
+            top_contributor TEXT,
+            top_contributor_files INTEGER NOT NULL DEFAULT 0,
+            latest_scan_at TEXT,
+            latest_project TEXT,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Contributor x project importance matrix (see db_stats.refresh_importance_scores)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS importance_scores (
+            project_id INTEGER NOT NULL,
+            contributor TEXT NOT NULL,
+            contrib_files INTEGER NOT NULL DEFAULT 0,
+            total_files INTEGER NOT NULL DEFAULT 0,
+            contributors_count INTEGER NOT NULL DEFAULT 0,
+            score REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (project_id, contributor),
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        )
+    """)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS project_importance (
+            project_id INTEGER PRIMARY KEY,
+            total_files INTEGER NOT NULL DEFAULT 0,
+            contributors_count INTEGER NOT NULL DEFAULT 0,
+            top_contributor TEXT,
+            top_contrib_files INTEGER NOT NULL DEFAULT 0,
+            top_fraction REAL NOT NULL DEFAULT 0,
+            top_score REAL NOT NULL DEFAULT 0,
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        )
+    """)
+
+    # Contributor roles inferred at scan time (see detect_roles.save_project_roles)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS project_contributor_roles (
+            project_id INTEGER NOT NULL,
+            contributor TEXT NOT NULL,
+            position INTEGER NOT NULL DEFAULT 0,
+            primary_role TEXT,
+            confidence REAL,
+            role_json TEXT NOT NULL,
+            PRIMARY KEY (project_id, contributor),
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        )
+    """)
+
+    # One row per commit, collected by contrib_metrics.analyze_repo (see db_commits)
+    cur.execute(_COMMITS_SQL)
+
+    # Full-text search: one document per searchable text (see db_search), indexed
+    # by an external-content FTS5 table that the triggers keep in sync.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS search_documents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            ref_id INTEGER,
+            content TEXT NOT NULL,
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        )
+    """)
+    cur.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+            content,
+            content='search_documents',
+            content_rowid='id',
+            prefix='2 3'
+        )
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN
+            INSERT INTO search_index (rowid, content) VALUES (new.id, new.content);
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN
+            INSERT INTO search_index (search_index, rowid, content) VALUES ('delete', old.id, old.content);
+        END
+    """)
+
+    # Scans superseded by a newer scan of the same project, stored as deltas
+    # against their successor (see db_history)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS scan_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            scan_id INTEGER,
+            scanned_at TEXT,
+            notes TEXT,
+            file_count INTEGER NOT NULL DEFAULT 0,
+            total_size INTEGER NOT NULL DEFAULT 0,
+            contributor_count INTEGER NOT NULL DEFAULT 0,
+            delta_json TEXT NOT NULL,
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        )
+    """)
+
+    # Single-row bookkeeping for db_maintenance (pending flag + last report)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS maintenance_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            pending INTEGER NOT NULL DEFAULT 0,
+            pending_reason TEXT,
+            requested_at TEXT,
+            last_run_at TEXT,
+            last_report_json TEXT,
+            last_error TEXT,
+            last_error_at TEXT
+        )
+    """)
+    _ensure_table_column(conn, "maintenance_state", "last_error", "TEXT")
+    _ensure_table_column(conn, "maintenance_state", "last_error_at", "TEXT")
+
     # Upgrade legacy generated-output tables in-place when users already have older DBs.
     _ensure_table_column(conn, "resumes", "metadata_json", "TEXT")
     _ensure_table_column(conn, "resumes", "generated_at", "TEXT DEFAULT CURRENT_TIMESTAMP")
     _ensure_table_column(conn, "portfolios", "portfolio_path", "TEXT")
     _ensure_table_column(conn, "portfolios", "metadata_json", "TEXT")
     _ensure_table_column(conn, "portfolios", "generated_at", "TEXT DEFAULT CURRENT_TIMESTAMP")
+    _ensure_table_column(conn, "project_stats", "categories_json", "TEXT NOT NULL DEFAULT '{}'")
+    _ensure_scans_project_link(conn)
+    _ensure_file_facts(conn)
+    _ensure_compact_paths(conn)
+    _ensure_resume_llm_flag(conn)
+    _ensure_commit_authors(conn)
+    ensure_data_version(conn)
 
     # --- Indexes ---
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_file_path ON files (file_path)")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_file_name ON files (file_name)")
+    # files.file_path / file_name were indexed but never looked up by value
+    cur.execute("DROP INDEX IF EXISTS idx_file_path")
+    cur.execute("DROP INDEX IF EXISTS idx_file_name")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_files_dir_id ON files (dir_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_files_scan_category ON files (scan_id, category)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_files_scan_id ON files (scan_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_files_scan_extension ON files (scan_id, file_extension)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_scans_project_id ON scans (project_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_scans_project ON scans (project)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_scans_scanned_at ON scans (scanned_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_file_contributors_contributor_id ON file_contributors (contributor_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_file_languages_language_id ON file_languages (language_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_project_skills_skill_id ON project_skills (skill_id)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_projects_name ON projects (name)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_contributors_name ON contributors (name)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_languages_name ON languages (name)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_skills_name ON skills (name)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_resumes_username ON resumes (username)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_resumes_generated_at ON resumes (generated_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_resumes_username_generated ON resumes (username, generated_at)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_portfolios_username ON portfolios (username)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_portfolios_created_at ON portfolios (created_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_resumes_contributor_id ON resumes (contributor_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_portfolios_contributor_id ON portfolios (contributor_id)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_project_evidence_project_id ON project_evidence (project_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_project_evidence_project_created ON project_evidence (project_id, created_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_importance_scores_contributor ON importance_scores (contributor, score DESC)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_project_importance_score ON project_importance (top_score DESC)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_commits_project_author_time ON commits (project_id, author, committed_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_commits_project_time ON commits (project_id, committed_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_search_documents_project_kind ON search_documents (project_id, kind)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_scan_history_project ON scan_history (project_id, scanned_at)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_custom_rankings_name ON custom_rankings (name)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_custom_ranking_items_rank ON custom_ranking_items (ranking_id)")
 
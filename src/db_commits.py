@@ -0,0 +1,135 @@
+# src/db_commits.py
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional
+
+from contrib_metrics import canonical_username
+
+
+# SQL bucket expressions over commits.committed_at; weeks start on Monday,
+# matching the ISO week keys analyze_repo() uses for commits_per_week.
+PERIOD_EXPRESSIONS = {
+    "day": "date(c.committed_at)",
+    "week": "date(c.committed_at, '-' || ((CAST(strftime('%w', c.committed_at) AS INTEGER) + 6) % 7) || ' days')",
+    "month": "strftime('%Y-%m', c.committed_at)",
+}
+
+
+def replace_project_commits(conn: sqlite3.Connection, project_id: int, commit_log: Iterable) -> int:
+    """
+    Replace the commits rows of one project with commit_log, the per-commit rows
+    collected by analyze_repo() (see contrib_metrics.RepoMetrics). Authors are
+    stored by canonical username; no contributors rows are created for them.
+    Does not commit; returns the number of rows written.
+    """
+    if project_id is None:
+        return 0
+
+    cur = conn.cursor()
+    cur.execute("DELETE FROM commits WHERE project_id = ?", (project_id,))
+
+    rows = [
+        (project_id, canonical_username(author or ""), committed_at, files_changed or 0, lines_added or 0, lines_removed or 0)
+        for committed_at, author, files_changed, lines_added, lines_removed in commit_log
+    ]
+    cur.executemany(
+        """
+        INSERT INTO commits (project_id, author, committed_at, files_changed, lines_added, lines_removed)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    return len(rows)
+
+
+def has_project_commits(conn: sqlite3.Connection, project_id: int) -> bool:
+    row = conn.execute("SELECT 1 FROM commits WHERE project_id = ? LIMIT 1", (project_id,)).fetchone()
+    return row is not None
+
+
+def commit_activity(
+    conn: sqlite3.Connection,
+    project_id: int,
+    granularity: str,
+    author: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Commit counts per period for one project, optionally for a single author
+    (matched by canonical username) and within [start, end] dates (inclusive).
+    Returns [{"period", "value"}] ordered by period.
+    """
+    period_expr = PERIOD_EXPRESSIONS[granularity]
+    where = ["c.project_id = ?"]
+    params: List[Any] = [project_id]
+    if author is not None:
+        where.append("c.author = ?")
+        params.append(canonical_username(author))
+    if start:
+        where.append("c.committed_at >= ?")
+        params.append(start)
+    if end:
+        # Dates compare as prefixes, so extend the bound to the end of that day
+        where.append("c.committed_at < date(?, '+1 day')")
+        params.append(end)
+
+    rows = conn.execute(
+        f"""
+        SELECT {period_expr} AS period, COUNT(*) AS value
+        FROM commits c
+        WHERE {' AND '.join(where)}
+        GROUP BY period
+        ORDER BY period ASC
+        """,
+        params,
+    ).fetchall()
+    return [{"period": row[0], "value": int(row[1] or 0)} for row in rows]
+
+
+def projects_with_commits(conn: sqlite3.Connection, project_ids: Iterable[int]) -> set:
+    """The ids among project_ids that have commits rows (one query for all of them)."""
+    project_ids = list(project_ids)
+    if not project_ids:
+        return set()
+    placeholders = ",".join("?" for _ in project_ids)
+    rows = conn.execute(
+        f"SELECT DISTINCT project_id FROM commits WHERE project_id IN ({placeholders})",
+        project_ids,
+    ).fetchall()
+    return {row[0] for row in rows}
+
+
+def commit_activity_by_project(
+    conn: sqlite3.Connection,
+    project_ids: Iterable[int],
+    granularity: str,
+    author: Optional[str] = None,
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    commit_activity() for several projects in one query, as
+    {project_id: [{"period", "value"}]}. Projects without matching commits
+    are absent.
+    """
+    project_ids = list(project_ids)
+    if not project_ids:
+        return {}
+    period_expr = PERIOD_EXPRESSIONS[granularity]
+    where = [f"c.project_id IN ({','.join('?' for _ in project_ids)})"]
+    params: List[Any] = list(project_ids)
+    if author is not None:
+        where.append("c.author = ?")
+        params.append(canonical_username(author))
+
+    activity: Dict[int, List[Dict[str, Any]]] = {}
+    for row in conn.execute(
+        f"""
+        SELECT c.project_id, {period_expr} AS period, COUNT(*) AS value
+        FROM commits c
+        WHERE {' AND '.join(where)}
+        GROUP BY c.project_id, period
+        ORDER BY c.project_id, period ASC
+        """,
+        params,
+    ):
+        activity.setdefault(row[0], []).append({"period": row[1], "value": int(row[2] or 0)})
+    return activity
@@ -0,0 +1,352 @@
+# src/db_history.py
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+# Scans older than a project's live scan are kept in scan_history as reverse
+# deltas: each row records how that scan differed from the next newer one (a
+# later history row, or the live scan in scans/files). Walking the chain back
+# from the live snapshot rebuilds any retained scan; file_count, total_size and
+# contributor_count are stored per row so growth series need no rebuild.
+
+DEFAULT_KEEP_SCANS = 10
+DEFAULT_MAX_AGE_DAYS = None
+
+# Per-file values compared between scans; the file path is the key
+FILE_FIELDS = ("size", "modified_at", "owner", "category", "extension", "languages", "contributors")
+
+
+def load_retention_policy() -> Dict[str, Optional[int]]:
+    """
+    Read the history retention policy from the user config: scan_history_keep
+    (number of older scans kept per project, 0 disables history) and
+    scan_history_max_age_days (drop older scans past this age; None keeps all).
+    """
+    try:
+        from config import load_config
+        config = load_config()
+    except Exception:
+        config = {}
+    keep = config.get("scan_history_keep", DEFAULT_KEEP_SCANS)
+    max_age = config.get("scan_history_max_age_days", DEFAULT_MAX_AGE_DAYS)
+    return {
+        "keep": max(0, int(keep)) if keep is not None else None,
+        "max_age_days": max(0, int(max_age)) if max_age is not None else None,
+    }
+
+
+def snapshot_scan(conn: sqlite3.Connection, scan_id: int) -> Dict[str, Dict[str, Any]]:
+    """Return {file_path: {field: value}} for the files of one live scan."""
+    files: Dict[str, Dict[str, Any]] = {}
+    by_id: Dict[int, Dict[str, Any]] = {}
+    for row in conn.execute(
+        """
+        SELECT id, file_path, file_size, modified_at, owner, category, file_extension
+        FROM files_full
+        WHERE scan_id = ?
+        """,
+        (scan_id,),
+    ):
+        entry = {
+            "size": row[2],
+            "modified_at": row[3],
+            "owner": row[4],
+            "category": row[5],
+            "extension": row[6],
+            "languages": [],
+            "contributors": [],
+        }
+        files[row[1]] = entry
+        by_id[row[0]] = entry
+
+    for field, sql in (
+        ("languages", """
+            SELECT fl.file_id, l.name FROM files f
+            JOIN file_languages fl ON fl.file_id = f.id
+            JOIN languages l ON l.id = fl.language_id
+            WHERE f.scan_id = ?
+        """),
+        ("contributors", """
+            SELECT fc.file_id, c.name FROM files f
+            JOIN file_contributors fc ON fc.file_id = f.id
+            JOIN contributors c ON c.id = fc.contributor_id
+            WHERE f.scan_id = ?
+        """),
+    ):
+        for file_id, name in conn.execute(sql, (scan_id,)):
+            if file_id in by_id:
+                by_id[file_id][field].append(name)
+    for entry in files.values():
+        entry["languages"].sort()
+        entry["contributors"].sort()
+    return files
+
+
+def project_state(conn: sqlite3.Connection, project_id: int) -> Dict[str, Any]:
+    """Project-level values tracked in history: the tech summary and skill names."""
+    row = conn.execute("SELECT tech_json FROM projects WHERE id = ?", (project_id,)).fetchone()
+    try:
+        tech = json.loads(row[0]) if row and row[0] else None
+    except (TypeError, ValueError):
+        tech = None
+    skills = sorted(
+        r[0]
+        for r in conn.execute(
+            "SELECT sk.name FROM project_skills ps JOIN skills sk ON sk.id = ps.skill_id WHERE ps.project_id = ?",
+            (project_id,),
+        )
+    )
+    return {"tech": tech, "skills": skills}
+
+
+def diff_snapshots(older: Dict[str, Dict[str, Any]], newer: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Delta that turns newer back into older: files only in older ("added"),
+    files only in newer ("removed") and files whose values differ ("changed",
+    holding the older values).
+    """
+    return {
+        "added": {path: entry for path, entry in older.items() if path not in newer},
+        "removed": sorted(path for path in newer if path not in older),
+        "changed": {
+            path: entry for path, entry in older.items()
+            if path in newer and any(entry.get(f) != newer[path].get(f) for f in FILE_FIELDS)
+        },
+    }
+
+
+def apply_delta(snapshot: Dict[str, Dict[str, Any]], delta: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Apply a diff_snapshots() delta to a newer snapshot, returning the older one."""
+    older = {path: entry for path, entry in snapshot.items() if path not in set(delta.get("removed", ()))}
+    older.update(delta.get("changed", {}))
+    older.update(delta.get("added", {}))
+    return older
+
+
+def record_superseded_scans(
+    conn: sqlite3.Connection,
+    project_id: int,
+    new_scan_id: int,
+    old_scan_ids: List[int],
+    old_state: Dict[str, Any],
+) -> int:
+    """
+    Store the live scans old_scan_ids of a project as deltas before they are
+    pruned in favour of new_scan_id. old_state is the project state captured
+    before the new scan updated it. Does not commit; returns rows written.
+    """
+    if not old_scan_ids:
+        return 0
+    newer = snapshot_scan(conn, new_scan_id)
+    new_state = project_state(conn, project_id)
+    rows = []
+    # Walk newest first so each delta is taken against its successor, then
+    # insert oldest first so history ids grow with scan age like scan ids do
+    for old_scan_id in sorted(old_scan_ids, reverse=True):
+        scan = conn.execute("SELECT scanned_at, notes FROM scans WHERE id = ?", (old_scan_id,)).fetchone()
+        older = snapshot_scan(conn, old_scan_id)
+        delta = diff_snapshots(older, newer)
+        project_delta = {key: old_state.get(key) for key in ("tech", "skills") if old_state.get(key) != new_state.get(key)}
+        if project_delta:
+            delta["project"] = project_delta
+        contributors = {name for entry in older.values() for name in entry["contributors"]}
+        rows.append((
+            project_id,
+            old_scan_id,
+            scan[0] if scan else None,
+            scan[1] if scan else None,
+            len(older),
+            sum(entry["size"] or 0 for entry in older.values()),
+            len(contributors),
+            json.dumps(delta, separators=(",", ":"), default=str),
+        ))
+        # the project state before any earlier scan is unknown; stop tracking it
+        newer, new_state = older, old_state
+
+    conn.executemany(
+        """
+        INSERT INTO scan_history
+            (project_id, scan_id, scanned_at, notes, file_count, total_size, contributor_count, delta_json)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        reversed(rows),
+    )
+    return len(rows)
+
+
+def apply_retention(
+    conn: sqlite3.Connection,
+    project_id: int,
+    keep: Optional[int] = DEFAULT_KEEP_SCANS,
+    max_age_days: Optional[int] = DEFAULT_MAX_AGE_DAYS,
+) -> int:
+    """
+    Drop the oldest history rows of a project beyond keep, and any older than
+    max_age_days. Only the oldest end of a chain is ever removed, so every
+    retained scan stays reconstructible. Does not commit; returns rows deleted.
+    """
+    removed = 0
+    if max_age_days is not None:
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=max_age_days)).strftime("%Y-%m-%d %H:%M:%S")
+        removed += conn.execute(
+            "DELETE FROM scan_history WHERE project_id = ? AND scanned_at < ?",
+            (project_id, cutoff),
+        ).rowcount
+    if keep is not None:
+        removed += conn.execute(
+            """
+            DELETE FROM scan_history
+            WHERE project_id = ?
+              AND id NOT IN (
+                  SELECT id FROM scan_history WHERE project_id = ? ORDER BY id DESC LIMIT ?
+              )
+            """,
+            (project_id, project_id, keep),
+        ).rowcount
+    return removed
+
+
+def _live_scan(conn: sqlite3.Connection, project_id: int):
+    return conn.execute(
+        "SELECT id, scanned_at, notes FROM scans WHERE project_id = ? ORDER BY id DESC LIMIT 1",
+        (project_id,),
+    ).fetchone()
+
+
+def reconstruct_scan(conn: sqlite3.Connection, project_id: int, history_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild a retained historical scan of a project by applying the deltas
+    from the live scan back to history_id. Returns None if it is not retained.
+    """
+    target = conn.execute(
+        "SELECT id, scan_id, scanned_at, notes FROM scan_history WHERE id = ? AND project_id = ?",
+        (history_id, project_id),
+    ).fetchone()
+    live = _live_scan(conn, project_id)
+    if not target or not live:
+        return None
+
+    files = snapshot_scan(conn, live[0])
+    state = project_state(conn, project_id)
+    for (delta_json,) in conn.execute(
+        "SELECT delta_json FROM scan_history WHERE project_id = ? AND id >= ? ORDER BY id DESC",
+        (project_id, history_id),
+    ).fetchall():
+        delta = json.loads(delta_json)
+        files = apply_delta(files, delta)
+        state.update(delta.get("project", {}))
+
+    return {
+        "history_id": target[0],
+        "scan_id": target[1],
+        "project_id": project_id,
+        "scanned_at": target[2],
+        "notes": target[3],
+        "tech": state["tech"],
+        "skills": state["skills"],
+        "files": [{"file_path": path, **files[path]} for path in sorted(files)],
+    }
+
+
+def history_series(conn: sqlite3.Connection, project_id: int) -> List[Dict[str, Any]]:
+    """
+    Growth over time for one project, oldest first: one point per retained
+    historical scan (from its stored counts) followed by the live scan.
+    """
+    series = [
+        {
+            "history_id": row[0],
+            "scan_id": row[1],
+            "scanned_at": row[2],
+            "notes": row[3],
+            "file_count": row[4],
+            "total_size": row[5],
+            "contributor_count": row[6],
+        }
+        for row in conn.execute(
+            """
+            SELECT id, scan_id, scanned_at, notes, file_count, total_size, contributor_count
+            FROM scan_history
+            WHERE project_id = ?
+            ORDER BY id ASC
+            """,
+            (project_id,),
+        )
+    ]
+    live = _live_scan(conn, project_id)
+    if live:
+        counts = conn.execute(
+            """
+            SELECT COUNT(*), COALESCE(SUM(f.file_size), 0),
+                   (SELECT COUNT(DISTINCT fc.contributor_id) FROM files f2
+                    JOIN file_contributors fc ON fc.file_id = f2.id WHERE f2.scan_id = ?)
+            FROM files f
+            WHERE f.scan_id = ?
+            """,
+            (live[0], live[0]),
+        ).fetchone()
+        series.append({
+            "history_id": None,
+            "scan_id": live[0],
+            "scanned_at": live[1],
+            "notes": live[2],
+            "file_count": counts[0],
+            "total_size": counts[1],
+            "contributor_count": counts[2],
+        })
+    return series
+
+
+def history_activity(
+    conn: sqlite3.Connection,
+    project_ids: Iterable[int],
+    period_expr: str,
+    metric: str,
+) -> Dict[str, int]:
+    """
+    Heatmap values contributed by retained history, as {period: value}.
+    period_expr is written over s.scanned_at; metric is "scans" (one per
+    historical scan) or "files" (its file count).
+    """
+    project_ids = list(project_ids)
+    if not project_ids:
+        return {}
+    value_expr = "COUNT(*)" if metric == "scans" else "SUM(s.file_count)"
+    placeholders = ",".join("?" for _ in project_ids)
+    rows = conn.execute(
+        f"""
+        SELECT {period_expr} AS period, {value_expr} AS value
+        FROM scan_history s
+        WHERE s.project_id IN ({placeholders})
+        GROUP BY period
+        """,
+        project_ids,
+    ).fetchall()
+    return {row[0]: int(row[1] or 0) for row in rows}
+
+
+def history_activity_by_project(
+    conn: sqlite3.Connection,
+    project_ids: Iterable[int],
+    period_expr: str,
+    metric: str,
+) -> Dict[int, Dict[str, int]]:
+    """history_activity() kept apart per project, as {project_id: {period: value}}."""
+    project_ids = list(project_ids)
+    if not project_ids:
+        return {}
+    value_expr = "COUNT(*)" if metric == "scans" else "SUM(s.file_count)"
+    placeholders = ",".join("?" for _ in project_ids)
+    activity: Dict[int, Dict[str, int]] = {}
+    for row in conn.execute(
+        f"""
+        SELECT s.project_id, {period_expr} AS period, {value_expr} AS value
+        FROM scan_history s
+        WHERE s.project_id IN ({placeholders})
+        GROUP BY s.project_id, period
+        """,
+        project_ids,
+    ):
+        activity.setdefault(row[0], {})[row[1]] = int(row[2] or 0)
+    return activity
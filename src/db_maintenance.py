@@ -1,31 +1,57 @@
 # src/db_maintenance.py
+import json
 import sqlite3
-from typing import Optional
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
 
+from change_feed import change_feed
+from db_stats import refresh_global_stats
 
-def prune_old_project_scans(conn: sqlite3.Connection, project_name: str, keep_scan_id: int) -> int:
+
+def prune_old_project_scans(
+    conn: sqlite3.Connection,
+    project_name: str,
+    keep_scan_id: int,
+    project_id: Optional[int] = None,
+) -> int:
     """
     Deletes all older scans (and their file + join-table rows) for a given project,
     keeping only keep_scan_id.
 
+    When project_id is given, scans are matched on the indexed scans.project_id
+    column; otherwise the legacy scans.project name is used.
+
     Returns:
         int: number of scans deleted
     """
-    if not project_name:
+    if not project_name and project_id is None:
         return 0
 
     cur = conn.cursor()
 
     # Find scans for this project that are NOT the one we just created
-    cur.execute(
-        """
-        SELECT id
-        FROM scans
-        WHERE project = ?
-          AND id != ?
-        """,
-        (project_name, keep_scan_id),
-    )
+    if project_id is not None:
+        cur.execute(
+            """
+            SELECT id
+            FROM scans
+            WHERE project_id = ?
+              AND id != ?
+            """,
+            (project_id, keep_scan_id),
+        )
+    else:
+        cur.execute(
+            """
+            SELECT id
+            FROM scans
+            WHERE project = ?
+              AND id != ?
+            """,
+            (project_name, keep_scan_id),
+        )
     old_scan_ids = [row["id"] if isinstance(row, sqlite3.Row) else row[0] for row in cur.fetchall()]
 
     if not old_scan_ids:
@@ -67,3 +93,298 @@ def prune_old_project_scans(conn: sqlite3.Connection, project_name: str, keep_sc
     )
 
     return len(old_scan_ids)
+
+
+# --- Background maintenance ---
+#
+# Orphan cleanup and storage upkeep used to run inline in delete_project_by_id.
+# Writers now only flag the database as needing maintenance (request_maintenance);
+# MaintenanceScheduler performs the work off the request path, at most once per
+# min_interval and only once the app has been idle for idle_seconds.
+
+MAINTENANCE_STATE_ID = 1
+
+# Pages handed back to the filesystem per incremental_vacuum call
+INCREMENTAL_VACUUM_PAGES = 2000
+
+
+def _scalar(conn: sqlite3.Connection, sql: str, params=()):
+    row = conn.execute(sql, params).fetchone()
+    return row[0] if row else None
+
+
+def request_maintenance(conn: sqlite3.Connection, reason: str = "") -> None:
+    """Flag the database as needing a maintenance pass. Does not commit."""
+    conn.execute(
+        """
+        INSERT INTO maintenance_state (id, pending, pending_reason, requested_at)
+        VALUES (?, 1, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(id) DO UPDATE SET
+            pending = 1,
+            pending_reason = excluded.pending_reason,
+            requested_at = excluded.requested_at
+        """,
+        (MAINTENANCE_STATE_ID, reason or None),
+    )
+
+
+def maintenance_pending(conn: sqlite3.Connection) -> bool:
+    return bool(_scalar(conn, "SELECT pending FROM maintenance_state WHERE id = ?", (MAINTENANCE_STATE_ID,)))
+
+
+def collect_orphans(conn: sqlite3.Connection) -> Dict[str, int]:
+    """
+    Delete contributors, languages and interned path_dirs no longer linked to
+    any file (or, for contributors, any resume or portfolio). Each
+    check is an indexed NOT EXISTS probe.
+    Does not commit; returns the number of rows removed per table.
+    """
+    cur = conn.cursor()
+    cur.execute("""
+        DELETE FROM contributors
+        WHERE NOT EXISTS (SELECT 1 FROM file_contributors fc WHERE fc.contributor_id = contributors.id)
+          AND NOT EXISTS (SELECT 1 FROM resumes r WHERE r.contributor_id = contributors.id)
+          AND NOT EXISTS (SELECT 1 FROM portfolios p WHERE p.contributor_id = contributors.id)
+    """)
+    contributors_removed = cur.rowcount
+    cur.execute("""
+        DELETE FROM languages
+        WHERE NOT EXISTS (SELECT 1 FROM file_languages fl WHERE fl.language_id = languages.id)
+    """)
+    languages_removed = cur.rowcount
+    cur.execute("""
+        DELETE FROM path_dirs
+        WHERE NOT EXISTS (SELECT 1 FROM files f WHERE f.dir_id = path_dirs.id)
+    """)
+    return {"contributors": contributors_removed, "languages": languages_removed, "path_dirs": cur.rowcount}
+
+
+def run_maintenance(
+    conn: sqlite3.Connection,
+    vacuum_pages: int = INCREMENTAL_VACUUM_PAGES,
+    full_vacuum: bool = False,
+) -> Dict[str, Any]:
+    """
+    Run one maintenance pass: orphan cleanup, PRAGMA optimize (ANALYZE on the
+    first run), incremental vacuum and, in WAL mode, a checkpoint. Clears the
+    pending flag, stores the report in maintenance_state and returns it.
+
+    Databases created before auto_vacuum was enabled cannot vacuum
+    incrementally; the report flags them with needs_full_vacuum. The one-off
+    full VACUUM that converts them rewrites the whole file, so it only runs
+    when asked for with full_vacuum (POST /database/maintenance?full_vacuum=true),
+    never from the background pass.
+    """
+    started = time.perf_counter()
+    page_size = _scalar(conn, "PRAGMA page_size") or 0
+    pages_before = _scalar(conn, "PRAGMA page_count") or 0
+    freelist_before = _scalar(conn, "PRAGMA freelist_count") or 0
+
+    removed = collect_orphans(conn)
+    if removed["contributors"]:
+        # The dashboard's contributor count and top contributor include them
+        refresh_global_stats(conn)
+    conn.execute(
+        "UPDATE maintenance_state SET pending = 0, pending_reason = NULL WHERE id = ?",
+        (MAINTENANCE_STATE_ID,),
+    )
+    conn.commit()
+    if removed["contributors"] or removed["languages"]:
+        change_feed.publish(
+            "maintenance", conn, action="orphans_removed",
+            contributors=removed["contributors"], languages=removed["languages"],
+        )
+
+    analyzed = _scalar(conn, "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'") is None
+    if analyzed:
+        conn.execute("ANALYZE")
+    conn.execute("PRAGMA optimize")
+    conn.commit()
+
+    incremental = _scalar(conn, "PRAGMA auto_vacuum") == 2  # INCREMENTAL
+    if full_vacuum:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        incremental = True
+    elif incremental and _scalar(conn, "PRAGMA freelist_count"):
+        conn.execute(f"PRAGMA incremental_vacuum({int(vacuum_pages)})").fetchall()
+
+    checkpointed = False
+    if str(_scalar(conn, "PRAGMA journal_mode")).lower() == "wal":
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        checkpointed = True
+
+    pages_after = _scalar(conn, "PRAGMA page_count") or 0
+    report = {
+        "ran_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%SZ"),
+        "orphans_removed": removed,
+        "analyzed": analyzed,
+        "full_vacuum": full_vacuum,
+        "needs_full_vacuum": not incremental,
+        "wal_checkpoint": checkpointed,
+        "freelist_pages_before": freelist_before,
+        "freelist_pages_after": _scalar(conn, "PRAGMA freelist_count") or 0,
+        "pages_reclaimed": max(0, pages_before - pages_after),
+        "bytes_reclaimed": max(0, pages_before - pages_after) * page_size,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    conn.execute(
+        """
+        INSERT INTO maintenance_state (id, pending, last_run_at, last_report_json)
+        VALUES (?, 0, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            last_run_at = excluded.last_run_at,
+            last_report_json = excluded.last_report_json,
+            last_error = NULL,
+            last_error_at = NULL
+        """,
+        (MAINTENANCE_STATE_ID, report["ran_at"], json.dumps(report)),
+    )
+    conn.commit()
+    return report
+
+
+def run_maintenance_if_pending(conn: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+    """Run a maintenance pass only if one has been requested; returns its report or None."""
+    if not maintenance_pending(conn):
+        return None
+    return run_maintenance(conn)
+
+
+def record_maintenance_failure(conn: sqlite3.Connection, error: str) -> None:
+    """Store the error of a failed pass (cleared by the next successful one) and commit."""
+    conn.rollback()
+    conn.execute(
+        """
+        INSERT INTO maintenance_state (id, last_error, last_error_at)
+        VALUES (?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            last_error = excluded.last_error,
+            last_error_at = excluded.last_error_at
+        """,
+        (MAINTENANCE_STATE_ID, error, datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%SZ")),
+    )
+    conn.commit()
+
+
+def load_maintenance_status(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Return {"pending", "pending_reason", "requested_at", "last_run_at", "last_report", "last_error", "last_error_at"}."""
+    row = conn.execute(
+        """
+        SELECT pending, pending_reason, requested_at, last_run_at, last_report_json, last_error, last_error_at
+        FROM maintenance_state WHERE id = ?
+        """,
+        (MAINTENANCE_STATE_ID,),
+    ).fetchone()
+    if not row:
+        return {
+            "pending": False, "pending_reason": None, "requested_at": None, "last_run_at": None,
+            "last_report": None, "last_error": None, "last_error_at": None,
+        }
+    return {
+        "pending": bool(row[0]),
+        "pending_reason": row[1],
+        "requested_at": row[2],
+        "last_run_at": row[3],
+        "last_report": json.loads(row[4]) if row[4] else None,
+        "last_error": row[5],
+        "last_error_at": row[6],
+    }
+
+
+class MaintenanceScheduler:
+    """
+    Daemon thread that runs run_maintenance() when the database is flagged
+    (or every `interval` seconds regardless), waiting until no activity has been
+    noted for `idle_seconds` and never more often than every `min_interval`.
+    After a failed pass the next attempt waits min_interval, doubling with
+    each further failure up to `interval`.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        interval: float = 6 * 60 * 60,
+        min_interval: float = 60.0,
+        idle_seconds: float = 5.0,
+        poll_seconds: float = 2.0,
+    ):
+        self._connect = connect
+        self.interval = interval
+        self.min_interval = min_interval
+        self.idle_seconds = idle_seconds
+        self.poll_seconds = poll_seconds
+        self.last_report: Optional[Dict[str, Any]] = None
+        self._started = self._last_activity = time.monotonic()
+        self._last_run: Optional[float] = None
+        self._failures = 0
+        self._retry_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def note_activity(self) -> None:
+        self._last_activity = time.monotonic()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="db-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_now(self, full_vacuum: bool = False) -> Dict[str, Any]:
+        """
+        Run a maintenance pass immediately (serialized with the background
+        thread). full_vacuum is passed on to run_maintenance; the background
+        thread never sets it.
+        """
+        with self._lock:
+            conn = self._connect()
+            try:
+                report = run_maintenance(conn, full_vacuum=full_vacuum)
+            except Exception as exc:
+                self._failures += 1
+                self._retry_at = time.monotonic() + min(self.min_interval * 2 ** (self._failures - 1), self.interval)
+                try:
+                    record_maintenance_failure(conn, f"{type(exc).__name__}: {exc}")
+                except sqlite3.Error:
+                    pass
+                raise
+            finally:
+                conn.close()
+            self._last_run = time.monotonic()
+            self._failures = 0
+            self._retry_at = None
+            self.last_report = report
+            return report
+
+    def is_due(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        if self._retry_at is not None and now < self._retry_at:
+            return False
+        if self._last_run is not None and now - self._last_run < self.min_interval:
+            return False
+        if now - self._last_activity < self.idle_seconds:
+            return False
+        if now - (self._last_run if self._last_run is not None else self._started) >= self.interval:
+            return True
+        conn = self._connect()
+        try:
+            return maintenance_pending(conn)
+        finally:
+            conn.close()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                if self.is_due():
+                    self.run_now()
+            except Exception as exc:
+                print(f"Database maintenance failed: {exc}")
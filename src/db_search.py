@@ -0,0 +1,225 @@
+# src/db_search.py
+import re
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional
+
+# Searchable text is kept in search_documents (one row per file path, summary,
+# evidence item, ...) and indexed by the external-content FTS5 table
+# search_index; triggers created in db._ensure_schema keep the two in step.
+SEARCH_KINDS = ("project", "summary", "file", "skill", "evidence")
+
+# bm25() is negative (lower is better); matches in a project's name or summary
+# should outrank a hit in one of its many file paths.
+KIND_WEIGHTS = {
+    "project": 4.0,
+    "summary": 2.0,
+    "skill": 2.0,
+    "evidence": 1.5,
+    "file": 1.0,
+}
+
+MAX_MATCHES_PER_PROJECT = 3
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _project_documents(conn: sqlite3.Connection, project_id: int, kind: str) -> List[tuple]:
+    if kind == "project":
+        row = conn.execute("SELECT name, custom_name FROM projects WHERE id = ?", (project_id,)).fetchone()
+        if not row:
+            return []
+        text = " ".join(part for part in (row[1], row[0]) if part)
+        return [(None, text)]
+    if kind == "summary":
+        row = conn.execute("SELECT summary_text FROM projects WHERE id = ?", (project_id,)).fetchone()
+        return [(None, row[0])] if row and row[0] else []
+    if kind == "file":
+        rows = conn.execute(
+            """
+            SELECT f.id, f.file_path
+            FROM scans s
+            JOIN files_full f ON f.scan_id = s.id
+            WHERE s.project_id = ?
+            """,
+            (project_id,),
+        ).fetchall()
+        return [(r[0], r[1]) for r in rows if r[1]]
+    if kind == "skill":
+        rows = conn.execute(
+            """
+            SELECT sk.id, sk.name
+            FROM project_skills ps
+            JOIN skills sk ON sk.id = ps.skill_id
+            WHERE ps.project_id = ?
+            """,
+            (project_id,),
+        ).fetchall()
+        return [(r[0], r[1]) for r in rows if r[1]]
+    if kind == "evidence":
+        rows = conn.execute(
+            "SELECT id, description, value FROM project_evidence WHERE project_id = ?",
+            (project_id,),
+        ).fetchall()
+        docs = []
+        for r in rows:
+            text = " ".join(part for part in (r[2], r[1]) if part and part.strip())
+            if text:
+                docs.append((r[0], text))
+        return docs
+    raise ValueError(f"Unknown search document kind: {kind}")
+
+
+def reindex_project(conn: sqlite3.Connection, project_id: int, kinds: Optional[Iterable[str]] = None) -> None:
+    """
+    Rebuild the search documents of one project, limited to `kinds` (default:
+    all of SEARCH_KINDS) so a summary edit does not re-read every file path.
+    Does not commit.
+    """
+    if project_id is None:
+        return
+    kinds = tuple(kinds) if kinds is not None else SEARCH_KINDS
+    cur = conn.cursor()
+    for kind in kinds:
+        cur.execute("DELETE FROM search_documents WHERE project_id = ? AND kind = ?", (project_id, kind))
+        cur.executemany(
+            "INSERT INTO search_documents (project_id, kind, ref_id, content) VALUES (?, ?, ?, ?)",
+            [(project_id, kind, ref_id, text) for ref_id, text in _project_documents(conn, project_id, kind)],
+        )
+
+
+def remove_project(conn: sqlite3.Connection, project_id: int) -> None:
+    """Drop every search document of a project. Does not commit."""
+    conn.execute("DELETE FROM search_documents WHERE project_id = ?", (project_id,))
+
+
+def ensure_search_index(conn: sqlite3.Connection) -> None:
+    """
+    Index projects that have no search documents yet (databases created before
+    search existed) and commit. Run once per database when it is first opened
+    (see db.get_connection). Returns immediately when every project is indexed.
+    """
+    missing = [
+        row[0]
+        for row in conn.execute(
+            """
+            SELECT id FROM projects
+            WHERE id NOT IN (SELECT project_id FROM search_documents WHERE kind = 'project')
+            """
+        ).fetchall()
+    ]
+    if not missing:
+        return
+    for project_id in missing:
+        reindex_project(conn, project_id)
+    conn.commit()
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression: every word must match, as a
+    prefix, so 'api rout' finds 'src/api/routes.py'. Returns None if the text
+    has no searchable words.
+    """
+    tokens = _TOKEN_RE.findall(text or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _weighted_rank_sql() -> str:
+    cases = " ".join(f"WHEN '{kind}' THEN {weight}" for kind, weight in KIND_WEIGHTS.items())
+    return f"bm25(search_index) * (CASE d.kind {cases} ELSE 1.0 END)"
+
+
+def search_projects(
+    conn: sqlite3.Connection,
+    text: str,
+    limit: int = 20,
+    offset: int = 0,
+) -> Dict[str, Any]:
+    """
+    Rank projects by their best-matching search document.
+
+    Returns {"total", "results"}; each result carries the project id, name,
+    custom_name, score (higher is better), hit count and up to
+    MAX_MATCHES_PER_PROJECT matches as {"kind", "ref_id", "snippet"}.
+    """
+    match = build_match_query(text)
+    if match is None:
+        return {"total": 0, "results": []}
+
+    rank_sql = _weighted_rank_sql()
+    # bm25() and snippet() only work in a plain query over the FTS table, so the
+    # hits are ranked in a materialized CTE and grouped or windowed outside it.
+    hits_sql = f"""
+        SELECT d.id, d.project_id, d.kind, d.ref_id, {rank_sql} AS rank{{snippet}}
+        FROM search_index
+        JOIN search_documents d ON d.id = search_index.rowid
+        WHERE search_index MATCH ?
+    """
+    ranked = conn.execute(
+        f"""
+        WITH hits AS MATERIALIZED ({hits_sql.format(snippet='')})
+        SELECT project_id, MIN(rank) AS best, COUNT(*) AS hits,
+               COUNT(*) OVER () AS total
+        FROM hits
+        GROUP BY project_id
+        ORDER BY best ASC, project_id ASC
+        LIMIT ? OFFSET ?
+        """,
+        (match, limit, offset),
+    ).fetchall()
+    if not ranked:
+        total = 0
+        if offset:
+            total = conn.execute(
+                """
+                SELECT COUNT(DISTINCT d.project_id)
+                FROM search_index
+                JOIN search_documents d ON d.id = search_index.rowid
+                WHERE search_index MATCH ?
+                """,
+                (match,),
+            ).fetchone()[0]
+        return {"total": int(total), "results": []}
+
+    page_ids = [row[0] for row in ranked]
+    placeholders = ",".join("?" for _ in page_ids)
+    names = {
+        row[0]: (row[1], row[2])
+        for row in conn.execute(
+            f"SELECT id, name, custom_name FROM projects WHERE id IN ({placeholders})",
+            page_ids,
+        ).fetchall()
+    }
+
+    snippet_sql = ", snippet(search_index, 0, '[', ']', '…', 12) AS snippet"
+    matches: Dict[int, List[Dict[str, Any]]] = {pid: [] for pid in page_ids}
+    for row in conn.execute(
+        f"""
+        WITH hits AS MATERIALIZED ({hits_sql.format(snippet=snippet_sql)} AND d.project_id IN ({placeholders}))
+        SELECT project_id, kind, ref_id, snippet
+        FROM (
+            SELECT project_id, kind, ref_id, snippet,
+                   ROW_NUMBER() OVER (PARTITION BY project_id ORDER BY rank ASC, id ASC) AS rn
+            FROM hits
+        )
+        WHERE rn <= ?
+        ORDER BY project_id, rn
+        """,
+        [match] + page_ids + [MAX_MATCHES_PER_PROJECT],
+    ):
+        matches[row[0]].append({"kind": row[1], "ref_id": row[2], "snippet": row[3]})
+
+    results = []
+    for project_id, best, hits, _total in ranked:
+        name, custom_name = names.get(project_id, (None, None))
+        results.append({
+            "project_id": project_id,
+            "name": name,
+            "custom_name": custom_name,
+            "score": round(-float(best), 4),
+            "hits": int(hits),
+            "matches": matches[project_id],
+        })
+    return {"total": int(ranked[0][3]), "results": results}
@@ -0,0 +1,456 @@
+# src/db_stats.py
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from contrib_metrics import canonical_username
+
+
+def _row_value(row, key: str, index: int):
+    return row[key] if isinstance(row, sqlite3.Row) else row[index]
+
+
+def refresh_project_stats(conn: sqlite3.Connection, project_id: int) -> None:
+    """
+    Recompute the project_stats row for one project from its scans, files and
+    file contributors. Does not commit; callers run it inside their own write
+    transaction so the aggregate never disagrees with the rows it summarizes.
+    """
+    if project_id is None:
+        return
+
+    cur = conn.cursor()
+
+    cur.execute(
+        "SELECT COUNT(*) AS scan_count, MAX(scanned_at) AS latest_scan_at FROM scans WHERE project_id = ?",
+        (project_id,),
+    )
+    scan_row = cur.fetchone()
+    scan_count = _row_value(scan_row, "scan_count", 0) or 0
+    latest_scan_at = _row_value(scan_row, "latest_scan_at", 1)
+
+    cur.execute(
+        """
+        SELECT f.file_extension AS file_extension, COUNT(*) AS count
+        FROM scans s
+        JOIN files f ON f.scan_id = s.id
+        WHERE s.project_id = ?
+        GROUP BY f.file_extension
+        """,
+        (project_id,),
+    )
+    extensions = {
+        (_row_value(r, "file_extension", 0) or ""): _row_value(r, "count", 1)
+        for r in cur.fetchall()
+    }
+
+    # files.category is stored at scan time (contrib_metrics.classify_file)
+    cur.execute(
+        """
+        SELECT COALESCE(f.category, 'other') AS category, COUNT(*) AS count
+        FROM scans s
+        JOIN files f ON f.scan_id = s.id
+        WHERE s.project_id = ?
+        GROUP BY COALESCE(f.category, 'other')
+        """,
+        (project_id,),
+    )
+    categories = {_row_value(r, "category", 0): _row_value(r, "count", 1) for r in cur.fetchall()}
+
+    cur.execute(
+        """
+        SELECT c.name AS name, COUNT(DISTINCT f.id) AS file_count
+        FROM scans s
+        JOIN files f ON f.scan_id = s.id
+        JOIN file_contributors fc ON fc.file_id = f.id
+        JOIN contributors c ON c.id = fc.contributor_id
+        WHERE s.project_id = ?
+        GROUP BY c.id
+        ORDER BY file_count DESC, c.name
+        """,
+        (project_id,),
+    )
+    contributor_rows = cur.fetchall()
+    top = contributor_rows[0] if contributor_rows else None
+
+    cur.execute(
+        """
+        INSERT OR REPLACE INTO project_stats
+            (project_id, scan_count, file_count, extensions_json, categories_json, contributor_count,
+             top_contributor, top_contributor_files, latest_scan_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """,
+        (
+            project_id,
+            scan_count,
+            sum(extensions.values()),
+            json.dumps(extensions, sort_keys=True),
+            json.dumps(categories, sort_keys=True),
+            len(contributor_rows),
+            _row_value(top, "name", 0) if top else None,
+            _row_value(top, "file_count", 1) if top else 0,
+            latest_scan_at,
+        ),
+    )
+
+
+def refresh_global_stats(conn: sqlite3.Connection) -> None:
+    """
+    Recompute the single global_stats row used by the dashboard. Like
+    refresh_project_stats this does not commit.
+    """
+    cur = conn.cursor()
+
+    project_count = cur.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+    scan_count = cur.execute("SELECT COUNT(*) FROM scans").fetchone()[0]
+    file_count = cur.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    contributor_count = cur.execute(
+        "SELECT COUNT(DISTINCT name) FROM contributors WHERE name IS NOT NULL AND TRIM(name) <> ''"
+    ).fetchone()[0]
+
+    top = cur.execute(
+        """
+        SELECT c.name, COUNT(fc.file_id) AS file_count
+        FROM contributors c
+        LEFT JOIN file_contributors fc ON c.id = fc.contributor_id
+        WHERE c.name IS NOT NULL AND TRIM(c.name) <> ''
+        GROUP BY c.id
+        ORDER BY file_count DESC
+        LIMIT 1
+        """
+    ).fetchone()
+    latest = cur.execute(
+        "SELECT scanned_at, project FROM scans ORDER BY scanned_at DESC LIMIT 1"
+    ).fetchone()
+
+    cur.execute(
+        """
+        INSERT OR REPLACE INTO global_stats
+            (id, project_count, scan_count, file_count, contributor_count,
+             top_contributor, top_contributor_files, latest_scan_at, latest_project, updated_at)
+        VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """,
+        (
+            project_count,
+            scan_count,
+            file_count,
+            contributor_count,
+            top[0] if top else None,
+            top[1] if top else 0,
+            latest[0] if latest else None,
+            latest[1] if latest else None,
+        ),
+    )
+
+
+def score_project_contributors(contribs: Dict[str, int], total: int) -> Dict[str, float]:
+    """
+    Score every contributor of one project. The score blends three factors:
+      - Coverage (60%): fraction of the project's files the contributor touched.
+      - Dominance gap (30%): lead over the next highest contributor, as a
+        fraction of total files. Only the top contributor gets a non-zero gap.
+      - Team size factor (10%): 1 / number_of_contributors, so one person's
+        work counts for more in a small team.
+    """
+    if not contribs:
+        return {}
+    sorted_counts = sorted(contribs.values(), reverse=True)
+    top_count = sorted_counts[0]
+    second_count = sorted_counts[1] if len(sorted_counts) > 1 else 0
+    team_factor = 1.0 / float(len(contribs))
+
+    scores = {}
+    for name, files in contribs.items():
+        coverage = float(files) / float(total) if total > 0 else 0.0
+        dominance_gap = (files - second_count) / float(total) if total > 0 and files == top_count else 0.0
+        scores[name] = (0.6 * coverage) + (0.3 * dominance_gap) + (0.1 * team_factor)
+    return scores
+
+
+def _contributor_file_counts(conn: sqlite3.Connection, project_id: Optional[int] = None) -> Dict[int, Dict[str, int]]:
+    """Return {project_id: {canonical contributor: distinct files}} in one grouped query."""
+    where = "WHERE s.project_id = ?" if project_id is not None else "WHERE s.project_id IS NOT NULL"
+    params: Tuple = (project_id,) if project_id is not None else ()
+    rows = conn.execute(
+        f"""
+        SELECT s.project_id, c.name, COUNT(DISTINCT f.id)
+        FROM scans s
+        JOIN files f ON f.scan_id = s.id
+        JOIN file_contributors fc ON fc.file_id = f.id
+        JOIN contributors c ON c.id = fc.contributor_id
+        {where}
+        GROUP BY s.project_id, c.id
+        """,
+        params,
+    ).fetchall()
+
+    per_project: Dict[int, Dict[str, int]] = {}
+    for pid, raw_name, files in rows:
+        # Several raw names can collapse onto one canonical username
+        canon = canonical_username(raw_name or "")
+        contribs = per_project.setdefault(pid, {})
+        contribs[canon] = contribs.get(canon, 0) + files
+    return per_project
+
+
+def _write_importance(conn: sqlite3.Connection, project_id: int, total: int, contribs: Dict[str, int]) -> None:
+    cur = conn.cursor()
+    scores = score_project_contributors(contribs, total)
+
+    cur.execute("DELETE FROM importance_scores WHERE project_id = ?", (project_id,))
+    cur.executemany(
+        """
+        INSERT INTO importance_scores (project_id, contributor, contrib_files, total_files, contributors_count, score)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (project_id, name, files, total, len(contribs), scores[name])
+            for name, files in contribs.items()
+        ],
+    )
+
+    top_name, top_files, top_fraction, top_score = None, 0, 0.0, 0.0
+    if contribs:
+        top_name = max(contribs.items(), key=lambda x: x[1])[0]
+        top_files = contribs[top_name]
+        top_fraction = float(top_files) / float(total) if total > 0 else 0.0
+        top_score = scores[top_name]
+    cur.execute(
+        """
+        INSERT OR REPLACE INTO project_importance
+            (project_id, total_files, contributors_count, top_contributor, top_contrib_files, top_fraction, top_score)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        (project_id, total, len(contribs), top_name, top_files, top_fraction, top_score),
+    )
+
+
+def refresh_importance_scores(conn: sqlite3.Connection, project_id: Optional[int] = None) -> None:
+    """
+    Recompute the contributor x project importance matrix. Scores only depend on
+    a project's own contributors, so a scan refreshes just its project; with no
+    project_id every project is rebuilt from a single grouped query. Does not commit.
+    """
+    if project_id is not None:
+        project_ids = [project_id]
+    else:
+        project_ids = [r[0] for r in conn.execute("SELECT id FROM projects").fetchall()]
+
+    per_project = _contributor_file_counts(conn, project_id)
+    placeholders = ",".join("?" for _ in project_ids)
+    totals = {
+        r[0]: r[1]
+        for r in conn.execute(
+            f"""
+            SELECT s.project_id, COUNT(f.id)
+            FROM scans s
+            JOIN files f ON f.scan_id = s.id
+            WHERE s.project_id IN ({placeholders})
+            GROUP BY s.project_id
+            """,
+            project_ids,
+        ).fetchall()
+    } if project_ids else {}
+
+    for pid in project_ids:
+        _write_importance(conn, pid, totals.get(pid, 0), per_project.get(pid, {}))
+
+
+def ensure_stats(conn: sqlite3.Connection) -> None:
+    """
+    Fill in any missing aggregate rows (databases created before project_stats
+    existed, or rows written outside save_scan) and commit them. Run once per
+    database when it is first opened (see db.get_connection), so the readers
+    below never write.
+
+    Returns immediately when everything is already materialized.
+    """
+    cur = conn.cursor()
+    missing = [
+        _row_value(r, "id", 0)
+        for r in cur.execute(
+            """
+            SELECT id FROM projects
+            WHERE id NOT IN (SELECT project_id FROM project_stats)
+               OR id NOT IN (SELECT project_id FROM project_importance)
+            """
+        ).fetchall()
+    ]
+    has_global = cur.execute("SELECT 1 FROM global_stats WHERE id = 1").fetchone() is not None
+    if not missing and has_global:
+        return
+
+    for project_id in missing:
+        refresh_project_stats(conn, project_id)
+        refresh_importance_scores(conn, project_id)
+    if missing or not has_global:
+        refresh_global_stats(conn)
+    conn.commit()
+
+
+_PROJECT_STATS_COLUMNS = ("project_id", "scan_count", "file_count", "extensions_json", "categories_json",
+                          "contributor_count", "top_contributor", "top_contributor_files", "latest_scan_at")
+
+
+def _project_stats_from_row(row) -> Dict[str, Any]:
+    stats = dict(zip(_PROJECT_STATS_COLUMNS, row))
+    stats["extensions"] = json.loads(stats.pop("extensions_json") or "{}")
+    stats["categories"] = json.loads(stats.pop("categories_json") or "{}")
+    return stats
+
+
+def load_project_stats(conn: sqlite3.Connection, project_id: int) -> Optional[Dict[str, Any]]:
+    """Return the materialized stats for one project, or None if the project is unknown."""
+    row = conn.execute(
+        f"SELECT {', '.join(_PROJECT_STATS_COLUMNS)} FROM project_stats WHERE project_id = ?",
+        (project_id,),
+    ).fetchone()
+    if not row:
+        return None
+    return _project_stats_from_row(row)
+
+
+def load_projects_stats(conn: sqlite3.Connection, project_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """Return the materialized stats of several projects in one query, keyed by project id."""
+    if not project_ids:
+        return {}
+    placeholders = ",".join("?" for _ in project_ids)
+    rows = conn.execute(
+        f"SELECT {', '.join(_PROJECT_STATS_COLUMNS)} FROM project_stats WHERE project_id IN ({placeholders})",
+        list(project_ids),
+    ).fetchall()
+    return {stats["project_id"]: stats for stats in map(_project_stats_from_row, rows)}
+
+
+def load_global_stats(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Return the materialized global stats row (zeros before it is first written)."""
+    row = conn.execute(
+        """
+        SELECT project_count, scan_count, file_count, contributor_count,
+               top_contributor, top_contributor_files, latest_scan_at, latest_project
+        FROM global_stats
+        WHERE id = 1
+        """
+    ).fetchone()
+    keys = ("project_count", "scan_count", "file_count", "contributor_count",
+            "top_contributor", "top_contributor_files", "latest_scan_at", "latest_project")
+    if row is None:
+        return {**dict.fromkeys(keys), "project_count": 0, "scan_count": 0, "file_count": 0,
+                "contributor_count": 0, "top_contributor_files": 0}
+    return dict(zip(keys, row))
+
+
+def top_projects_for_contributor(
+    conn: sqlite3.Connection,
+    contributor: str,
+    k: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Return the contributor's top-k projects by importance score (all when k is None)."""
+    sql = """
+        SELECT p.name, i.contrib_files, i.total_files, i.contributors_count, i.score
+        FROM importance_scores i
+        JOIN projects p ON p.id = i.project_id
+        WHERE i.contributor = ?
+        ORDER BY i.score DESC, i.contrib_files DESC, p.name
+    """
+    params: List[Any] = [canonical_username(contributor or "")]
+    if k is not None:
+        sql += " LIMIT ?"
+        params.append(k)
+    keys = ("project", "contrib_files", "total_files", "contributors_count", "score")
+    return [dict(zip(keys, row)) for row in conn.execute(sql, params).fetchall()]
+
+
+def top_projects_by_contributor(
+    conn: sqlite3.Connection,
+    project_ids: Optional[List[int]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    top_projects_for_contributor for every contributor at once, keyed by
+    canonical name. With project_ids, only the entries of those projects.
+    """
+    keys = ("project", "contrib_files", "total_files", "contributors_count", "score")
+    where, params = project_id_filter("i.project_id", project_ids)
+    ranked: Dict[str, List[Dict[str, Any]]] = {}
+    for row in conn.execute(
+        f"""
+        SELECT i.contributor, p.name, i.contrib_files, i.total_files, i.contributors_count, i.score
+        FROM importance_scores i
+        JOIN projects p ON p.id = i.project_id
+        WHERE {where}
+        ORDER BY i.contributor, i.score DESC, i.contrib_files DESC, p.name
+        """,
+        params,
+    ):
+        ranked.setdefault(row[0], []).append(dict(zip(keys, row[1:])))
+    return ranked
+
+
+def top_projects(
+    conn: sqlite3.Connection,
+    k: Optional[int] = None,
+    project_ids: Optional[List[int]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Return the top-k projects by their top contributor's importance score.
+    With project_ids, only those projects are ranked.
+    """
+    where, params = project_id_filter("i.project_id", project_ids)
+    sql = f"""
+        SELECT p.name, i.total_files, i.contributors_count, i.top_contributor,
+               i.top_contrib_files, i.top_fraction, i.top_score
+        FROM project_importance i
+        JOIN projects p ON p.id = i.project_id
+        WHERE i.total_files > 0 AND {where}
+        ORDER BY i.top_score DESC, i.top_fraction DESC, i.total_files DESC, p.name
+    """
+    if k is not None:
+        sql += " LIMIT ?"
+        params.append(k)
+    keys = ("project", "total_files", "contributors_count", "top_contributor",
+            "top_contrib_files", "top_fraction", "top_score")
+    return [dict(zip(keys, row)) for row in conn.execute(sql, params).fetchall()]
+
+
+def project_id_filter(column: str, project_ids: Optional[Iterable[int]]) -> Tuple[str, List[Any]]:
+    """A "column IN (...)" SQL condition and its params; always true when project_ids is None."""
+    if project_ids is None:
+        return "1", []
+    project_ids = list(project_ids)
+    if not project_ids:
+        return "0", []
+    return f"{column} IN ({','.join('?' for _ in project_ids)})", project_ids
+
+
+def importance_score(
+    conn: sqlite3.Connection,
+    project_id: int,
+    contributor: Optional[str] = None,
+) -> Optional[float]:
+    """
+    Single-cell lookup. With a contributor, return their score on the project;
+    without one, return the project's top score. None when there is no entry.
+    """
+    if contributor is None:
+        row = conn.execute(
+            "SELECT top_score FROM project_importance WHERE project_id = ? AND total_files > 0",
+            (project_id,),
+        ).fetchone()
+    else:
+        row = conn.execute(
+            "SELECT score FROM importance_scores WHERE project_id = ? AND contributor = ?",
+            (project_id, canonical_username(contributor)),
+        ).fetchone()
+    return row[0] if row else None
+
+
+def project_top_scores(conn: sqlite3.Connection, project_ids: List[int]) -> Dict[int, float]:
+    """Batch form of importance_score without a contributor: each project's top score, keyed by id."""
+    if not project_ids:
+        return {}
+    placeholders = ",".join("?" for _ in project_ids)
+    rows = conn.execute(
+        f"SELECT project_id, top_score FROM project_importance WHERE project_id IN ({placeholders}) AND total_files > 0",
+        list(project_ids),
+    ).fetchall()
+    return {row[0]: row[1] for row in rows}
@@ -0,0 +1,427 @@
+# src/db_transfer.py
+import argparse
+import base64
+import gzip
+import io
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import zlib
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+from db import DB_PATH, backfill_derived_data, get_connection
+from db_version import bump_data_version
+
+# Export/import of the whole database for backups and moving a workspace
+# between machines. Exports read from an online-backup snapshot of the
+# database, so they are consistent even while scans are being written, and
+# stream in constant memory.
+#
+# NDJSON layout, one JSON value per line:
+#   {"type": "header", "format": 1, "exported_at": ...}
+#   {"type": "table", "name": "projects", "columns": ["id", "name", ...]}
+#   [1, "demo", ...]                      <- rows of the last table, in column order
+#   {"type": "end", "tables": {"projects": 12, ...}}
+# BLOB values are written as {"$base64": "..."}. The end record lets an import
+# reject a truncated file instead of loading part of it.
+
+EXPORT_FORMAT = 1
+EXPORT_FORMATS = ("ndjson", "sqlite")
+
+SQLITE_MAGIC = b"SQLite format 3\x00"
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Pages copied per step of the online backup; the source is unlocked between steps
+BACKUP_PAGES = 1024
+FETCH_SIZE = 1000
+CHUNK_BYTES = 64 * 1024
+
+
+def _db_path(db_path: Optional[str] = None) -> str:
+    # Re-read the override so API calls follow FILE_DATA_DB_PATH changes made after import
+    return db_path or os.environ.get("FILE_DATA_DB_PATH") or DB_PATH
+
+
+def _data_tables(conn: sqlite3.Connection) -> List[str]:
+    """
+    Tables holding data. SQLite internals, the FTS index (rebuilt on import)
+    and the data_version counter (it belongs to the database, not its data)
+    are left out.
+    """
+    return [
+        row[0]
+        for row in conn.execute(
+            """
+            SELECT name FROM sqlite_master
+            WHERE type = 'table' AND name NOT LIKE 'sqlite_%' AND name NOT LIKE 'search_index%'
+              AND name != 'data_version'
+            ORDER BY name
+            """
+        )
+    ]
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+
+
+def snapshot_database(dest_path: str, db_path: Optional[str] = None) -> None:
+    """Copy the database to dest_path with SQLite's online backup API."""
+    source = sqlite3.connect(_db_path(db_path))
+    dest = sqlite3.connect(dest_path)
+    try:
+        source.backup(dest, pages=BACKUP_PAGES)
+    finally:
+        dest.close()
+        source.close()
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return {"$base64": base64.b64encode(value).decode("ascii")}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "$base64" in value:
+        return base64.b64decode(value["$base64"])
+    return value
+
+
+def _iter_ndjson_lines(snapshot_path: str) -> Iterator[str]:
+    conn = sqlite3.connect(snapshot_path)
+    try:
+        yield json.dumps({
+            "type": "header",
+            "format": EXPORT_FORMAT,
+            "exported_at": datetime.now(timezone.utc).isoformat(),
+        }) + "\n"
+        counts = {}
+        for table in _data_tables(conn):
+            columns = _table_columns(conn, table)
+            yield json.dumps({"type": "table", "name": table, "columns": columns}) + "\n"
+            cur = conn.execute(f'SELECT * FROM "{table}"')
+            count = 0
+            while True:
+                rows = cur.fetchmany(FETCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield json.dumps([_encode_value(v) for v in row], separators=(",", ":"), default=str) + "\n"
+                count += len(rows)
+            counts[table] = count
+        yield json.dumps({"type": "end", "tables": counts}) + "\n"
+    finally:
+        conn.close()
+
+
+def _iter_file_chunks(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as fh:
+        while True:
+            chunk = fh.read(CHUNK_BYTES)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _iter_ndjson_chunks(snapshot_path: str) -> Iterator[bytes]:
+    buffer = []
+    size = 0
+    for line in _iter_ndjson_lines(snapshot_path):
+        data = line.encode("utf-8")
+        buffer.append(data)
+        size += len(data)
+        if size >= CHUNK_BYTES:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def _gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_export(fmt: str = "ndjson", compress: bool = False, db_path: Optional[str] = None) -> Iterator[bytes]:
+    """
+    Yield the database as bytes: NDJSON rows (fmt="ndjson") or the SQLite file
+    itself (fmt="sqlite"), gzip-compressed when compress is set. Both read a
+    backup snapshot taken in a temporary directory, removed once the
+    generator is exhausted or closed. Raises ValueError for an unknown format.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'")
+
+    def generate():
+        tmpdir = tempfile.mkdtemp(prefix="mda_export_")
+        try:
+            snapshot_path = os.path.join(tmpdir, "snapshot.db")
+            snapshot_database(snapshot_path, db_path=db_path)
+            chunks = _iter_ndjson_chunks(snapshot_path) if fmt == "ndjson" else _iter_file_chunks(snapshot_path)
+            yield from (_gzip_chunks(chunks) if compress else chunks)
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    return generate()
+
+
+def export_database(dest_path: str, fmt: str = "ndjson", compress: bool = False, db_path: Optional[str] = None) -> int:
+    """Write an export to dest_path ("-" for stdout). Returns bytes written."""
+    written = 0
+    out = sys.stdout.buffer if dest_path == "-" else open(dest_path, "wb")
+    try:
+        for chunk in iter_export(fmt, compress=compress, db_path=db_path):
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    return written
+
+
+def _buffered(stream: BinaryIO) -> io.BufferedReader:
+    """Wrap stream so its first bytes can be peeked at without consuming them."""
+    return stream if isinstance(stream, io.BufferedReader) else io.BufferedReader(stream)
+
+
+def import_database(stream: BinaryIO, batch_size: int = FETCH_SIZE) -> Dict[str, Any]:
+    """
+    Replace the contents of the database with an export read from stream, a
+    binary file object holding NDJSON or a SQLite file, optionally gzipped.
+    Everything happens in one transaction: on any error the database is left
+    as it was. Raises ValueError if the input is not a valid export.
+    """
+    stream = _buffered(stream)
+    if stream.peek(len(GZIP_MAGIC))[:len(GZIP_MAGIC)] == GZIP_MAGIC:
+        stream = _buffered(gzip.GzipFile(fileobj=stream, mode="rb"))
+    if stream.peek(len(SQLITE_MAGIC))[:len(SQLITE_MAGIC)] == SQLITE_MAGIC:
+        return _import_sqlite(stream)
+    return _import_ndjson(stream, batch_size)
+
+
+def _connect_target() -> sqlite3.Connection:
+    conn = get_connection()
+    # transactions are managed explicitly below
+    conn.isolation_level = None
+    return conn
+
+
+def _import_sqlite(stream: BinaryIO) -> Dict[str, Any]:
+    tmpdir = tempfile.mkdtemp(prefix="mda_import_")
+    try:
+        source_path = os.path.join(tmpdir, "import.db")
+        with open(source_path, "wb") as fh:
+            shutil.copyfileobj(stream, fh, CHUNK_BYTES)
+        source = sqlite3.connect(source_path)
+        try:
+            if source.execute("PRAGMA quick_check").fetchone()[0] != "ok":
+                raise ValueError("Imported SQLite file is corrupt")
+            counts = {t: source.execute(f'SELECT COUNT(*) FROM "{t}"').fetchone()[0] for t in _data_tables(source)}
+            dest = _connect_target()
+            try:
+                source.backup(dest, pages=BACKUP_PAGES)
+            finally:
+                dest.close()
+        except sqlite3.DatabaseError as exc:
+            raise ValueError(f"Invalid SQLite file: {exc}") from exc
+        finally:
+            source.close()
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    # upgrade an older schema in place, fill in derived rows it predates, and
+    # give the restored database a new version epoch so responses cached for
+    # the old contents are not reused
+    conn = get_connection()
+    try:
+        backfill_derived_data(conn)
+        conn.execute("UPDATE data_version SET epoch = lower(hex(randomblob(8))), version = 0 WHERE id = 1")
+        conn.commit()
+    finally:
+        conn.close()
+    return {"format": "sqlite", "tables": counts, "skipped_tables": []}
+
+
+def _import_ndjson(stream: BinaryIO, batch_size: int) -> Dict[str, Any]:
+    lines = io.TextIOWrapper(stream, encoding="utf-8")
+    try:
+        result = _load_ndjson(lines, batch_size)
+    finally:
+        # leave the caller's stream open
+        lines.detach()
+    # an export from an older version may lack derived rows
+    conn = get_connection()
+    try:
+        backfill_derived_data(conn)
+    finally:
+        conn.close()
+    return result
+
+
+def _load_ndjson(lines: io.TextIOWrapper, batch_size: int) -> Dict[str, Any]:
+    try:
+        header = json.loads(next(lines, "") or "null")
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get("type") != "header":
+        raise ValueError("Not a database export: missing header record")
+    if not isinstance(header.get("format"), int) or header["format"] > EXPORT_FORMAT:
+        raise ValueError(f"Unsupported export format {header.get('format')!r}")
+
+    conn = _connect_target()
+    try:
+        conn.execute("PRAGMA foreign_keys = OFF")
+        conn.execute("BEGIN")
+        tables = _data_tables(conn)
+
+        # Defer index builds: drop secondary indexes and triggers now, recreate
+        # them once every row is in, and rebuild the FTS index in one pass
+        deferred = conn.execute(
+            """
+            SELECT type, name, sql FROM sqlite_master
+            WHERE type IN ('index', 'trigger') AND sql IS NOT NULL AND name NOT LIKE 'sqlite_%'
+            """
+        ).fetchall()
+        for obj_type, name, _sql in deferred:
+            conn.execute(f'DROP {obj_type.upper()} "{name}"')
+        for table in tables:
+            conn.execute(f'DELETE FROM "{table}"')
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_sequence'").fetchone():
+            conn.execute("DELETE FROM sqlite_sequence")
+
+        counts: Dict[str, int] = {}
+        skipped: List[str] = []
+        expected = None
+        insert_sql = None
+        positions: List[int] = []
+        current = None
+        batch: List[tuple] = []
+
+        def flush():
+            if batch and insert_sql:
+                conn.executemany(insert_sql, batch)
+            batch.clear()
+
+        for line_no, line in enumerate(lines, start=2):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                raise ValueError(f"Invalid JSON on line {line_no}") from exc
+
+            if isinstance(record, list):
+                if current is None:
+                    raise ValueError(f"Row before any table record on line {line_no}")
+                counts[current] += 1
+                if insert_sql:
+                    batch.append(tuple(_decode_value(record[i]) for i in positions))
+                    if len(batch) >= batch_size:
+                        flush()
+                continue
+
+            kind = record.get("type") if isinstance(record, dict) else None
+            if kind == "table":
+                flush()
+                current = record["name"]
+                counts[current] = 0
+                if current in tables:
+                    existing = set(_table_columns(conn, current))
+                    columns = [c for c in record["columns"] if c in existing]
+                    positions = [record["columns"].index(c) for c in columns]
+                    quoted = ", ".join(f'"{c}"' for c in columns)
+                    insert_sql = f'INSERT INTO "{current}" ({quoted}) VALUES ({", ".join("?" for _ in columns)})'
+                else:
+                    skipped.append(current)
+                    insert_sql = None
+            elif kind == "end":
+                flush()
+                expected = record.get("tables") or {}
+                break
+            else:
+                raise ValueError(f"Unknown record on line {line_no}")
+
+        if expected is None:
+            raise ValueError("Export is incomplete: missing end record")
+        if expected != counts:
+            raise ValueError("Export is incomplete: row counts do not match the end record")
+
+        for _obj_type, _name, sql in deferred:
+            conn.execute(sql)
+        # foreign keys were off for the load: refuse rows whose parent is missing
+        violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+        if violations:
+            broken = sorted({f"{row[0]} -> {row[2]}" for row in violations})
+            raise ValueError(f"Export has {len(violations)} rows with missing parents: {', '.join(broken)}")
+        if "search_documents" in tables and conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'search_index'"
+        ).fetchone():
+            conn.execute("INSERT INTO search_index (search_index) VALUES ('rebuild')")
+        bump_data_version(conn)
+        conn.execute("COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+    return {
+        "format": "ndjson",
+        "tables": {name: n for name, n in counts.items() if name not in skipped},
+        "skipped_tables": skipped,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point: export or import the whole database."""
+    parser = argparse.ArgumentParser(description="Export or import the whole database")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export_cmd = sub.add_parser("export", help="Write a consistent snapshot of the database")
+    export_cmd.add_argument("dest", help="output file, or - for stdout")
+    export_cmd.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    export_cmd.add_argument("--gzip", action="store_true", help="gzip the output (implied by a .gz file name)")
+
+    import_cmd = sub.add_parser("import", help="Replace the database with an export")
+    import_cmd.add_argument("source", help="export file (NDJSON or SQLite, optionally gzipped), or - for stdin")
+
+    parser.add_argument("--db", default=None, help="database path (default: FILE_DATA_DB_PATH or file_data.db)")
+    args = parser.parse_args(argv)
+    if args.db:
+        os.environ["FILE_DATA_DB_PATH"] = os.path.abspath(args.db)
+
+    if args.command == "export":
+        compress = args.gzip or args.dest.endswith(".gz")
+        written = export_database(args.dest, fmt=args.format, compress=compress)
+        if args.dest != "-":
+            print(f"Exported {written} bytes to {args.dest}")
+        return 0
+
+    source = sys.stdin.buffer if args.source == "-" else open(args.source, "rb")
+    try:
+        result = import_database(source)
+    except ValueError as exc:
+        print(f"Import failed: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+    total = sum(result["tables"].values())
+    print(f"Imported {total} rows into {len(result['tables'])} tables")
+    if result["skipped_tables"]:
+        print("Skipped tables not in this schema: " + ", ".join(result["skipped_tables"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+# src/db_version.py
+import os
+import sqlite3
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+# A single counter that goes up whenever user-visible data changes, so API
+# responses can be cached and revalidated (ETag) until the next write. Triggers
+# on the source tables bump it, which covers every write path (API, CLI, ad-hoc
+# SQL) without each one having to remember to. The bulk per-file tables are
+# left out: they only change together with a scans/projects row, which already
+# bumps it. Derived tables (stats, importance, roles) are caches and do not.
+#
+# epoch is random per database file, so a recreated database never reuses an
+# old database's (epoch, version) pair.
+
+VERSIONED_TABLES = (
+    "projects",
+    "scans",
+    "contributors",
+    "languages",
+    "skills",
+    "project_skills",
+    "project_evidence",
+    "portfolios",
+    "resumes",
+    "custom_rankings",
+    "custom_ranking_items",
+)
+
+
+def ensure_data_version(conn: sqlite3.Connection) -> None:
+    """Create the data_version row and the triggers that bump it (idempotent)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            epoch TEXT NOT NULL,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute("INSERT OR IGNORE INTO data_version (id, epoch, version) VALUES (1, lower(hex(randomblob(8))), 0)")
+    for table in VERSIONED_TABLES:
+        for op in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS data_version_{table}_{op.lower()} AFTER {op} ON {table} BEGIN
+                    UPDATE data_version SET version = version + 1 WHERE id = 1;
+                END
+            """)
+
+
+def bump_data_version(conn: sqlite3.Connection) -> None:
+    """Bump the version by hand, for writes made with the triggers dropped (bulk import). Does not commit."""
+    conn.execute("UPDATE data_version SET version = version + 1 WHERE id = 1")
+
+
+def data_version(conn: sqlite3.Connection) -> Optional[Tuple[str, int]]:
+    """Return (epoch, version) as seen by conn (inside its current transaction, if any)."""
+    row = conn.execute("SELECT epoch, version FROM data_version WHERE id = 1").fetchone()
+    return (row[0], row[1]) if row else None
+
+
+def read_data_version(db_path: str) -> Optional[Tuple[str, int]]:
+    """
+    Return (epoch, version) of the database at db_path, or None if it has no
+    version yet. Opens a bare connection: this runs on every cacheable request,
+    so it skips the schema checks of db.get_connection.
+    """
+    try:
+        conn = sqlite3.connect(f"file:{quote(os.path.abspath(db_path))}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return None
+    try:
+        row = conn.execute("SELECT epoch, version FROM data_version WHERE id = 1").fetchone()
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+    return (row[0], row[1]) if row else None
@@ -16,8 +16,9 @@ metrics to infer roles such as:
 - Project Steward: High activity levels indicating leadership/coordination role
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from collections import defaultdict, Counter
+import json
 import os
 from contrib_metrics import classify_file, canonical_username
 
@@ -266,7 +267,8 @@ def categorize_contributor_role(
     commits: int,
     lines_added: int,
     lines_removed: int,
-    activity_by_category: Dict[str, int]
+    activity_by_category: Dict[str, int],
+    extension_counts: Optional[Dict[str, int]] = None
 ) -> Dict:
     """
     Categorize a single contributor's role based on their activity patterns.
@@ -279,6 +281,8 @@ def categorize_contributor_role(
         lines_removed: Total lines removed by this contributor
         activity_by_category: Dict with keys (code, test, docs, design, other)
                             containing activity counts per category
+        extension_counts: Optional {lowercased extension: file count}; derived
+                          from files_changed when not given
     
     Returns:
         Dict with keys:
@@ -319,7 +323,7 @@ def categorize_contributor_role(
     }
     
     # Determine primary and secondary roles based on file patterns
-    role_scores = _calculate_role_scores(files_changed, contribution_breakdown)
+    role_scores = _calculate_role_scores(files_changed, contribution_breakdown, extension_counts)
     
     # Get ranked roles
     sorted_roles = sorted(role_scores.items(), key=lambda x: -x[1])
@@ -372,19 +376,21 @@ def categorize_contributor_role(
     }
 
 
-def _calculate_role_scores(files_changed: List[str], breakdown: Dict[str, float]) -> Dict[str, float]:
+def _calculate_role_scores(files_changed: List[str], breakdown: Dict[str, float],
+                           extension_counts: Optional[Dict[str, int]] = None) -> Dict[str, float]:
     """
     Calculate role scores based on file extensions and patterns.
     
     Returns a dict mapping role names to scores.
     """
     role_scores = defaultdict(float)
-    extension_counts = Counter()
     
-    # Count file extensions
-    for file_path in files_changed:
-        _, ext = os.path.splitext(file_path.lower())
-        extension_counts[ext] += 1
+    # Count file extensions unless the caller already has them (stored per file at scan time)
+    if extension_counts is None:
+        extension_counts = Counter()
+        for file_path in files_changed:
+            _, ext = os.path.splitext(file_path.lower())
+            extension_counts[ext] += 1
     
     # Score each role based on matching extensions
     for role, patterns in ROLE_PATTERNS.items():
@@ -467,7 +473,8 @@ def analyze_project_roles(contributors_data: Dict) -> Dict:
             data.get("commits", 0),
             data.get("lines_added", 0),
             data.get("lines_removed", 0),
-            data.get("activity_by_category", {})
+            data.get("activity_by_category", {}),
+            data.get("extension_counts"),
         )
         contributor_roles.append(role_analysis)
     
@@ -479,7 +486,15 @@ def analyze_project_roles(contributors_data: Dict) -> Dict:
             unique_contributors[canonical_name] = role
     
     deduped_roles = list(unique_contributors.values())
-    
+
+    return {
+        "contributors": deduped_roles,
+        "summary": _summarize_roles(deduped_roles)
+    }
+
+
+def _summarize_roles(deduped_roles: List[Dict]) -> Dict:
+    """Project-level role distribution for a list of per-contributor role analyses."""
     role_counts = Counter(r["primary_role"] for r in deduped_roles)
     role_distribution = {
         role: count
@@ -496,11 +511,7 @@ def analyze_project_roles(contributors_data: Dict) -> Dict:
         "development_team_size": len(developers),
         "team_composition": _describe_team_composition(deduped_roles),
     }
-    
-    return {
-        "contributors": deduped_roles,
-        "summary": summary
-    }
+    return summary
 
 
 def _describe_team_composition(contributor_roles: List[Dict]) -> str:
@@ -612,6 +623,163 @@ def format_roles_report(analysis_result: Dict, per_project_data: Dict[str, Dict]
     return "\n".join(report)
 
 
+# Placeholder and bot identities that are never assigned a role
+ROLE_BLACKLIST = {"githubclassroombot", "unknown", "n/a", "none"}
+
+
+def build_contributors_data(files_by_contributor: Dict[str, Iterable[str]], skip: Iterable[str] = ROLE_BLACKLIST,
+                            file_facts: Optional[Dict[str, tuple]] = None) -> Dict:
+    """Turn {contributor: file paths} into the input expected by analyze_project_roles().
+
+    file_facts maps a path to its stored (category, extension) (files.category /
+    files.file_extension); paths missing from it are classified here.
+    Commits and line counts are estimated from the number of files touched,
+    since file ownership is all that is known for non-git projects.
+    """
+    file_facts = file_facts or {}
+    skip = {name.lower() for name in skip}
+    contributors_data = {}
+    for name, paths in files_by_contributor.items():
+        if not name or not name.strip() or name.strip().lower() in skip:
+            continue
+        files_changed = sorted({path for path in paths if path})
+
+        activity_by_category = {"code": 0, "test": 0, "docs": 0, "design": 0, "other": 0}
+        extension_counts = Counter()
+        for file_path in files_changed:
+            category, ext = file_facts.get(file_path) or (None, None)
+            if category is None:
+                category = classify_file(file_path)
+            if ext is None:
+                ext = os.path.splitext(file_path.lower())[1]
+            activity_by_category[category] = activity_by_category.get(category, 0) + 1
+            extension_counts[ext] += 1
+
+        file_count = len(files_changed)
+        contributors_data[name] = {
+            "files_changed": files_changed,
+            "commits": max(1, file_count),  # At least 1 commit per file touched
+            "lines_added": file_count * 50,  # Rough estimate: 50 lines per file
+            "lines_removed": file_count * 10,
+            "activity_by_category": activity_by_category,
+            "extension_counts": dict(extension_counts),
+        }
+    return contributors_data
+
+
+def save_project_roles(conn, project_id: int, files_by_contributor: Dict[str, Iterable[str]],
+                       file_facts: Optional[Dict[str, tuple]] = None) -> Dict:
+    """Analyze a project's contributors and replace its rows in project_contributor_roles.
+
+    Runs inside the caller's transaction (no commit). Returns the analysis.
+    """
+    analysis = analyze_project_roles(build_contributors_data(files_by_contributor, file_facts=file_facts))
+    conn.execute("DELETE FROM project_contributor_roles WHERE project_id = ?", (project_id,))
+    conn.executemany(
+        """
+        INSERT INTO project_contributor_roles (project_id, contributor, position, primary_role, confidence, role_json)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (project_id, role["name"], position, role["primary_role"], role["confidence"], json.dumps(role))
+            for position, role in enumerate(analysis["contributors"])
+        ],
+    )
+    return analysis
+
+
+def ensure_project_roles(conn) -> None:
+    """Analyze and store the roles of projects that have none stored yet (scanned
+    before roles were persisted) from their per-file activity, and commit.
+
+    Run once per database when it is first opened (see db.get_connection).
+    """
+    rows = conn.execute(
+        """
+        SELECT s.project_id, c.name AS contributor_name, f.file_path, f.category, f.file_extension
+        FROM scans s
+        JOIN files_full f ON f.scan_id = s.id
+        JOIN file_contributors fc ON fc.file_id = f.id
+        JOIN contributors c ON c.id = fc.contributor_id
+        WHERE s.project_id IS NOT NULL
+          AND s.project_id NOT IN (SELECT project_id FROM project_contributor_roles)
+          AND c.name IS NOT NULL
+          AND TRIM(c.name) <> ''
+        """
+    ).fetchall()
+    if not rows:
+        return
+
+    files_by_project: Dict[int, Dict[str, List[str]]] = defaultdict(dict)
+    facts_by_project: Dict[int, Dict[str, tuple]] = defaultdict(dict)
+    for row in rows:
+        file_path = row["file_path"] or ""
+        files_by_project[row["project_id"]].setdefault(row["contributor_name"], []).append(file_path)
+        if row["category"]:
+            facts_by_project[row["project_id"]][file_path] = (row["category"], row["file_extension"] or "")
+    for project_id, files_by_contributor in files_by_project.items():
+        save_project_roles(conn, project_id, files_by_contributor, file_facts=facts_by_project[project_id])
+    conn.commit()
+
+
+def _analysis_from_rows(rows) -> Dict:
+    contributors = [json.loads(row["role_json"]) for row in rows]
+    return {"contributors": contributors, "summary": _summarize_roles(contributors)}
+
+
+def load_project_roles(conn, project_id: int) -> Optional[Dict]:
+    """Return the stored role analysis for a project, or None if none has been stored."""
+    rows = conn.execute(
+        "SELECT role_json FROM project_contributor_roles WHERE project_id = ? ORDER BY position",
+        (project_id,),
+    ).fetchall()
+    if not rows:
+        return None
+    return _analysis_from_rows(rows)
+
+
+def load_projects_roles(conn, project_ids: List[int]) -> Dict[int, Dict]:
+    """Return the stored role analyses of several projects in one query; projects without stored roles are omitted."""
+    if not project_ids:
+        return {}
+    placeholders = ",".join("?" for _ in project_ids)
+    rows = conn.execute(
+        f"SELECT project_id, role_json FROM project_contributor_roles WHERE project_id IN ({placeholders}) ORDER BY project_id, position",
+        list(project_ids),
+    ).fetchall()
+    rows_by_project = defaultdict(list)
+    for row in rows:
+        rows_by_project[row["project_id"]].append(row)
+    return {project_id: _analysis_from_rows(project_rows) for project_id, project_rows in rows_by_project.items()}
+
+
+def load_project_roles_from_db() -> Dict[str, Dict]:
+    """Load the stored role analysis of every project, keyed by project name."""
+    try:
+        from db import get_connection
+    except ImportError:
+        print("Error: Could not import db module")
+        return {}
+
+    conn = get_connection()
+    try:
+        rows = conn.execute(
+            """
+            SELECT p.name AS project_name, r.role_json
+            FROM project_contributor_roles r
+            JOIN projects p ON p.id = r.project_id
+            ORDER BY p.name, r.position
+            """
+        ).fetchall()
+    finally:
+        conn.close()
+
+    rows_by_project = defaultdict(list)
+    for row in rows:
+        rows_by_project[row["project_name"]].append(row)
+    return {name: _analysis_from_rows(project_rows) for name, project_rows in rows_by_project.items()}
+
+
 def load_contributors_per_project_from_db() -> Dict[str, Dict]:
     """Load contributors and their metrics per project from the database.
     
@@ -640,80 +808,46 @@ def load_contributors_per_project_from_db() -> Dict[str, Dict]:
     try:
         # Get all projects from scans
         cur.execute("""
-            SELECT DISTINCT s.project
-            FROM scans s
-            WHERE s.project IS NOT NULL
-            ORDER BY s.project
+            SELECT DISTINCT p.id, p.name
+            FROM projects p
+            JOIN scans s ON s.project_id = p.id
+            ORDER BY p.name
         """)
         
-        projects = [row['project'] for row in cur.fetchall()]
+        project_rows = cur.fetchall()
+        projects = [row['name'] for row in project_rows]
         print(f"Found {len(projects)} projects in database")
         
         if not projects:
             print("No projects found in database.")
             return {}
         
+        # Every (project, contributor, file) link in one query
+        cur.execute("""
+            SELECT DISTINCT s.project_id, c.name, f.file_path, f.category, f.file_extension
+            FROM scans s
+            JOIN files_full f ON f.scan_id = s.id
+            JOIN file_contributors fc ON fc.file_id = f.id
+            JOIN contributors c ON c.id = fc.contributor_id
+            WHERE s.project_id IS NOT NULL
+        """)
+        files_by_project = defaultdict(lambda: defaultdict(list))
+        facts_by_project = defaultdict(dict)
+        for row in cur.fetchall():
+            files_by_project[row['project_id']][canonical_username(row['name'])].append(row['file_path'])
+            if row['category']:
+                facts_by_project[row['project_id']][row['file_path']] = (row['category'], row['file_extension'] or '')
+
         projects_data = {}
-        
-        for project_name in projects:
-            # Get all contributors for this project
-            cur.execute("""
-                SELECT DISTINCT c.name, c.id
-                FROM contributors c
-                JOIN file_contributors fc ON c.id = fc.contributor_id
-                JOIN files f ON fc.file_id = f.id
-                JOIN scans s ON f.scan_id = s.id
-                WHERE s.project = ?
-                ORDER BY c.name
-            """, (project_name,))
-            
-            contributors = cur.fetchall()
-            print(f"  {project_name}: {len(contributors)} contributors")
-            
-            if not contributors:
+        for project_row in project_rows:
+            project_name = project_row['name']
+            files_by_contributor = files_by_project.get(project_row['id'], {})
+            print(f"  {project_name}: {len(files_by_contributor)} contributors")
+            if not files_by_contributor:
                 continue
-            
-            contributors_data = {}
-            
-            for contrib_row in contributors:
-                contrib_name = contrib_row['name']
-                contrib_id = contrib_row['id']
-                
-                # Get all files for this contributor in this project
-                cur.execute("""
-                    SELECT DISTINCT f.file_path, f.file_name
-                    FROM files f
-                    JOIN file_contributors fc ON f.id = fc.file_id
-                    JOIN scans s ON f.scan_id = s.id
-                    WHERE fc.contributor_id = ? AND s.project = ?
-                """, (contrib_id, project_name))
-                
-                files = cur.fetchall()
-                files_changed = [f['file_path'] for f in files]
-                
-                # Classify files by category
-                activity_by_category = {"code": 0, "test": 0, "docs": 0, "design": 0, "other": 0}
-                for file_path in files_changed:
-                    category = classify_file(file_path)
-                    activity_by_category[category] = activity_by_category.get(category, 0) + 1
-                
-                # Count total file contributions
-                file_count = len(files_changed)
-                estimated_commits = max(1, file_count)
-                estimated_lines_added = file_count * 50
-                estimated_lines_removed = file_count * 10
-                
-                # Normalize the contributor name
-                canonical_name = canonical_username(contrib_name)
-                contributors_data[canonical_name] = {
-                    "files_changed": files_changed,
-                    "commits": estimated_commits,
-                    "lines_added": estimated_lines_added,
-                    "lines_removed": estimated_lines_removed,
-                    "activity_by_category": activity_by_category
-                }
-            
-            projects_data[project_name] = contributors_data
+            projects_data[project_name] = build_contributors_data(
+                files_by_contributor, skip=(), file_facts=facts_by_project.get(project_row['id'])
+            )
         
         print(f"Loaded data for {len(projects_data)} projects")
         return projects_data
@@ -767,8 +901,8 @@ def load_contributors_from_db() -> Dict:
             
             # Get all files for this contributor
             cur.execute("""
-                SELECT DISTINCT f.file_path, f.file_name
-                FROM files f
+                SELECT DISTINCT f.file_path, f.file_name, f.category
+                FROM files_full f
                 JOIN file_contributors fc ON f.id = fc.file_id
                 WHERE fc.contributor_id = ?
             """, (contrib_id,))
@@ -778,10 +912,10 @@ def load_contributors_from_db() -> Dict:
             
             print(f"  {contrib_name}: {len(files_changed)} files")
             
-            # Classify files by category
+            # Category stored at scan time; rows saved before it existed are classified here
             activity_by_category = {"code": 0, "test": 0, "docs": 0, "design": 0, "other": 0}
-            for file_path in files_changed:
-                category = classify_file(file_path)
+            for f in files:
+                category = f['category'] or classify_file(f['file_path'])
                 activity_by_category[category] = activity_by_category.get(category, 0) + 1
             
             # Count total file contributions (number of files they've touched)
@@ -862,15 +996,9 @@ if __name__ == "__main__":
     # Analyze overall roles
     result = analyze_project_roles(contributors_data)
     
-    # Load and analyze per-project contributions
-    print("\nLoading per-project contributor data...")
-    per_project_raw = load_contributors_per_project_from_db()
-    
-    # Analyze roles for each project
-    per_project_analysis = {}
-    if per_project_raw:
-        for project_name, project_contributors in per_project_raw.items():
-            per_project_analysis[project_name] = analyze_project_roles(project_contributors)
+    # Per-project roles are computed and stored when each project is scanned
+    print("\nLoading per-project contributor roles...")
+    per_project_analysis = load_project_roles_from_db()
     
     # Generate and print the complete report
     print(format_roles_report(result, per_project_analysis))
@@ -5,9 +5,12 @@ Run this script to get a concise summary of scans, files, projects, languages, s
 and contributors.
 
 It is safe to run against a fresh or older schema; missing tables are skipped.
-Also provides JSON output for API use, including skills exercised for frontend.
+Also provides JSON output for API use, including skills exercised for frontend,
+and keyset-paginated sections (scans, files, projects, contributors, skills
+timeline) that can be read a page at a time or streamed as NDJSON.
 """
 
+import json
 import os
 import sys
 import sqlite3
@@ -22,6 +25,7 @@ sys.path.insert(
 # Project imports (from src/)
 from skill_timeline import print_grouped_skill_timeline
 from file_utils import is_image_file
+from keyset import decode_cursor, encode_cursor, newer_first_after
 
 try:
     # Allow overriding DB for inspecting temporary DBs used in tests
@@ -30,6 +34,11 @@ except Exception:
     DB_PATH = os.environ.get('FILE_DATA_DB_PATH') or os.path.join(os.path.dirname(__file__), '..', 'file_data.db')
 
 
+def _resolve_db_path(db_path=None):
+    # Re-read the override so API calls follow FILE_DATA_DB_PATH changes made after import
+    return db_path or os.environ.get('FILE_DATA_DB_PATH') or DB_PATH
+
+
 def safe_query(cur, sql, params=()):
     try:
         return list(cur.execute(sql, params))
@@ -55,6 +64,243 @@ def human_ts(ts):
     return str(ts)
 
 
+# Sections that can be paged through with inspect_section / iter_section_ndjson
+INSPECT_SECTIONS = ("scans", "files", "projects", "contributors", "skills_timeline")
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Bound on bound parameters per IN (...) list
+_IN_CHUNK = 500
+_SAMPLE_FILES_PER_CONTRIBUTOR = 5
+
+
+def _chunks(values, size=_IN_CHUNK):
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _placeholders(values):
+    return ",".join("?" for _ in values)
+
+
+def _files_source(q):
+    """files_full (compact paths rebuilt, see db._ensure_compact_paths) when present, else files."""
+    found = q("SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = 'files_full'")
+    return "files_full" if found else "files"
+
+
+def project_details(q, project_ids):
+    """Return ({project_id: (scan_count, file_count)}, {project_id: [skill names]}) in grouped queries.
+
+    Counts come from the materialized project_stats rows; projects without one
+    (older DBs) are counted with one grouped query per chunk instead of per project.
+    """
+    project_ids = list(project_ids)
+    counts = {}
+    skills = {pid: [] for pid in project_ids}
+    for chunk in _chunks(project_ids):
+        marks = _placeholders(chunk)
+        for r in q(f"SELECT project_id, scan_count, file_count FROM project_stats WHERE project_id IN ({marks})", chunk):
+            counts[r['project_id']] = (r['scan_count'], r['file_count'])
+
+        missing = [pid for pid in chunk if pid not in counts]
+        if missing:
+            marks = _placeholders(missing)
+            scan_counts = {
+                r['project_id']: r['c']
+                for r in q(f"SELECT project_id, COUNT(*) AS c FROM scans WHERE project_id IN ({marks}) GROUP BY project_id", missing)
+            }
+            file_counts = {
+                r['project_id']: r['c']
+                for r in q(
+                    f"SELECT s.project_id, COUNT(f.id) AS c FROM scans s JOIN files f ON f.scan_id = s.id "
+                    f"WHERE s.project_id IN ({marks}) GROUP BY s.project_id",
+                    missing,
+                )
+            }
+            for pid in missing:
+                counts[pid] = (scan_counts.get(pid, 0), file_counts.get(pid, 0))
+
+        marks = _placeholders(chunk)
+        for r in q(f"SELECT ps.project_id, sk.name FROM skills sk JOIN project_skills ps ON sk.id = ps.skill_id WHERE ps.project_id IN ({marks})", chunk):
+            skills[r['project_id']].append(r['name'])
+    return counts, skills
+
+
+def contributor_sample_files(q, contributor_ids, per_contributor=_SAMPLE_FILES_PER_CONTRIBUTOR):
+    """Return {contributor_id: [{file_name, file_path}, ...]} with up to per_contributor files each."""
+    samples = {cid: [] for cid in contributor_ids}
+    files_source = _files_source(q) if contributor_ids else "files"
+    for chunk in _chunks(contributor_ids):
+        rows = q(
+            f"""
+            SELECT contributor_id, file_name, file_path FROM (
+                SELECT fc.contributor_id, f.file_name, f.file_path,
+                       ROW_NUMBER() OVER (PARTITION BY fc.contributor_id ORDER BY f.id) AS rn
+                FROM file_contributors fc
+                JOIN {files_source} f ON f.id = fc.file_id
+                WHERE fc.contributor_id IN ({_placeholders(chunk)})
+            )
+            WHERE rn <= ?
+            ORDER BY contributor_id, rn
+            """,
+            (*chunk, per_contributor),
+        )
+        for r in rows:
+            samples[r['contributor_id']].append({"file_name": r['file_name'], "file_path": r['file_path']})
+    return samples
+
+
+def _scans_page(q, key, limit):
+    where, params = ("", [])
+    if key:
+        clause, params = newer_first_after("scanned_at", "id", key)
+        where = f"WHERE {clause} "
+    rows = q(
+        f"SELECT id, scanned_at, project, notes FROM scans {where}ORDER BY scanned_at DESC, id DESC LIMIT ?",
+        (*params, limit),
+    )
+    return [dict(r) for r in rows], lambda item: [item['scanned_at'], item['id']]
+
+
+def _files_page(q, key, limit):
+    cols = "id, file_name, file_path, file_extension, file_size, modified_at, scan_id"
+    source = _files_source(q)
+    if key:
+        rows = q(f"SELECT {cols} FROM {source} WHERE id < ? ORDER BY id DESC LIMIT ?", (key[0], limit))
+    else:
+        rows = q(f"SELECT {cols} FROM {source} ORDER BY id DESC LIMIT ?", (limit,))
+    return [dict(r) for r in rows], lambda item: [item['id']]
+
+
+def _projects_page(q, key, limit):
+    where, params = ("", [])
+    if key:
+        where, params = "WHERE name > ? OR (name = ? AND id > ?) ", [key[0], key[0], key[1]]
+    rows = q(
+        f"SELECT id, name, repo_url, created_at, summary_text FROM projects {where}ORDER BY name, id LIMIT ?",
+        (*params, limit),
+    )
+    counts, skills = project_details(q, [p['id'] for p in rows])
+    items = [
+        {
+            "id": p['id'],
+            "name": p['name'],
+            "repo_url": p['repo_url'],
+            "created_at": p['created_at'],
+            "scan_count": counts.get(p['id'], (0, 0))[0],
+            "file_count": counts.get(p['id'], (0, 0))[1],
+            "skills": skills.get(p['id'], []),
+            "summary_text": p['summary_text'] or "",
+        }
+        for p in rows
+    ]
+    return items, lambda item: [item['name'], item['id']]
+
+
+def _contributors_page(q, key, limit):
+    where, params = ("", [])
+    if key:
+        where, params = "WHERE name > ? OR (name = ? AND id > ?) ", [key[0], key[0], key[1]]
+    rows = q(f"SELECT id, name FROM contributors {where}ORDER BY name, id LIMIT ?", (*params, limit))
+    samples = contributor_sample_files(q, [c['id'] for c in rows])
+    items = [{"id": c['id'], "name": c['name'], "sample_files": samples.get(c['id'], [])} for c in rows]
+    return items, lambda item: [item['name'], item['id']]
+
+
+def _skills_timeline_page(q, key, limit):
+    where, params = ("", [])
+    if key:
+        clause, params = newer_first_after("s.scanned_at", "s.id", key)
+        where = f"WHERE {clause} OR (s.id = ? AND sk.id > ?) "
+        params = [*params, key[1], key[2]]
+    rows = q(
+        f"""
+        SELECT sk.id AS skill_id, sk.name AS skill, s.id AS scan_id, s.scanned_at AS datetime, p.name AS project
+        FROM scans s
+        JOIN projects p ON p.id = s.project_id
+        JOIN project_skills ps ON ps.project_id = p.id
+        JOIN skills sk ON sk.id = ps.skill_id
+        {where}
+        ORDER BY s.scanned_at DESC, s.id DESC, sk.id
+        LIMIT ?
+        """,
+        (*params, limit),
+    )
+    return [dict(r) for r in rows], lambda item: [item['datetime'], item['scan_id'], item['skill_id']]
+
+
+_SECTION_PAGES = {
+    "scans": _scans_page,
+    "files": _files_page,
+    "projects": _projects_page,
+    "contributors": _contributors_page,
+    "skills_timeline": _skills_timeline_page,
+}
+
+
+def _read_only_query(cur):
+    def q(sql, params=()):
+        try:
+            return list(cur.execute(sql, params))
+        except sqlite3.OperationalError:
+            return []
+    return q
+
+
+def _page(q, section, key, limit):
+    # Fetch one extra row to know whether another page follows
+    items, key_of = _SECTION_PAGES[section](q, key, limit + 1)
+    next_cursor = encode_cursor(key_of(items[limit - 1])) if len(items) > limit else None
+    return items[:limit], next_cursor
+
+
+def _fetch_page(path, section, cursor, limit):
+    if section not in _SECTION_PAGES:
+        raise ValueError(f"Unknown section '{section}'. Expected one of: {', '.join(INSPECT_SECTIONS)}")
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    key = decode_cursor(cursor) if cursor else None
+
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return _page(_read_only_query(conn.cursor()), section, key, limit)
+    finally:
+        conn.close()
+
+
+def inspect_section(section: str, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE, db_path: str = None) -> dict:
+    """Return one page of a section as {"section", "items", "next_cursor"}.
+
+    Pass next_cursor back as cursor to read the following page; it is None on the last page.
+    Raises ValueError for an unknown section or a malformed cursor.
+    """
+    items, next_cursor = _fetch_page(_resolve_db_path(db_path), section, cursor, limit)
+    return {"section": section, "items": items, "next_cursor": next_cursor}
+
+
+def iter_section_ndjson(section: str, cursor: str = None, db_path: str = None, page_size: int = MAX_PAGE_SIZE):
+    """Yield every row of a section from cursor onwards as NDJSON lines.
+
+    Rows are read one page at a time with a fresh connection per page, so the
+    generator can be consumed from any thread and never holds a read open
+    between pages. Validation errors are raised before the first line is yielded.
+    """
+    path = _resolve_db_path(db_path)
+    items, next_cursor = _fetch_page(path, section, cursor, page_size)
+
+    def generate(items, next_cursor):
+        while True:
+            for item in items:
+                yield json.dumps(item, default=str) + "\n"
+            if not next_cursor:
+                return
+            items, next_cursor = _fetch_page(path, section, next_cursor, page_size)
+
+    return generate(items, next_cursor)
+
+
 def inspect_connection(conn: sqlite3.Connection, db_label: str = None):
     """CLI inspection function."""
     label = db_label or DB_PATH
@@ -87,7 +333,8 @@ def inspect_connection(conn: sqlite3.Connection, db_label: str = None):
     print('\n' + '='*80)
     print("Files (recent)")
     print('='*80)
-    files = safe_query(cur, "SELECT id, file_name, file_path, file_extension, file_size, modified_at FROM files ORDER BY (modified_at IS NULL), modified_at DESC, id DESC LIMIT 20")
+    files_source = _files_source(lambda sql, params=(): safe_query(cur, sql, params))
+    files = safe_query(cur, f"SELECT id, file_name, file_path, file_extension, file_size, modified_at FROM {files_source} ORDER BY (modified_at IS NULL), modified_at DESC, id DESC LIMIT 20")
     for f in files:
         size = f['file_size'] if f['file_size'] is not None else 'unknown'
         print(f"[{f['id']}] {f['file_name']} ({f['file_extension'] or ''}) — {size} bytes — modified: {human_ts(f['modified_at'])}\n    path: {f['file_path']}")
@@ -97,13 +344,13 @@ def inspect_connection(conn: sqlite3.Connection, db_label: str = None):
     print("Projects and skills")
     print('='*80)
     projects = safe_query(cur, "SELECT id, name, repo_url, created_at, summary_text FROM projects ORDER BY name")
+    counts, skills_by_project = project_details(lambda sql, params=(): safe_query(cur, sql, params), [p['id'] for p in projects])
     for p in projects:
         print(f"Project {p['id']}: {p['name']} (repo: {p['repo_url'] or '<none>'}) created: {human_ts(p['created_at'])}")
-        sc = safe_query(cur, "SELECT COUNT(*) AS c FROM scans WHERE project = ?", (p['name'],))
-        fc = safe_query(cur, "SELECT COUNT(f.id) AS c FROM files f JOIN scans s ON f.scan_id = s.id WHERE s.project = ?", (p['name'],))
-        print(f"  scans: {sc[0]['c'] if sc else 0} | files: {fc[0]['c'] if fc else 0}")
-        skills = safe_query(cur, "SELECT sk.name FROM skills sk JOIN project_skills ps ON sk.id = ps.skill_id WHERE ps.project_id = ?", (p['id'],))
-        print('  skills:', ', '.join([r['name'] for r in skills]) if skills else '(none)')
+        scan_count, file_count = counts.get(p['id'], (0, 0))
+        print(f"  scans: {scan_count} | files: {file_count}")
+        skills = skills_by_project.get(p['id'], [])
+        print('  skills:', ', '.join(skills) if skills else '(none)')
 
         # Summary snippet
         summary = (p['summary_text'] or '').strip()
@@ -137,9 +384,10 @@ def inspect_connection(conn: sqlite3.Connection, db_label: str = None):
 
     # Contributors
     contribs = safe_query(cur, "SELECT id, name FROM contributors ORDER BY name")
+    samples = contributor_sample_files(lambda sql, params=(): safe_query(cur, sql, params), [c['id'] for c in contribs])
     for c in contribs:
         print(f"Contributor {c['id']}: {c['name']}")
-        sample_files = safe_query(cur, "SELECT f.file_name, f.file_path FROM files f JOIN file_contributors fc ON f.id = fc.file_id WHERE fc.contributor_id = ? LIMIT 5", (c['id'],))
+        sample_files = samples.get(c['id'], [])
         for sf in sample_files:
             print(f"   - {sf['file_name']}  ({sf['file_path']})")
         if not sample_files:
@@ -149,11 +397,19 @@ def inspect_connection(conn: sqlite3.Connection, db_label: str = None):
     if scans:
         sid = scans[0]['id']
         print(f"\nDetails for scan id {sid}:")
-        frows = safe_query(cur, "SELECT id, file_name, file_path FROM files WHERE scan_id = ? LIMIT 50", (sid,))
+        frows = safe_query(cur, f"SELECT id, file_name, file_path FROM {files_source} WHERE scan_id = ? LIMIT 50", (sid,))
+        file_ids = [fr['id'] for fr in frows]
+        langs_by_file, conts_by_file = {}, {}
+        if file_ids:
+            marks = _placeholders(file_ids)
+            for r in safe_query(cur, f"SELECT fl.file_id, l.name FROM languages l JOIN file_languages fl ON l.id = fl.language_id WHERE fl.file_id IN ({marks})", file_ids):
+                langs_by_file.setdefault(r['file_id'], []).append(r['name'])
+            for r in safe_query(cur, f"SELECT fc.file_id, c.name FROM contributors c JOIN file_contributors fc ON c.id = fc.contributor_id WHERE fc.file_id IN ({marks})", file_ids):
+                conts_by_file.setdefault(r['file_id'], []).append(r['name'])
         for fr in frows:
-            langs = safe_query(cur, "SELECT l.name FROM languages l JOIN file_languages fl ON l.id = fl.language_id WHERE fl.file_id = ?", (fr['id'],))
-            conts = safe_query(cur, "SELECT c.name FROM contributors c JOIN file_contributors fc ON c.id = fc.contributor_id WHERE fc.file_id = ?", (fr['id'],))
-            print(f" - {fr['file_name']} | langs: {', '.join([r['name'] for r in langs]) or '<none>'} | contribs: {', '.join([r['name'] for r in conts]) or '<none>'}")
+            langs = langs_by_file.get(fr['id'], [])
+            conts = conts_by_file.get(fr['id'], [])
+            print(f" - {fr['file_name']} | langs: {', '.join(langs) or '<none>'} | contribs: {', '.join(conts) or '<none>'}")
 
     # Skills timeline
     print_grouped_skill_timeline(cur, safe_query, human_ts, lambda t: print('\n' + '='*80 + f"\n{t}\n" + '='*80))
@@ -162,69 +418,75 @@ def inspect_connection(conn: sqlite3.Connection, db_label: str = None):
 
 
 def inspect_database_json(db_path: str = None):
-    """Return all database information as JSON for frontend."""
-    import json
-    path = db_path or DB_PATH
-    conn = sqlite3.connect(path)
+    """Return an overview of the database as JSON for frontend (see iter_database_overview)."""
+    return dict(iter_database_overview(db_path))
+
+
+def iter_database_overview(db_path: str = None):
+    """Yield the database overview as (section, value) pairs, each built when reached.
+
+    The API streams these a section at a time. Recent scans and files are the
+    first page of their sections; next_cursors holds the cursors for reading
+    further with inspect_section. skills_exercised has one row per (skill,
+    project) with the latest scan time; the full skill x scan timeline is the
+    paginated "skills_timeline" section.
+    """
+    path = _resolve_db_path(db_path)
+    # A streamed response resumes the generator from worker threads, one at a time
+    conn = sqlite3.connect(path, check_same_thread=False)
     conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
+    try:
+        yield from _overview_sections(_read_only_query(conn.cursor()))
+    finally:
+        conn.close()
 
-    def q(sql, params=()):
-        try:
-            return list(cur.execute(sql, params))
-        except sqlite3.OperationalError:
-            return []
 
-    result = {}
+def _overview_sections(q):
+    next_cursors = {}
 
     # Recent scans
-    scans = q("SELECT id, scanned_at, project, notes FROM scans ORDER BY scanned_at DESC LIMIT 50")
-    result['recent_scans'] = [dict(s) for s in scans]
+    recent_scans, next_cursors['scans'] = _page(q, "scans", None, 50)
+    yield 'recent_scans', recent_scans
 
     # Files
-    files = q("SELECT id, file_name, file_path, file_extension, file_size, modified_at, scan_id FROM files ORDER BY id DESC LIMIT 100")
-    result['files'] = [dict(f) for f in files]
+    files, next_cursors['files'] = _page(q, "files", None, 100)
+    yield 'files', files
 
-    # Projects
+    # Projects (counts and skills for every project in grouped queries)
     projects = q("SELECT id, name, repo_url, created_at, summary_text FROM projects ORDER BY name")
+    counts, skills_by_project = project_details(q, [p['id'] for p in projects])
     projects_list = []
     summaries_list = []
     for p in projects:
-        sc = q("SELECT COUNT(*) AS c FROM scans WHERE project = ?", (p['name'],))
-        fc = q("SELECT COUNT(f.id) AS c FROM files f JOIN scans s ON f.scan_id = s.id WHERE s.project = ?", (p['name'],))
-        skills = q("SELECT sk.name FROM skills sk JOIN project_skills ps ON sk.id = ps.skill_id WHERE ps.project_id = ?", (p['id'],))
+        scan_count, file_count = counts.get(p['id'], (0, 0))
         projects_list.append({
             "id": p['id'],
             "name": p['name'],
             "repo_url": p['repo_url'],
             "created_at": p['created_at'],
-            "scan_count": sc[0]['c'] if sc else 0,
-            "file_count": fc[0]['c'] if fc else 0,
-            "skills": [s['name'] for s in skills],
+            "scan_count": scan_count,
+            "file_count": file_count,
+            "skills": skills_by_project.get(p['id'], []),
             "summary_text": p['summary_text'] or ""
         })
         summaries_list.append({
             "project": p['name'],
             "summary": p['summary_text'] or "<none>"
         })
-    result['projects'] = projects_list
-    result['project_summaries'] = summaries_list
+    yield 'projects', projects_list
+    yield 'project_summaries', summaries_list
 
     # Contributors
     contribs = q("SELECT id, name FROM contributors ORDER BY name")
-    contrib_list = []
-    for c in contribs:
-        sample_files = q("SELECT f.file_name, f.file_path FROM files f JOIN file_contributors fc ON f.id = fc.file_id WHERE fc.contributor_id = ? LIMIT 5", (c['id'],))
-        contrib_list.append({
-            "id": c['id'],
-            "name": c['name'],
-            "sample_files": [dict(sf) for sf in sample_files]
-        })
-    result['contributors'] = contrib_list
+    samples = contributor_sample_files(q, [c['id'] for c in contribs])
+    yield 'contributors', [
+        {"id": c['id'], "name": c['name'], "sample_files": samples.get(c['id'], [])}
+        for c in contribs
+    ]
 
     # Languages top
     lang_rows = q("SELECT l.name, COUNT(fl.file_id) AS file_count FROM languages l LEFT JOIN file_languages fl ON l.id = fl.language_id GROUP BY l.id ORDER BY file_count DESC LIMIT 20")
-    result['languages'] = [dict(r) for r in lang_rows]
+    yield 'languages', [dict(r) for r in lang_rows]
 
     # Thumbnails
     thumb_rows = q("SELECT id, name, thumbnail_path FROM projects ORDER BY name")
@@ -245,25 +507,22 @@ def inspect_database_json(db_path: str = None):
             "thumbnail_path": t['thumbnail_path'],
             "status": status
         })
-    result['thumbnails'] = thumbs_list
+    yield 'thumbnails', thumbs_list
 
-    # Skills exercised (timeline)
-    skills_rows = []
+    # Skills exercised, collapsed to the latest scan per (skill, project)
     timeline_data = q("""
-        SELECT sk.name as skill, s.scanned_at as datetime, s.project
+        SELECT sk.name AS skill, MAX(s.scanned_at) AS datetime, p.name AS project
         FROM project_skills ps
         JOIN skills sk ON ps.skill_id = sk.id
         JOIN projects p ON ps.project_id = p.id
-        JOIN scans s ON s.project = p.name
-        ORDER BY s.scanned_at DESC
+        JOIN scans s ON s.project_id = p.id
+        GROUP BY ps.skill_id, ps.project_id
+        ORDER BY datetime DESC
     """)
-    for row in timeline_data:
-        skills_rows.append({
-            "skill": row['skill'],
-            "datetime": row['datetime'],
-            "project": row['project']
-        })
-    result['skills_exercised'] = skills_rows
+    yield 'skills_exercised', [
+        {"skill": row['skill'], "datetime": row['datetime'], "project": row['project']}
+        for row in timeline_data
+    ]
 
     # ---------------- RESUMES ----------------
     resume_rows = q("""
@@ -272,7 +531,7 @@ def inspect_database_json(db_path: str = None):
         ORDER BY generated_at DESC
     """)
 
-    result['resumes'] = [dict(r) for r in resume_rows]
+    yield 'resumes', [dict(r) for r in resume_rows]
 
 
     # ---------------- PORTFOLIOS ----------------
@@ -282,10 +541,8 @@ def inspect_database_json(db_path: str = None):
         ORDER BY created_at DESC
     """)
 
-    result['portfolios'] = [dict(p) for p in portfolio_rows]
-
-    conn.close()
-    return result
+    yield 'portfolios', [dict(p) for p in portfolio_rows]
+    yield 'next_cursors', next_cursors
 
 
 def main(db_path: str = None):
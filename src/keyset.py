@@ -0,0 +1,31 @@
+# src/keyset.py
+import base64
+import json
+
+# Keyset (cursor) pagination helpers shared by inspect_db and the API list
+# endpoints. A cursor is the sort key of the last row on a page, so the next
+# page is a range seek on an index instead of an OFFSET scan.
+
+
+def encode_cursor(key) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor string."""
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str):
+    """Decode a cursor produced by encode_cursor; raises ValueError if it is malformed."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(key, list):
+        raise ValueError("Invalid cursor")
+    return key
+
+
+def newer_first_after(ts_col, id_col, key):
+    """WHERE clause for rows after key in ORDER BY ts_col DESC, id_col DESC (NULL timestamps last)."""
+    ts, row_id = key[0], key[1]
+    if ts is None:
+        return f"({ts_col} IS NULL AND {id_col} < ?)", [row_id]
+    return f"({ts_col} < ? OR ({ts_col} = ? AND {id_col} < ?) OR {ts_col} IS NULL)", [ts, ts, row_id]
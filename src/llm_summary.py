@@ -1,6 +1,5 @@
 import json
 import os
-import httpx
 import hashlib
 from collections import Counter
 from datetime import datetime
@@ -133,6 +132,9 @@ def _run_ollama(prompt: str, model: str, timeout: int = 120) -> Optional[str]:
         "stream": False,
     }
 
+    # httpx is only needed once a summary is requested; keep it off startup
+    import httpx
+
     for host in hosts:
         url = f"{host.rstrip('/')}/api/generate"
         try:
@@ -46,13 +46,14 @@ from rank_projects import (
 from summarize_projects import summarize_top_ranked_projects, db_is_initialized
 from contrib_metrics import canonical_username
 from db import get_connection, DB_PATH
+from db_maintenance import run_maintenance_if_pending
 from thumbnail_manager import handle_edit_project_thumbnail
 from file_utils import is_image_file
 from project_evidence import handle_project_evidence
 from project_info_output import gather_project_info, output_project_info
 from detect_roles import (
     load_contributors_from_db,
-    load_contributors_per_project_from_db,
+    load_project_roles_from_db,
     analyze_project_roles,
     format_roles_report,
     display_all_roles
@@ -1080,6 +1081,7 @@ def handle_add_to_resume(resume_row, path):
     print("\nResume successfully updated.")
 
 from db import clear_database, delete_project_by_id
+from db_transfer import export_database, import_database
 
 # ============================================================
 # MANAGE SCANNED PROJECTS
@@ -1303,9 +1305,11 @@ def database_management_menu():
         print("1. Inspect database")
         print("2. Clear database (REMOVE ALL DATA)")
         print("3. Remove a project")
-        print("4. Go back")
+        print("4. Export database")
+        print("5. Import database (REPLACES ALL DATA)")
+        print("6. Go back")
 
-        choice = input("Select an option (1-4): ").strip()
+        choice = input("Select an option (1-6): ").strip()
 
         if choice == "1":
             handle_inspect_database()
@@ -1324,11 +1328,52 @@ def database_management_menu():
             remove_project_menu()
 
         elif choice == "4":
+            handle_export_database()
+
+        elif choice == "5":
+            handle_import_database()
+
+        elif choice == "6":
             return
 
         else:
             print_error("Invalid selection.", "Enter a number from the list or 'q' to cancel.")
 
+def handle_export_database():
+    """Write a snapshot of the database to a file (NDJSON, gzipped when the name ends in .gz)."""
+    dest = input("Export to file (e.g. backup.ndjson.gz, blank to cancel): ").strip()
+    if not dest:
+        print("Cancelled.")
+        return
+    fmt = "sqlite" if dest.endswith((".db", ".db.gz")) else "ndjson"
+    try:
+        written = export_database(dest, fmt=fmt, compress=dest.endswith(".gz"))
+    except Exception as e:
+        print_error(f"Failed to export database: {e}", "Check that the destination folder exists and is writable.")
+        return
+    print(f"✔ Exported {written} bytes to {dest}")
+
+def handle_import_database():
+    """Replace the database with an export file."""
+    source = input("Import from file (blank to cancel): ").strip()
+    if not source:
+        print("Cancelled.")
+        return
+    if not os.path.isfile(source):
+        print_error(f"File not found: {source}")
+        return
+    confirm = input("**This will REPLACE ALL DATA. Type 'IMPORT' to confirm**: ")
+    if confirm != "IMPORT":
+        print("Cancelled.")
+        return
+    try:
+        with open(source, "rb") as fh:
+            result = import_database(fh)
+    except ValueError as e:
+        print_error(f"Failed to import database: {e}", "Use a file written by the database export.")
+        return
+    print(f"✔ Imported {sum(result['tables'].values())} rows into {len(result['tables'])} tables.")
+
 def remove_project_menu():
     """
     Show projects, prompt user to select one, then delete it.
@@ -1403,15 +1448,12 @@ def handle_analyze_roles():
     
     per_project_analysis = None
     if show_per_project:
-        print("\nLoading per-project contributor data...")
-        per_project_raw = load_contributors_per_project_from_db()
-        
-        if per_project_raw:
-            print(f"Found {len(per_project_raw)} projects")
-            print("Analyzing roles for each project...")
-            per_project_analysis = {}
-            for project_name, project_contributors in per_project_raw.items():
-                per_project_analysis[project_name] = analyze_project_roles(project_contributors)
+        print("\nLoading per-project contributor roles...")
+        # Roles are computed and stored when each project is scanned
+        per_project_analysis = load_project_roles_from_db() or None
+
+        if per_project_analysis:
+            print(f"Found {len(per_project_analysis)} projects")
         else:
             print("No per-project data found.")
     
@@ -1421,6 +1463,17 @@ def handle_analyze_roles():
     print(report)
 
 
+def _run_pending_maintenance():
+    """Clean up after deletes/prunes from this session before exiting."""
+    try:
+        with get_connection() as conn:
+            report = run_maintenance_if_pending(conn)
+        if report and report.get("bytes_reclaimed"):
+            print(f"Database maintenance reclaimed {report['bytes_reclaimed'] // 1024} KB.")
+    except Exception as e:
+        print(f"Database maintenance skipped: {e}")
+
+
 def main():
     """Main menu loop."""
     while True:
@@ -1452,6 +1505,7 @@ def main():
         elif choice == "12":
             database_management_menu()
         elif choice == "0":
+            _run_pending_maintenance()
             print("\nExiting program. Goodbye!")
             sys.exit(0)
         else:
@@ -0,0 +1,1027 @@
+# src/portfolio_export.py
+import base64
+import datetime as _dt
+import functools
+import json
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+# Rendering of the self-contained web portfolio HTML export. The page shell
+# (stylesheet, modal script, section markup) is built once at import and the
+# document is written out section by section, so an export never holds the
+# whole page as one string. Thumbnails are embedded as data URIs, optionally
+# downscaled, and cached by path and modification time across exports.
+
+THUMBNAIL_MAX_DIMENSION = 960
+THUMBNAIL_CACHE_BYTES = 32 * 1024 * 1024
+# Raster formats Pillow can re-encode without losing animation or vectors
+_DOWNSCALE_FORMATS = {"PNG": "image/png", "JPEG": "image/jpeg", "WEBP": "image/webp"}
+
+MAX_TIMELINE_SKILLS = 10
+_NO_HEATMAP = '<p class="tile-placeholder-text">No heatmap data available for this project.</p>'
+
+
+class ThumbnailCache:
+    """
+    Thread-safe LRU of thumbnail data URIs keyed by (path, mtime, size,
+    max_dimension), bounded by the total length of the cached URIs. Replacing
+    a thumbnail file changes its key, so stale entries simply age out.
+    """
+
+    def __init__(self, max_bytes: int = THUMBNAIL_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Optional[str]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Optional[str]]:
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, self._entries[key]
+
+    def put(self, key: Hashable, value: Optional[str]) -> None:
+        size = len(value or "")
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key) or "")
+            self._entries[key] = value
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted or "")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+thumbnail_cache = ThumbnailCache()
+
+
+@functools.lru_cache(maxsize=None)
+def _pillow_image() -> Any:
+    """PIL.Image, imported on the first export rather than at API startup; None without Pillow."""
+    try:
+        from PIL import Image  # type: ignore
+    except Exception:
+        return None
+    return Image
+
+
+def _downscale(data: bytes, max_dimension: int) -> Optional[Tuple[bytes, str]]:
+    """Re-encode an image no larger than max_dimension on either side; None when that would not help."""
+    try:
+        with _pillow_image().open(BytesIO(data)) as img:
+            media_type = _DOWNSCALE_FORMATS.get(img.format or "")
+            if media_type is None or getattr(img, "is_animated", False):
+                return None
+            if max(img.size) <= max_dimension:
+                return None
+            img.thumbnail((max_dimension, max_dimension))
+            out = BytesIO()
+            img.save(out, format=img.format if img.format else "PNG", optimize=True)
+    except Exception:
+        return None
+    encoded = out.getvalue()
+    return (encoded, media_type) if len(encoded) < len(data) else None
+
+
+def thumbnail_data_uri(path: Optional[str], max_dimension: Optional[int] = THUMBNAIL_MAX_DIMENSION) -> Optional[str]:
+    """
+    Return the thumbnail at path as a base64 data URI, or None if it cannot be
+    read. Images larger than max_dimension are downscaled when Pillow is
+    installed; pass None or 0 to embed the file unchanged.
+    """
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_mtime_ns, stat.st_size, max_dimension or 0)
+    found, cached = thumbnail_cache.get(key)
+    if found:
+        return cached
+
+    uri = None
+    try:
+        with open(path, "rb") as fh:
+            data = fh.read()
+        media_type = mimetypes.guess_type(path)[0] or "image/png"
+        if max_dimension and _pillow_image() is not None:
+            smaller = _downscale(data, max_dimension)
+            if smaller is not None:
+                data, media_type = smaller
+        uri = f"data:{media_type};base64,{base64.b64encode(data).decode('ascii')}"
+    except Exception:
+        uri = None
+    thumbnail_cache.put(key, uri)
+    return uri
+
+
+def _h(val: Any) -> str:
+    """Escape a value for insertion into HTML."""
+    if val is None:
+        return ""
+    return str(val).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+
+def _js(val: Any) -> str:
+    """JSON-encode a value for inline embedding in a <script> block."""
+    return json.dumps(val).replace("</", "<\\/")
+
+
+def export_project_entry(
+    project: Dict[str, Any],
+    detail: Dict[str, Any],
+    username: str,
+    featured: bool,
+    thumb: Optional[str],
+) -> Dict[str, Any]:
+    """Per-project data shown on the export's cards and in its detail modal."""
+    git = detail.get("git_metrics") or {}
+    llm_summary = (detail.get("llm_summary") or {}).get("text") or None
+    contributors = detail.get("contributors") or []
+    files_summary = detail.get("files_summary") or {}
+
+    all_roles = (detail.get("contributor_roles") or {}).get("contributors") or []
+    user_role = next((c for c in all_roles if (c.get("name") or "").lower() == username.lower()), None)
+
+    total_commits = git.get("total_commits")
+    duration_days = git.get("duration_days")
+    lines_added_per_author = git.get("lines_added_per_author") or {}
+    lines_removed_per_author = git.get("lines_removed_per_author") or {}
+    commits_per_author = git.get("commits_per_author") or {}
+    user_commits = commits_per_author.get(username)
+    all_authors = sorted(commits_per_author.items(), key=lambda x: -(x[1] or 0))
+    user_rank = next((i for i, (n, _) in enumerate(all_authors) if n.lower() == username.lower()), -1)
+    commit_pct = f"{(user_commits / total_commits * 100):.1f}" if total_commits and user_commits is not None else None
+    avg_commits_per_week = f"{(user_commits / max(1, (duration_days or 1) / 7)):.1f}" if duration_days and user_commits is not None else None
+
+    breakdown = (user_role or {}).get("contribution_breakdown") or {}
+    breakdown_entries = sorted([(k, v) for k, v in breakdown.items() if v > 0], key=lambda x: -x[1])
+    ext_entries = sorted(
+        [(ext, cnt) for ext, cnt in (files_summary.get("extensions") or {}).items() if ext],
+        key=lambda x: -x[1]
+    )[:6]
+
+    return {
+        "id": project["id"],
+        "name": project["custom_name"] or project["name"],
+        "is_featured": featured,
+        "is_collaborative": len(contributors) > 1,
+        "thumb": thumb,
+        "repo_url": project.get("repo_url") or (detail.get("project") or {}).get("repo_url") or None,
+        "llm_summary": llm_summary,
+        "languages": detail.get("languages") or [],
+        "frameworks": detail.get("frameworks") or [],
+        "skills": detail.get("skills") or [],
+        "contributors": contributors,
+        "ext_entries": ext_entries,
+        "evidence": detail.get("evidence") or [],
+        "total_commits": total_commits,
+        "total_lines_added": sum(v or 0 for v in lines_added_per_author.values()) or None,
+        "total_files": files_summary.get("total_files") or 0,
+        "duration_days": duration_days,
+        "project_start": (str(git.get("project_start") or "")[:10]) or None,
+        "project_end": (str(git.get("project_end") or "")[:10]) or None,
+        "user_commits": user_commits,
+        "commit_pct": commit_pct,
+        "avg_commits_per_week": avg_commits_per_week,
+        "lines_added": lines_added_per_author.get(username),
+        "lines_removed": lines_removed_per_author.get(username),
+        "user_rank": user_rank,
+        "all_authors_count": len(all_authors),
+        "rank_score": detail.get("rank_score"),
+        "user_role": user_role,
+        "breakdown_entries": breakdown_entries,
+    }
+
+
+def skills_timeline_rows(projects: Iterable[Dict[str, Any]], details: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Rows of the skills timeline: the most widespread skills, each with a dot per project start date."""
+    skill_entries = []
+    for p in projects:
+        pid = p["id"]
+        detail = details.get(pid, {})
+        git = detail.get("git_metrics") or {}
+        start_raw = git.get("project_start") or (detail.get("project") or {}).get("created_at") or None
+        date_str = str(start_raw)[:10] if start_raw else None
+        if not date_str or len(date_str) < 10:
+            continue
+        name = (p.get("custom_name") or p.get("name") or "")
+        for skill in detail.get("skills") or []:
+            if skill:
+                skill_entries.append({"skill": skill, "projectId": pid, "projectName": name, "date": date_str})
+
+    skill_project_counts: dict = {}
+    for e in skill_entries:
+        skill_project_counts.setdefault(e["skill"], set()).add(e["projectId"])
+    top_skills = sorted(skill_project_counts.keys(), key=lambda s: (-len(skill_project_counts[s]), s))[:MAX_TIMELINE_SKILLS]
+    top_skill_set = set(top_skills)
+    filtered_entries = [e for e in skill_entries if e["skill"] in top_skill_set]
+
+    rows = []
+    for skill in top_skills:
+        dots = sorted([e for e in filtered_entries if e["skill"] == skill], key=lambda e: e["date"])
+        rows.append({"skill": skill, "dots": [{"projectName": d["projectName"], "date": d["date"]} for d in dots]})
+    rows.sort(key=lambda r: r["dots"][0]["date"])
+    return rows
+
+
+def _parse_iso(s: Any) -> Optional[_dt.date]:
+    try:
+        return _dt.date(int(s[:4]), int(s[5:7]), int(s[8:10]))
+    except Exception:
+        return None
+
+
+def _project_card_html(proj: Dict[str, Any], extra_class: str = "") -> str:
+    name = _h(proj["name"])
+    thumb = proj["thumb"]
+    summary = _h(proj["llm_summary"]) if proj["llm_summary"] else "No summary available."
+    thumb_html = (
+        f'<img src="{thumb}" alt="{name} thumbnail" />'
+        if thumb
+        else '<span class="project-card-no-thumb">No thumbnail</span>'
+    )
+    return f"""
+        <div class="project-card-16-9 {extra_class}" onclick="openModal({proj["id"]})" style="cursor:pointer">
+          <div class="project-card-header">
+            <span class="project-card-name">{name}</span>
+          </div>
+          <div class="project-card-image">{thumb_html}</div>
+          <div class="project-card-footer">
+            <p class="project-card-summary">{summary}</p>
+          </div>
+        </div>"""
+
+
+def _cell_color(value: Any, mx: Any) -> str:
+    if not value or value <= 0 or mx <= 0:
+        return "rgba(241, 245, 249, 0.08)"
+    ratio = min(1, value / mx)
+    alpha = 0.22 + (ratio * 0.78)
+    return f"rgba(74, 222, 128, {alpha:.3f})"
+
+
+def _heatmap_html(proj: Dict[str, Any], hdata: Dict[str, Any]) -> str:
+    """Weekly contribution heatmap of one project, with its summary stats and legend."""
+    cells = hdata.get("cells") or []
+    max_val = hdata.get("max_value") or 1
+    range_start = hdata.get("range_start") or ""
+    range_end = hdata.get("range_end") or ""
+
+    def start_of_week_monday(d):
+        return d - _dt.timedelta(days=(d.weekday()))
+
+    values_by_week = {c["period"]: c["value"] for c in cells if c.get("period")}
+    sorted_periods = sorted(values_by_week.keys())
+    first_cell = _parse_iso(sorted_periods[0]) if sorted_periods else None
+    last_cell = _parse_iso(sorted_periods[-1]) if sorted_periods else None
+    start_date = _parse_iso(range_start) or first_cell
+    end_date = _parse_iso(range_end) or last_cell
+    if not start_date or not end_date:
+        return _NO_HEATMAP
+
+    week_entries = []
+    cursor = start_of_week_monday(start_date)
+    end_week = start_of_week_monday(end_date)
+    while cursor <= end_week:
+        iso = cursor.isoformat()
+        week_entries.append({"period": iso, "value": values_by_week.get(iso, 0)})
+        cursor += _dt.timedelta(days=7)
+
+    if not week_entries:
+        return _NO_HEATMAP
+
+    total_val = sum(e["value"] for e in week_entries)
+    active_weeks = sum(1 for e in week_entries if e["value"] > 0)
+    consistency_pct = round(active_weeks / len(week_entries) * 100) if week_entries else 0
+    avg_active = round((total_val / active_weeks) * 10) / 10 if active_weeks > 0 else 0
+
+    def fmt_week(iso):
+        d = _parse_iso(iso)
+        if not d:
+            return iso
+        return d.strftime("%b %-d") if os.name != "nt" else d.strftime("%b %d").lstrip("0") or d.strftime("%b %d")
+
+    cells_html = "".join(
+        f'<span class="heatmap-cell heatmap-cell--week" '
+        f'title="Week of {e["period"]}: {e["value"]} commit(s)" '
+        f'style="background-color:{_cell_color(e["value"], max_val)}"></span>'
+        for e in week_entries
+    )
+    labels_html = "".join(
+        f'<span class="heatmap-week-label">{_h(fmt_week(e["period"])) if i % 6 == 0 or i == len(week_entries) - 1 else ""}</span>'
+        for i, e in enumerate(week_entries)
+    )
+    legend1 = _cell_color(1, max_val)
+    legend2 = _cell_color(max(1, max_val // 2), max_val)
+    legend3 = _cell_color(max_val, max_val)
+
+    def safe_fmt(iso):
+        d = _parse_iso(iso)
+        if not d:
+            return iso
+        return d.strftime("%b %d")
+
+    return f"""
+        <div class="heatmap-summary-grid">
+          <div class="heatmap-stat"><span class="heatmap-stat-label">Total</span><span class="heatmap-stat-value">{total_val} commit(s)</span></div>
+          <div class="heatmap-stat"><span class="heatmap-stat-label">Active Weeks</span><span class="heatmap-stat-value">{active_weeks}/{len(week_entries)}</span></div>
+          <div class="heatmap-stat"><span class="heatmap-stat-label">Consistency</span><span class="heatmap-stat-value">{consistency_pct}%</span></div>
+          <div class="heatmap-stat"><span class="heatmap-stat-label">Peak Week</span><span class="heatmap-stat-value">{max_val} commit(s)</span></div>
+        </div>
+        <div class="heatmap-scroll-wrap" aria-label="Project contribution heatmap">
+          <div class="heatmap-scroll-content">
+            <div class="project-heatmap-grid">{cells_html}</div>
+            <div class="project-heatmap-weeks" aria-hidden="true">{labels_html}</div>
+          </div>
+        </div>
+        <div class="heatmap-legend" aria-hidden="true">
+          <span class="heatmap-legend-text">Less</span>
+          <span class="heatmap-legend-swatch" style="background-color:{legend1}"></span>
+          <span class="heatmap-legend-swatch" style="background-color:{legend2}"></span>
+          <span class="heatmap-legend-swatch" style="background-color:{legend3}"></span>
+          <span class="heatmap-legend-text">More</span>
+        </div>
+        <div class="heatmap-meta">
+          <span>{_h(proj["name"])}</span>
+          <span>Duration: {_h(safe_fmt(range_start)) if range_start else "N/A"} - {_h(safe_fmt(range_end)) if range_end else "N/A"}</span>
+          <span>Avg active week: {avg_active} commit(s)</span>
+        </div>"""
+
+
+_TIMELINE_DOT_R = 5
+_TIMELINE_ROW_H = 28
+_TIMELINE_AXIS_H = 20
+_TIMELINE_CHART_W = 600
+_TIMELINE_ROW_COLORS = [
+    "rgba(74,222,128,0.85)", "rgba(52,211,153,0.85)", "rgba(34,197,94,0.85)",
+    "rgba(16,185,129,0.85)", "rgba(5,150,105,0.85)", "rgba(74,222,128,0.65)",
+    "rgba(52,211,153,0.65)", "rgba(34,197,94,0.65)", "rgba(16,185,129,0.65)",
+    "rgba(5,150,105,0.65)",
+]
+
+
+def _skills_timeline_html(rows: List[Dict[str, Any]], project_count: int) -> str:
+    """SVG skills timeline from skills_timeline_rows, spanning the earliest dot to today."""
+    all_dates = [dot["date"] for row in rows for dot in row["dots"]]
+    if not rows or not all_dates:
+        return '<p class="tile-placeholder-text">No skill or date data available.</p>'
+    row_h = _TIMELINE_ROW_H
+    chart_w = _TIMELINE_CHART_W
+
+    min_d = _parse_iso(min(all_dates))
+    max_d = _dt.date.today()
+    span_days = max((max_d - min_d).days, 1)
+
+    def date_to_x(d):
+        return ((d - min_d).days / span_days) * chart_w
+
+    svg_h = len(rows) * row_h + _TIMELINE_AXIS_H
+    tick_count = 4
+    ticks = []
+    for i in range(tick_count + 1):
+        td = min_d + _dt.timedelta(days=int(span_days * i / tick_count))
+        ticks.append((date_to_x(td), td.strftime("%b '%y")))
+
+    label_col_html = "".join(
+        f'<div class="skills-timeline-label" style="height:{row_h}px;background:{"rgba(255,255,255,0.015)" if ri % 2 == 0 else "transparent"}">{_h(row["skill"])}</div>'
+        for ri, row in enumerate(rows)
+    )
+
+    svg_rows = []
+    for ri, row in enumerate(rows):
+        cy = ri * row_h + row_h // 2
+        color = _TIMELINE_ROW_COLORS[ri % len(_TIMELINE_ROW_COLORS)]
+        svg_rows.append(f'<rect x="0" y="{ri * row_h}" width="{chart_w}" height="{row_h}" fill="{"rgba(255,255,255,0.015)" if ri % 2 == 0 else "transparent"}" />')
+        svg_rows.append(f'<line x1="0" y1="{cy}" x2="{chart_w}" y2="{cy}" stroke="rgba(255,255,255,0.1)" stroke-width="1" stroke-dasharray="3 3" />')
+        for dot in row["dots"]:
+            d = _parse_iso(dot["date"])
+            if not d:
+                continue
+            label_text = _h(f'{dot["projectName"]} | {d.strftime("%b %Y")}')
+            svg_rows.append(
+                f'<circle cx="{date_to_x(d):.1f}" cy="{cy}" r="{_TIMELINE_DOT_R}" fill="{color}" stroke="rgba(0,0,0,0.3)" stroke-width="1"><title>{label_text}</title></circle>'
+            )
+
+    axis_labels = "".join(
+        f'<text x="{x:.1f}" y="{len(rows) * row_h + 14}" text-anchor="middle" font-size="10" fill="rgba(255,255,255,0.35)" font-family="inherit">{_h(label)}</text>'
+        for x, label in ticks
+    )
+
+    return f"""
+        <div class="skills-timeline-wrap">
+          <div class="skills-timeline-body">
+            <div class="skills-timeline-labels" style="height:{len(rows) * row_h}px">{label_col_html}</div>
+            <div class="skills-timeline-chart" style="flex:1 1 0;min-width:0;overflow:visible">
+              <svg width="100%" viewBox="0 0 {chart_w} {svg_h}" style="display:block;overflow:visible">
+                {"".join(svg_rows)}{axis_labels}
+              </svg>
+            </div>
+          </div>
+        </div>
+        <div class="heatmap-summary-grid" style="margin-top:0.65rem">
+          <div class="heatmap-stat"><span class="heatmap-stat-label">Number of Skills Detected</span><span class="heatmap-stat-value">{len(rows)}</span></div>
+          <div class="heatmap-stat"><span class="heatmap-stat-label">Span</span><span class="heatmap-stat-value">{round(span_days / 30)}mo</span></div>
+          <div class="heatmap-stat"><span class="heatmap-stat-label">Earliest Skill</span><span class="heatmap-stat-value">{min_d.strftime("%b %Y") if min_d else "-"}</span></div>
+          <div class="heatmap-stat"><span class="heatmap-stat-label">Projects with Skills</span><span class="heatmap-stat-value">{project_count}</span></div>
+        </div>"""
+
+
+_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8" />
+<meta name="viewport" content="width=device-width, initial-scale=1.0" />
+<title>{title} - Portfolio</title>
+<link rel="preconnect" href="https://fonts.googleapis.com" />
+<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin />
+<link href="https://fonts.googleapis.com/css2?family=DM+Sans:wght@400;500;600;700&family=DM+Mono:wght@400;500&display=swap" rel="stylesheet" />
+
+"""
+
+_STYLE = """
+/* ----- Variables ----- */
+:root {
+  --bg-surface:     rgba(255,255,255,0.04);
+  --bg-surface-md:  rgba(255,255,255,0.07);
+  --bg-surface-hi:  rgba(255,255,255,0.10);
+  --border:         rgba(255,255,255,0.08);
+  --border-md:      rgba(255,255,255,0.13);
+  --text-primary:   #f1f5f9;
+  --text-secondary: rgba(241,245,249,0.55);
+  --text-muted:     rgba(241,245,249,0.32);
+  --accent-green:   #4ade80;
+  --accent-cyan:    #22d3ee;
+  --accent-red:     #f87171;
+  --radius-sm:      8px;
+  --radius-md:      12px;
+  --radius-lg:      16px;
+  --shadow-sm:      0 2px 8px rgba(0,0,0,0.3);
+  --shadow-md:      0 6px 20px rgba(0,0,0,0.4);
+  --shadow-lg:      0 12px 40px rgba(0,0,0,0.5);
+}
+
+/* ----- Reset & Base ----- */
+*, *::before, *::after { box-sizing: border-box; }
+html { scroll-behavior: smooth; }
+body {
+  font-family: 'DM Sans','Inter',-apple-system,BlinkMacSystemFont,sans-serif;
+  margin: 0;
+  padding: 1.75rem;
+  background: radial-gradient(circle at center,#0a5948,#08271f 80%);
+  background-attachment: fixed;
+  color: var(--text-primary);
+  min-height: 100vh;
+  -webkit-font-smoothing: antialiased;
+}
+h1,h2,h3,h4,h5 { color: var(--text-primary); letter-spacing: -0.02em; }
+p { color: var(--text-secondary); line-height: 1.6; }
+a { color: var(--accent-cyan); }
+::-webkit-scrollbar { width: 6px; height: 6px; }
+::-webkit-scrollbar-track { background: transparent; }
+::-webkit-scrollbar-thumb { background: rgba(255,255,255,0.12); border-radius: 99px; }
+input, select {
+  font-family: inherit;
+  font-size: 0.88rem;
+  background: var(--bg-surface);
+  border: 1px solid var(--border-md);
+  border-radius: var(--radius-sm);
+  color: var(--text-primary);
+  padding: 0.5rem 0.75rem;
+  outline: none;
+}
+select option { background: #1a2535; color: var(--text-primary); }
+button {
+  font-family: inherit;
+  font-size: 0.88rem;
+  font-weight: 600;
+  padding: 0.6rem 1.1rem;
+  border: 1px solid var(--border-md);
+  border-radius: var(--radius-sm);
+  background: linear-gradient(135deg,var(--accent-green),var(--accent-cyan));
+  color: #0f172a;
+  cursor: pointer;
+  margin: 0.2rem;
+  box-shadow: 0 2px 12px rgba(74,222,128,0.2);
+  transition: transform 0.15s ease,box-shadow 0.15s ease,opacity 0.15s ease;
+  letter-spacing: 0.01em;
+}
+button:hover { transform: translateY(-1px); box-shadow: 0 6px 20px rgba(74,222,128,0.3); opacity: 0.92; }
+button:active { transform: translateY(0); }
+
+/* ----- Layout ----- */
+.page-shell { max-width: 76rem; margin: 0 auto; text-align: center; }
+.portfolio-page { display: flex; flex-direction: column; gap: 1.5rem; text-align: left; }
+.portfolio-dashboard { display: grid; gap: 1.5rem; }
+
+/* ----- Portfolio header & tiles ----- */
+.portfolio-header {
+  background: var(--bg-surface);
+  border: 1px solid var(--border);
+  border-radius: var(--radius-lg);
+  padding: 1.5rem 2rem;
+  box-shadow: var(--shadow-sm);
+}
+.portfolio-dashboard-name { font-size: 1.5rem; font-weight: 700; color: var(--text-primary); margin: 0 0 0.5rem; letter-spacing: -0.02em; }
+.portfolio-header-summary { margin: 0; font-size: 0.88rem; color: var(--text-secondary); }
+
+.portfolio-tile {
+  background: var(--bg-surface);
+  border: 1px solid var(--border);
+  border-radius: var(--radius-lg);
+  padding: 1.2rem;
+  box-shadow: var(--shadow-sm);
+  min-width: 0;
+  max-width: 100%;
+}
+.tile-heading { margin: 0 0 0.8rem; font-size: 0.75rem; font-weight: 700; letter-spacing: 0.09em; text-transform: uppercase; color: var(--text-muted); }
+.tile-placeholder-text { color: var(--text-muted); font-size: 0.88rem; margin: 0 0 0.5rem; }
+
+/* ----- Hero action button ----- */
+.hero-action-button {
+  display: inline-flex;
+  align-items: center;
+  justify-content: center;
+  min-height: 2.65rem;
+  padding: 0.55rem 1rem;
+  background: var(--bg-surface-md);
+  border: 1px solid var(--border);
+  border-radius: var(--radius-sm);
+  color: var(--text-secondary);
+  font-size: 0.85rem;
+  font-weight: 600;
+  cursor: pointer;
+  text-decoration: none;
+  box-shadow: none;
+  transition: background 0.15s ease,border-color 0.15s ease,transform 0.15s ease;
+}
+.hero-action-button:hover { background: var(--bg-surface-hi); border-color: var(--border-md); transform: translateY(-1px); box-shadow: none; }
+
+/* ----- Heatmap ----- */
+.heatmap-toolbar { display: flex; align-items: center; justify-content: space-between; gap: 0.7rem; flex-wrap: wrap; margin-bottom: 0.7rem; }
+.portfolio-form-label { display: flex; flex-direction: column; gap: 0.4rem; font-weight: 600; font-size: 0.88rem; color: var(--text-secondary); }
+
+.heatmap-panel { min-height: 188px; background: linear-gradient(180deg,rgba(255,255,255,0.04),rgba(255,255,255,0.02)); border: 1px solid var(--border); border-radius: var(--radius-sm); padding: 0.75rem; max-width: 100%; overflow: hidden; }
+.heatmap-scroll-wrap { overflow-x: auto; overflow-y: hidden; max-width: 100%; }
+.heatmap-scroll-content { width: max-content; min-width: 100%; }
+
+.heatmap-summary-grid { display: grid; grid-template-columns: repeat(4,minmax(0,1fr)); gap: 0.45rem; margin-bottom: 0.65rem; }
+.heatmap-stat { background: rgba(255,255,255,0.04); border: 1px solid rgba(255,255,255,0.08); border-radius: 8px; padding: 0.4rem 0.48rem; display: grid; gap: 0.15rem; }
+.heatmap-stat-label { font-size: 0.66rem; color: var(--text-muted); text-transform: uppercase; letter-spacing: 0.06em; }
+.heatmap-stat-value { font-size: 0.78rem; color: var(--text-primary); font-weight: 700; line-height: 1.1; }
+
+.project-heatmap-grid { display: grid; grid-template-rows: 18px; grid-auto-flow: column; grid-auto-columns: 26px; gap: 4px; overflow: visible; padding: 0.2rem; }
+.heatmap-cell { width: 26px; height: 18px; border-radius: 2px; border: 1px solid rgba(255,255,255,0.06); background: rgba(241,245,249,0.08); }
+.heatmap-cell--week { border-radius: 3px; }
+.project-heatmap-weeks { display: grid; grid-template-rows: 16px; grid-auto-flow: column; grid-auto-columns: 26px; gap: 4px; overflow: visible; margin-top: 0.42rem; padding: 0 0.2rem; }
+.heatmap-week-label { font-size: 0.62rem; line-height: 1; color: var(--text-muted); white-space: nowrap; }
+
+.heatmap-legend { display: flex; align-items: center; gap: 0.35rem; margin-top: 0.45rem; }
+.heatmap-legend-swatch { width: 14px; height: 10px; border-radius: 3px; border: 1px solid rgba(255,255,255,0.08); }
+.heatmap-legend-text { font-size: 0.68rem; color: var(--text-muted); }
+.heatmap-meta { display: flex; justify-content: flex-start; flex-wrap: wrap; gap: 0.6rem; margin-top: 0.7rem; font-size: 0.78rem; color: var(--text-secondary); }
+
+.heatmap-scope-toggle { display: flex; border: 1px solid var(--border-md); border-radius: var(--radius-sm); overflow: hidden; flex-shrink: 0; align-self: flex-end; }
+.scope-btn { font-family: inherit; font-size: 0.8rem; font-weight: 600; padding: 0.38rem 0.85rem; border: none; border-radius: 0; background: transparent; color: var(--text-secondary); cursor: pointer; margin: 0; box-shadow: none; transition: background 0.15s,color 0.15s; letter-spacing: 0.01em; }
+.scope-btn + .scope-btn { border-left: 1px solid var(--border-md); }
+.scope-btn--active { background: var(--bg-surface-hi); color: var(--text-primary); }
+.scope-btn:hover:not(.scope-btn--active) { background: var(--bg-surface-md); color: var(--text-primary); }
+
+/* ----- Skills timeline ----- */
+.skills-timeline-wrap { display: flex; flex-direction: column; gap: 0; }
+.skills-timeline-body { display: flex; align-items: flex-start; background: linear-gradient(180deg,rgba(255,255,255,0.04),rgba(255,255,255,0.02)); border-radius: 8px; border: 1px solid rgba(255,255,255,0.07); padding: 0.5rem 0.75rem 0.5rem 0.5rem; overflow: hidden; }
+.skills-timeline-labels { flex-shrink: 0; display: flex; flex-direction: column; padding-right: 0.5rem; }
+.skills-timeline-label { display: flex; align-items: center; font-size: 11px; color: rgba(255,255,255,0.65); white-space: nowrap; padding: 0 6px 0 2px; user-select: none; }
+.skills-timeline-chart { flex: 1 1 0; min-width: 0; overflow: visible; }
+
+/* ----- Project cards ----- */
+.featured-card-container { display: flex; flex-direction: row; justify-content: center; gap: 0.9rem; margin-top: 0.8rem; }
+.all-projects-card-container { display: flex; flex-direction: row; flex-wrap: wrap; justify-content: center; gap: 0.9rem; margin-top: 0.8rem; }
+.all-projects-header { display: flex; justify-content: space-between; align-items: center; flex-wrap: wrap; gap: 0.6rem; margin-bottom: 0.5rem; }
+.all-projects-search { display: flex; gap: 0.5rem; align-items: center; }
+.all-projects-search input { width: 180px; }
+
+.project-card-16-9 { display: flex; flex-direction: column; border: 1px solid var(--border); border-radius: var(--radius-md); background: var(--bg-surface-md); overflow: hidden; cursor: pointer; transition: transform 0.18s ease,box-shadow 0.18s ease,border-color 0.18s ease; }
+.project-card-16-9.featured { flex: 0 0 calc((100% - 1.8rem) / 3); }
+.project-card-16-9.all-projects { flex: 0 0 calc((100% - 2.7rem) / 4); }
+.project-card-16-9:hover { transform: translateY(-3px); box-shadow: var(--shadow-md); border-color: var(--border-md); }
+.project-card-header { display: flex; align-items: center; justify-content: space-between; padding: 0.45rem 0.6rem 0.45rem 0.7rem; background: var(--bg-surface-hi); border-bottom: 1px solid var(--border); min-height: 2rem; gap: 0.4rem; }
+.project-card-name { font-weight: 700; font-size: 0.82rem; color: var(--text-primary); line-height: 1.25; word-break: break-word; flex: 1; min-width: 0; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+.project-card-image { position: relative; width: 100%; aspect-ratio: 16/9; background: var(--bg-surface-md); overflow: hidden; flex-shrink: 0; }
+.project-card-image img { position: absolute; inset: 0; width: 100%; height: 100%; object-fit: cover; display: block; }
+.project-card-no-thumb { position: absolute; inset: 0; display: flex; align-items: center; justify-content: center; color: var(--text-muted); font-size: 0.75rem; letter-spacing: 0.04em; opacity: 0.5; }
+.project-card-footer { padding: 0.4rem 0.7rem 0.5rem; background: var(--bg-surface-md); border-top: 1px solid var(--border); min-height: 2.2rem; }
+.project-card-summary { font-size: 0.72rem; color: var(--text-secondary); line-height: 1.4; display: -webkit-box; -webkit-line-clamp: 2; line-clamp: 2; -webkit-box-orient: vertical; overflow: hidden; }
+
+/* ----- Modal ----- */
+.modal-overlay { position: fixed; inset: 0; background: rgba(0,0,0,0.75); backdrop-filter: blur(6px); display: flex; align-items: center; justify-content: center; z-index: 9999; }
+.modal-overlay::before { content: ""; position: absolute; inset: 0; background: radial-gradient(circle at center,rgba(74,222,128,0.08),transparent 60%); pointer-events: none; }
+.modal-card { width: 720px; max-width: 95vw; max-height: 85vh; overflow-y: auto; background: radial-gradient(circle at center,#0a5948,#08271f 80%); border: 1px solid rgba(74,222,128,0.18); border-radius: var(--radius-lg); padding: 1.3rem; box-shadow: var(--shadow-lg); position: relative; text-align: left; }
+.modal-actions { display: flex; justify-content: flex-end; gap: 0.5rem; }
+
+.panel-eyebrow { display: inline-block; font-size: 0.72rem; font-weight: 700; letter-spacing: 0.1em; text-transform: uppercase; color: var(--text-muted); }
+.modal-section { padding: 1rem; border-radius: var(--radius-md); background: linear-gradient(135deg,rgba(74,222,128,0.06),rgba(34,211,238,0.06)),rgba(255,255,255,0.03); border: 1px solid rgba(74,222,128,0.12); margin-bottom: 0.9rem; }
+.modal-section .panel-eyebrow { display: block; margin-bottom: 0.5rem; }
+.modal-section-body { margin: 0.25rem 0 0; font-size: 0.84rem; color: var(--text-primary); line-height: 1.55; }
+.modal-section-body--primary { color: var(--text-primary); }
+.modal-date-range { display: block; margin-top: 0.2rem; font-size: 0.78rem; color: var(--text-muted); letter-spacing: 0.02em; }
+.modal-grid-row, .modal-full-row { margin-bottom: 0.9rem; }
+.modal-grid-row .detail-card, .modal-full-row.detail-card { background: linear-gradient(135deg,rgba(74,222,128,0.06),rgba(34,211,238,0.06)),rgba(255,255,255,0.03); border-color: rgba(74,222,128,0.12); border-radius: var(--radius-md); }
+
+.modal-tiles-heading { display: block; font-size: 0.72rem; letter-spacing: 0.08em; text-transform: uppercase; color: var(--text-muted); margin-top: 0.9rem; margin-bottom: 0.5rem; }
+.modal-metric-tiles { display: grid; grid-template-columns: repeat(4,1fr); gap: 0.6rem; margin-bottom: 0.9rem; }
+.modal-metric-tiles--2x2 { grid-template-columns: repeat(2,1fr); grid-auto-rows: 1fr; }
+
+.metric-tile { display: flex; flex-direction: column; align-items: center; justify-content: center; align-self: stretch; padding: 1rem; border-radius: var(--radius-md); background: linear-gradient(135deg,rgba(74,222,128,0.06),rgba(34,211,238,0.06)),rgba(255,255,255,0.03); border: 1px solid rgba(74,222,128,0.12); text-align: center; gap: 0.25rem; }
+.metric-tile-value { font-size: 1.15rem; font-weight: 700; color: var(--accent-green); line-height: 1.1; }
+.metric-tile-label { font-size: 0.72rem; font-weight: 600; letter-spacing: 0.05em; text-transform: uppercase; color: var(--text-primary); margin-top: 0.2rem; }
+.metric-tile--multi { flex-direction: row; align-items: stretch; gap: 0; padding: 0; overflow: hidden; }
+.metric-col { display: flex; flex-direction: column; align-items: center; justify-content: center; flex: 1; padding: 0.75rem 0.4rem; gap: 0.1rem; border-right: 1px solid rgba(74,222,128,0.1); }
+.metric-col:last-child { border-right: none; }
+.metric-col-value { font-size: 1.15rem; font-weight: 700; color: var(--accent-green); line-height: 1.1; }
+.metric-col-value--added { color: var(--accent-green); }
+.metric-col-value--removed { color: var(--accent-red); }
+.metric-col-label { font-size: 0.72rem; font-weight: 600; letter-spacing: 0.05em; text-transform: uppercase; color: var(--text-primary); margin-top: 0.2rem; }
+.metric-col-sub { font-size: 0.68rem; color: var(--text-primary); opacity: 0.7; }
+
+.chip-cloud { display: flex; flex-wrap: wrap; gap: 0.55rem; }
+.detail-chip { display: inline-flex; align-items: center; padding: 0.45rem 0.72rem; border-radius: 999px; background: rgba(34,211,238,0.1); border: 1px solid rgba(34,211,238,0.16); color: var(--text-primary); font-size: 0.82rem; }
+.chip-count { margin-left: 0.3rem; opacity: 0.55; font-size: 0.78rem; }
+.modal-chip-cloud-gap { margin-top: 0.5rem; }
+
+.detail-card { background: rgba(255,255,255,0.03); border: 1px solid var(--border); border-radius: var(--radius-lg); padding: 1rem; }
+.detail-card-header { display: flex; justify-content: space-between; align-items: start; gap: 0.8rem; margin-bottom: 0.85rem; }
+.detail-grid { display: grid; grid-template-columns: minmax(0,1.35fr) minmax(280px,0.8fr); gap: 0.9rem; }
+
+.modal-evidence-list { display: grid; gap: 0.6rem; margin-top: 0.5rem; }
+.modal-evidence-item { padding: 1rem; border-radius: var(--radius-md); background: linear-gradient(135deg,rgba(74,222,128,0.06),rgba(34,211,238,0.06)),rgba(255,255,255,0.03); border: 1px solid rgba(74,222,128,0.12); }
+.modal-evidence-type { font-size: 0.78rem; font-weight: 700; letter-spacing: 0.05em; text-transform: uppercase; color: var(--text-muted); }
+.modal-evidence-link { color: var(--accent-green); text-decoration: none; display: block; }
+.modal-evidence-link:hover { text-decoration: underline; }
+
+/* ----- Responsive ----- */
+@media (max-width: 900px) {
+  .project-card-16-9.featured { flex: 0 0 calc((100% - 0.9rem) / 2); }
+  .project-card-16-9.all-projects { flex: 0 0 calc((100% - 0.9rem) / 2); }
+  .heatmap-summary-grid { grid-template-columns: repeat(2,minmax(0,1fr)); }
+}
+@media (max-width: 540px) {
+  .featured-card-container { flex-direction: column; }
+  .all-projects-card-container { flex-direction: column; }
+  .project-card-16-9.featured, .project-card-16-9.all-projects { flex: 1 1 auto; }
+}
+@media (max-width: 520px) {
+  .modal-metric-tiles { grid-template-columns: repeat(2,1fr); }
+}
+"""
+
+_MODAL_JS = r"""function fmt(n) { return n != null ? Number(n).toLocaleString() : null; }
+
+function escHtml(s) {
+  if (s == null) return '';
+  return String(s).replace(/&/g,'&amp;').replace(/</g,'&lt;').replace(/>/g,'&gt;').replace(/"/g,'&quot;');
+}
+
+function chip(text, count) {
+  return `<span class="detail-chip">${escHtml(text)}${count != null ? `<span class="chip-count">×${count}</span>` : ''}</span>`;
+}
+
+function metricTile(value, label) {
+  return `<div class="metric-tile"><span class="metric-tile-value">${escHtml(String(value))}</span><span class="metric-tile-label">${escHtml(label)}</span></div>`;
+}
+
+function openModal(pid) {
+  const p = MODAL_DATA[String(pid)];
+  if (!p) return;
+  const name = escHtml(p.name || '(unnamed)');
+  const collab = p.is_collaborative ? 'Collaborative' : 'Individual';
+
+  let html = `<div class="detail-card-header" style="margin-bottom:1rem">
+    <div>
+      <span class="panel-eyebrow">Project · ${collab}</span>
+      <h3 style="margin:0">${name}</h3>`;
+  if (p.project_start || p.project_end) {
+    html += `<span class="modal-date-range">${escHtml(p.project_start || '?')} → ${escHtml(p.project_end || 'present')}</span>`;
+  }
+  html += `</div><button type="button" class="hero-action-button" onclick="closeModal()">✕ Close</button></div>`;
+
+  // Thumbnail
+  if (p.thumb) {
+    html += `<div style="position:relative;width:100%;aspect-ratio:16/9;margin-bottom:1rem;overflow:hidden">
+      <img src="${p.thumb}" alt="${name} thumbnail" style="position:absolute;inset:0;width:100%;height:100%;object-fit:contain" />
+    </div>`;
+  }
+
+  // LLM Summary
+  if (p.llm_summary) {
+    html += `<div class="modal-section"><span class="panel-eyebrow">About</span><p class="modal-section-body">${escHtml(p.llm_summary)}</p></div>`;
+  }
+
+  // Languages & Frameworks
+  const langs = (p.languages || []).concat(p.frameworks || []);
+  const exts = p.ext_entries || [];
+  if (langs.length || exts.length) {
+    html += `<div class="detail-grid modal-grid-row">`;
+    if (langs.length) {
+      html += `<article class="detail-card"><div class="detail-card-header"><span class="panel-eyebrow">Languages &amp; Frameworks</span></div><div class="chip-cloud">${langs.map(l => chip(l)).join('')}</div></article>`;
+    }
+    if (exts.length) {
+      html += `<article class="detail-card"><div class="detail-card-header"><span class="panel-eyebrow">File Breakdown</span></div><div class="chip-cloud">${exts.map(([ext,cnt]) => chip(ext, cnt)).join('')}</div></article>`;
+    }
+    html += `</div>`;
+  }
+
+  // Skills
+  if ((p.skills || []).length) {
+    html += `<article class="detail-card modal-full-row"><div class="detail-card-header"><span class="panel-eyebrow">Skills</span></div><div class="chip-cloud">${p.skills.map(s => chip(s)).join('')}</div></article>`;
+  }
+
+  // Project Metrics
+  const hasProjMetrics = p.total_commits != null || p.total_lines_added != null || p.total_files > 0 || p.duration_days != null;
+  if (hasProjMetrics) {
+    html += `<span class="modal-tiles-heading">Project Metrics</span><div class="modal-metric-tiles">`;
+    if (p.total_commits != null) html += metricTile(fmt(p.total_commits), 'Total Commits');
+    if (p.total_lines_added != null) html += metricTile(fmt(p.total_lines_added), 'Lines of Code');
+    if (p.total_files > 0) html += metricTile(fmt(p.total_files), 'Files');
+    if (p.duration_days != null) html += metricTile(fmt(p.duration_days), 'Days Active');
+    html += `</div>`;
+  }
+
+  // User Metrics
+  const displayName = EXPORT_DISPLAY_NAME;
+  const hasUserMetrics = p.user_commits != null || p.lines_added != null || p.lines_removed != null || p.user_rank >= 0 || p.rank_score != null;
+  if (hasUserMetrics) {
+    html += `<span class="modal-tiles-heading">${escHtml(displayName)}'s Metrics</span><div class="modal-metric-tiles modal-metric-tiles--2x2">`;
+    if (p.user_commits != null) {
+      html += `<div class="metric-tile metric-tile--multi">
+        <div class="metric-col"><span class="metric-col-value">${fmt(p.user_commits)}</span><span class="metric-col-label">Total</span><span class="metric-col-sub">commits</span></div>`;
+      if (p.commit_pct != null) html += `<div class="metric-col"><span class="metric-col-value">${escHtml(p.commit_pct)}%</span><span class="metric-col-label">Share</span><span class="metric-col-sub">of project</span></div>`;
+      if (p.avg_commits_per_week != null) html += `<div class="metric-col"><span class="metric-col-value">${escHtml(p.avg_commits_per_week)}</span><span class="metric-col-label">Avg</span><span class="metric-col-sub">per week</span></div>`;
+      html += `</div>`;
+    }
+    if (p.lines_added != null || p.lines_removed != null) {
+      html += `<div class="metric-tile metric-tile--multi">
+        <div class="metric-col"><span class="metric-col-value metric-col-value--added">+${fmt(p.lines_added ?? 0)}</span><span class="metric-col-label">Added</span><span class="metric-col-sub">lines</span></div>
+        <div class="metric-col"><span class="metric-col-value metric-col-value--removed">-${fmt(p.lines_removed ?? 0)}</span><span class="metric-col-label">Removed</span><span class="metric-col-sub">lines</span></div>
+      </div>`;
+    }
+    if (p.user_rank >= 0 && p.all_authors_count > 1) {
+      html += metricTile(`#${p.user_rank + 1}`, `Contributor Rank of ${p.all_authors_count}`);
+    }
+    if (p.rank_score != null) {
+      html += metricTile(`${Math.round(p.rank_score * 100)}/100`, 'Rank Score');
+    }
+    html += `</div>`;
+  }
+
+  // User Role
+  const role = p.user_role;
+  if (role) {
+    html += `<div class="modal-section"><span class="panel-eyebrow">${escHtml(displayName)}'s Role</span>
+      <p class="modal-section-body modal-section-body--primary">${escHtml(role.primary_role)}${role.role_description ? ` - ${escHtml(role.role_description)}` : ''}</p>
+      <p class="modal-section-body">Confidence: ${Math.round((role.confidence || 0) * 100)}%</p>`;
+    if ((role.secondary_roles || []).length) {
+      html += `<p class="modal-section-body" style="color:var(--text-secondary)">Also: ${role.secondary_roles.map(escHtml).join(', ')}</p>`;
+    }
+    if ((p.breakdown_entries || []).length) {
+      html += `<div class="chip-cloud modal-chip-cloud-gap">${p.breakdown_entries.map(([cat, pct]) => `<span class="detail-chip">${escHtml(cat)}<span class="chip-count">${Math.round(pct)}%</span></span>`).join('')}</div>`;
+    }
+    html += `</div>`;
+  }
+
+  // Evidence
+  if ((p.evidence || []).length) {
+    html += `<div class="modal-section"><span class="panel-eyebrow">Evidence of Success</span><div class="modal-evidence-list">`;
+    for (const ev of p.evidence) {
+      html += `<div class="modal-evidence-item">
+        <p class="modal-section-body modal-section-body--primary"><span class="modal-evidence-type">${escHtml(ev.type)}</span>${ev.description ? ` - ${escHtml(ev.description)}` : ''}</p>
+        ${ev.value ? `<p class="modal-section-body">${escHtml(ev.value)}</p>` : ''}
+        ${ev.url ? `<a class="modal-section-body modal-evidence-link" href="${escHtml(ev.url)}" target="_blank" rel="noreferrer">${escHtml(ev.source || ev.url)}</a>` : ''}
+      </div>`;
+    }
+    html += `</div></div>`;
+  }
+
+  // Actions
+  html += `<div class="modal-actions">`;
+  if (p.repo_url) {
+    html += `<a class="hero-action-button" href="${escHtml(p.repo_url)}" target="_blank" rel="noreferrer">Open Repository</a>`;
+  }
+  html += `<button type="button" class="hero-action-button" onclick="closeModal()">Close</button></div>`;
+
+  document.getElementById('modal-body').innerHTML = html;
+  document.getElementById('project-modal').style.display = 'flex';
+  document.body.style.overflow = 'hidden';
+}
+
+function closeModal() {
+  document.getElementById('project-modal').style.display = 'none';
+  document.body.style.overflow = '';
+}
+
+document.addEventListener('keydown', function(e) {
+  if (e.key === 'Escape') closeModal();
+});
+
+var _heatmapScope = 'user';
+var _heatmapPid = null;
+
+function switchHeatmap(pid) {
+  _heatmapPid = pid;
+  document.querySelectorAll('[id^="heatmap-user-"],[id^="heatmap-project-"]').forEach(el => el.style.display = 'none');
+  const panel = document.getElementById('heatmap-' + _heatmapScope + '-' + pid);
+  if (panel) panel.style.display = 'block';
+}
+
+function setHeatmapScope(scope) {
+  _heatmapScope = scope;
+  // Update button active states
+  document.getElementById('scope-btn-user').classList.toggle('scope-btn--active', scope === 'user');
+  document.getElementById('scope-btn-project').classList.toggle('scope-btn--active', scope === 'project');
+  // Show the correct panel for the currently selected project
+  const select = document.querySelector('.heatmap-toolbar select');
+  const pid = _heatmapPid || (select ? select.value : null);
+  if (pid) switchHeatmap(pid);
+}
+
+// Project search
+document.addEventListener('DOMContentLoaded', function() {
+  const searchInput = document.getElementById('project-search');
+  if (!searchInput) return;
+  searchInput.addEventListener('input', function() {
+    const q = this.value.toLowerCase();
+    document.querySelectorAll('#all-projects-grid .project-card-16-9').forEach(function(card) {
+      const name = (card.querySelector('.project-card-name') || {}).textContent || '';
+      card.style.display = name.toLowerCase().includes(q) ? '' : 'none';
+    });
+  });
+});
+"""
+
+_BODY_OPEN = """
+
+</head>
+<body>
+<div class="page-shell portfolio-page">
+  <div class="portfolio-dashboard">
+
+    <!-- Header tile -->
+    <section class="portfolio-header">
+      <p class="portfolio-dashboard-name">{display_name}</p>
+      <p class="portfolio-header-summary">{header_summary}</p>
+    </section>
+
+    <!-- Activity Heatmap -->
+    <section class="portfolio-tile">
+      <h3 class="tile-heading">Activity Heatmap</h3>
+      <div class="heatmap-toolbar">
+        <label class="portfolio-form-label" style="margin:0">
+          Project
+          <select onchange="switchHeatmap(this.value)">
+            {selector_options}
+          </select>
+        </label>
+        <div class="heatmap-scope-toggle" id="heatmap-scope-toggle">
+          <button type="button" class="scope-btn scope-btn--active" id="scope-btn-user" onclick="setHeatmapScope('user')">{display_name}</button>
+          <button type="button" class="scope-btn" id="scope-btn-project" onclick="setHeatmapScope('project')">Project-wide</button>
+        </div>
+      </div>
+      """
+
+_TIMELINE_OPEN = """
+    </section>
+
+    <!-- Skills Timeline -->
+    <section class="portfolio-tile">
+      <h3 class="tile-heading">Skills Timeline</h3>
+      """
+
+_FEATURED_OPEN = """
+    </section>
+
+    <!-- Featured Projects -->
+    <section class="portfolio-tile">
+      <h3 class="tile-heading">Featured Projects</h3>
+      <div class="featured-card-container">
+        """
+
+_ALL_PROJECTS_OPEN = """
+      </div>
+    </section>
+
+    <!-- All Projects -->
+    <section class="portfolio-tile">
+      <div class="all-projects-header">
+        <h3 class="tile-heading">All Projects</h3>
+        <div class="all-projects-search">
+          <input type="text" id="project-search" placeholder="Search projects..." />
+        </div>
+      </div>
+      <div class="all-projects-card-container" id="all-projects-grid">
+        """
+
+_SCRIPT_OPEN = """
+      </div>
+    </section>
+
+  </div>
+</div>
+
+<!-- Project Detail Modal -->
+<div id="project-modal" class="modal-overlay" style="display:none" onclick="if(event.target===this)closeModal()" role="dialog" aria-modal="true">
+  <div class="modal-card" onclick="event.stopPropagation()">
+    <div id="modal-body"></div>
+  </div>
+</div>
+
+<script>
+"""
+
+_DOCUMENT_CLOSE = """
+</script>
+</body>
+</html>"""
+
+# Static parts of the page, encoded once
+_STYLE_BYTES = ("<style>" + _STYLE + "</style>").encode("utf-8")
+_MODAL_JS_BYTES = _MODAL_JS.encode("utf-8")
+_TIMELINE_OPEN_BYTES = _TIMELINE_OPEN.encode("utf-8")
+_FEATURED_OPEN_BYTES = _FEATURED_OPEN.encode("utf-8")
+_ALL_PROJECTS_OPEN_BYTES = _ALL_PROJECTS_OPEN.encode("utf-8")
+_SCRIPT_OPEN_BYTES = _SCRIPT_OPEN.encode("utf-8")
+_DOCUMENT_CLOSE_BYTES = _DOCUMENT_CLOSE.encode("utf-8")
+
+
+def iter_portfolio_html(
+    display_name: str,
+    header_summary: str,
+    projects: List[Dict[str, Any]],
+    heatmaps: Dict[str, Dict[int, Dict[str, Any]]],
+    timeline_rows: List[Dict[str, Any]],
+) -> Iterator[bytes]:
+    """
+    Write the export document as UTF-8 chunks, one page section (or one
+    project's heatmap panels, card or modal entry) at a time. projects are
+    export_project_entry dicts; heatmaps maps "user"/"project" to per-project
+    heatmap payloads.
+    """
+    yield _HEAD.format(title=_h(display_name)).encode("utf-8")
+    yield _STYLE_BYTES
+    yield _BODY_OPEN.format(
+        display_name=_h(display_name),
+        header_summary=_h(header_summary),
+        selector_options="".join(f'<option value="{p["id"]}">{_h(p["name"])}</option>' for p in projects),
+    ).encode("utf-8")
+
+    # One panel per scope and project (first project shown), JS toggles between them
+    for i, proj in enumerate(projects):
+        pid = proj["id"]
+        display = "block" if i == 0 else "none"
+        user_panel = _heatmap_html(proj, heatmaps.get("user", {}).get(pid, {}))
+        project_panel = _heatmap_html(proj, heatmaps.get("project", {}).get(pid, {}))
+        yield (
+            f'<div id="heatmap-user-{pid}" class="heatmap-panel" style="display:{display}">{user_panel}</div>\n'
+            f'<div id="heatmap-project-{pid}" class="heatmap-panel" style="display:none">{project_panel}</div>\n'
+        ).encode("utf-8")
+
+    yield _TIMELINE_OPEN_BYTES
+    yield _skills_timeline_html(timeline_rows, len(projects)).encode("utf-8")
+
+    yield _FEATURED_OPEN_BYTES
+    featured = [p for p in projects if p["is_featured"]]
+    if not featured:
+        yield b'<p class="tile-placeholder-text" style="margin:0">No featured projects.</p>'
+    for proj in featured:
+        yield _project_card_html(proj, "featured").encode("utf-8")
+
+    yield _ALL_PROJECTS_OPEN_BYTES
+    for proj in projects:
+        yield _project_card_html(proj, "all-projects").encode("utf-8")
+
+    yield _SCRIPT_OPEN_BYTES
+    yield b"const MODAL_DATA = {"
+    for i, proj in enumerate(projects):
+        yield (("," if i else "") + _js(str(proj["id"])) + ":" + _js(proj)).encode("utf-8")
+    yield f"}};\nconst EXPORT_DISPLAY_NAME = {_js(display_name)};\n".encode("utf-8")
+    yield _MODAL_JS_BYTES
+    yield _DOCUMENT_CLOSE_BYTES
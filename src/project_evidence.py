@@ -1,7 +1,9 @@
 from typing import List, Dict, Optional
 import sqlite3
 import os
+from change_feed import change_feed
 from db import get_connection
+from db_search import reindex_project
 
 # Valid evidence types - used for validation
 EVIDENCE_TYPES = [
@@ -57,8 +59,11 @@ def add_evidence(project_id: int, evidence_data: Dict) -> int:
                 "added_by_user": evidence_data.get("added_by_user", True),
             },
         )
+        evidence_id = cur.lastrowid
+        reindex_project(conn, project_id, kinds=("evidence",))
         conn.commit()
-        return cur.lastrowid
+        change_feed.publish("evidence", conn, action="created", project_id=project_id, evidence_id=evidence_id)
+        return evidence_id
     except Exception:
         conn.rollback()
         raise
@@ -84,6 +89,14 @@ def get_evidence_for_project(project_id: int) -> List[Dict]:
     finally:
         conn.close()
 
+def _reindex_evidence_project(conn, ev_id: int) -> Optional[int]:
+    """Refresh the search documents for the evidence of the project owning ev_id; returns that project's id."""
+    row = conn.execute("SELECT project_id FROM project_evidence WHERE id = ?", (ev_id,)).fetchone()
+    if row:
+        reindex_project(conn, row["project_id"], kinds=("evidence",))
+        return row["project_id"]
+    return None
+
 def update_evidence(ev_id: int, updates: Dict) -> bool:
     """Update specific fields in an evidence row."""
     if not updates:
@@ -98,8 +111,12 @@ def update_evidence(ev_id: int, updates: Dict) -> bool:
             f"UPDATE project_evidence SET {fields} WHERE id = :id",
             updates,
         )
+        updated = cur.rowcount > 0
+        project_id = _reindex_evidence_project(conn, ev_id)
         conn.commit()
-        return cur.rowcount > 0
+        if updated:
+            change_feed.publish("evidence", conn, action="updated", project_id=project_id, evidence_id=ev_id)
+        return updated
     except Exception:
         conn.rollback()
         raise
@@ -112,9 +129,15 @@ def delete_evidence(ev_id: int) -> bool:
     conn.execute('PRAGMA foreign_keys = ON')
     cur = conn.cursor()
     try:
+        row = cur.execute("SELECT project_id FROM project_evidence WHERE id = ?", (ev_id,)).fetchone()
         cur.execute("DELETE FROM project_evidence WHERE id = ?", (ev_id,))
+        deleted = cur.rowcount > 0
+        if row:
+            reindex_project(conn, row["project_id"], kinds=("evidence",))
         conn.commit()
-        return cur.rowcount > 0
+        if deleted:
+            change_feed.publish("evidence", conn, action="deleted", project_id=row["project_id"], evidence_id=ev_id)
+        return deleted
     except Exception:
         conn.rollback()
         raise
@@ -8,9 +8,11 @@ from typing import List, Dict, Optional
 from datetime import datetime
 import re
 
+from change_feed import change_feed
 from db import get_connection
 from sqlite3 import OperationalError
 from contrib_metrics import canonical_username
+from db_stats import top_projects, top_projects_for_contributor
 
 
 def _get_project_collaboration_status(project_name: str) -> str:
@@ -24,11 +26,12 @@ def _get_project_collaboration_status(project_name: str) -> str:
         # Count distinct contributors for this project
         cur.execute(
             "SELECT COUNT(DISTINCT c.id) AS contrib_count "
-            "FROM contributors c "
-            "JOIN file_contributors fc ON c.id = fc.contributor_id "
-            "JOIN files f ON fc.file_id = f.id "
-            "JOIN scans s ON f.scan_id = s.id "
-            "WHERE s.project = ?",
+            "FROM projects p "
+            "JOIN scans s ON s.project_id = p.id "
+            "JOIN files f ON f.scan_id = s.id "
+            "JOIN file_contributors fc ON fc.file_id = f.id "
+            "JOIN contributors c ON c.id = fc.contributor_id "
+            "WHERE p.name = ?",
             (project_name,)
         )
         row = cur.fetchone()
@@ -165,6 +168,7 @@ def save_custom_ranking(name: str, ordered_projects: List[str], description: str
                 (ranking_id, idx, project_name),
             )
         conn.commit()
+        change_feed.publish("rankings", conn, action="saved", name=name)
         return ranking_id
     finally:
         conn.close()
@@ -180,7 +184,10 @@ def delete_custom_ranking(name: str) -> bool:
         _ensure_custom_ranking_tables(conn)
         cur.execute("DELETE FROM custom_rankings WHERE name = ?", (name,))
         conn.commit()
-        return cur.rowcount > 0
+        deleted = cur.rowcount > 0
+        if deleted:
+            change_feed.publish("rankings", conn, action="deleted", name=name)
+        return deleted
     finally:
         conn.close()
 
@@ -195,7 +202,10 @@ def rename_custom_ranking(old_name: str, new_name: str) -> bool:
         _ensure_custom_ranking_tables(conn)
         cur.execute("UPDATE custom_rankings SET name = ? WHERE name = ?", (new_name, old_name))
         conn.commit()
-        return cur.rowcount > 0
+        renamed = cur.rowcount > 0
+        if renamed:
+            change_feed.publish("rankings", conn, action="renamed", name=new_name, previous_name=old_name)
+        return renamed
     finally:
         conn.close()
 
@@ -246,8 +256,8 @@ def rank_projects(order: str = "desc", limit: Optional[int] = None) -> List[Dict
         " MAX(s.scanned_at) AS last_scan,"
         " COUNT(s.id) AS scans_count"
         " FROM scans s"
-        " LEFT JOIN projects p ON p.name = s.project"
-        " GROUP BY COALESCE(p.name, s.project)"
+        " LEFT JOIN projects p ON p.id = s.project_id"
+        " GROUP BY COALESCE(s.project_id, s.project)"
         f" ORDER BY created_at {order.upper()}"
     )
     if limit is not None and isinstance(limit, int) and limit > 0:
@@ -435,164 +445,16 @@ def rank_projects_by_importance(mode: str = "project", contributor_name: Optiona
     This consolidates the previous two separate implementations.
     """
     mode = (mode or "project").lower()
+    # Scores are precomputed after every scan; read them with indexed top-K lookups.
     conn = get_connection()
-    cur = conn.cursor()
-    try:
-        # total files per project (used by both modes)
-        cur.execute(
-            "SELECT s.project AS project, COUNT(f.id) AS total_files "
-            "FROM scans s JOIN files f ON f.scan_id = s.id "
-            "GROUP BY s.project"
-        )
-        totals = {row[0]: row[1] for row in cur.fetchall()}
-
-        if mode == "project":
-            cur.execute(
-                "SELECT s.project AS project, c.name AS contributor, COUNT(DISTINCT f.id) AS file_count "
-                "FROM scans s "
-                "JOIN files f ON f.scan_id = s.id "
-                "JOIN file_contributors fc ON fc.file_id = f.id "
-                "JOIN contributors c ON c.id = fc.contributor_id "
-                "GROUP BY s.project, c.id "
-                "ORDER BY s.project"
-            )
-            rows = cur.fetchall()
-
-            proj_map = {}
-            for project, total in totals.items():
-                proj_map[project] = {
-                    "project": project,
-                    "total_files": total,
-                    "contributors_count": 0,
-                    "top_contributor": None,
-                    "top_contrib_files": 0,
-                    "top_fraction": 0.0,
-                    "_contributors": {},
-                }
-
-            for r in rows:
-                project = r[0]
-                raw_contrib = r[1]
-                fcount = r[2]
-                # normalize contributor name using canonical_username to match contrib_metrics
-                contrib = canonical_username(raw_contrib or "")
-                if project not in proj_map:
-                    proj_map[project] = {
-                        "project": project,
-                        "total_files": totals.get(project, 0),
-                        "contributors_count": 0,
-                        "top_contributor": None,
-                        "top_contrib_files": 0,
-                        "top_fraction": 0.0,
-                        "_contributors": {},
-                    }
-                # accumulate counts for the canonical contributor key
-                proj_map[project]["_contributors"][contrib] = proj_map[project]["_contributors"].get(contrib, 0) + fcount
-
-            # finalize stats
-            result = []
-            for p, info in proj_map.items():
-                contribs = info.pop("_contributors", {})
-                info["contributors_count"] = len(contribs)
-                if contribs:
-                    top_name = max(contribs.items(), key=lambda x: x[1])[0]
-                    top_files = contribs[top_name]
-                    info["top_contributor"] = top_name
-                    info["top_contrib_files"] = top_files
-                    total = info.get("total_files") or 0
-                    second_count = sorted(contribs.values(), reverse=True)[1] if len(contribs) > 1 else 0
-                    coverage = float(top_files) / float(total) if total > 0 else 0.0
-                    dominance_gap = (top_files - second_count) / float(total) if total > 0 else 0.0
-                    team_factor = 1.0 / float(info["contributors_count"]) if info["contributors_count"] > 0 else 0.0
-                    info["top_fraction"] = coverage
-                    info["top_score"] = (0.6 * coverage) + (0.3 * dominance_gap) + (0.1 * team_factor)
-                else:
-                    info["top_fraction"] = 0.0
-                    info["top_score"] = 0.0
-                result.append(info)
-
-            # sort by composite score, then coverage, then size
-            result.sort(key=lambda x: (-x.get("top_score", 0.0), -x.get("top_fraction", 0.0), -x.get("total_files", 0), x["project"]))
-            if limit is not None and isinstance(limit, int) and limit > 0:
-                return result[:limit]
-            return result
-
-        elif mode == "contributor":
-            if not contributor_name:
-                return []
-            # Fetch all contributor counts and canonicalize names, then filter by canonical contributor_name.
-            # Score is intentionally more robust than a raw "percent of files touched" metric by blending three factors:
-            #   - Coverage (60%): Fraction of files touched in the project by this contributor.
-            #     A contributor touching more files shows broader project engagement.
-            #   - Dominance Gap (30%): Lead over the next highest contributor, measured as
-            #     (this_contrib_files - second_highest_files) / total_files.
-            #     This measures how distinctly this person led compared to peers.
-            #     Only counts if this contributor is in the top position.
-            #   - Team Size Factor (10%): Computed as 1 / number_of_contributors.
-            #     Smaller teams give individuals more influence per capita, reflecting
-            #     the reality that one person's work matters more in a 2-person team
-            #     than in a 10-person team.
-            cur.execute(
-                "SELECT s.project AS project, c.name AS contributor, COUNT(DISTINCT f.id) AS contrib_files "
-                "FROM scans s "
-                "JOIN files f ON f.scan_id = s.id "
-                "JOIN file_contributors fc ON fc.file_id = f.id "
-                "JOIN contributors c ON c.id = fc.contributor_id "
-                "GROUP BY s.project, c.id",
-            )
-            rows = cur.fetchall()
-
-            # canonicalize the input contributor name for matching
-            target = canonical_username(contributor_name or "")
-            per_project: Dict[str, Dict[str, int]] = {}
-            for r in rows:
-                project = r[0]
-                raw_contrib = r[1]
-                contrib_files = r[2]
-                canon = canonical_username(raw_contrib or "")
-                per_project.setdefault(project, {})
-                per_project[project][canon] = per_project[project].get(canon, 0) + contrib_files
-
-            result = []
-            for project, contribs in per_project.items():
-                if target not in contribs:
-                    continue
-
-                total = totals.get(project, 0)
-                contrib_files = contribs.get(target, 0)
-                contributors_count = len(contribs)
-
-                coverage = float(contrib_files) / float(total) if total > 0 else 0.0
-
-                # dominance measures how far ahead the contributor is compared to the next highest contributor
-                sorted_counts = sorted(contribs.values(), reverse=True)
-                top_count = sorted_counts[0]
-                second_count = sorted_counts[1] if len(sorted_counts) > 1 else 0
-                dominance_gap = (contrib_files - second_count) / float(total) if total > 0 and contrib_files == top_count else 0.0
-
-                team_factor = 1.0 / float(contributors_count) if contributors_count > 0 else 0.0
-
-                # Weighted composite score for stability across different project sizes/team sizes
-                score = (0.6 * coverage) + (0.3 * dominance_gap) + (0.1 * team_factor)
-
-                result.append({
-                    "project": project,
-                    "contrib_files": contrib_files,
-                    "total_files": total,
-                    "contributors_count": contributors_count,
-                    "score": score,
-                })
-
-            result.sort(key=lambda x: (-x["score"], -x["contrib_files"], x["project"]))
-            if limit is not None and isinstance(limit, int) and limit > 0:
-                return result[:limit]
-            return result
-
-        else:
+    k = limit if isinstance(limit, int) and limit > 0 else None
+    if mode == "project":
+        return top_projects(conn, k)
+    if mode == "contributor":
+        if not contributor_name:
             return []
-    finally:
-        # Do not close the connection here for the same reason as above.
-        pass
+        return top_projects_for_contributor(conn, contributor_name, k)
+    return []
 
 
 def print_projects_by_contributor(projects: List[Dict], contributor_name: str):
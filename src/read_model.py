@@ -0,0 +1,428 @@
+# src/read_model.py
+import bisect
+import copy
+import itertools
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from contrib_metrics import canonical_username
+from db_stats import project_id_filter, top_projects, top_projects_by_contributor
+from db_version import data_version
+
+# Optional in-memory read model of the project graph: projects, skills,
+# contributors, the importance rankings and the per-project data of the web
+# showcase. It is loaded on first use and tagged with the database data
+# version (see db_version). db.py's scan, rename and delete functions pass the
+# projects they changed right after they commit, and only those projects are
+# re-read into a new snapshot. Everything else reloads the whole graph: a
+# write that does not name its projects (clear_database), a snapshot that was
+# not at the version the write started from, and any other writer (the CLI,
+# an import, ad-hoc SQL), whose version bump makes the next read reload.
+# Enabled with "read_model": true in the user config; when disabled the API
+# reads from SQL as before.
+
+# Names the contributors list hides (same filter as the SQL query)
+HIDDEN_CONTRIBUTORS = ("githubclassroombot", "unknown", "n/a", "none")
+SHOWCASE_EVIDENCE_PER_PROJECT = 3
+
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def _fold(value: str) -> str:
+    """Case-fold like SQLite's LIKE: ASCII letters only."""
+    return value.translate(_ASCII_LOWER)
+
+
+class _PrefixIndex:
+    """Values sorted by their folded form, so a LIKE 'prefix%' match is two bisections."""
+
+    def __init__(self, items: Iterable[Tuple[str, Any]]):
+        entries = sorted((_fold(text), payload) for text, payload in items if text is not None)
+        self._keys = [key for key, _ in entries]
+        self._payloads = [payload for _, payload in entries]
+
+    def match(self, prefix: str) -> List[Any]:
+        folded = _fold(prefix)
+        lo = bisect.bisect_left(self._keys, folded)
+        hi = bisect.bisect_right(self._keys, folded + "\U0010ffff")
+        return self._payloads[lo:hi]
+
+
+class ProjectGraph:
+    """One consistent snapshot of the read model, as of data version `version`."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.version = data_version(conn)
+        self.projects: List[Dict[str, Any]] = _load_projects(conn)
+        self._index_projects()
+        self._load_names(conn)
+        self.top_projects = top_projects(conn)
+        self.contributor_rankings = top_projects_by_contributor(conn)
+        # Creation and scan chronology per project name (rank_projects)
+        self.chronology: Dict[str, Dict[str, Any]] = _load_chronology(conn)
+        # Showcase data: newest evidence and the scan timeline of each project
+        self.evidence: Dict[int, List[Dict[str, Any]]] = _load_evidence(conn)
+        self.evolution: Dict[int, List[Dict[str, Any]]] = _load_evolution(conn)
+
+    def with_projects(self, conn: sqlite3.Connection, project_ids: Iterable[int]) -> "ProjectGraph":
+        """
+        A new snapshot at conn's data version with the sections of project_ids
+        re-read from conn (removed where the project is gone) and every other
+        project's data carried over. The skill and contributor name lists are
+        re-read whole: they are single-column scans, and no per-project link
+        says which names a write added.
+        """
+        ids = sorted(set(project_ids))
+        graph = copy.copy(self)
+        graph.version = data_version(conn)
+
+        fresh = _load_projects(conn, ids)
+        # A project keeps its name across writes, but a deleted one is only known here
+        names = {self.projects_by_id[pid]["name"] for pid in ids if pid in self.projects_by_id}
+        names.update(project["name"] for project in fresh)
+        graph.projects = sorted(
+            [project for project in self.projects if project["id"] not in ids] + fresh,
+            key=lambda project: project["id"],
+        )
+        graph._index_projects()
+        graph._load_names(conn)
+
+        graph.top_projects = sorted(
+            [row for row in self.top_projects if row["project"] not in names] + top_projects(conn, project_ids=ids),
+            key=lambda row: (-row["top_score"], -row["top_fraction"], -row["total_files"], row["project"]),
+        )
+        rankings = {
+            contributor: [row for row in rows if row["project"] not in names]
+            for contributor, rows in self.contributor_rankings.items()
+        }
+        for contributor, rows in top_projects_by_contributor(conn, project_ids=ids).items():
+            rankings[contributor] = sorted(
+                rankings.get(contributor, []) + rows,
+                key=lambda row: (-row["score"], -row["contrib_files"], row["project"]),
+            )
+        graph.contributor_rankings = {contributor: rows for contributor, rows in rankings.items() if rows}
+
+        graph.chronology = {name: row for name, row in self.chronology.items() if name not in names}
+        graph.chronology.update(_load_chronology(conn, ids))
+        graph.evidence = {pid: rows for pid, rows in self.evidence.items() if pid not in ids}
+        graph.evidence.update(_load_evidence(conn, ids))
+        graph.evolution = {pid: rows for pid, rows in self.evolution.items() if pid not in ids}
+        graph.evolution.update(_load_evolution(conn, ids))
+        return graph
+
+    def _index_projects(self) -> None:
+        self.project_ids = [project["id"] for project in self.projects]
+        self.projects_by_id = {project["id"]: project for project in self.projects}
+        self.projects_by_name = {project["name"]: project for project in self.projects}
+        self._project_names = _PrefixIndex(
+            [(project["name"], project["id"]) for project in self.projects]
+            + [(project["custom_name"], project["id"]) for project in self.projects]
+        )
+
+    def _load_names(self, conn: sqlite3.Connection) -> None:
+        self.skills = [row[0] for row in conn.execute("SELECT name FROM skills ORDER BY name")]
+        self._skill_names = _PrefixIndex((name, name) for name in self.skills)
+        placeholders = ",".join("?" for _ in HIDDEN_CONTRIBUTORS)
+        self.contributors = [
+            row[0]
+            for row in conn.execute(
+                f"""
+                SELECT DISTINCT name FROM contributors
+                WHERE name IS NOT NULL AND TRIM(name) <> '' AND LOWER(name) NOT IN ({placeholders})
+                ORDER BY name
+                """,
+                HIDDEN_CONTRIBUTORS,
+            )
+        ]
+        self._contributor_names = _PrefixIndex((name, name) for name in self.contributors)
+
+    def list_projects(
+        self,
+        after: Optional[int] = None,
+        name_prefix: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """GET /projects rows (id order) with the endpoint's filters applied."""
+        if after is not None and not isinstance(after, int):
+            return []
+        if name_prefix:
+            ids = sorted(set(self._project_names.match(name_prefix)))
+            start = bisect.bisect_right(ids, after) if after is not None else 0
+            candidates = (self.projects_by_id[project_id] for project_id in ids[start:])
+        else:
+            start = bisect.bisect_right(self.project_ids, after) if after is not None else 0
+            candidates = itertools.islice(self.projects, start, None)
+        rows = []
+        for project in candidates:
+            latest = project["latest_scan_at"]
+            if since and (latest is None or latest < since):
+                continue
+            if until and (latest is None or latest > until):
+                continue
+            rows.append(project)
+            if limit is not None and len(rows) >= limit:
+                break
+        return rows
+
+    def list_skills(self, after=None, name_prefix=None, limit=None) -> List[str]:
+        return _names_page(self.skills, self._skill_names, after, name_prefix, limit)
+
+    def list_contributors(self, after=None, name_prefix=None, limit=None) -> List[str]:
+        return _names_page(self.contributors, self._contributor_names, after, name_prefix, limit)
+
+    def ranking(self, mode: str = "project", contributor_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """rank_projects_by_importance(mode, contributor_name), as fresh dicts the caller may modify."""
+        if mode == "project":
+            rows = self.top_projects
+        elif mode == "contributor" and contributor_name:
+            rows = self.contributor_rankings.get(canonical_username(contributor_name), [])
+        else:
+            rows = []
+        return [dict(row) for row in rows]
+
+    def sections(self) -> Dict[str, Any]:
+        """Every loaded section, for the consistency check."""
+        return {
+            "projects": self.projects,
+            "skills": self.skills,
+            "contributors": self.contributors,
+            "top_projects": self.top_projects,
+            "contributor_rankings": self.contributor_rankings,
+            "chronology": self.chronology,
+            "evidence": self.evidence,
+            "evolution": self.evolution,
+        }
+
+
+def _load_projects(conn: sqlite3.Connection, project_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+    where, params = project_id_filter("p.id", project_ids)
+    return [
+        dict(row)
+        for row in conn.execute(
+            f"""
+            SELECT p.id, p.name, p.custom_name, p.repo_url, p.created_at, p.thumbnail_path,
+                   (SELECT MAX(scanned_at) FROM scans s WHERE s.project_id = p.id) AS latest_scan_at
+            FROM projects p
+            WHERE {where}
+            ORDER BY p.id
+            """,
+            params,
+        )
+    ]
+
+
+def _load_chronology(conn: sqlite3.Connection, project_ids: Optional[List[int]] = None) -> Dict[str, Dict[str, Any]]:
+    where, params = project_id_filter("s.project_id", project_ids)
+    return {
+        row["project"]: dict(row)
+        for row in conn.execute(
+            f"""
+            SELECT COALESCE(p.name, COALESCE(s.project, '<unknown>')) AS project,
+                   COALESCE(p.created_at, MIN(s.scanned_at)) AS created_at,
+                   MIN(s.scanned_at) AS first_scan,
+                   MAX(s.scanned_at) AS last_scan,
+                   COUNT(s.id) AS scans_count
+            FROM scans s
+            LEFT JOIN projects p ON p.id = s.project_id
+            WHERE {where}
+            GROUP BY COALESCE(s.project_id, s.project)
+            """,
+            params,
+        )
+    }
+
+
+def _load_evidence(conn: sqlite3.Connection, project_ids: Optional[List[int]] = None) -> Dict[int, List[Dict[str, Any]]]:
+    where, params = project_id_filter("project_id", project_ids)
+    evidence: Dict[int, List[Dict[str, Any]]] = {}
+    for row in conn.execute(
+        f"""
+        SELECT project_id, id, type, description, value, source, url, created_at
+        FROM (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY project_id ORDER BY created_at DESC, id DESC) AS rn
+            FROM project_evidence
+            WHERE {where}
+        )
+        WHERE rn <= ?
+        ORDER BY project_id, rn
+        """,
+        [*params, SHOWCASE_EVIDENCE_PER_PROJECT],
+    ):
+        entry = dict(row)
+        evidence.setdefault(entry.pop("project_id"), []).append(entry)
+    return evidence
+
+
+def _load_evolution(conn: sqlite3.Connection, project_ids: Optional[List[int]] = None) -> Dict[int, List[Dict[str, Any]]]:
+    where, params = project_id_filter("project_id", project_ids)
+    evolution: Dict[int, List[Dict[str, Any]]] = {}
+    for row in conn.execute(
+        f"SELECT project_id, id AS history_id, scanned_at, notes FROM scan_history WHERE {where} "
+        "ORDER BY project_id, id ASC",
+        params,
+    ):
+        entry = dict(row)
+        evolution.setdefault(entry.pop("project_id"), []).append({"id": None, **entry})
+    for row in conn.execute(
+        f"SELECT project_id, id, scanned_at, notes FROM scans WHERE project_id IS NOT NULL AND {where} "
+        "ORDER BY project_id, scanned_at ASC",
+        params,
+    ):
+        entry = dict(row)
+        evolution.setdefault(entry.pop("project_id"), []).append(entry)
+    return evolution
+
+
+def _names_page(names: List[str], index: _PrefixIndex, after, name_prefix, limit) -> List[str]:
+    if after is not None and not isinstance(after, str):
+        return []
+    if name_prefix:
+        names = sorted(index.match(name_prefix))
+    start = bisect.bisect_right(names, after) if after is not None else 0
+    end = start + limit if limit is not None else len(names)
+    return names[start:end]
+
+
+def load_graph(conn: sqlite3.Connection) -> ProjectGraph:
+    """Load a ProjectGraph inside one read transaction, so every section matches its version."""
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN")
+    try:
+        return ProjectGraph(conn)
+    finally:
+        if own_transaction:
+            conn.rollback()
+
+
+class ReadModel:
+    """
+    Holds the current ProjectGraph. graph() is safe to call from any thread;
+    readers get an immutable snapshot and reloads swap it in whole.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        # None: read "read_model" from the user config on first use
+        self._enabled = enabled
+        self._graph: Optional[ProjectGraph] = None
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.deltas = 0
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled is None:
+            try:
+                from config import load_config
+                self._enabled = bool(load_config().get("read_model", False))
+            except Exception:
+                self._enabled = False
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value: Optional[bool]) -> None:
+        self._enabled = value
+        if not value:
+            self.reset()
+
+    @property
+    def version(self) -> Optional[Tuple[str, int]]:
+        graph = self._graph
+        return graph.version if graph is not None else None
+
+    def graph(self, version: Optional[Tuple[str, int]], connect: Callable[[], sqlite3.Connection]) -> Optional[ProjectGraph]:
+        """The snapshot at data version `version`, reloading it if it is older; None when disabled."""
+        if not self.enabled or version is None:
+            return None
+        graph = self._graph
+        if graph is not None and graph.version == version:
+            return graph
+        with self._lock:
+            graph = self._graph
+            if graph is None or graph.version != version:
+                with connect() as conn:
+                    graph = self._load(conn)
+        return graph
+
+    def note_write(
+        self,
+        conn: sqlite3.Connection,
+        project_ids: Optional[Iterable[int]] = None,
+        versions: Optional[Tuple[Optional[Tuple[str, int]], Optional[Tuple[str, int]]]] = None,
+    ) -> None:
+        """
+        Update the snapshot from conn after a committed write. No-op until the
+        model is in use. With the write's project_ids and the data versions
+        (before, after) it read inside its transaction, only those projects
+        are re-read, provided the snapshot is at `before` and conn still sees
+        `after`; otherwise the whole graph is reloaded.
+        """
+        if self._graph is None:
+            return
+        with self._lock:
+            try:
+                if project_ids is not None and versions is not None and self._graph.version == versions[0]:
+                    graph = self._apply(conn, project_ids, versions[1])
+                    if graph is not None:
+                        self._graph = graph
+                        self.deltas += 1
+                        return
+                self._load(conn)
+            except sqlite3.Error:
+                # The next read reloads through graph()
+                self._graph = None
+
+    def advance(self, before: Optional[Tuple[str, int]], after: Optional[Tuple[str, int]]) -> None:
+        """Carry the snapshot over a version bump that changed no table it reads."""
+        with self._lock:
+            if self._graph is not None and self._graph.version == before:
+                self._graph.version = after
+
+    def verify(self, connect: Callable[[], sqlite3.Connection]) -> Dict[str, Any]:
+        """Compare the snapshot with a fresh load from SQL and list the sections that differ."""
+        graph = self._graph
+        if graph is None:
+            return {"loaded": False, "version": None, "consistent": None, "mismatches": []}
+        with connect() as conn:
+            fresh = load_graph(conn)
+        if fresh.version != graph.version:
+            # The database moved on; the snapshot is simply stale, not inconsistent
+            return {"loaded": True, "version": list(graph.version or ()), "consistent": None, "mismatches": []}
+        expected = fresh.sections()
+        mismatches = [name for name, value in graph.sections().items() if value != expected[name]]
+        return {
+            "loaded": True,
+            "version": list(graph.version or ()),
+            "consistent": not mismatches,
+            "mismatches": mismatches,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._graph = None
+
+    def _apply(self, conn: sqlite3.Connection, project_ids: Iterable[int], version: Optional[Tuple[str, int]]) -> Optional[ProjectGraph]:
+        """The snapshot with project_ids re-read, or None if conn is no longer at `version`."""
+        own_transaction = not conn.in_transaction
+        if own_transaction:
+            conn.execute("BEGIN")
+        try:
+            if data_version(conn) != version:
+                # Another write landed after this one; only a full reload covers it
+                return None
+            return self._graph.with_projects(conn, project_ids)
+        finally:
+            if own_transaction:
+                conn.rollback()
+
+    def _load(self, conn: sqlite3.Connection) -> ProjectGraph:
+        graph = load_graph(conn)
+        self._graph = graph
+        self.loads += 1
+        return graph
+
+
+read_model = ReadModel()
@@ -0,0 +1,46 @@
+# src/response_cache.py
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class ResponseCache:
+    """
+    Small thread-safe LRU of rendered API responses. Keys include the database
+    data version (see db_version), so a write makes every older entry
+    unreachable; those entries simply age out of the LRU.
+    """
+
+    def __init__(self, max_entries: int = 256, max_body_bytes: int = 4 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_body_bytes = max_body_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[bytes, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Tuple[bytes, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, body: bytes, meta: Any = None) -> None:
+        if len(body) > self.max_body_bytes:
+            return
+        with self._lock:
+            self._entries[key] = (body, meta)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
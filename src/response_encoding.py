@@ -0,0 +1,166 @@
+# src/response_encoding.py
+import json
+import zlib
+from typing import Any, Iterable, Iterator, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+# Response encoding for the API. The heavy read endpoints return plain
+# dicts/lists, so they skip FastAPI's jsonable_encoder walk and are encoded in
+# one pass (orjson when installed, else the json module). Stored JSON blobs
+# (e.g. projects.git_metrics_json) can be spliced in as RawJSON instead of being
+# parsed and re-encoded. Large text-like responses are gzipped on the way out.
+
+GZIP_MINIMUM_SIZE = 1024
+GZIP_LEVEL = 6
+
+_COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+# Server-sent events must reach the client as soon as they are written
+_NEVER_COMPRESS_TYPES = ("text/event-stream",)
+
+
+class RawJSON:
+    """Already-encoded JSON, written into the response as-is by dumps_json."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data.encode("utf-8") if isinstance(data, str) else bytes(data)
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, RawJSON):
+        # Only top-level members are spliced; deeper fragments are decoded
+        return json.loads(obj.data)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return jsonable_encoder(obj)
+
+
+def _dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps_json(content: Any) -> bytes:
+    """Encode content as compact UTF-8 JSON; RawJSON content or top-level values are spliced in unchanged."""
+    if isinstance(content, RawJSON):
+        return content.data
+    if isinstance(content, dict) and any(isinstance(value, RawJSON) for value in content.values()):
+        return b"".join(iter_json_object(content.items()))
+    return _dumps(content)
+
+
+def iter_json_object(members: Iterable[Tuple[str, Any]]) -> Iterator[bytes]:
+    """Encode (key, value) pairs as one JSON object, a member at a time, for streaming."""
+    yield b"{"
+    first = True
+    for key, value in members:
+        encoded = value.data if isinstance(value, RawJSON) else _dumps(value)
+        yield (b"" if first else b",") + _dumps(str(key)) + b":" + encoded
+        first = False
+    yield b"}"
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps_json. Returning one from an endpoint skips jsonable_encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+def _compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    if content_type.startswith(_NEVER_COMPRESS_TYPES):
+        return False
+    return content_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    Gzip text-like responses of at least minimum_size bytes for clients that
+    accept it. Unlike Starlette's GZipMiddleware it leaves binary downloads
+    (PDF, images, zip, already-gzipped exports) alone, and flushes after each
+    chunk of a streaming response so progress streams still arrive as written.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = GZIP_MINIMUM_SIZE, level: int = GZIP_LEVEL) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or "gzip" not in Headers(scope=scope).get("accept-encoding", ""):
+            await self.app(scope, receive, send)
+            return
+
+        start: Message = {}
+        state = {"passthrough": False, "compressor": None}
+
+        async def send_compressed(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                # Bodies relayed by BaseHTTPMiddleware arrive in chunks but keep
+                # their Content-Length, so small ones are still recognised here
+                length = headers.get("content-length")
+                if (
+                    "content-encoding" in headers
+                    or not _compressible(headers.get("content-type", ""))
+                    or (length is not None and length.isdigit() and int(length) < self.minimum_size)
+                ):
+                    state["passthrough"] = True
+                    await send(message)
+                else:
+                    start.update(message)
+                return
+            if message["type"] != "http.response.body" or state["passthrough"]:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            compressor = state["compressor"]
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    state["passthrough"] = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = state["compressor"] = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Encoding"] = "gzip"
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                    data = compressor.compress(body) + compressor.flush(zlib.Z_SYNC_FLUSH)
+                else:
+                    data = compressor.compress(body) + compressor.flush()
+                    headers["Content-Length"] = str(len(data))
+                await send(start)
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+
+            if more_body:
+                data = compressor.compress(body) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            else:
+                data = compressor.compress(body) + compressor.flush()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,221 @@
+# src/resume_pdf.py
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from typing import Dict, Hashable, Optional, Tuple
+
+# Resume PDF rendering. ReportLab builds the PDF in a small process pool so a
+# long resume never holds an API worker thread, and the page count comes from
+# the finished document rather than re-parsing the bytes. Rendered artifacts
+# are cached by resume ID and markdown content hash; a concurrent request for
+# the same content waits on the render already in flight.
+
+PDF_CACHE_BYTES = 16 * 1024 * 1024
+RENDER_WORKERS = 2
+
+
+def content_digest(markdown_text: str) -> str:
+    return hashlib.sha256(markdown_text.encode("utf-8")).hexdigest()
+
+
+def render_resume_pdf(markdown_text: str) -> Tuple[bytes, int]:
+    """Render resume markdown with ReportLab; returns (pdf_bytes, page_count)."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.lib import colors
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable
+
+    buf = BytesIO()
+    doc = SimpleDocTemplate(
+        buf, pagesize=letter,
+        leftMargin=0.75*inch, rightMargin=0.75*inch,
+        topMargin=0.75*inch, bottomMargin=0.75*inch
+    )
+
+    dark = colors.HexColor("#111827")
+    mid = colors.HexColor("#334155")
+    body_color = colors.HexColor("#0f172a")
+    divider_color = colors.HexColor("#cbd5e1")
+
+    style_h1 = ParagraphStyle("h1", fontSize=24, fontName="Helvetica-Bold",
+                               textColor=dark, spaceAfter=10, leading=28)
+    style_h2 = ParagraphStyle("h2", fontSize=8.5, fontName="Helvetica-Bold",
+                               textColor=mid, spaceBefore=16, spaceAfter=2,
+                               letterSpacing=1.2)
+    style_h3 = ParagraphStyle("h3", fontSize=10.5, fontName="Helvetica-Bold",
+                               textColor=dark, spaceBefore=8, spaceAfter=2)
+    style_body = ParagraphStyle("body", fontSize=10, fontName="Helvetica",
+                                textColor=body_color, spaceAfter=3, leading=14)
+    style_bullet = ParagraphStyle("bullet", fontSize=10, fontName="Helvetica",
+                                  textColor=body_color, spaceAfter=2, leading=14,
+                                  leftIndent=14, firstLineIndent=0)
+    style_meta = ParagraphStyle("meta", fontSize=9, fontName="Helvetica-Oblique",
+                                textColor=mid, spaceBefore=8)
+
+    story = []
+    for line in markdown_text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            story.append(Spacer(1, 3))
+        elif stripped.startswith("# "):
+            story.append(Paragraph(stripped[2:], style_h1))
+        elif stripped.startswith("## "):
+            text = stripped[3:].upper()
+            story.append(Spacer(1, 2))
+            story.append(Paragraph(text, style_h2))
+            story.append(HRFlowable(width="100%", thickness=0.5,
+                                    color=divider_color, spaceAfter=5))
+        elif stripped.startswith("**") and stripped.endswith("**"):
+            story.append(Paragraph(stripped[2:-2], style_h3))
+        elif stripped.startswith("- "):
+            text = stripped[2:]
+            text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)
+            story.append(Paragraph(f"\u2022\u00a0{text}", style_bullet))
+        elif stripped.startswith("_") and stripped.endswith("_"):
+            story.append(Paragraph(f"<i>{stripped[1:-1]}</i>", style_meta))
+        else:
+            text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', stripped)
+            story.append(Paragraph(text, style_body))
+
+    doc.build(story)
+    # doc.page is the number of the last page laid out
+    return buf.getvalue(), max(int(doc.page), 1)
+
+
+class PdfArtifactCache:
+    """
+    Thread-safe LRU of rendered resume PDFs keyed by (resume_id, content
+    digest), bounded by the total size of the cached PDFs. Editing a resume
+    changes its digest; invalidate() drops the superseded entries right away.
+    """
+
+    def __init__(self, max_bytes: int = PDF_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[bytes, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, resume_id: int, digest: str) -> Optional[Tuple[bytes, int]]:
+        key = (resume_id, digest)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, resume_id: int, digest: str, pdf_bytes: bytes, page_count: int) -> None:
+        if len(pdf_bytes) > self.max_bytes:
+            return
+        key = (resume_id, digest)
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key)[0])
+            self._entries[key] = (pdf_bytes, page_count)
+            self._size += len(pdf_bytes)
+            while self._size > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def invalidate(self, resume_id: int) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == resume_id]:
+                self._size -= len(self._entries.pop(key)[0])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PdfRenderer:
+    """
+    Runs render_resume_pdf in a lazily started process pool. Requests for the
+    same content share one render. If worker processes cannot be started, or
+    one dies mid-render, the render falls back to a background thread.
+    """
+
+    def __init__(self, max_workers: int = RENDER_WORKERS):
+        self.max_workers = max_workers
+        self._pool = None  # ProcessPoolExecutor, started by the first render
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.RLock()
+
+    def submit(self, markdown_text: str, digest: Optional[str] = None) -> "Future[Tuple[bytes, int]]":
+        digest = digest or content_digest(markdown_text)
+        with self._lock:
+            future = self._inflight.get(digest)
+            if future is not None:
+                return future
+            future = self._inflight[digest] = self._start(markdown_text)
+        future.add_done_callback(lambda done: self._forget(digest, done))
+        return future
+
+    def _start(self, markdown_text: str) -> Future:
+        # multiprocessing is imported with the first render, not at API startup
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        try:
+            if self._pool is None:
+                # spawn: forking a process that runs server threads is unsafe
+                self._pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            inner = self._pool.submit(render_resume_pdf, markdown_text)
+        except (BrokenProcessPool, OSError, RuntimeError):
+            self._reset_pool()
+            return self._thread_pool().submit(render_resume_pdf, markdown_text)
+
+        result: Future = Future()
+
+        def _relay(done: Future) -> None:
+            if isinstance(done.exception(), BrokenProcessPool):
+                # A worker died (killed, out of memory): start a fresh pool
+                # next time and render this one on a thread
+                self._reset_pool()
+                self._thread_pool().submit(render_resume_pdf, markdown_text).add_done_callback(_relay)
+            elif done.exception() is not None:
+                result.set_exception(done.exception())
+            else:
+                result.set_result(done.result())
+
+        inner.add_done_callback(_relay)
+        return result
+
+    def _reset_pool(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resume-pdf")
+            return self._threads
+
+    def _forget(self, digest: str, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(digest) is future:
+                del self._inflight[digest]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+            threads, self._threads = self._threads, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        if threads is not None:
+            threads.shutdown(wait=False, cancel_futures=True)
@@ -17,7 +17,7 @@ from consent import ask_for_data_consent, ask_yes_no
 from detect_langs import detect_languages_and_frameworks, LANGUAGE_MAP
 from detect_skills import detect_skills
 from file_utils import is_valid_format, is_image_file
-from db import get_connection, init_db, save_scan
+from db import get_connection, init_db, save_scan, save_scans
 from collab_summary import summarize_project_contributions, identify_contributions
 from datetime import datetime
 from llm_summary import get_or_generate_summary, summary_timestamp
@@ -554,6 +554,17 @@ def _persist_scan(scan_source: str, files_found: list, project: str = None, note
     )
 
 
+def _persist_scans(records: list, listing_fallback: bool = False) -> list:
+    """Persist several projects' scans (save_scan keyword dicts) in one batch via db.save_scans.
+
+    With listing_fallback, a project whose full save fails keeps at least its
+    file listing (see _persist_single_project). Returns a list aligned with
+    records: the scan_id, or the exception that project's save raised (other
+    projects are still saved).
+    """
+    return save_scans(records, listing_fallback=listing_fallback)
+
+
 def _run_with_progress(func, args=(), kwargs=None, total_steps: int = 30):
     """Run `func(*args, **kwargs)` in a background thread while showing a filling progress bar.
 
@@ -1088,6 +1099,8 @@ def _persist_multi_repo_scans(scan_source: str, file_list: list, repo_roots: lis
     else:
         repo_file_map = _map_files_to_repos(file_list, repo_roots)
     
+    # Analyze every repo first, then write them all in one batch
+    records = []
     for repo_root in repo_roots:
         if repo_root not in repo_file_map or not repo_file_map[repo_root]:
             continue
@@ -1155,9 +1168,9 @@ def _persist_multi_repo_scans(scan_source: str, file_list: list, repo_roots: lis
                     summary_text = None
 
             # Persist this repo's scan with its OWN detected languages and skills
-            _persist_scan(
-                repo_root,
-                files_for_repo,
+            records.append(dict(
+                scan_source=repo_root,
+                files_found=files_for_repo,
                 project=project_name,
                 notes=None,
                 file_metadata=file_metadata,
@@ -1172,12 +1185,16 @@ def _persist_multi_repo_scans(scan_source: str, file_list: list, repo_roots: lis
                 summary_input_hash=summary_input_hash,
                 summary_model=summary_model,
                 summary_updated_at=summary_updated_at,
-            )
-            if show_progress:
-                print(f"  Saved project: {project_name}")
+            ))
         except Exception as e:
             print(f"  Warning: failed to save project {project_name}: {e}")
 
+    for record, outcome in zip(records, _persist_scans(records)):
+        if isinstance(outcome, Exception):
+            print(f"  Warning: failed to save project {record['project']}: {outcome}")
+        elif show_progress:
+            print(f"  Saved project: {record['project']}")
+
 
 def _get_repo_info(path: str):
     """Return (created_at_iso, repo_url) for a git repo found at or above path, or (None, None)."""
@@ -1877,8 +1894,8 @@ def _scan_single_project_phases(
         'metrics': metrics,
     }
 
-# Persist a single project's scan results to the database
-def _persist_single_project(repo_root: str, project_name: str, files_for_repo: list, proj_result: dict, file_meta: dict, generate_llm_summary: bool, project_thumbnail_path: str = None):
+# Build the save_scan keyword arguments for one scanned project
+def _project_scan_record(repo_root: str, project_name: str, files_for_repo: list, proj_result: dict, file_meta: dict, generate_llm_summary: bool, project_thumbnail_path: str = None) -> dict:
     
     skills_res = proj_result.get('skills_res')
     tech_summary = {}
@@ -1915,23 +1932,32 @@ def _persist_single_project(repo_root: str, project_name: str, files_for_repo: l
         except Exception:
             summary_text = None
 
+    return dict(
+        scan_source=repo_root, files_found=files_for_repo, project=project_name, notes=None,
+        file_metadata=file_meta,
+        detected_languages=proj_result['languages_all'],
+        detected_skills=proj_result['skills'],
+        contributors=proj_result['contributors'],
+        project_created_at=project_created_at,
+        project_repo_url=project_repo_url,
+        project_thumbnail_path=project_thumbnail_path,
+        git_metrics=proj_result['metrics'],
+        tech_summary=tech_summary,
+        summary_text=summary_text, summary_input_hash=summary_input_hash,
+        summary_model=summary_model, summary_updated_at=summary_updated_at,
+    )
+
+
+# Persist a single project's scan results to the database
+def _persist_single_project(repo_root: str, project_name: str, files_for_repo: list, proj_result: dict, file_meta: dict, generate_llm_summary: bool, project_thumbnail_path: str = None):
+    record = _project_scan_record(
+        repo_root, project_name, files_for_repo, proj_result, file_meta, generate_llm_summary,
+        project_thumbnail_path=project_thumbnail_path,
+    )
     try:
-        _persist_scan(
-            repo_root, files_for_repo, project=project_name, notes=None,
-            file_metadata=file_meta,
-            detected_languages=proj_result['languages_all'],
-            detected_skills=proj_result['skills'],
-            contributors=proj_result['contributors'],
-            project_created_at=project_created_at,
-            project_repo_url=project_repo_url,
-            project_thumbnail_path=project_thumbnail_path,
-            git_metrics=proj_result['metrics'],
-            tech_summary=tech_summary,
-            summary_text=summary_text, summary_input_hash=summary_input_hash,
-            summary_model=summary_model, summary_updated_at=summary_updated_at,
-        )
+        _persist_scan(**record)
     except Exception:
-        init_db()
+        # Keep at least the file listing; the schema is ensured on every connection
         _persist_scan(repo_root, files_for_repo, project=project_name)
 
 
@@ -2148,6 +2174,57 @@ def scan_with_clean_output(
             detected_project_names = []
             project_results = []
             failed_projects = []
+            # save_scan kwargs per scanned project, written in one batch after the
+            # loop (or before each prompt between projects)
+            pending_records = []
+
+            def _report_project_failed(idx, repo_root, proj_name, error):
+                progress.item(f"Project failed: {proj_name} ({error})")
+                if progress_callback:
+                    progress_callback({
+                        "type": "project_failed",
+                        "project_index": idx + 1,
+                        "total_projects": len(repo_roots),
+                        "project_name": proj_name,
+                        "project_path": os.path.abspath(repo_root),
+                        "error": error,
+                    })
+
+            def _report_project_completed(idx, repo_root, proj_name):
+                if progress_callback:
+                    progress_callback({
+                        "type": "project_completed",
+                        "project_index": idx + 1,
+                        "total_projects": len(repo_roots),
+                        "project_name": proj_name,
+                        "project_path": os.path.abspath(repo_root),
+                        "success": True,
+                    })
+
+            def _flush_pending_records():
+                # Projects are only reported completed once their save outcome is known
+                if not pending_records:
+                    return
+                outcomes = _persist_scans([record for _, _, record in pending_records], listing_fallback=True)
+                for (idx, repo_root, record), outcome in zip(pending_records, outcomes):
+                    proj_name = record['project']
+                    if not isinstance(outcome, Exception):
+                        progress.item(f"Saved to database: {proj_name}")
+                        _report_project_completed(idx, repo_root, proj_name)
+                        continue
+                    error = str(outcome)
+                    if proj_name in detected_project_names:
+                        detected_project_names.remove(proj_name)
+                    for entry in project_results:
+                        if entry['project_path'] == os.path.abspath(repo_root):
+                            entry.update({"success": False, "error": error})
+                    failed_projects.append({
+                        "project_name": proj_name,
+                        "project_path": os.path.abspath(repo_root),
+                        "error": error,
+                    })
+                    _report_project_failed(idx, repo_root, proj_name, error)
+                pending_records.clear()
 
             for idx, repo_root in enumerate(repo_roots):
                 proj_name = os.path.basename(os.path.abspath(repo_root))
@@ -2186,11 +2263,10 @@ def scan_with_clean_output(
                     detected_project_names.append(proj_name)
 
                     if save_to_db:
-                        _persist_single_project(
+                        pending_records.append((idx, repo_root, _project_scan_record(
                             repo_root, proj_name, files_for_repo,
                             proj_result, file_meta, generate_llm_summary,
-                        )
-                        progress.item(f"Saved to database: {proj_name}")
+                        )))
 
                     if output_project_info is not None:
                         try:
@@ -2226,15 +2302,8 @@ def scan_with_clean_output(
                         "success": True,
                         "contributors": proj_result['contributors'],
                     })
-                    if progress_callback:
-                        progress_callback({
-                            "type": "project_completed",
-                            "project_index": idx + 1,
-                            "total_projects": len(repo_roots),
-                            "project_name": proj_name,
-                            "project_path": os.path.abspath(repo_root),
-                            "success": True,
-                        })
+                    if not save_to_db:
+                        _report_project_completed(idx, repo_root, proj_name)
                 except Exception as exc:
                     failed_projects.append({
                         "project_name": proj_name,
@@ -2247,23 +2316,18 @@ def scan_with_clean_output(
                         "success": False,
                         "error": str(exc),
                     })
-                    progress.item(f"Project failed: {proj_name} ({exc})")
-                    if progress_callback:
-                        progress_callback({
-                            "type": "project_failed",
-                            "project_index": idx + 1,
-                            "total_projects": len(repo_roots),
-                            "project_name": proj_name,
-                            "project_path": os.path.abspath(repo_root),
-                            "error": str(exc),
-                        })
+                    _report_project_failed(idx, repo_root, proj_name, str(exc))
 
                 if prompt_between_projects and idx < len(repo_roots) - 1:
+                    # Save what was scanned before waiting on the user
+                    _flush_pending_records()
                     next_name = os.path.basename(os.path.abspath(repo_roots[idx + 1]))
                     if not ask_yes_no(f"\nReady to proceed with next project? ({next_name}) (y/n): ", default=True):
                         progress.item("Remaining projects skipped by user.")
                         break
 
+            _flush_pending_records()
+
             # Print overall completion summary
             progress.header("All Scans Complete!")
             progress.item(f"{len(detected_project_names)} of {len(repo_roots)} projects scanned")
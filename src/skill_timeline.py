@@ -27,7 +27,7 @@ def print_grouped_skill_timeline(cur, safe_query, human_ts, print_header) -> Non
         FROM skills sk
         JOIN project_skills ps ON sk.id = ps.skill_id
         JOIN projects p ON ps.project_id = p.id
-        JOIN scans s ON s.project = p.name
+        JOIN scans s ON s.project_id = p.id
         ORDER BY sk.name ASC, used_at ASC
     """)
 
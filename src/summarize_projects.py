@@ -24,117 +24,153 @@ if src_dir not in sys.path:
 from db import get_connection
 from rank_projects import rank_projects_by_contributor
 from contrib_metrics import canonical_username
-def gather_project_info_from_db(project_name: str) -> dict:
-    """Load project metadata from the database in the same shape as gather_project_info."""
-    if not project_name:
-        raise ValueError("project_name is required")
+def _project_info_from_rows(project_name, row, languages, skills, contributor_rows) -> dict:
+    git_metrics = {}
+    if row and row["git_metrics_json"]:
+        try:
+            git_metrics = json.loads(row["git_metrics_json"]) or {}
+        except Exception:
+            git_metrics = {}
 
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            "SELECT id, git_metrics_json, tech_json FROM projects WHERE name = ?",
-            (project_name,),
-        )
-        row = cur.fetchone()
-        project_id = row["id"] if row else None
+    tech_data = {}
+    if row and row["tech_json"]:
+        try:
+            tech_data = json.loads(row["tech_json"]) or {}
+        except Exception:
+            tech_data = {}
+
+    frameworks = tech_data.get("frameworks") or []
+
+    contributions: Dict[str, Dict] = {}
+    for r in contributor_rows:
+        key = canonical_username(r["contributor"] or "")
+        contributions[key] = {
+            "commits": 0,
+            "files": [],
+            "file_count": r["file_count"] or 0,
+        }
+
+    commits_per_author = {}
+    files_changed_per_author = {}
+    if isinstance(git_metrics, dict):
+        commits_per_author = git_metrics.get("commits_per_author") or {}
+        files_changed_per_author = git_metrics.get("files_changed_per_author") or {}
 
-        git_metrics = {}
-        if row and row["git_metrics_json"]:
-            try:
-                git_metrics = json.loads(row["git_metrics_json"]) or {}
-            except Exception:
-                git_metrics = {}
+    for author, commits in commits_per_author.items():
+        key = canonical_username(author or "")
+        entry = contributions.setdefault(key, {"commits": 0, "files": [], "file_count": 0})
+        entry["commits"] = commits or 0
 
-        tech_data = {}
-        if row and row["tech_json"]:
-            try:
-                tech_data = json.loads(row["tech_json"]) or {}
-            except Exception:
-                tech_data = {}
+    for author, files_changed in files_changed_per_author.items():
+        key = canonical_username(author or "")
+        entry = contributions.setdefault(key, {"commits": 0, "files": [], "file_count": 0})
+        if isinstance(files_changed, (list, set, tuple)):
+            entry["files"] = list(files_changed)
+        if entry.get("file_count", 0) == 0:
+            entry["file_count"] = len(entry.get("files", []))
 
-        frameworks = tech_data.get("frameworks") or []
+    return {
+        "project_name": project_name,
+        "languages": languages,
+        "frameworks": frameworks,
+        "skills": skills,
+        "contributions": contributions,
+        "git_metrics": git_metrics or {},
+        "projects_detected": 1,
+    }
 
+
+def gather_projects_info_from_db(project_names: List[str]) -> Dict[str, dict]:
+    """Load metadata for several projects at once, keyed by project name.
+
+    Uses a fixed number of queries however many projects are requested; each
+    value has the same shape as gather_project_info_from_db.
+    """
+    names = list(dict.fromkeys(name for name in project_names if name))
+    if not names:
+        return {}
+
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        placeholders = ",".join("?" for _ in names)
         cur.execute(
-            """
-            SELECT DISTINCT l.name
-            FROM languages l
-            JOIN file_languages fl ON fl.language_id = l.id
-            JOIN files f ON f.id = fl.file_id
-            JOIN scans s ON s.id = f.scan_id
-            WHERE s.project = ?
-            ORDER BY l.name COLLATE NOCASE
-            """,
-            (project_name,),
+            f"SELECT id, name, git_metrics_json, tech_json FROM projects WHERE name IN ({placeholders})",
+            names,
         )
-        languages = [r["name"] for r in cur.fetchall()]
+        rows_by_name = {r["name"]: r for r in cur.fetchall()}
+        project_ids = [r["id"] for r in rows_by_name.values()]
+
+        languages_by_id: Dict[int, List[str]] = defaultdict(list)
+        skills_by_id: Dict[int, List[str]] = defaultdict(list)
+        contributors_by_id: Dict[int, list] = defaultdict(list)
+        if project_ids:
+            id_placeholders = ",".join("?" for _ in project_ids)
+            cur.execute(
+                f"""
+                SELECT DISTINCT s.project_id, l.name
+                FROM languages l
+                JOIN file_languages fl ON fl.language_id = l.id
+                JOIN files f ON f.id = fl.file_id
+                JOIN scans s ON s.id = f.scan_id
+                WHERE s.project_id IN ({id_placeholders})
+                ORDER BY l.name COLLATE NOCASE
+                """,
+                project_ids,
+            )
+            for r in cur.fetchall():
+                languages_by_id[r["project_id"]].append(r["name"])
 
-        skills: List[str] = []
-        if project_id:
             cur.execute(
-                """
-                SELECT sk.name
+                f"""
+                SELECT ps.project_id, sk.name
                 FROM project_skills ps
                 JOIN skills sk ON sk.id = ps.skill_id
-                WHERE ps.project_id = ?
+                WHERE ps.project_id IN ({id_placeholders})
                 ORDER BY sk.name COLLATE NOCASE
                 """,
-                (project_id,),
+                project_ids,
             )
-            skills = [r["name"] for r in cur.fetchall()]
+            for r in cur.fetchall():
+                skills_by_id[r["project_id"]].append(r["name"])
 
-        cur.execute(
-            """
-            SELECT c.name AS contributor, COUNT(DISTINCT f.id) AS file_count
-            FROM contributors c
-            JOIN file_contributors fc ON fc.contributor_id = c.id
-            JOIN files f ON f.id = fc.file_id
-            JOIN scans s ON s.id = f.scan_id
-            WHERE s.project = ?
-            GROUP BY c.name
-            """,
-            (project_name,),
-        )
-        contributions: Dict[str, Dict] = {}
-        for r in cur.fetchall():
-            key = canonical_username(r["contributor"] or "")
-            contributions[key] = {
-                "commits": 0,
-                "files": [],
-                "file_count": r["file_count"] or 0,
-            }
-
-        commits_per_author = {}
-        files_changed_per_author = {}
-        if isinstance(git_metrics, dict):
-            commits_per_author = git_metrics.get("commits_per_author") or {}
-            files_changed_per_author = git_metrics.get("files_changed_per_author") or {}
-
-        for author, commits in commits_per_author.items():
-            key = canonical_username(author or "")
-            entry = contributions.setdefault(key, {"commits": 0, "files": [], "file_count": 0})
-            entry["commits"] = commits or 0
-
-        for author, files_changed in files_changed_per_author.items():
-            key = canonical_username(author or "")
-            entry = contributions.setdefault(key, {"commits": 0, "files": [], "file_count": 0})
-            if isinstance(files_changed, (list, set, tuple)):
-                entry["files"] = list(files_changed)
-            if entry.get("file_count", 0) == 0:
-                entry["file_count"] = len(entry.get("files", []))
-
-        return {
-            "project_name": project_name,
-            "languages": languages,
-            "frameworks": frameworks,
-            "skills": skills,
-            "contributions": contributions,
-            "git_metrics": git_metrics or {},
-            "projects_detected": 1,
-        }
+            cur.execute(
+                f"""
+                SELECT s.project_id, c.name AS contributor, COUNT(DISTINCT f.id) AS file_count
+                FROM contributors c
+                JOIN file_contributors fc ON fc.contributor_id = c.id
+                JOIN files f ON f.id = fc.file_id
+                JOIN scans s ON s.id = f.scan_id
+                WHERE s.project_id IN ({id_placeholders})
+                GROUP BY s.project_id, c.name
+                """,
+                project_ids,
+            )
+            for r in cur.fetchall():
+                contributors_by_id[r["project_id"]].append(r)
     finally:
         conn.close()
 
+    infos = {}
+    for name in names:
+        row = rows_by_name.get(name)
+        project_id = row["id"] if row else None
+        infos[name] = _project_info_from_rows(
+            name,
+            row,
+            languages_by_id.get(project_id, []),
+            skills_by_id.get(project_id, []),
+            contributors_by_id.get(project_id, []),
+        )
+    return infos
+
+
+def gather_project_info_from_db(project_name: str) -> dict:
+    """Load project metadata from the database in the same shape as gather_project_info."""
+    if not project_name:
+        raise ValueError("project_name is required")
+    return gather_projects_info_from_db([project_name])[project_name]
+
 
 def generate_combined_summary(
     contributor_name: str,
@@ -346,7 +382,7 @@ def summarize_top_ranked_projects(contributor_name: str, limit: Optional[int] =
         limit: Maximum number of top projects to summarize (None for all)
     
     Returns:
-        List of dicts with keys: project, project_info (dict from gather_project_info_from_db),
+        List of dicts with keys: project, project_info (dict from gather_projects_info_from_db),
         and error (if summary generation failed).
     """
     contributor_name = canonical_username(contributor_name or "")
@@ -364,14 +400,23 @@ def summarize_top_ranked_projects(contributor_name: str, limit: Optional[int] =
     
     results = []
     print(f"\nAnalyzing top {len(top_projects)} project(s) for '{contributor_name}'...\n")
-    
+
+    # Gather project info for every ranked project in one batch
+    infos: Dict[str, dict] = {}
+    batch_error = None
+    try:
+        infos = gather_projects_info_from_db([p["project"] for p in top_projects])
+    except Exception as e:
+        batch_error = e
+
     for i, project_info in enumerate(top_projects, 1):
         project_name = project_info["project"]
         print(f"[{i}/{len(top_projects)}] Processing: {project_name}")
         
-        # Gather project info from DB
         try:
-            info = gather_project_info_from_db(project_name)
+            if batch_error is not None:
+                raise batch_error
+            info = infos[project_name]
             print(f"  [SUCCESS] Project info gathered\n")
             results.append({
                 "project": project_name,
@@ -0,0 +1,129 @@
+"""Benchmark the heaviest API responses: encoding time and bytes on the wire.
+
+Not collected by pytest. Run from the repository root:
+
+    python test/benchmark_responses.py [--projects 8] [--files 2000] [--repeat 5]
+
+Seeds a throwaway database (projects with large git metrics, many files and a
+long commit history) and, for each endpoint, reports the median request time
+with and without gzip, the response size, and how long FastAPI's default
+encoding (jsonable_encoder + json.dumps) takes against dumps_json for the same
+payload.
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+
+def _seed(db_mod, projects: int, files: int) -> tuple:
+    from db_commits import replace_project_commits
+
+    authors = [f"dev{i}" for i in range(12)]
+    project_ids = []
+    for p in range(projects):
+        root = f"/bench/project_{p}"
+        paths = [f"{root}/src/pkg_{f % 40}/module_{f}.py" for f in range(files)]
+        git_metrics = {
+            "commits_per_author": {a: 50 + i for i, a in enumerate(authors)},
+            "files_changed_per_author": {a: [path[len(root) + 1:] for path in paths[i::3]] for i, a in enumerate(authors)},
+            "commits_per_week": {f"2024-W{w:02d}": w for w in range(1, 53)},
+        }
+        db_mod.save_scan(
+            root,
+            [(path, 1000 + f, None) for f, path in enumerate(paths)],
+            project=f"project_{p}",
+            contributors=authors,
+            detected_languages=["Python"],
+            detected_skills=["APIs", "Testing"],
+            git_metrics=git_metrics,
+        )
+        with db_mod.get_connection() as conn:
+            project_id = conn.execute("SELECT id FROM projects WHERE name = ?", (f"project_{p}",)).fetchone()[0]
+            replace_project_commits(conn, project_id, [
+                (f"2024-{1 + d // 28:02d}-{1 + d % 28:02d} {h:02d}:00:00", authors[(d + h) % len(authors)], 3, 40, 5)
+                for d in range(336) for h in range(0, 24, 3)
+            ])
+            conn.commit()
+        project_ids.append(project_id)
+    portfolio_id = db_mod.save_portfolio("dev0", "Bench", included_project_ids=project_ids)
+    return project_ids, portfolio_id
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=8)
+    parser.add_argument("--files", type=int, default=2000, help="files per project")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["FILE_DATA_DB_PATH"] = os.path.join(tmp, "file_data.db")
+        os.environ["HOME"] = tmp
+
+        import db as db_mod
+        from fastapi.encoders import jsonable_encoder
+        from fastapi.testclient import TestClient
+        import api as api_mod
+        from response_encoding import dumps_json
+
+        with redirect_stdout(io.StringIO()):
+            project_ids, portfolio_id = _seed(db_mod, args.projects, args.files)
+
+        endpoints = [
+            ("project detail", f"/projects/{project_ids[0]}"),
+            ("database inspect", "/database/inspect"),
+            ("export html", f"/web/portfolio/{portfolio_id}/export-html"),
+            ("heatmap", f"/web/portfolio/{portfolio_id}/heatmap?granularity=day&metric=commits"),
+            ("project heatmap", f"/web/portfolio/{portfolio_id}/heatmap/project?project_id={project_ids[0]}&granularity=day"),
+        ]
+
+        header = f"{'endpoint':<18}{'identity ms':>12}{'gzip ms':>10}{'bytes':>12}{'gzip bytes':>12}{'default enc ms':>16}{'fast enc ms':>13}"
+        print(header)
+        print("-" * len(header))
+        with TestClient(api_mod.app) as client:
+            for label, path in endpoints:
+                # the response cache would turn repeat requests into replays
+                plain = lambda: (api_mod.response_cache.clear(), client.get(path, headers={"Accept-Encoding": "identity"}))[1]
+                zipped = lambda: (api_mod.response_cache.clear(), client.get(path, headers={"Accept-Encoding": "gzip"}))[1]
+                response = plain()
+                api_mod.response_cache.clear()
+                with client.stream("GET", path, headers={"Accept-Encoding": "gzip"}) as wire:
+                    wire_bytes = sum(len(chunk) for chunk in wire.iter_raw())
+                plain_ms = _median_ms(plain, args.repeat)
+                gzip_ms = _median_ms(zipped, args.repeat)
+
+                default_ms = fast_ms = float("nan")
+                if response.headers.get("content-type", "").startswith("application/json"):
+                    payload = response.json()
+                    default_ms = _median_ms(
+                        lambda: json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+                        args.repeat,
+                    )
+                    fast_ms = _median_ms(lambda: dumps_json(payload), args.repeat)
+
+                print(
+                    f"{label:<18}{plain_ms:>12.1f}{gzip_ms:>10.1f}{len(response.content):>12,}{wire_bytes:>12,}"
+                    f"{default_ms:>16.1f}{fast_ms:>13.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark backend cold start: time to the first /health and import cost.
+
+Not collected by pytest. Run from the repository root:
+
+    python test/benchmark_startup.py [--repeat 5] [--top 15]
+
+Starts the API the way the desktop app does (python -m uvicorn src.api:app)
+against a throwaway database and reports the median time until /health
+answers, then the import time of src/api.py and src/main_menu.py with the
+slowest modules from a -X importtime profile. A warm-up run first writes the
+bytecode caches, so the numbers match a normal (not first-ever) launch.
+"""
+
+import argparse
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SRC = os.path.join(ROOT, "src")
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _time_to_health(env, timeout: float = 60.0) -> float:
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {proc.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as resp:
+                    if resp.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError(f"/health did not answer within {timeout:.0f}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def _import_profile(module: str, env):
+    """Run -X importtime for one module; returns (total_ms, [(self_ms, cumulative_ms, name)])."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Lines are in completion order, so a module's subtree is everything since
+    # the previous top-level entry (interpreter startup imports come first)
+    subtree = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        subtree.append((int(self_us) / 1000, int(cumulative_us) / 1000, name))
+        if len(indent) == 1:
+            if name == module:
+                return subtree[-1][1], subtree
+            subtree = []
+    raise RuntimeError(f"no import profile for {module}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list per profile")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, FILE_DATA_DB_PATH=os.path.join(tmp, "file_data.db"), HOME=tmp)
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+        _time_to_health(env)
+        samples = [_time_to_health(env) for _ in range(args.repeat)]
+        print(f"time to first /health: median {statistics.median(samples):.0f} ms "
+              f"(min {min(samples):.0f}, max {max(samples):.0f}, {args.repeat} runs)")
+
+        for module in ("api", "main_menu"):
+            total_ms, rows = _import_profile(module, env)
+            print(f"\nimport {module}: {total_ms:.0f} ms")
+            print(f"{'self ms':>9}{'cumulative ms':>15}  module")
+            for self_ms, cumulative_ms, name in sorted(rows, key=lambda row: row[1], reverse=True)[:args.top]:
+                print(f"{self_ms:>9.1f}{cumulative_ms:>15.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
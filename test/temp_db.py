@@ -0,0 +1,44 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Allow importing from src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import db as db_mod
+
+
+class TempDatabaseTestCase(unittest.TestCase):
+    """Points FILE_DATA_DB_PATH at a fresh database file in a temporary directory for each test."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self._old_db = os.environ.get("FILE_DATA_DB_PATH")
+        self.db_path = os.path.join(self.tmpdir.name, "file_data.db")
+        os.environ["FILE_DATA_DB_PATH"] = self.db_path
+
+    def tearDown(self):
+        if self._old_db is None:
+            os.environ.pop("FILE_DATA_DB_PATH", None)
+        else:
+            os.environ["FILE_DATA_DB_PATH"] = self._old_db
+        self.tmpdir.cleanup()
+
+    def save_project(self, project, files, **scan_kwargs):
+        """
+        save_scan `files` as a scan of /tmp/<project> and return the project id.
+        Each file is a path (10 bytes) or a (path, size) pair.
+        """
+        files_found = [(f, 10, None) if isinstance(f, str) else (f[0], f[1], None) for f in files]
+        db_mod.save_scan(
+            scan_source=f"/tmp/{project}",
+            files_found=files_found,
+            project=project,
+            **scan_kwargs,
+        )
+        return self.project_id(project)
+
+    def project_id(self, name):
+        with db_mod.get_connection() as conn:
+            return conn.execute("SELECT id FROM projects WHERE name = ?", (name,)).fetchone()["id"]
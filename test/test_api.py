@@ -15,6 +15,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..",
 import api as api_mod
 from config import config_path
 import db as db_mod
+from db_commits import replace_project_commits
+from inspect_db import inspect_database_json
 
 
 class TestAPI(unittest.TestCase):
@@ -204,6 +206,8 @@ class TestAPI(unittest.TestCase):
                 (project_id, "impact", "Shipped API dashboard", "v1", "internal", None),
             )
             conn.commit()
+            # the rows above bypass save_scan, like an older database: derive what opening one would
+            db_mod.backfill_derived_data(conn)
 
         portfolio_id = db_mod.save_portfolio(username=username, portfolio_name="Test Portfolio", included_project_ids=[project_id], created_at="2025-02-14 12:00:00Z")
         return portfolio_id, project_id
@@ -301,6 +305,43 @@ class TestAPI(unittest.TestCase):
         self.assertFalse(results[0]["llm_used"])
         self.assertTrue(results[1]["llm_used"])
 
+    def test_list_endpoints_paginate_filter_and_select_fields(self):
+        for name in ("alpha", "beta", "alpine"):
+            db_mod.save_scan(f"/p/{name}", [(f"/p/{name}/main.py", 1, None)], project=name, contributors=[name])
+        with db_mod.get_connection() as conn:
+            for day in (1, 2, 3):
+                conn.execute(
+                    "INSERT INTO resumes (username, resume_path, metadata_json, generated_at) VALUES (?, ?, ?, ?)",
+                    ("alice", f"/r/{day}.md", json.dumps({"llm_summary": "x" if day == 2 else ""}), f"2026-01-0{day} 10:00:00Z"),
+                )
+            conn.commit()
+
+        first = self.client.get("/projects?limit=2&fields=id,name")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual([set(p) for p in first.json()], [{"id", "name"}, {"id", "name"}])
+        cursor = first.headers["X-Next-Cursor"]
+        self.assertIn('rel="next"', first.headers["Link"])
+        rest = self.client.get(f"/projects?limit=2&fields=id,name&after={cursor}")
+        self.assertNotIn("X-Next-Cursor", rest.headers)
+        self.assertEqual([p["name"] for p in first.json() + rest.json()], ["alpha", "beta", "alpine"])
+        # replayed from the response cache with its pagination header
+        self.assertEqual(self.client.get("/projects?limit=2&fields=id,name").headers["X-Next-Cursor"], cursor)
+
+        self.assertEqual([p["name"] for p in self.client.get("/projects?name_prefix=ALP").json()], ["alpha", "alpine"])
+        self.assertEqual(self.client.get("/projects?fields=nope").status_code, 400)
+        self.assertEqual(self.client.get("/projects?after=%%%").status_code, 400)
+        self.assertEqual(self.client.get("/contributors?name_prefix=alp").json(), ["alpha", "alpine"])
+
+        page = self.client.get("/resumes?username=alice&limit=2&fields=generated_at,llm_used")
+        self.assertEqual(page.json(), [
+            {"generated_at": "2026-01-03 10:00:00Z", "llm_used": False},
+            {"generated_at": "2026-01-02 10:00:00Z", "llm_used": True},
+        ])
+        older = self.client.get(f"/resumes?username=alice&limit=2&after={page.headers['X-Next-Cursor']}").json()
+        self.assertEqual([r["generated_at"] for r in older], ["2026-01-01 10:00:00Z"])
+        ranged = self.client.get("/resumes?since=2026-01-02&until=2026-01-02 23:59:59").json()
+        self.assertEqual([r["generated_at"] for r in ranged], ["2026-01-02 10:00:00Z"])
+
     def test_projects_upload_and_list(self):
         self.client.post("/privacy-consent", json={"data_consent": True})
         project_dir = os.path.join(self.tmpdir.name, "project")
@@ -551,6 +592,7 @@ class TestAPI(unittest.TestCase):
                 (project_id, "award", "demo", "winner", "internal", None),
             )
             conn.commit()
+            db_mod.backfill_derived_data(conn)
 
         resp = self.client.get(f"/projects/{project_id}")
         self.assertEqual(resp.status_code, 200)
@@ -566,10 +608,127 @@ class TestAPI(unittest.TestCase):
         self.assertTrue(len(data["contributor_roles"]["contributors"]) >= 1)
         self.assertEqual(data["contributor_roles"]["contributors"][0]["name"], "alice")
 
+        slim = self.client.get(f"/projects/{project_id}?include=skills,evidence").json()
+        self.assertEqual(set(slim), {"project", "skills", "evidence"})
+        self.assertEqual(slim["skills"], data["skills"])
+        without = self.client.get(f"/projects/{project_id}?exclude=git_metrics,scans").json()
+        self.assertEqual(set(without), set(data) - {"git_metrics", "scans"})
+        self.assertEqual(self.client.get(f"/projects/{project_id}?include=bogus").status_code, 400)
+
+        self.assertEqual(self.client.get(f"/projects/{project_id}/roles").json(), data["contributor_roles"])
+        self.assertEqual(self.client.get(f"/projects/{project_id}/git-metrics").json(), data["git_metrics"])
+        self.assertEqual(
+            self.client.get(f"/projects/{project_id}/rank").json(),
+            {"project_id": project_id, "rank_score": data["rank_score"]},
+        )
+        self.assertEqual(self.client.get("/projects/999999/roles").status_code, 404)
+
         skills_resp = self.client.get("/skills")
         self.assertEqual(skills_resp.status_code, 200)
         self.assertIn("APIs", skills_resp.json())
 
+    def test_database_inspect_sections_paginate_and_stream(self):
+        with db_mod.get_connection() as conn:
+            for i in range(3):
+                conn.execute("INSERT INTO scans (project, notes) VALUES (?, ?)", (f"proj_{i}", "n"))
+            conn.commit()
+
+        first = self.client.get("/database/inspect/scans?limit=2")
+        self.assertEqual(first.status_code, 200)
+        page = first.json()
+        self.assertEqual(len(page["items"]), 2)
+        self.assertIsNotNone(page["next_cursor"])
+
+        second = self.client.get("/database/inspect/scans", params={"limit": 2, "cursor": page["next_cursor"]})
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(len(second.json()["items"]), 1)
+        self.assertIsNone(second.json()["next_cursor"])
+
+        streamed = self.client.get("/database/inspect/scans?format=ndjson")
+        self.assertEqual(streamed.status_code, 200)
+        self.assertTrue(streamed.headers["content-type"].startswith("application/x-ndjson"))
+        self.assertEqual(len(streamed.text.strip().splitlines()), 3)
+
+        self.assertEqual(self.client.get("/database/inspect/unknown").status_code, 404)
+        self.assertEqual(self.client.get("/database/inspect/scans?cursor=bogus").status_code, 400)
+
+    def test_large_responses_are_gzipped_and_git_metrics_sent_as_stored(self):
+        db_mod.save_scan("/p/big", [("/p/big/main.py", 1, None)], project="big", contributors=["alice"])
+        git_metrics = {"files_changed_per_author": {"alice": [f"src/module_{i}.py" for i in range(500)]}}
+        with db_mod.get_connection() as conn:
+            project_id = conn.execute("SELECT id FROM projects WHERE name = 'big'").fetchone()[0]
+            conn.execute("UPDATE projects SET git_metrics_json = ? WHERE id = ?", (json.dumps(git_metrics), project_id))
+            conn.commit()
+
+        resp = self.client.get(f"/projects/{project_id}", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(resp.headers["content-encoding"], "gzip")
+        self.assertLess(int(resp.headers["content-length"]), len(resp.content))
+        self.assertEqual(resp.json()["git_metrics"], git_metrics)
+
+        with db_mod.get_connection() as conn:
+            conn.execute("UPDATE projects SET git_metrics_json = 'not json' WHERE id = ?", (project_id,))
+            conn.commit()
+        self.assertEqual(self.client.get(f"/projects/{project_id}").json()["git_metrics"], {})
+
+        overview = self.client.get("/database/inspect")
+        self.assertEqual(overview.status_code, 200)
+        self.assertEqual(overview.json(), inspect_database_json(db_path=self.db_path))
+
+    def test_export_html_includes_project_heatmap(self):
+        portfolio_id, project_id = self._seed_web_portfolio_data()
+        with db_mod.get_connection() as conn:
+            replace_project_commits(conn, project_id, [("2025-01-06 10:00:00", "alice", 1, 5, 0)])
+            conn.commit()
+
+        resp = self.client.get(f"/web/portfolio/{portfolio_id}/export-html", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.headers["content-encoding"], "gzip")
+        self.assertIn("demo_web_project", resp.text)
+        self.assertNotIn("No heatmap data available for this project.", resp.text)
+
+        # streamed rather than rendered into one body
+        plain = self.client.get(f"/web/portfolio/{portfolio_id}/export-html", headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("content-length", plain.headers)
+        self.assertEqual(plain.text, resp.text)
+        self.assertEqual(self.client.get("/web/portfolio/9999/export-html").status_code, 404)
+
+    def test_read_endpoints_revalidate_on_data_version(self):
+        _, project_id = self._seed_web_portfolio_data()
+
+        first = self.client.get("/projects")
+        etag = first.headers["etag"]
+        self.assertEqual(self.client.get("/projects", headers={"If-None-Match": etag}).status_code, 304)
+        self.assertEqual(self.client.get("/projects").json(), first.json())
+
+        self.assertEqual(self.client.patch(f"/projects/{project_id}", json={"custom_name": "Renamed"}).status_code, 200)
+        after = self.client.get("/projects", headers={"If-None-Match": etag})
+        self.assertEqual(after.status_code, 200)
+        self.assertNotEqual(after.headers["etag"], etag)
+        self.assertEqual(after.json()[0]["custom_name"], "Renamed")
+
+        # Writes that change no table keep the cached responses valid
+        etag = after.headers["etag"]
+        self.assertEqual(self.client.post("/privacy-consent", json={"data_consent": True}).status_code, 200)
+        self.assertEqual(self.client.get("/projects", headers={"If-None-Match": etag}).status_code, 304)
+
+        self.assertNotIn("etag", self.client.get("/config").headers)
+
+    def test_database_export_import_round_trip(self):
+        self._seed_web_portfolio_data()
+        exported = self.client.get("/database/export", params={"gzip": True})
+        self.assertEqual(exported.status_code, 200)
+        self.assertIn("attachment", exported.headers["content-disposition"])
+
+        self.client.delete("/database/clear")
+        self.assertEqual(self.client.get("/projects").json(), [])
+
+        imported = self.client.post("/database/import", content=exported.content)
+        self.assertEqual(imported.status_code, 200)
+        self.assertGreaterEqual(imported.json()["tables"]["projects"], 1)
+        self.assertEqual([p["name"] for p in self.client.get("/projects").json()], ["demo_web_project"])
+
+        self.assertEqual(self.client.post("/database/import", content=b"not an export").status_code, 400)
+
     def test_resume_generate_get_edit(self):
         self._write_project_info()
         resp = self.client.post(
@@ -613,7 +772,7 @@ class TestAPI(unittest.TestCase):
             ).fetchone()["id"]
             conn.commit()
 
-        with patch.object(api_mod, "_render_resume_pdf_with_reportlab", return_value=b"%PDF-1.4 test"):
+        with patch.object(api_mod, "_render_resume_pdf", return_value=(b"%PDF-1.4 test", 1)):
             resp = self.client.get(f"/resume/{resume_id}/pdf")
 
         self.assertEqual(resp.status_code, 200)
@@ -652,16 +811,36 @@ class TestAPI(unittest.TestCase):
             "is_multi_page": True,
         })
 
-    def test_count_pdf_pages_fallback_uses_pages_count_object(self):
-        pdf_bytes = (
-            b"%PDF-1.4\n"
-            b"4 0 obj\n<< /Type /Page >>\nendobj\n"
-            b"6 0 obj\n<< /Type /Page >>\nendobj\n"
-            b"9 0 obj\n<< /Count 2 /Kids [ 4 0 R 6 0 R ] /Type /Pages >>\nendobj\n"
-        )
+    def test_resume_pdf_is_rendered_once_until_edited(self):
+        resume_dir = os.path.join(self.tmpdir.name, "resumes")
+        os.makedirs(resume_dir, exist_ok=True)
+        resume_path = os.path.join(resume_dir, "resume_alice.md")
+        with open(resume_path, "w", encoding="utf-8") as f:
+            f.write("# Alice Example\n\n## Summary\nBuilt robust APIs.\n")
+
+        with db_mod.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO resumes (username, resume_path, metadata_json, generated_at) VALUES (?, ?, ?, ?)",
+                ("alice", resume_path, "{}", "2026-01-01 10:00:00Z"),
+            )
+            resume_id = conn.execute(
+                "SELECT id FROM resumes ORDER BY id DESC LIMIT 1"
+            ).fetchone()["id"]
+            conn.commit()
+
+        with patch.object(api_mod, "_render_resume_pdf", return_value=(b"%PDF-1.4 two pages", 2)) as render:
+            info = self.client.get(f"/resume/{resume_id}/pdf/info")
+            pdf = self.client.get(f"/resume/{resume_id}/pdf")
+            self.assertEqual(render.await_count, 1)
+            self.assertEqual(info.json()["page_count"], 2)
+            self.assertTrue(info.json()["is_multi_page"])
+            self.assertEqual(pdf.content, b"%PDF-1.4 two pages")
 
-        with patch.object(api_mod, "PdfReader", None):
-            self.assertEqual(api_mod._count_pdf_pages(pdf_bytes), 2)
+            self.client.post(f"/resume/{resume_id}/edit", json={"content": "# Alice Example\nUpdated\n"})
+            self.assertEqual(len(api_mod.resume_pdf_cache), 0)
+            self.client.get(f"/resume/{resume_id}/pdf/info")
+            self.assertEqual(render.await_count, 2)
+            self.assertEqual(render.await_args.args[0], "# Alice Example\nUpdated\n")
 
     def test_resume_pdf_missing_file_returns_404(self):
         missing_path = os.path.join(self.tmpdir.name, "resumes", "missing_resume.md")
@@ -719,6 +898,61 @@ class TestAPI(unittest.TestCase):
         self.assertEqual(resp_rename.status_code, 200)
         self.assertEqual(resp_rename.json()["portfolio_name"], "Renamed Portfolio")
 
+    def test_web_project_heatmap_reads_commits_table(self):
+        portfolio_id, project_id = self._seed_web_portfolio_data()
+        with db_mod.get_connection() as conn:
+            replace_project_commits(conn, project_id, [
+                ("2025-01-06 10:00:00", "alice", 1, 5, 0),
+                ("2025-01-07 11:00:00", "bob", 1, 2, 0),
+                ("2025-02-10 09:00:00", "alice", 2, 8, 1),
+            ])
+            conn.commit()
+
+        url = f"/web/portfolio/{portfolio_id}/heatmap/project"
+        month = self.client.get(url, params={"project_id": project_id, "granularity": "month"}).json()
+        self.assertEqual(month["value_unit"], "commits")
+        self.assertEqual(month["cells"], [{"period": "2025-01", "value": 2}, {"period": "2025-02", "value": 1}])
+
+        user_day = self.client.get(
+            url, params={"project_id": project_id, "granularity": "day", "view_scope": "user"}
+        ).json()
+        self.assertEqual([c["period"] for c in user_day["cells"]], ["2025-01-06", "2025-02-10"])
+
+        portfolio_commits = self.client.get(
+            f"/web/portfolio/{portfolio_id}/heatmap", params={"granularity": "month", "metric": "commits"}
+        ).json()
+        self.assertEqual(portfolio_commits["max_value"], 2)
+
+    def test_project_history_endpoints_and_heatmap(self):
+        portfolio_id, project_id = self._seed_web_portfolio_data()
+        proj_dir = os.path.join(self.tmpdir.name, "demo_web_project")
+        db_mod.save_scan(proj_dir, [(os.path.join(proj_dir, "old.py"), 10, None)], project="demo_web_project", contributors=["alice"])
+        db_mod.save_scan(proj_dir, [(os.path.join(proj_dir, "main.py"), 20, None)], project="demo_web_project", contributors=["alice"])
+
+        history = self.client.get(f"/projects/{project_id}/history").json()
+        self.assertEqual(history["retention"], {"keep": 10, "max_age_days": None})
+        # the policy comes from the config, so the series is not answered from the cache
+        changed = {"keep": 3, "max_age_days": 30}
+        with patch.object(api_mod, "load_retention_policy", return_value=changed):
+            self.assertEqual(self.client.get(f"/projects/{project_id}/history").json()["retention"], changed)
+        past = [item for item in history["scans"] if item["history_id"] is not None]
+        self.assertGreaterEqual(len(past), 2)
+        self.assertIsNone(history["scans"][-1]["history_id"])
+
+        snapshot = self.client.get(f"/projects/{project_id}/history/{past[-1]['history_id']}").json()
+        self.assertEqual([f["file_path"] for f in snapshot["files"]], [os.path.join(proj_dir, "old.py")])
+        self.assertEqual(self.client.get(f"/projects/{project_id}/history/9999").status_code, 404)
+
+        scans = self.client.get(
+            f"/web/portfolio/{portfolio_id}/heatmap", params={"granularity": "month", "metric": "scans"}
+        ).json()
+        self.assertEqual(sum(cell["value"] for cell in scans["cells"]), len(history["scans"]))
+
+        showcase = self.client.get(f"/web/portfolio/{portfolio_id}/showcase").json()
+        evolution = showcase["projects"][0]["evolution"]
+        self.assertEqual(len(evolution), len(history["scans"]))
+        self.assertIsNone(evolution[0]["id"])
+
     def test_web_portfolio_endpoints(self):
         portfolio_id, project_id = self._seed_web_portfolio_data()
 
@@ -753,6 +987,132 @@ class TestAPI(unittest.TestCase):
         timeline_after_resp = self.client.get(f"/web/portfolio/{portfolio_id}/timeline")
         self.assertEqual(timeline_after_resp.status_code, 200)
 
+    def test_web_portfolio_bundle_matches_individual_views(self):
+        portfolio_id, project_id = self._seed_web_portfolio_data()
+        for value in ("Regional science fair", "Hackathon finalist", "Dean's list", "Best demo"):
+            self.client.post(f"/projects/{project_id}/evidence", json={"type": "award", "value": value})
+
+        resp = self.client.get(f"/web/portfolio/{portfolio_id}/bundle")
+        self.assertEqual(resp.status_code, 200)
+        bundle = resp.json()
+
+        base = f"/web/portfolio/{portfolio_id}"
+        self.assertEqual(bundle["portfolio"], self.client.get(f"/portfolios/{portfolio_id}").json())
+        self.assertEqual(bundle["timeline"], self.client.get(f"{base}/timeline?granularity=month").json())
+        self.assertEqual(bundle["heatmap"], self.client.get(f"{base}/heatmap?granularity=day").json())
+        self.assertEqual(bundle["showcase"], self.client.get(f"{base}/showcase?limit=3").json())
+        # the batched evidence query still keeps only the three newest per project
+        self.assertEqual(len(bundle["showcase"]["projects"][0]["evidence"]), 3)
+        self.assertEqual(
+            bundle["project_heatmaps"][str(project_id)],
+            self.client.get(f"{base}/heatmap/project", params={"project_id": project_id}).json(),
+        )
+        self.assertEqual(
+            bundle["projects"][str(project_id)],
+            self.client.get(f"/projects/{project_id}?exclude=scans").json(),
+        )
+
+        # per-project heatmaps are built with grouped queries for every metric and scope
+        for metric in ("scans", "files", "contrib_files"):
+            for scope in ("project", "user"):
+                params = {"project_metric": metric, "project_view_scope": scope, "project_granularity": "month"}
+                batched = self.client.get(f"{base}/bundle", params=params).json()["project_heatmaps"]
+                single = self.client.get(
+                    f"{base}/heatmap/project",
+                    params={"project_id": project_id, "metric": metric, "view_scope": scope, "granularity": "month"},
+                ).json()
+                self.assertEqual(batched[str(project_id)], single)
+
+        user_scope = self.client.get(f"{base}/bundle", params={"project_view_scope": "user"}).json()
+        self.assertEqual(user_scope["project_heatmaps"][str(project_id)]["view_scope"], "user")
+        self.assertEqual(self.client.get("/web/portfolio/9999/bundle").status_code, 404)
+
+    def test_read_model_serves_the_same_responses_as_sql(self):
+        portfolio_id, project_id = self._seed_web_portfolio_data()
+        self.client.post(f"/projects/{project_id}/evidence", json={"type": "award", "value": "Best demo"})
+        db_mod.save_scan(
+            "/scans/second", [("/scans/second/app.py", 10, None)], project="second_project",
+            contributors=["alice", "carol"], detected_skills=["Docker"], notes="first",
+        )
+        paths = [
+            "/projects", "/projects?limit=1", "/projects?name_prefix=DEMO", "/projects?since=2025-02-01",
+            "/skills", "/skills?limit=1&name_prefix=t", "/contributors", "/contributors?limit=2",
+            "/rank-projects", "/rank-projects?mode=contributor&contributor_name=alice",
+            "/rank-projects?sort_mode=chronological&chronological_order=asc",
+            f"/web/portfolio/{portfolio_id}/showcase", f"/web/portfolio/{portfolio_id}/bundle",
+        ]
+
+        def fetch():
+            api_mod.response_cache.clear()
+            return {path: (resp.json(), resp.headers.get("x-next-cursor"))
+                    for path, resp in ((path, self.client.get(path)) for path in paths)}
+
+        from_sql = fetch()
+        api_mod.read_model.enabled = True
+        try:
+            self.assertEqual(fetch(), from_sql)
+            status = self.client.get("/database/read-model", params={"verify": True}).json()
+            self.assertTrue(status["loaded"])
+            self.assertTrue(status["consistent"])
+
+            # db.py writes apply the projects they changed as part of the write...
+            loads, deltas = api_mod.read_model.loads, api_mod.read_model.deltas
+            db_mod.save_scan("/scans/third", [("/scans/third/x.py", 1, None)], project="third_project")
+            self.assertEqual(api_mod.read_model.deltas, deltas + 1)
+            names = [project["name"] for project in self.client.get("/projects").json()]
+            self.assertIn("third_project", names)
+            self.assertEqual(api_mod.read_model.loads, loads)
+            self.assertTrue(self.client.get("/database/read-model", params={"verify": True}).json()["consistent"])
+
+            # ...and any other write is picked up by the next read
+            with db_mod.get_connection() as conn:
+                conn.execute("UPDATE projects SET custom_name = 'Renamed' WHERE name = 'third_project'")
+                conn.commit()
+            projects = self.client.get("/projects", params={"name_prefix": "ren"}).json()
+            self.assertEqual([project["custom_name"] for project in projects], ["Renamed"])
+            self.assertEqual(api_mod.read_model.loads, loads + 1)
+        finally:
+            api_mod.read_model.enabled = None
+        self.assertFalse(self.client.get("/database/read-model").json()["loaded"])
+
+    def test_writes_publish_change_events(self):
+        portfolio_id, project_id = self._seed_web_portfolio_data()
+        feed = api_mod.change_feed
+        feed.check_version(api_mod.read_data_version(self.db_path))
+        start = feed.last_id
+
+        evidence = self.client.post(f"/projects/{project_id}/evidence", json={"type": "award", "value": "Best demo"})
+        self.client.delete(f"/projects/{project_id}/evidence/{evidence.json()['evidence_id']}")
+        self.client.patch(f"/projects/{project_id}", json={"custom_name": "Demo"})
+        self.client.post("/custom-rankings", json={"name": "mine", "projects": ["demo_project"]})
+        self.client.delete("/custom-rankings/mine")
+        self.client.patch(f"/portfolios/{portfolio_id}/name", json={"portfolio_name": "Renamed"})
+        db_mod.save_scan("/scans/second", [("/scans/second/app.py", 10, None)], project="second_project")
+
+        events = feed.events_since(start)
+        self.assertEqual(
+            [(event["topic"], event["action"]) for event in events],
+            [
+                ("evidence", "created"), ("evidence", "deleted"), ("projects", "updated"),
+                ("rankings", "saved"), ("rankings", "deleted"), ("portfolios", "updated"), ("scans", "saved"),
+            ],
+        )
+        self.assertEqual(events[0]["project_id"], project_id)
+        self.assertEqual(events[-1]["projects"], ["second_project"])
+        with db_mod.get_connection() as conn:
+            second_id = conn.execute("SELECT id FROM projects WHERE name = 'second_project'").fetchone()[0]
+        self.assertEqual(events[-1]["project_ids"], [second_id])
+
+        # Every version bump so far is accounted for by an event...
+        self.assertIsNone(feed.check_version(api_mod.read_data_version(self.db_path)))
+        # ...while a write from outside the API process is reported as a database change
+        with db_mod.get_connection() as conn:
+            conn.execute("UPDATE projects SET custom_name = 'Elsewhere' WHERE id = ?", (project_id,))
+            conn.commit()
+        event = feed.check_version(api_mod.read_data_version(self.db_path))
+        self.assertEqual((event["topic"], event["action"]), ("database", "changed"))
+
+        self.assertEqual(self.client.get("/events", params={"topics": "projects,nope"}).status_code, 400)
 
     def test_delete_project_endpoint(self):
         with api_mod.get_connection() as conn:
@@ -935,6 +1295,32 @@ class TestAPI(unittest.TestCase):
         self.assertEqual(body["project"]["repo_url"], "https://keep-url.com")
         self.assertEqual(body["project"]["thumbnail_path"], "/new/thumb.png")
 
+    def test_search_endpoint_follows_project_edits(self):
+        with api_mod.get_connection() as conn:
+            conn.execute("INSERT INTO projects (name) VALUES (?)", ("search_demo",))
+            project_id = conn.execute(
+                "SELECT id FROM projects WHERE name = ?",
+                ("search_demo",),
+            ).fetchone()["id"]
+            conn.commit()
+
+        resp = self.client.patch(
+            f"/projects/{project_id}",
+            json={"custom_name": "Weather Station", "summary_text": "Collects telemetry from sensors"},
+        )
+        self.assertEqual(resp.status_code, 200)
+
+        body = self.client.get("/search", params={"q": "telemetry"}).json()
+        self.assertEqual(body["total"], 1)
+        self.assertIsNone(body["next_offset"])
+        self.assertEqual(body["results"][0]["project_id"], project_id)
+        self.assertEqual(body["results"][0]["matches"][0]["kind"], "summary")
+
+        self.client.post(f"/projects/{project_id}/evidence", json={"type": "award", "value": "Regional science fair"})
+        self.assertEqual(self.client.get("/search", params={"q": "science fair"}).json()["total"], 1)
+        self.assertEqual(self.client.get("/search", params={"q": "weather"}).json()["total"], 1)
+        self.assertEqual(self.client.get("/search", params={"q": ""}).status_code, 422)
+
     def test_project_thumbnail_image_endpoint(self):
         thumbnail_path = os.path.join(self.tmpdir.name, "thumb.png")
         with open(thumbnail_path, "wb") as fh:
@@ -1024,6 +1410,13 @@ class TestAPI(unittest.TestCase):
         resp = self.client.delete(f"/projects/{project_id}")
         self.assertEqual(resp.status_code, 200)
 
+        # Orphans are left for the background maintenance pass
+        status = self.client.get("/database/maintenance").json()
+        self.assertTrue(status["pending"])
+        report = self.client.post("/database/maintenance").json()
+        self.assertEqual(report["orphans_removed"], {"contributors": 1, "languages": 1, "path_dirs": 0})
+        self.assertFalse(self.client.get("/database/maintenance").json()["pending"])
+
         with api_mod.get_connection() as conn:
             contributor_row = conn.execute(
                 "SELECT id FROM contributors WHERE name = ?",
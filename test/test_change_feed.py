@@ -0,0 +1,132 @@
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import threading
+import unittest
+
+# Allow importing from src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from change_feed import QUEUE_SIZE, ChangeFeed, format_event, iter_event_stream
+from db_version import data_version
+
+
+def _parse(chunk: bytes):
+    fields = dict(line.split(": ", 1) for line in chunk.decode("utf-8").strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+
+class TestChangeFeed(unittest.TestCase):
+    def test_publish_from_another_thread_reaches_subscribers(self):
+        feed = ChangeFeed()
+
+        async def run():
+            subscription = feed.subscribe()
+            thread = threading.Thread(target=feed.publish, args=("projects",), kwargs={"project_id": 7})
+            thread.start()
+            event = await subscription.get(timeout=5)
+            thread.join()
+            feed.unsubscribe(subscription)
+            return event
+
+        self.assertEqual(asyncio.run(run()), {"id": 1, "topic": "projects", "project_id": 7})
+        self.assertEqual(feed.subscriber_count(), 0)
+
+    def test_reconnect_replays_missed_events_or_asks_for_a_resync(self):
+        feed = ChangeFeed(history=3)
+        for topic in ("projects", "scans", "evidence", "resumes"):
+            feed.publish(topic)
+
+        async def drain(last_event_id):
+            subscription = feed.subscribe(last_event_id)
+            events = []
+            while True:
+                event = await subscription.get(timeout=0)
+                if event is None:
+                    return events
+                events.append(event)
+
+        self.assertEqual([e["topic"] for e in asyncio.run(drain(2))], ["evidence", "resumes"])
+        self.assertEqual(asyncio.run(drain(4)), [])
+        # Event 1 has left the history
+        self.assertEqual(asyncio.run(drain(0)), [{"id": 4, "topic": "database", "action": "resync"}])
+        self.assertIsNone(feed.events_since(0))
+
+    def test_slow_subscriber_gets_one_resync_instead_of_a_backlog(self):
+        feed = ChangeFeed()
+
+        async def run():
+            subscription = feed.subscribe()
+            for _ in range(QUEUE_SIZE + 5):
+                feed.publish("scans")
+            await asyncio.sleep(0)
+            events = []
+            while (event := await subscription.get(timeout=0)) is not None:
+                events.append(event)
+            return events
+
+        events = asyncio.run(run())
+        self.assertLess(len(events), QUEUE_SIZE)
+        self.assertIn({"id": QUEUE_SIZE + 1, "topic": "database", "action": "resync"}, events)
+        self.assertEqual(events[-1]["id"], QUEUE_SIZE + 5)
+
+    def test_version_changes_without_an_event_are_reported(self):
+        feed = ChangeFeed()
+        self.assertIsNone(feed.check_version(("a", 1)))
+        self.assertIsNone(feed.check_version(("a", 1)))
+        feed.advance(("a", 1), ("a", 2))
+        self.assertIsNone(feed.check_version(("a", 2)))
+        self.assertEqual(feed.check_version(("a", 5))["action"], "changed")
+        self.assertEqual(feed.check_version(("b", 0))["action"], "replaced")
+
+    def test_known_version_only_moves_forward(self):
+        feed = ChangeFeed()
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE data_version (id INTEGER PRIMARY KEY, epoch TEXT, version INTEGER)")
+        conn.execute("INSERT INTO data_version VALUES (1, 'a', 3)")
+        stale = data_version(conn)
+        conn.execute("UPDATE data_version SET version = 7")
+        current = data_version(conn)
+
+        feed.publish("projects", conn)
+        self.assertEqual(feed.version, current)
+        # A publisher or stream check that read the version earlier does not move it back
+        conn.execute("UPDATE data_version SET version = ?", (stale[1],))
+        feed.publish("scans", conn)
+        self.assertEqual(feed.version, current)
+        self.assertIsNone(feed.check_version(stale))
+        self.assertEqual(feed.version, current)
+        conn.close()
+
+    def test_event_stream_filters_topics_and_checks_the_version(self):
+        feed = ChangeFeed()
+        versions = iter([("a", 1), ("a", 1), ("a", 2)])
+
+        async def read_version():
+            return next(versions, ("a", 2))
+
+        async def run():
+            stream = iter_event_stream(feed, read_version, topics=["projects"], check_interval=0.01)
+            self.assertTrue((await stream.__anext__()).startswith(b"retry: "))
+            feed.publish("resumes", resume_id=1)
+            feed.publish("projects", project_id=3)
+            chunks = [await stream.__anext__(), await stream.__anext__()]
+            await stream.aclose()
+            return chunks
+
+        chunks = asyncio.run(run())
+        self.assertEqual(_parse(chunks[0]), ("projects", {"id": 2, "topic": "projects", "project_id": 3}))
+        self.assertEqual(_parse(chunks[1]), ("database", {"id": 3, "topic": "database", "action": "changed"}))
+        self.assertEqual(feed.subscriber_count(), 0)
+
+    def test_format_event(self):
+        self.assertEqual(
+            format_event({"id": 3, "topic": "scans", "scan_ids": [1]}),
+            b'id: 3\nevent: scans\ndata: {"id": 3, "topic": "scans", "scan_ids": [1]}\n\n',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
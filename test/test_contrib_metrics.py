@@ -172,6 +172,35 @@ class TestContribMetrics(unittest.TestCase):
             _robust_rmtree(tmp)
 
     @unittest.skipUnless(_git_available(), "git is required for these tests")
+    @unittest.skipUnless(_git_available(), "git is required for these tests")
+    def test_commit_log_has_one_row_per_commit(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            _run(['git', 'init'], cwd=tmp)
+            _run(['git', 'config', 'user.name', 'Alice'], cwd=tmp)
+            _run(['git', 'config', 'user.email', 'alice@example.com'], cwd=tmp)
+
+            for name, content, date in [
+                ('a.py', 'x=1\ny=2\n', '2025-01-06T10:00:00'),
+                ('b.py', 'z=3\n', '2025-02-03T09:30:00'),
+            ]:
+                with open(os.path.join(tmp, name), 'w') as f:
+                    f.write(content)
+                _run(['git', 'add', name], cwd=tmp)
+                env = os.environ.copy()
+                env.update({'GIT_AUTHOR_DATE': date, 'GIT_COMMITTER_DATE': date})
+                _run(['git', 'commit', '-m', f'add {name}'], cwd=tmp, env=env)
+
+            metrics = analyze_repo(tmp)
+            self.assertEqual(
+                sorted(metrics.commit_log),
+                [('2025-01-06 10:00:00', 'alice', 1, 2, 0), ('2025-02-03 09:30:00', 'alice', 1, 1, 0)],
+            )
+            # The per-commit rows are not part of the metrics payload itself
+            self.assertNotIn('commit_log', metrics)
+        finally:
+            _robust_rmtree(tmp)
+
     def test_zero_commit_user_excluded(self):
         tmp = tempfile.mkdtemp()
         try:
@@ -55,9 +55,13 @@ class TestDatabaseClearAndDeleteProject(unittest.TestCase):
         # Assert all tables are empty
         with get_connection() as conn:
             cur = conn.cursor()
+            # FTS5 shadow tables (search_index_data, _config, ...) always hold
+            # index bookkeeping rows; the search_index table itself must be empty.
+            # data_version keeps its single counter row so caches see the clear.
             tables = cur.execute("""
                 SELECT name FROM sqlite_master
-                WHERE type='table' AND name NOT LIKE 'sqlite_%';
+                WHERE type='table' AND name NOT LIKE 'sqlite_%' AND name NOT LIKE 'search_index_%'
+                  AND name != 'data_version';
             """).fetchall()
 
             for (table,) in tables:
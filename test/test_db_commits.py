@@ -0,0 +1,152 @@
+import os
+import sys
+import unittest
+
+# Allow importing from src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import db as db_mod
+from contrib_metrics import RepoMetrics
+from db_commits import commit_activity, commit_activity_by_project, has_project_commits, projects_with_commits
+from db_maintenance import collect_orphans
+from temp_db import TempDatabaseTestCase
+
+
+COMMIT_LOG = [
+    ("2025-01-06 10:00:00", "alice", 2, 10, 1),  # Monday
+    ("2025-01-08 23:59:00", "Alice", 1, 3, 0),   # same week, same canonical author
+    ("2025-01-08 12:00:00", "bob", 1, 1, 1),
+    ("2025-02-02 08:00:00", "bob", 4, 40, 5),    # Sunday, still week of 2025-01-27
+]
+
+
+class TestDbCommits(TempDatabaseTestCase):
+    def _save(self, commit_log):
+        metrics = RepoMetrics({"total_commits": len(commit_log)}, commit_log=commit_log)
+        return self.save_project("demo", ["/tmp/demo/a.py"], git_metrics=metrics)
+
+    def test_save_scan_stores_commits(self):
+        project_id = self._save(COMMIT_LOG)
+        with db_mod.get_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT c.committed_at, c.author, c.files_changed, c.lines_added, c.lines_removed
+                FROM commits c
+                WHERE c.project_id = ?
+                ORDER BY c.committed_at
+                """,
+                (project_id,),
+            ).fetchall()
+            stored_json = conn.execute("SELECT git_metrics_json FROM projects WHERE id = ?", (project_id,)).fetchone()[0]
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(tuple(rows[0]), ("2025-01-06 10:00:00", "alice", 2, 10, 1))
+        self.assertEqual({row["author"] for row in rows}, {"alice", "bob"})
+        self.assertNotIn("commit_log", stored_json)
+
+    def test_commit_authors_do_not_become_contributors(self):
+        project_id = self._save(COMMIT_LOG + [("2025-03-01 09:00:00", "dependabot[bot]", 1, 2, 2), ("2025-03-02 09:00:00", "", 1, 1, 0)])
+        with db_mod.get_connection() as conn:
+            names = [row[0] for row in conn.execute("SELECT name FROM contributors ORDER BY name")]
+            self.assertEqual(commit_activity(conn, project_id, "month")[-1], {"period": "2025-03", "value": 2})
+        self.assertEqual(names, [])
+
+    def test_commits_linked_to_contributors_are_converted_to_names(self):
+        with db_mod.get_connection() as conn:
+            conn.execute("DROP TABLE commits")
+            conn.execute("""
+                CREATE TABLE commits (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    project_id INTEGER NOT NULL,
+                    author_id INTEGER NOT NULL,
+                    committed_at TEXT NOT NULL,
+                    files_changed INTEGER NOT NULL DEFAULT 0,
+                    lines_added INTEGER NOT NULL DEFAULT 0,
+                    lines_removed INTEGER NOT NULL DEFAULT 0,
+                    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
+                    FOREIGN KEY (author_id) REFERENCES contributors(id)
+                )
+            """)
+            project_id = conn.execute("INSERT INTO projects (name) VALUES ('demo')").lastrowid
+            author_id = conn.execute("INSERT INTO contributors (name) VALUES ('dependabotbot')").lastrowid
+            conn.execute(
+                "INSERT INTO commits (project_id, author_id, committed_at) VALUES (?, ?, '2025-01-06 10:00:00')",
+                (project_id, author_id),
+            )
+            conn.commit()
+
+        with db_mod.get_connection() as conn:
+            rows = [tuple(row) for row in conn.execute("SELECT project_id, author FROM commits")]
+            collect_orphans(conn)
+            contributors = conn.execute("SELECT COUNT(*) FROM contributors").fetchone()[0]
+        self.assertEqual(rows, [(project_id, "dependabotbot")])
+        self.assertEqual(contributors, 0)
+
+    def test_commit_activity_granularities(self):
+        project_id = self._save(COMMIT_LOG)
+        with db_mod.get_connection() as conn:
+            self.assertEqual(
+                commit_activity(conn, project_id, "day"),
+                [
+                    {"period": "2025-01-06", "value": 1},
+                    {"period": "2025-01-08", "value": 2},
+                    {"period": "2025-02-02", "value": 1},
+                ],
+            )
+            self.assertEqual(
+                commit_activity(conn, project_id, "week"),
+                [{"period": "2025-01-06", "value": 3}, {"period": "2025-01-27", "value": 1}],
+            )
+            self.assertEqual(
+                commit_activity(conn, project_id, "month"),
+                [{"period": "2025-01", "value": 3}, {"period": "2025-02", "value": 1}],
+            )
+            self.assertEqual(
+                commit_activity(conn, project_id, "week", author="Alice"),
+                [{"period": "2025-01-06", "value": 2}],
+            )
+            self.assertEqual(
+                commit_activity(conn, project_id, "day", start="2025-01-08", end="2025-01-08"),
+                [{"period": "2025-01-08", "value": 2}],
+            )
+            self.assertEqual(commit_activity(conn, project_id, "day", author="nobody"), [])
+
+    def test_activity_by_project_matches_single_project_queries(self):
+        project_id = self._save(COMMIT_LOG)
+        with db_mod.get_connection() as conn:
+            self.assertEqual(projects_with_commits(conn, [project_id, project_id + 1]), {project_id})
+            for granularity in ("day", "week", "month"):
+                self.assertEqual(
+                    commit_activity_by_project(conn, [project_id, project_id + 1], granularity),
+                    {project_id: commit_activity(conn, project_id, granularity)},
+                )
+            self.assertEqual(
+                commit_activity_by_project(conn, [project_id], "week", author="Alice"),
+                {project_id: [{"period": "2025-01-06", "value": 2}]},
+            )
+            self.assertEqual(commit_activity_by_project(conn, [project_id], "day", author="nobody"), {})
+
+    def test_rescan_replaces_and_delete_removes_commits(self):
+        project_id = self._save(COMMIT_LOG)
+        self._save(COMMIT_LOG[:1])
+        with db_mod.get_connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM commits WHERE project_id = ?", (project_id,)).fetchone()[0]
+        self.assertEqual(count, 1)
+
+        db_mod.delete_project_by_id(project_id)
+        with db_mod.get_connection() as conn:
+            self.assertFalse(has_project_commits(conn, project_id))
+
+    def test_plain_metrics_dict_leaves_commits_untouched(self):
+        project_id = self._save(COMMIT_LOG)
+        db_mod.save_scan(
+            scan_source="/tmp/demo",
+            files_found=[("/tmp/demo/a.py", 10, None)],
+            project="demo",
+            git_metrics={"total_commits": 4},
+        )
+        with db_mod.get_connection() as conn:
+            self.assertTrue(has_project_commits(conn, project_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
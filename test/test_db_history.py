@@ -0,0 +1,136 @@
+import json
+import os
+import sys
+import unittest
+
+# Allow importing from src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import db as db_mod
+from db_history import apply_delta, apply_retention, diff_snapshots, history_series, reconstruct_scan
+from temp_db import TempDatabaseTestCase
+
+
+def _entry(size, contributors=("alice",)):
+    return {
+        "size": size,
+        "modified_at": None,
+        "owner": None,
+        "category": "code",
+        "extension": ".py",
+        "languages": ["Python"],
+        "contributors": list(contributors),
+    }
+
+
+class TestDeltas(unittest.TestCase):
+    def test_delta_turns_newer_snapshot_back_into_older(self):
+        older = {"a.py": _entry(1), "b.py": _entry(2)}
+        newer = {"a.py": _entry(5), "c.py": _entry(3)}
+        delta = diff_snapshots(older, newer)
+        self.assertEqual(set(delta["added"]), {"b.py"})
+        self.assertEqual(delta["removed"], ["c.py"])
+        self.assertEqual(delta["changed"], {"a.py": _entry(1)})
+        self.assertEqual(apply_delta(newer, delta), older)
+
+    def test_unchanged_files_are_not_stored(self):
+        snapshot = {"a.py": _entry(1)}
+        self.assertEqual(diff_snapshots(snapshot, dict(snapshot)), {"added": {}, "removed": [], "changed": {}})
+
+
+class TestScanHistory(TempDatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self._old_home = os.environ.get("HOME")
+        os.environ["HOME"] = self.tmpdir.name
+
+    def tearDown(self):
+        if self._old_home is None:
+            os.environ.pop("HOME", None)
+        else:
+            os.environ["HOME"] = self._old_home
+        super().tearDown()
+
+    def _configure(self, **policy):
+        os.makedirs(os.path.join(self.tmpdir.name, ".mda"), exist_ok=True)
+        with open(os.path.join(self.tmpdir.name, ".mda", "config.json"), "w", encoding="utf-8") as f:
+            json.dump(policy, f)
+
+    def _save(self, files, notes, tech, skills):
+        files = [(f"/tmp/proj/{name}", size) for name, size in files]
+        return self.save_project(
+            "proj",
+            files,
+            notes=notes,
+            file_metadata={path: {"owner": "individual (alice)", "language": "Python"} for path, _ in files},
+            tech_summary=tech,
+            detected_skills=skills,
+        )
+
+    def _three_scans(self):
+        self._save([("a.py", 1), ("b.py", 2)], "first", {"frameworks": []}, ["APIs"])
+        self._save([("a.py", 5), ("c.py", 3)], "second", {"frameworks": ["FastAPI"]}, ["Testing"])
+        self._save([("c.py", 3), ("src/d.py", 4)], "third", {"frameworks": ["FastAPI"]}, [])
+        return self.project_id("proj")
+
+    def test_older_scans_are_reconstructed_from_deltas(self):
+        project_id = self._three_scans()
+        with db_mod.get_connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM scans").fetchone()[0], 1)
+            history_ids = [r[0] for r in conn.execute("SELECT id FROM scan_history ORDER BY id")]
+            self.assertEqual(len(history_ids), 2)
+
+            first = reconstruct_scan(conn, project_id, history_ids[0])
+            second = reconstruct_scan(conn, project_id, history_ids[1])
+
+        self.assertEqual(first["notes"], "first")
+        self.assertEqual([(f["file_path"], f["size"]) for f in first["files"]], [("/tmp/proj/a.py", 1), ("/tmp/proj/b.py", 2)])
+        self.assertEqual(first["tech"], {"frameworks": []})
+        self.assertEqual(first["skills"], ["APIs"])
+        self.assertEqual(first["files"][0]["contributors"], ["alice"])
+        self.assertEqual([(f["file_path"], f["size"]) for f in second["files"]], [("/tmp/proj/a.py", 5), ("/tmp/proj/c.py", 3)])
+        self.assertEqual(second["skills"], ["APIs", "Testing"])
+
+    def test_series_uses_stored_counts(self):
+        project_id = self._three_scans()
+        with db_mod.get_connection() as conn:
+            series = history_series(conn, project_id)
+        self.assertEqual([p["notes"] for p in series], ["first", "second", "third"])
+        self.assertEqual([p["total_size"] for p in series], [3, 8, 7])
+        self.assertEqual([p["file_count"] for p in series], [2, 2, 2])
+        self.assertIsNone(series[-1]["history_id"])
+
+    def test_retention_keeps_newest_history_rows(self):
+        self._configure(scan_history_keep=1)
+        project_id = self._three_scans()
+        with db_mod.get_connection() as conn:
+            rows = conn.execute("SELECT id, notes FROM scan_history").fetchall()
+            self.assertEqual([r["notes"] for r in rows], ["second"])
+            # the remaining scan still rebuilds from the live snapshot
+            self.assertEqual(len(reconstruct_scan(conn, project_id, rows[0]["id"])["files"]), 2)
+
+    def test_retention_by_age_and_disabled_history(self):
+        self._configure(scan_history_keep=0)
+        project_id = self._three_scans()
+        with db_mod.get_connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM scan_history").fetchone()[0], 0)
+            conn.execute(
+                "INSERT INTO scan_history (project_id, scanned_at, delta_json) VALUES (?, ?, '{}')",
+                (project_id, "2000-01-01 00:00:00"),
+            )
+            conn.execute(
+                "INSERT INTO scan_history (project_id, scanned_at, delta_json) VALUES (?, datetime('now'), '{}')",
+                (project_id,),
+            )
+            self.assertEqual(apply_retention(conn, project_id, keep=None, max_age_days=30), 1)
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM scan_history").fetchone()[0], 1)
+
+    def test_deleting_project_drops_its_history(self):
+        project_id = self._three_scans()
+        db_mod.delete_project_by_id(project_id)
+        with db_mod.get_connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM scan_history").fetchone()[0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
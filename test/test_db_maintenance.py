@@ -2,13 +2,27 @@ import os
 import sqlite3
 import sys
 import unittest
+from unittest.mock import patch
 
 import pytest
 
 # Allow importing from src/
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
 
-from db_maintenance import prune_old_project_scans
+import time
+
+import db as db_mod
+from change_feed import change_feed
+from db_stats import load_global_stats
+from db_version import data_version
+from db_maintenance import (
+    MaintenanceScheduler,
+    load_maintenance_status,
+    maintenance_pending,
+    prune_old_project_scans,
+    run_maintenance,
+)
+from temp_db import TempDatabaseTestCase
 
 
 def _create_min_schema(conn: sqlite3.Connection) -> None:
@@ -186,5 +200,141 @@ class TestDbMaintenance(unittest.TestCase):
         self.assertEqual(cur.fetchone()["c"], 1)
 
 
+class TestBackgroundMaintenance(TempDatabaseTestCase):
+    def _names(self, table):
+        with db_mod.get_connection() as conn:
+            return {row[0] for row in conn.execute(f"SELECT name FROM {table}")}
+
+    def test_delete_defers_orphan_cleanup_to_maintenance(self):
+        alpha = self.save_project("alpha", ["/tmp/alpha/a.py"], contributors=["alice"], detected_languages=["Python"])
+        self.save_project("beta", ["/tmp/beta/b.go"], contributors=["bob"], detected_languages=["Go"])
+
+        self.assertTrue(db_mod.delete_project_by_id(alpha))
+        self.assertIn("alice", self._names("contributors"))
+        start = change_feed.last_id
+        with db_mod.get_connection() as conn:
+            self.assertTrue(maintenance_pending(conn))
+            report = run_maintenance(conn)
+            status = load_maintenance_status(conn)
+            version = data_version(conn)
+
+        self.assertEqual(report["orphans_removed"], {"contributors": 1, "languages": 1, "path_dirs": 0})
+        # The removal is announced as its own event, not left for the stream to report as "database"
+        events = change_feed.events_since(start)
+        self.assertEqual(
+            events[-1],
+            {"id": events[-1]["id"], "topic": "maintenance", "action": "orphans_removed", "contributors": 1, "languages": 1},
+        )
+        self.assertIsNone(change_feed.check_version(version))
+        self.assertTrue(report["analyzed"])
+        self.assertEqual(self._names("contributors"), {"bob"})
+        self.assertEqual(self._names("languages"), {"Go"})
+        self.assertFalse(status["pending"])
+        self.assertEqual(status["last_report"]["orphans_removed"], report["orphans_removed"])
+        with db_mod.get_connection() as conn:
+            self.assertEqual(load_global_stats(conn)["contributor_count"], 1)
+
+    def test_rescan_prune_requests_maintenance_and_vacuum_reclaims_pages(self):
+        files = [f"/tmp/big/{i}_{'x' * 200}.py" for i in range(300)]
+        self.save_project("big", files, contributors=["alice"])
+        with db_mod.get_connection() as conn:
+            self.assertFalse(maintenance_pending(conn))
+            self.assertEqual(conn.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+
+        self.save_project("big", files[:1], contributors=["carol"])
+        with db_mod.get_connection() as conn:
+            self.assertTrue(maintenance_pending(conn))
+            self.assertGreater(conn.execute("PRAGMA freelist_count").fetchone()[0], 0)
+            report = run_maintenance(conn)
+
+        self.assertEqual(report["orphans_removed"]["contributors"], 1)
+        self.assertGreater(report["pages_reclaimed"], 0)
+        self.assertEqual(report["bytes_reclaimed"] % 512, 0)
+        self.assertFalse(report["full_vacuum"])
+
+    def test_full_vacuum_conversion_runs_only_when_requested(self):
+        files = [f"/tmp/big/{i}_{'x' * 200}.py" for i in range(300)]
+        self.save_project("big", files, contributors=["alice"])
+        with db_mod.get_connection() as conn:
+            # A database from before auto_vacuum was enabled
+            conn.execute("PRAGMA auto_vacuum = NONE")
+            conn.execute("VACUUM")
+        self.save_project("big", files[:1], contributors=["carol"])
+
+        with db_mod.get_connection() as conn:
+            self.assertGreater(conn.execute("PRAGMA freelist_count").fetchone()[0], 0)
+            report = run_maintenance(conn)
+            self.assertFalse(report["full_vacuum"])
+            self.assertTrue(report["needs_full_vacuum"])
+            # Nothing is handed back without the conversion
+            self.assertEqual(report["pages_reclaimed"], 0)
+            self.assertGreater(conn.execute("PRAGMA freelist_count").fetchone()[0], 0)
+
+        scheduler = MaintenanceScheduler(db_mod.get_connection)
+        report = scheduler.run_now(full_vacuum=True)
+        self.assertTrue(report["full_vacuum"])
+        self.assertFalse(report["needs_full_vacuum"])
+        self.assertGreater(report["pages_reclaimed"], 0)
+        with db_mod.get_connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+
+    def test_scheduler_waits_for_idle_and_rate_limits(self):
+        alpha = self.save_project("alpha", ["/tmp/alpha/a.py"], contributors=["alice"])
+        db_mod.delete_project_by_id(alpha)
+
+        scheduler = MaintenanceScheduler(db_mod.get_connection, min_interval=60, idle_seconds=5)
+        scheduler.note_activity()
+        self.assertFalse(scheduler.is_due())
+
+        now = time.monotonic() + 10
+        self.assertTrue(scheduler.is_due(now))
+        scheduler.run_now()
+        self.assertEqual(scheduler.last_report["orphans_removed"]["contributors"], 1)
+
+        # Flag it again: still inside min_interval, so nothing is due yet
+        with db_mod.get_connection() as conn:
+            conn.execute("UPDATE maintenance_state SET pending = 1")
+            conn.commit()
+        self.assertFalse(scheduler.is_due(time.monotonic() + 10))
+        self.assertTrue(scheduler.is_due(time.monotonic() + 61))
+
+    def test_contributors_with_resumes_or_portfolios_are_kept(self):
+        alpha = self.save_project("alpha", ["/tmp/alpha/a.py"], contributors=["alice"])
+        beta = self.save_project("beta", ["/tmp/beta/b.py"], contributors=["bob"])
+        db_mod.save_resume("alice", "/tmp/alice.md")
+        db_mod.save_portfolio("bob", "Bob's work")
+        db_mod.delete_project_by_id(alpha)
+        db_mod.delete_project_by_id(beta)
+
+        with db_mod.get_connection() as conn:
+            conn.execute("PRAGMA foreign_keys = ON")
+            report = run_maintenance(conn)
+            self.assertFalse(maintenance_pending(conn))
+
+        self.assertEqual(report["orphans_removed"]["contributors"], 0)
+        self.assertEqual(self._names("contributors"), {"alice", "bob"})
+
+    def test_scheduler_backs_off_and_records_failures(self):
+        scheduler = MaintenanceScheduler(db_mod.get_connection, interval=600, min_interval=60, idle_seconds=0)
+        with patch("db_maintenance.run_maintenance", side_effect=sqlite3.IntegrityError("boom")):
+            with self.assertRaises(sqlite3.IntegrityError):
+                scheduler.run_now()
+            self.assertFalse(scheduler.is_due(time.monotonic() + 30))
+            self.assertTrue(scheduler.is_due(time.monotonic() + 601))
+            with self.assertRaises(sqlite3.IntegrityError):
+                scheduler.run_now()
+        # The second failure doubles the wait
+        self.assertFalse(scheduler.is_due(time.monotonic() + 90))
+
+        with db_mod.get_connection() as conn:
+            status = load_maintenance_status(conn)
+        self.assertEqual(status["last_error"], "IntegrityError: boom")
+        self.assertIsNotNone(status["last_error_at"])
+
+        scheduler.run_now()
+        with db_mod.get_connection() as conn:
+            self.assertIsNone(load_maintenance_status(conn)["last_error"])
+
+
 if __name__ == "__main__":
     unittest.main()
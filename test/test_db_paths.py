@@ -0,0 +1,146 @@
+import json
+import os
+import sqlite3
+import sys
+import unittest
+
+# Allow importing from src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import db as db_mod
+from db_maintenance import collect_orphans
+from temp_db import TempDatabaseTestCase
+
+
+class TestSplitScanPaths(unittest.TestCase):
+    def test_posix_paths_share_their_directory_root(self):
+        root, dirs = db_mod._split_scan_paths([
+            ("/home/u/proj/a.py", "a.py"),
+            ("/home/u/proj/src/b.py", "b.py"),
+        ])
+        self.assertEqual(root, "/home/u/proj/")
+        self.assertEqual(dirs, ["", "src/"])
+
+    def test_root_is_cut_back_to_a_separator(self):
+        root, dirs = db_mod._split_scan_paths([
+            ("/data/app1/x.py", "x.py"),
+            ("/data/app2/y.py", "y.py"),
+        ])
+        self.assertEqual(root, "/data/")
+        self.assertEqual(dirs, ["app1/", "app2/"])
+
+    def test_zip_and_windows_paths(self):
+        root, dirs = db_mod._split_scan_paths([
+            ("C:\\zips\\outer.zip:root.txt", "root.txt"),
+            ("C:\\zips\\outer.zip:inner.zip:inner.txt", "inner.txt"),
+        ])
+        self.assertEqual(root, "C:\\zips\\outer.zip:")
+        self.assertEqual(dirs, ["", "inner.zip:"])
+
+    def test_path_not_ending_in_file_name_is_kept_whole(self):
+        root, dirs = db_mod._split_scan_paths([("/p/a.py", "a.py"), ("/p/weird/", "")])
+        self.assertEqual(root, "/p/")
+        self.assertEqual(dirs, ["", None])
+
+
+class TestCompactPathStorage(TempDatabaseTestCase):
+    PATHS = [
+        "/home/u/proj/main.py",
+        "/home/u/proj/src/util.py",
+        "/home/u/proj/src/util.py.bak/",
+        "/home/u/proj.zip:docs/readme.md",
+    ]
+
+    def _save(self):
+        metadata = {
+            "/home/u/proj/main.py": {"owner": "individual (alice)", "language": "Python"},
+            "/home/u/proj/src/util.py": {"owner": "individual (bob)", "language": "Python", "encoding": "utf-8"},
+        }
+        project_id = self.save_project("proj", self.PATHS, file_metadata=metadata)
+        with db_mod.get_connection() as conn:
+            return conn.execute("SELECT MAX(id) FROM scans WHERE project_id = ?", (project_id,)).fetchone()[0]
+
+    def test_files_full_rebuilds_paths_and_metadata(self):
+        scan_id = self._save()
+        with db_mod.get_connection() as conn:
+            root = conn.execute("SELECT root_path FROM scans WHERE id = ?", (scan_id,)).fetchone()[0]
+            self.assertEqual(root, "/home/u/")
+
+            stored = {
+                r["file_name"]: (r["file_path"], r["dir_id"], r["metadata_json"])
+                for r in conn.execute("SELECT file_name, file_path, dir_id, metadata_json FROM files WHERE scan_id = ?", (scan_id,))
+            }
+            self.assertEqual(stored["main.py"][:1], ("",))
+            self.assertIsNotNone(stored["main.py"][1])
+            self.assertIsNone(stored["main.py"][2])
+            self.assertEqual(json.loads(stored["util.py"][2]), {"encoding": "utf-8"})
+            # display path that does not end in its file name is stored whole
+            self.assertEqual(stored[""][:2], ("/home/u/proj/src/util.py.bak/", None))
+
+            rows = conn.execute("SELECT file_path, metadata_json FROM files_full WHERE scan_id = ? ORDER BY id", (scan_id,)).fetchall()
+            self.assertEqual([r["file_path"] for r in rows], self.PATHS)
+            self.assertEqual(json.loads(rows[0]["metadata_json"]), {"owner": "individual (alice)", "language": "Python"})
+            self.assertEqual(
+                json.loads(rows[1]["metadata_json"]),
+                {"encoding": "utf-8", "owner": "individual (bob)", "language": "Python"},
+            )
+
+    def test_rescan_reuses_directories_and_orphans_are_collected(self):
+        self._save()
+        with db_mod.get_connection() as conn:
+            dirs_before = conn.execute("SELECT COUNT(*) FROM path_dirs").fetchone()[0]
+        self._save()
+        with db_mod.get_connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM path_dirs").fetchone()[0], dirs_before)
+            conn.execute("INSERT INTO path_dirs (path) VALUES ('stale/')")
+            removed = collect_orphans(conn)
+            self.assertEqual(removed["path_dirs"], 1)
+
+    def test_legacy_rows_pass_through_files_full(self):
+        with db_mod.get_connection() as conn:
+            scan_id = conn.execute("INSERT INTO scans (project) VALUES ('old')").lastrowid
+            conn.execute(
+                "INSERT INTO files (scan_id, file_name, file_path, metadata_json) VALUES (?, ?, ?, ?)",
+                (scan_id, "a.py", "/old/a.py", '{"owner": "x"}'),
+            )
+            row = conn.execute("SELECT file_path, metadata_json FROM files_full WHERE scan_id = ?", (scan_id,)).fetchone()
+            self.assertEqual(tuple(row), ("/old/a.py", '{"owner": "x"}'))
+
+
+class TestFileFacts(TempDatabaseTestCase):
+    def test_save_scan_stores_category_and_lowercased_extension(self):
+        project_id = self.save_project("p", ["/p/App.PY", "/p/tests/test_app.py", "/p/logo.svg"])
+        with db_mod.get_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT f.file_name, f.file_extension, f.category
+                FROM files f JOIN scans s ON s.id = f.scan_id
+                WHERE s.project_id = ? ORDER BY f.id
+                """,
+                (project_id,),
+            ).fetchall()
+        self.assertEqual(
+            [tuple(r) for r in rows],
+            [("App.PY", ".py", "code"), ("test_app.py", ".py", "test"), ("logo.svg", ".svg", "design")],
+        )
+
+    def test_rows_saved_before_categories_are_backfilled(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript("""
+            CREATE TABLE scans (id INTEGER PRIMARY KEY AUTOINCREMENT, scanned_at TEXT, project TEXT, notes TEXT);
+            CREATE TABLE files (id INTEGER PRIMARY KEY AUTOINCREMENT, scan_id INTEGER NOT NULL, file_name TEXT NOT NULL,
+                                file_path TEXT NOT NULL, file_extension TEXT, file_size INTEGER, created_at TEXT,
+                                modified_at TEXT, owner TEXT, metadata_json TEXT);
+            INSERT INTO scans (project) VALUES ('old');
+            INSERT INTO files (scan_id, file_name, file_path, file_extension) VALUES (1, 'README.MD', '/old/README.MD', '.MD');
+        """)
+        conn.commit()
+        conn.close()
+
+        with db_mod.get_connection() as conn:
+            row = conn.execute("SELECT file_extension, category FROM files_full WHERE id = 1").fetchone()
+        self.assertEqual(tuple(row), (".md", "docs"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -28,7 +28,8 @@ class TestDbSchemaInit(unittest.TestCase):
         expected_tables = [
             "scans", "projects", "files", "contributors", "languages", "skills",
             "file_contributors", "file_languages", "project_skills", "project_evidence",
-            "resumes", "portfolios"
+            "resumes", "portfolios", "commits", "search_documents", "search_index",
+            "path_dirs"
         ]
         for table in expected_tables:
             self.assertIn(table, tables)
@@ -36,14 +37,21 @@ class TestDbSchemaInit(unittest.TestCase):
         # Indexes should exist
         indexes = [row["name"] for row in cur.execute("SELECT name FROM sqlite_master WHERE type='index'")]
         expected_indexes = [
-            "idx_file_path", "idx_file_name", "idx_files_scan_id", "idx_projects_name",
+            "idx_files_dir_id", "idx_files_scan_category", "idx_files_scan_id", "idx_projects_name",
             "idx_contributors_name", "idx_languages_name", "idx_skills_name",
             "idx_resumes_username", "idx_resumes_generated_at",
             "idx_portfolios_username", "idx_portfolios_created_at",
-            "idx_project_evidence_project_id"
+            "idx_project_evidence_project_id", "idx_scans_project_id",
+            "idx_scans_project", "idx_scans_scanned_at", "idx_files_scan_extension",
+            "idx_file_contributors_contributor_id", "idx_file_languages_language_id",
+            "idx_project_skills_skill_id", "idx_project_evidence_project_created",
+            "idx_commits_project_author_time", "idx_commits_project_time",
+            "idx_search_documents_project_kind"
         ]
         for idx in expected_indexes:
             self.assertIn(idx, indexes)
+        self.assertNotIn("idx_file_path", indexes)
+        self.assertNotIn("idx_file_name", indexes)
 
     def test_foreign_keys_and_cascade(self):
         """Check that ON DELETE CASCADE works for project_evidence."""
@@ -163,6 +171,95 @@ class TestDbSchemaInit(unittest.TestCase):
         cur.execute("SELECT COUNT(*) AS c FROM project_evidence WHERE id = ?", (evidence_id,))
         self.assertEqual(cur.fetchone()["c"], 0)
 
+    def test_scans_link_to_projects_by_id(self):
+        """Scans written by name are linked to projects.id, before or after the project exists."""
+        _ensure_schema(self.conn)
+        cur = self.conn.cursor()
+
+        # Scan written before its project row exists
+        cur.execute("INSERT INTO scans (project) VALUES (?)", ("EarlyProj",))
+        early_scan_id = cur.lastrowid
+        cur.execute("INSERT INTO projects (name) VALUES (?)", ("EarlyProj",))
+        early_project_id = cur.lastrowid
+
+        # Scan written after its project row exists
+        cur.execute("INSERT INTO scans (project) VALUES (?)", ("EarlyProj",))
+        late_scan_id = cur.lastrowid
+        self.conn.commit()
+
+        rows = cur.execute(
+            "SELECT id, project_id FROM scans WHERE id IN (?, ?)",
+            (early_scan_id, late_scan_id),
+        ).fetchall()
+        self.assertEqual({r["project_id"] for r in rows}, {early_project_id})
+
+    def test_project_rename_keeps_scans_in_sync(self):
+        """Renaming a project keeps the legacy scans.project text and scans_legacy view in sync."""
+        _ensure_schema(self.conn)
+        cur = self.conn.cursor()
+
+        cur.execute("INSERT INTO projects (name) VALUES (?)", ("OldName",))
+        project_id = cur.lastrowid
+        cur.execute("INSERT INTO scans (project, project_id) VALUES (?, ?)", ("OldName", project_id))
+        scan_id = cur.lastrowid
+        cur.execute("UPDATE projects SET name = ? WHERE id = ?", ("NewName", project_id))
+        self.conn.commit()
+
+        row = cur.execute("SELECT project FROM scans WHERE id = ?", (scan_id,)).fetchone()
+        self.assertEqual(row["project"], "NewName")
+        row = cur.execute("SELECT project FROM scans_legacy WHERE id = ?", (scan_id,)).fetchone()
+        self.assertEqual(row["project"], "NewName")
+
+    def test_legacy_scans_backfilled_with_project_id(self):
+        """An older scans table without project_id is migrated and backfilled by name."""
+        cur = self.conn.cursor()
+        cur.executescript(
+            """
+            CREATE TABLE projects (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE);
+            CREATE TABLE scans (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                scanned_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                project TEXT,
+                notes TEXT
+            );
+            INSERT INTO projects (name) VALUES ('LegacyProj');
+            INSERT INTO scans (project) VALUES ('LegacyProj');
+            INSERT INTO scans (project) VALUES ('Orphan');
+            """
+        )
+        _ensure_schema(self.conn)
+
+        rows = cur.execute("SELECT project, project_id FROM scans ORDER BY id").fetchall()
+        self.assertEqual(rows[0]["project_id"], 1)
+        self.assertIsNone(rows[1]["project_id"])
+
+
+    def test_legacy_resumes_backfilled_with_llm_flag(self):
+        """resumes.llm_used is derived from metadata_json on upgrade and on later writes."""
+        cur = self.conn.cursor()
+        cur.executescript(
+            """
+            CREATE TABLE resumes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                contributor_id INTEGER,
+                username TEXT NOT NULL,
+                resume_path TEXT NOT NULL,
+                metadata_json TEXT,
+                generated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+            INSERT INTO resumes (username, resume_path, metadata_json) VALUES ('a', 'r1', '{"llm_summary": "text"}');
+            INSERT INTO resumes (username, resume_path, metadata_json) VALUES ('a', 'r2', '{"llm_summary": ""}');
+            INSERT INTO resumes (username, resume_path, metadata_json) VALUES ('a', 'r3', 'not json');
+            """
+        )
+        _ensure_schema(self.conn)
+        cur.execute("INSERT INTO resumes (username, resume_path, metadata_json) VALUES ('a', 'r4', '{\"llm_summary\": true}')")
+        cur.execute("UPDATE resumes SET metadata_json = '{}' WHERE resume_path = 'r1'")
+
+        flags = [row[0] for row in cur.execute("SELECT llm_used FROM resumes ORDER BY id")]
+        self.assertEqual(flags, [0, 0, 0, 1])
+        cur.execute("UPDATE resumes SET metadata_json = '{\"llm_summary\": [1]}' WHERE resume_path = 'r2'")
+        self.assertEqual(cur.execute("SELECT llm_used FROM resumes WHERE resume_path = 'r2'").fetchone()[0], 1)
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,94 @@
+import os
+import sys
+import unittest
+
+# Allow importing from src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import db as db_mod
+from db_search import build_match_query, search_projects
+from project_evidence import add_evidence, delete_evidence, update_evidence
+from temp_db import TempDatabaseTestCase
+
+
+class TestDbSearch(TempDatabaseTestCase):
+    def _search(self, text, **kwargs):
+        with db_mod.get_connection() as conn:
+            return search_projects(conn, text, **kwargs)
+
+    def test_build_match_query(self):
+        self.assertEqual(build_match_query("api rout"), '"api"* "rout"*')
+        self.assertEqual(build_match_query('"quoted" AND -x'), '"quoted"* "AND"* "x"*')
+        self.assertIsNone(build_match_query("  ?! "))
+
+    def test_save_scan_indexes_files_skills_and_summary(self):
+        alpha = self.save_project("alpha", ["/tmp/alpha/src/auth_service.py"], detected_skills=["Docker"])
+        beta = self.save_project("beta", ["/tmp/beta/readme.md"], summary_text="A billing dashboard with auth")
+
+        found = self._search("auth")
+        self.assertEqual(found["total"], 2)
+        # A summary hit outranks a file path hit
+        self.assertEqual([r["project_id"] for r in found["results"]], [beta, alpha])
+        self.assertEqual(found["results"][0]["matches"][0]["kind"], "summary")
+        self.assertIn("[auth]", found["results"][0]["matches"][0]["snippet"])
+
+        self.assertEqual([r["project_id"] for r in self._search("dock")["results"]], [alpha])
+        self.assertEqual(self._search("auth billing")["total"], 1)
+        self.assertEqual(self._search("nothing-here-xyz")["results"], [])
+
+    def test_pagination(self):
+        for i in range(5):
+            self.save_project(f"proj{i}", [f"/tmp/proj{i}/shared_module.py"])
+        first = self._search("shared", limit=2)
+        rest = self._search("shared", limit=10, offset=2)
+        self.assertEqual(first["total"], 5)
+        ids = [r["project_id"] for r in first["results"] + rest["results"]]
+        self.assertEqual(len(set(ids)), 5)
+        self.assertEqual(self._search("shared", offset=10), {"total": 5, "results": []})
+
+    def test_rescan_display_name_evidence_and_delete_stay_in_sync(self):
+        project_id = self.save_project("gamma", ["/tmp/gamma/old_parser.py"])
+        self.save_project("gamma", ["/tmp/gamma/new_lexer.py"])
+        self.assertEqual(self._search("old_parser")["total"], 0)
+        self.assertEqual(self._search("lexer")["total"], 1)
+
+        db_mod.set_project_display_name("gamma", "Compiler Toolkit")
+        self.assertEqual(self._search("toolkit")["results"][0]["matches"][0]["kind"], "project")
+
+        evidence_id = add_evidence(project_id, {"type": "award", "value": "Hackathon winner"})
+        self.assertEqual(self._search("hackathon")["total"], 1)
+        update_evidence(evidence_id, {"value": "Best demo prize"})
+        self.assertEqual(self._search("hackathon")["total"], 0)
+        self.assertEqual(self._search("prize")["total"], 1)
+        delete_evidence(evidence_id)
+        self.assertEqual(self._search("prize")["total"], 0)
+
+        db_mod.delete_project_by_id(project_id)
+        self.assertEqual(self._search("lexer")["total"], 0)
+
+    def test_existing_projects_are_indexed_when_the_database_is_opened(self):
+        project_id = self.save_project("delta", ["/tmp/delta/main.py"])
+        with db_mod.get_connection() as conn:
+            conn.execute("DELETE FROM search_documents")
+            conn.commit()
+        # searching does not write
+        self.assertEqual(self._search("delta")["total"], 0)
+
+        db_mod._BACKFILLED_PATHS.clear()
+        with db_mod.get_connection() as conn:
+            count = conn.execute(
+                "SELECT COUNT(*) FROM search_documents WHERE project_id = ?", (project_id,)
+            ).fetchone()[0]
+        self.assertEqual(count, 2)
+        self.assertEqual(self._search("delta")["total"], 1)
+
+    def test_clear_database_empties_the_index(self):
+        self.save_project("epsilon", ["/tmp/epsilon/main.py"])
+        db_mod.clear_database()
+        self.assertEqual(self._search("epsilon")["total"], 0)
+        with db_mod.get_connection() as conn:
+            conn.execute("INSERT INTO search_index (search_index) VALUES ('integrity-check')")
+
+
+if __name__ == "__main__":
+    unittest.main()
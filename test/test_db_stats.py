@@ -0,0 +1,160 @@
+import os
+import sys
+import unittest
+
+# Allow importing from src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import db as db_mod
+from db_stats import importance_score, load_global_stats, load_project_stats, top_projects_for_contributor
+from rank_projects import rank_projects_by_importance
+from temp_db import TempDatabaseTestCase
+
+
+class TestDbStats(TempDatabaseTestCase):
+    def test_save_scan_materializes_project_and_global_stats(self):
+        self.save_project("alpha", ["a.py", "b.py", "README.MD"], contributors=["alice"])
+        self.save_project("beta", ["c.js"], contributors=["bob"])
+
+        with db_mod.get_connection() as conn:
+            stats = load_project_stats(conn, self.project_id("alpha"))
+            self.assertEqual(stats["scan_count"], 1)
+            self.assertEqual(stats["file_count"], 3)
+            self.assertEqual(stats["extensions"], {".py": 2, ".md": 1})
+            self.assertEqual(stats["categories"], {"code": 2, "docs": 1})
+            self.assertEqual(stats["contributor_count"], 1)
+            self.assertEqual(stats["top_contributor"], "alice")
+            self.assertEqual(stats["top_contributor_files"], 3)
+
+            totals = load_global_stats(conn)
+            self.assertEqual(totals["project_count"], 2)
+            self.assertEqual(totals["file_count"], 4)
+            self.assertEqual(totals["contributor_count"], 2)
+            self.assertEqual(totals["top_contributor"], "alice")
+
+    def test_rescan_replaces_project_stats(self):
+        self.save_project("alpha", ["a.py", "b.py"], contributors=["alice"])
+        self.save_project("alpha", ["a.py"], contributors=["alice"])
+
+        with db_mod.get_connection() as conn:
+            stats = load_project_stats(conn, self.project_id("alpha"))
+            self.assertEqual(stats["scan_count"], 1)
+            self.assertEqual(stats["file_count"], 1)
+            self.assertEqual(load_global_stats(conn)["file_count"], 1)
+
+    def test_delete_project_updates_stats(self):
+        self.save_project("alpha", ["a.py"], contributors=["alice"])
+        self.save_project("beta", ["b.py", "c.py"], contributors=["bob"])
+        alpha_id = self.project_id("alpha")
+
+        self.assertTrue(db_mod.delete_project_by_id(alpha_id))
+
+        with db_mod.get_connection() as conn:
+            self.assertIsNone(load_project_stats(conn, alpha_id))
+            totals = load_global_stats(conn)
+            self.assertEqual(totals["project_count"], 1)
+            self.assertEqual(totals["file_count"], 2)
+            self.assertEqual(totals["top_contributor"], "bob")
+
+    def test_missing_rows_are_backfilled_when_the_database_is_opened(self):
+        with db_mod.get_connection() as conn:
+            project_id = conn.execute("INSERT INTO projects (name) VALUES ('legacy')").lastrowid
+            scan_id = conn.execute(
+                "INSERT INTO scans (project, project_id) VALUES ('legacy', ?)", (project_id,)
+            ).lastrowid
+            conn.execute(
+                "INSERT INTO files (scan_id, file_name, file_path, file_extension) VALUES (?, 'x.py', 'x.py', '.py')",
+                (scan_id,),
+            )
+            conn.commit()
+
+            # readers do not write
+            self.assertIsNone(load_project_stats(conn, project_id))
+            self.assertEqual(load_global_stats(conn)["project_count"], 0)
+            self.assertFalse(conn.in_transaction)
+
+        # the next process to open the database fills the rows in
+        db_mod._BACKFILLED_PATHS.clear()
+        with db_mod.get_connection() as conn:
+            stats = load_project_stats(conn, project_id)
+            self.assertEqual(stats["file_count"], 1)
+            self.assertEqual(load_global_stats(conn)["project_count"], 1)
+
+    def test_resume_and_portfolio_contributors_are_counted(self):
+        self.save_project("alpha", ["a.py"], contributors=["alice"])
+        self.save_project("beta", ["b.py"], contributors=["bob"])
+        db_mod.save_resume("carol", "/tmp/carol.md")
+        db_mod.save_portfolio("dave", "Dave's work")
+        db_mod.save_resume("alice", "/tmp/alice.md")
+
+        with db_mod.get_connection() as conn:
+            live = conn.execute("SELECT COUNT(*) FROM contributors").fetchone()[0]
+            self.assertEqual(live, 4)
+            self.assertEqual(load_global_stats(conn)["contributor_count"], live)
+
+    def test_clear_database_resets_stats(self):
+        self.save_project("alpha", ["a.py"], contributors=["alice"])
+        db_mod.clear_database()
+
+        with db_mod.get_connection() as conn:
+            totals = load_global_stats(conn)
+            self.assertEqual(totals["project_count"], 0)
+            self.assertEqual(totals["file_count"], 0)
+            self.assertIsNone(totals["top_contributor"])
+
+    def _save_team(self, project, owners):
+        files = list(owners)
+        metadata = {path: {"owner": owner} for path, owner in owners.items()}
+        return db_mod.save_scan(
+            scan_source=f"/tmp/{project}",
+            files_found=[(path, 10, None) for path in files],
+            project=project,
+            file_metadata=metadata,
+        )
+
+    def test_importance_matrix_scores_every_contributor(self):
+        self._save_team("alpha", {
+            "a.py": "individual (alice)",
+            "b.py": "individual (alice)",
+            "c.py": "individual (alice)",
+            "d.py": "individual (bob)",
+        })
+        alpha_id = self.project_id("alpha")
+
+        with db_mod.get_connection() as conn:
+            # alice: 0.6 * 3/4 + 0.3 * (3 - 1)/4 + 0.1 * 1/2
+            self.assertAlmostEqual(importance_score(conn, alpha_id, "alice"), 0.65)
+            # bob: 0.6 * 1/4 + 0.1 * 1/2 (not the top contributor, no dominance gap)
+            self.assertAlmostEqual(importance_score(conn, alpha_id, "bob"), 0.2)
+            self.assertAlmostEqual(importance_score(conn, alpha_id), 0.65)
+            self.assertIsNone(importance_score(conn, alpha_id, "carol"))
+
+    def test_top_k_per_contributor(self):
+        self._save_team("alpha", {"a.py": "individual (alice)", "b.py": "individual (bob)"})
+        self._save_team("beta", {"c.py": "individual (alice)"})
+        self._save_team("gamma", {"d.py": "individual (bob)"})
+
+        with db_mod.get_connection() as conn:
+            top = top_projects_for_contributor(conn, "alice", 1)
+            self.assertEqual([item["project"] for item in top], ["beta"])
+            everything = top_projects_for_contributor(conn, "alice")
+            self.assertEqual([item["project"] for item in everything], ["beta", "alpha"])
+
+        ranked = rank_projects_by_importance(mode="contributor", contributor_name="alice")
+        self.assertEqual([item["project"] for item in ranked], ["beta", "alpha"])
+        ranked = rank_projects_by_importance(mode="project", limit=2)
+        self.assertEqual(len(ranked), 2)
+        self.assertAlmostEqual(ranked[0]["top_score"], 1.0)
+
+    def test_delete_project_removes_scores(self):
+        self._save_team("alpha", {"a.py": "individual (alice)"})
+        alpha_id = self.project_id("alpha")
+        db_mod.delete_project_by_id(alpha_id)
+
+        with db_mod.get_connection() as conn:
+            self.assertIsNone(importance_score(conn, alpha_id, "alice"))
+            self.assertEqual(top_projects_for_contributor(conn, "alice"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import gzip
+import io
+import json
+import os
+import sys
+import unittest
+
+# Allow importing from src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import db as db_mod
+from db_search import search_projects
+from db_transfer import export_database, import_database, iter_export
+from temp_db import TempDatabaseTestCase
+
+
+class TestDatabaseTransfer(TempDatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        db_mod.save_scan(
+            scan_source="/p/demo",
+            files_found=[("/p/demo/main.py", 10, None), ("/p/demo/README.md", 5, None)],
+            project="demo",
+            contributors=["alice"],
+            detected_skills=["APIs"],
+        )
+        with db_mod.get_connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS blobs (id INTEGER PRIMARY KEY, data BLOB)")
+            conn.execute("INSERT INTO blobs (data) VALUES (?)", (b"\x00\xffpng",))
+            conn.commit()
+
+    def _counts(self):
+        with db_mod.get_connection() as conn:
+            return {
+                table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("projects", "scans", "files", "file_contributors", "path_dirs", "search_documents")
+            }
+
+    def _reset(self):
+        os.remove(self.db_path)
+        with db_mod.get_connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS blobs (id INTEGER PRIMARY KEY, data BLOB)")
+            conn.commit()
+
+    def test_ndjson_round_trip_restores_rows_indexes_and_search(self):
+        before = self._counts()
+        dump = b"".join(iter_export("ndjson"))
+        lines = dump.decode("utf-8").splitlines()
+        self.assertEqual(json.loads(lines[0])["type"], "header")
+        self.assertEqual(json.loads(lines[-1])["type"], "end")
+
+        self._reset()
+        result = import_database(io.BytesIO(dump))
+
+        self.assertEqual(result["tables"]["files"], 2)
+        self.assertEqual(self._counts(), before)
+        with db_mod.get_connection() as conn:
+            self.assertEqual(conn.execute("SELECT data FROM blobs").fetchone()[0], b"\x00\xffpng")
+            names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            self.assertIn("idx_files_dir_id", names)
+            self.assertEqual(search_projects(conn, "main")["total"], 1)
+            # new rows continue after the imported ids
+            new_id = conn.execute("INSERT INTO projects (name) VALUES ('later')").lastrowid
+            self.assertGreater(new_id, max(r[0] for r in conn.execute("SELECT id FROM projects WHERE name != 'later'")))
+
+    def test_gzip_and_sqlite_exports_import(self):
+        before = self._counts()
+        for fmt in ("ndjson", "sqlite"):
+            dest = os.path.join(self.tmpdir.name, f"export.{fmt}.gz")
+            export_database(dest, fmt=fmt, compress=True)
+            with gzip.open(dest, "rb") as fh:
+                self.assertTrue(fh.read(16))
+            self._reset()
+            with open(dest, "rb") as fh:
+                result = import_database(fh)
+            self.assertEqual(result["format"], fmt)
+            self.assertEqual(self._counts(), before)
+
+    def test_truncated_export_is_rejected_and_database_is_untouched(self):
+        dump = b"".join(iter_export("ndjson"))
+        truncated = b"\n".join(dump.splitlines()[:-1]) + b"\n"
+        with db_mod.get_connection() as conn:
+            conn.execute("INSERT INTO projects (name) VALUES ('kept')")
+            conn.commit()
+        before = self._counts()
+
+        with self.assertRaises(ValueError):
+            import_database(io.BytesIO(truncated))
+        with self.assertRaises(ValueError):
+            import_database(io.BytesIO(b'{"hello": 1}\n'))
+
+        self.assertEqual(self._counts(), before)
+        with db_mod.get_connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'idx_files_dir_id'").fetchone()[0], 1)
+
+    def test_columns_missing_from_this_schema_are_dropped(self):
+        header = {"type": "header", "format": 1}
+        lines = [
+            header,
+            {"type": "table", "name": "skills", "columns": ["id", "name", "retired_column"]},
+            [7, "Go", "x"],
+            {"type": "table", "name": "gone_table", "columns": ["id"]},
+            [1],
+            {"type": "end", "tables": {"skills": 1, "gone_table": 1}},
+        ]
+        body = "".join(json.dumps(line) + "\n" for line in lines).encode("utf-8")
+        result = import_database(io.BytesIO(body))
+        self.assertEqual(result["skipped_tables"], ["gone_table"])
+        with db_mod.get_connection() as conn:
+            self.assertEqual([tuple(r) for r in conn.execute("SELECT id, name FROM skills")], [(7, "Go")])
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0], 0)
+
+
+    def test_rows_with_missing_parents_are_rejected(self):
+        lines = [
+            {"type": "header", "format": 1},
+            {"type": "table", "name": "project_skills", "columns": ["project_id", "skill_id"]},
+            [41, 42],
+            {"type": "end", "tables": {"project_skills": 1}},
+        ]
+        body = "".join(json.dumps(line) + "\n" for line in lines).encode("utf-8")
+        before = self._counts()
+        with self.assertRaisesRegex(ValueError, "project_skills"):
+            import_database(io.BytesIO(body))
+        self.assertEqual(self._counts(), before)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -166,6 +166,42 @@ class TestDatabaseModule(unittest.TestCase):
             cur.execute("SELECT COUNT(*) FROM contributors WHERE name = ?", ('x',))
             self.assertEqual(cur.fetchone()[0], 1)
 
+    def test_save_scans_batches_projects_and_isolates_failures(self):
+        now = time.time()
+        results = self.db.save_scans([
+            dict(scan_source="/r/one", files_found=[("/r/one/a.py", 1, now)], project="one", contributors=["alice"],
+                 detected_languages=["Python"]),
+            # files_found entries must be tuples or paths; this one makes the scan fail
+            dict(scan_source="/r/bad", files_found=[("/r/bad/x.py",)], project="bad", contributors=["mallory"]),
+            dict(scan_source="/r/two", files_found=[("/r/two/b.py", 1, now)], project="two", contributors=["alice"],
+                 detected_languages=["Python"]),
+        ], chunk_size=2)
+
+        self.assertIsInstance(results[0], int)
+        self.assertIsInstance(results[1], Exception)
+        self.assertIsInstance(results[2], int)
+
+        projects = {r[0] for r in self._fetchall("SELECT name FROM projects")}
+        self.assertEqual(projects, {"one", "two"})
+        contributors = {r[0] for r in self._fetchall("SELECT name FROM contributors")}
+        self.assertEqual(contributors, {"alice"})
+        self.assertEqual(self._fetchall("SELECT COUNT(*) FROM languages")[0][0], 1)
+        self.assertEqual(self._fetchall("SELECT project_count FROM global_stats")[0][0], 2)
+
+    def test_save_scans_listing_fallback_keeps_the_file_listing(self):
+        now = time.time()
+        # a skill sqlite cannot bind fails the full save; the retry drops it with the other metadata
+        results = self.db.save_scans([
+            dict(scan_source="/r/one", files_found=[("/r/one/a.py", 1, now)], project="one",
+                 detected_languages=["Python"], detected_skills=[["not", "a", "name"]]),
+        ], listing_fallback=True)
+
+        self.assertIsInstance(results[0], int)
+        self.assertEqual([tuple(r) for r in self._fetchall("SELECT name FROM projects")], [("one",)])
+        self.assertEqual(self._fetchall("SELECT COUNT(*) FROM files WHERE scan_id = ?", (results[0],))[0][0], 1)
+        self.assertEqual(self._fetchall("SELECT COUNT(*) FROM languages")[0][0], 0)
+        self.assertEqual(self._fetchall("SELECT COUNT(*) FROM skills")[0][0], 0)
+
 
 if __name__ == '__main__':
     unittest.main()
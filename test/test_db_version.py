@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+# Allow importing from src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import db as db_mod
+from db_stats import refresh_project_stats
+from db_version import read_data_version
+from response_cache import ResponseCache
+from temp_db import TempDatabaseTestCase
+
+
+class TestDataVersion(TempDatabaseTestCase):
+    def test_missing_database_has_no_version(self):
+        self.assertIsNone(read_data_version(os.path.join(self.tmpdir.name, "nope.db")))
+
+    def test_writes_bump_the_version_and_derived_tables_do_not(self):
+        db_mod.get_connection().close()
+        epoch, start = read_data_version(self.db_path)
+
+        db_mod.save_scan("/p/demo", [("/p/demo/main.py", 1, None)], project="demo")
+        _, after_scan = read_data_version(self.db_path)
+        self.assertGreater(after_scan, start)
+
+        with db_mod.get_connection() as conn:
+            project_id = conn.execute("SELECT id FROM projects").fetchone()[0]
+            refresh_project_stats(conn, project_id)
+            conn.commit()
+        self.assertEqual(read_data_version(self.db_path), (epoch, after_scan))
+
+        with db_mod.get_connection() as conn:
+            conn.execute("UPDATE projects SET custom_name = 'Demo' WHERE id = ?", (project_id,))
+            conn.commit()
+        _, after_edit = read_data_version(self.db_path)
+        self.assertGreater(after_edit, after_scan)
+
+        db_mod.clear_database()
+        self.assertEqual(read_data_version(self.db_path)[0], epoch)
+        self.assertGreater(read_data_version(self.db_path)[1], after_edit)
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_lru_eviction_and_size_limit(self):
+        cache = ResponseCache(max_entries=2, max_body_bytes=4)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        self.assertEqual(cache.get("a"), (b"1", None))
+        cache.put("c", b"3")
+        self.assertIsNone(cache.get("b"))
+        cache.put("big", b"12345")
+        self.assertIsNone(cache.get("big"))
+        self.assertEqual(len(cache), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
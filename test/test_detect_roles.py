@@ -11,12 +11,16 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 from detect_roles import (
     categorize_contributor_role,
     analyze_project_roles,
+    build_contributors_data,
     _calculate_role_scores,
     _calculate_role_confidence,
     format_roles_report,
     load_contributors_per_project_from_db,
+    load_project_roles,
+    load_project_roles_from_db,
     ROLE_PATTERNS,
 )
+from temp_db import TempDatabaseTestCase
 
 
 class TestCategorizeContributorRole(unittest.TestCase):
@@ -487,5 +491,69 @@ class TestPerProjectAnalysis(unittest.TestCase):
 
 
 
+class TestPersistedProjectRoles(TempDatabaseTestCase):
+    """Roles are computed when a scan is saved and read back from project_contributor_roles."""
+
+    def setUp(self):
+        super().setUp()
+        import db as db_mod
+        self.db = db_mod
+
+    def _save(self, files, owner):
+        return self.save_project("demo", files, file_metadata={path: {"owner": owner} for path in files})
+
+    def test_save_scan_stores_roles(self):
+        self._save(["/tmp/demo/test_a.py", "/tmp/demo/test_b.py", "/tmp/demo/test_c.py"], "individual (alice)")
+
+        with self.db.get_connection() as conn:
+            roles = load_project_roles(conn, self.project_id("demo"))
+        self.assertEqual([c["name"] for c in roles["contributors"]], ["alice"])
+        self.assertEqual(roles["summary"]["total_contributors"], 1)
+        self.assertIn("demo", load_project_roles_from_db())
+
+    def test_rescan_replaces_stored_roles(self):
+        self._save(["/tmp/demo/a.py"], "individual (alice)")
+        self._save(["/tmp/demo/a.py"], "individual (bob)")
+
+        with self.db.get_connection() as conn:
+            roles = load_project_roles(conn, self.project_id("demo"))
+        self.assertEqual([c["name"] for c in roles["contributors"]], ["bob"])
+
+    def test_blacklisted_owner_gets_no_role(self):
+        self._save(["/tmp/demo/a.py"], "individual (unknown)")
+
+        with self.db.get_connection() as conn:
+            self.assertIsNone(load_project_roles(conn, self.project_id("demo")))
+
+
+    def test_missing_roles_are_analyzed_when_the_database_is_opened(self):
+        self._save(["/tmp/demo/a.py"], "individual (alice)")
+        with self.db.get_connection() as conn:
+            conn.execute("DELETE FROM project_contributor_roles")
+            conn.commit()
+            self.assertIsNone(load_project_roles(conn, self.project_id("demo")))
+
+        self.db._BACKFILLED_PATHS.clear()
+        with self.db.get_connection() as conn:
+            roles = load_project_roles(conn, self.project_id("demo"))
+        self.assertEqual([c["name"] for c in roles["contributors"]], ["alice"])
+
+class TestBuildContributorsData(unittest.TestCase):
+    """Stored file facts are used instead of re-classifying paths."""
+
+    def test_uses_file_facts_when_given(self):
+        files = {"alice": ["/p/notes.py", "/p/app.py"]}
+        facts = {"/p/notes.py": ("docs", ".md")}
+        data = build_contributors_data(files, file_facts=facts)["alice"]
+        self.assertEqual(data["activity_by_category"]["docs"], 1)
+        self.assertEqual(data["activity_by_category"]["code"], 1)
+        self.assertEqual(data["extension_counts"], {".md": 1, ".py": 1})
+
+    def test_extension_counts_drive_role_scores(self):
+        scores = _calculate_role_scores(["a.py", "b.py"], {}, extension_counts={".js": 2})
+        self.assertIn("Frontend Developer", scores)
+        self.assertNotIn("Backend Developer", scores)
+
+
 if __name__ == '__main__':
     unittest.main()
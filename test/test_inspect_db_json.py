@@ -2,7 +2,11 @@
 import sqlite3
 import tempfile
 import os
-from inspect_db import inspect_database_json
+import json
+
+import pytest
+
+from inspect_db import inspect_database_json, inspect_section, iter_section_ndjson
 
 def create_test_db_file():
     # In-memory DB
@@ -66,4 +70,92 @@ def test_inspect_database_json_structure():
     assert result['thumbnails'][0]['project_name'] == 'ProjA'
 
     # Clean up temp file
-    os.remove(db_path)
\ No newline at end of file
+    os.remove(db_path)
+
+def create_paged_test_db_file(count=7):
+    fd, temp_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(temp_path)
+    conn.executescript("""
+        CREATE TABLE scans(id INTEGER PRIMARY KEY, scanned_at TEXT, project TEXT, notes TEXT, project_id INTEGER);
+        CREATE TABLE projects(id INTEGER PRIMARY KEY, name TEXT, repo_url TEXT, created_at TEXT, summary_text TEXT, thumbnail_path TEXT);
+        CREATE TABLE files(id INTEGER PRIMARY KEY, file_name TEXT, file_path TEXT, file_extension TEXT, file_size INTEGER, modified_at TEXT, scan_id INTEGER);
+        CREATE TABLE skills(id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE project_skills(project_id INTEGER, skill_id INTEGER);
+        CREATE TABLE contributors(id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE file_contributors(file_id INTEGER, contributor_id INTEGER);
+    """)
+    conn.executemany("INSERT INTO skills(id, name) VALUES (?, ?)", [(1, "Python"), (2, "SQL")])
+    for i in range(1, count + 1):
+        # Two scans share a timestamp so the cursor has to break ties on id
+        ts = f"2026-03-0{min(i, 6)} 12:00:00"
+        conn.execute("INSERT INTO projects(id, name) VALUES (?, ?)", (i, f"Proj{i}"))
+        conn.execute("INSERT INTO scans(id, scanned_at, project, project_id) VALUES (?, ?, ?, ?)", (i, ts, f"Proj{i}", i))
+        conn.execute("INSERT INTO files(id, file_name, file_path, scan_id) VALUES (?, ?, ?, ?)", (i, f"f{i}.py", f"/f{i}.py", i))
+        conn.execute("INSERT INTO contributors(id, name) VALUES (?, ?)", (i, f"user{i}"))
+        conn.execute("INSERT INTO file_contributors(file_id, contributor_id) VALUES (?, ?)", (i, i))
+        conn.executemany("INSERT INTO project_skills(project_id, skill_id) VALUES (?, ?)", [(i, 1), (i, 2)])
+    conn.commit()
+    conn.close()
+    return temp_path
+
+
+def _read_all_pages(section, db_path, limit):
+    items, cursor = [], None
+    while True:
+        page = inspect_section(section, cursor=cursor, limit=limit, db_path=db_path)
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return items
+
+
+@pytest.mark.parametrize("section, expected", [
+    ("scans", 7),
+    ("files", 7),
+    ("projects", 7),
+    ("contributors", 7),
+    ("skills_timeline", 14),
+])
+def test_inspect_section_pages_cover_every_row_once(section, expected):
+    db_path = create_paged_test_db_file()
+    try:
+        paged = _read_all_pages(section, db_path, limit=3)
+        streamed = [json.loads(line) for line in iter_section_ndjson(section, db_path=db_path, page_size=2)]
+        assert len(paged) == expected
+        assert paged == streamed
+        assert len({json.dumps(item, sort_keys=True) for item in paged}) == expected
+    finally:
+        os.remove(db_path)
+
+
+def test_inspect_section_page_contents():
+    db_path = create_paged_test_db_file()
+    try:
+        scans = inspect_section("scans", limit=2, db_path=db_path)["items"]
+        assert [s["id"] for s in scans] == [7, 6]
+
+        project = inspect_section("projects", limit=1, db_path=db_path)["items"][0]
+        assert project["name"] == "Proj1"
+        assert project["scan_count"] == 1 and project["file_count"] == 1
+        assert sorted(project["skills"]) == ["Python", "SQL"]
+
+        contributor = inspect_section("contributors", limit=1, db_path=db_path)["items"][0]
+        assert contributor["sample_files"] == [{"file_name": "f1.py", "file_path": "/f1.py"}]
+
+        overview = inspect_database_json(db_path=db_path)
+        assert len(overview["skills_exercised"]) == 14
+        assert overview["next_cursors"] == {"scans": None, "files": None}
+    finally:
+        os.remove(db_path)
+
+
+def test_inspect_section_rejects_unknown_section_and_bad_cursor():
+    db_path = create_paged_test_db_file(count=1)
+    try:
+        with pytest.raises(ValueError):
+            inspect_section("nope", db_path=db_path)
+        with pytest.raises(ValueError):
+            inspect_section("scans", cursor="not-a-cursor", db_path=db_path)
+    finally:
+        os.remove(db_path)
@@ -0,0 +1,75 @@
+import json
+import os
+import sqlite3
+import sys
+import unittest
+from unittest.mock import patch
+
+# Allow importing from src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import db as db_mod
+from temp_db import TempDatabaseTestCase
+
+
+class TestLoadProjectsForGeneration(TempDatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        git_metrics = {
+            "commits_per_author": {"alice": 3},
+            "lines_added_per_author": {"alice": 40},
+            "files_changed_per_author": {"alice": ["a.py"]},
+        }
+        for i in range(3):
+            self.save_project(f"git{i}", [f"/tmp/git{i}/a.py"], contributors=["alice"], git_metrics=git_metrics)
+        self.save_project("plain", ["/tmp/plain/b.py"], contributors=["bob"])
+
+    def _count_queries(self, **kwargs):
+        statements = []
+        real_connect = sqlite3.connect
+
+        def connect(*args, **kw):
+            conn = real_connect(*args, **kw)
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        with patch("sqlite3.connect", side_effect=connect):
+            projects, root = db_mod.load_projects_for_generation(**kwargs)
+        selects = [s for s in statements if s.lstrip().upper().startswith(("SELECT", "PRAGMA TABLE_INFO(PROJECTS)"))]
+        return projects, root, selects
+
+    def test_query_count_does_not_grow_with_projects(self):
+        _, _, before = self._count_queries()
+        for i in range(3, 8):
+            db_mod.save_scan(
+                scan_source=f"/tmp/extra{i}",
+                files_found=[(f"/tmp/extra{i}/c.py", 10, None)],
+                project=f"extra{i}",
+            )
+        projects, _, after = self._count_queries()
+        self.assertEqual(len(projects), 9)
+        self.assertEqual(len(before), len(after))
+
+    def test_projection_skips_unrequested_fields(self):
+        projects, _, selects = self._count_queries(fields=["skills"])
+        self.assertEqual(set(projects["git0"]), {"project_name", "skills"})
+        self.assertFalse(any("file_contributors" in s or "file_languages" in s for s in selects))
+
+    def test_git_metrics_are_parsed_lazily(self):
+        with patch("db.json.loads", wraps=json.loads) as loads:
+            projects, root = db_mod.load_projects_for_generation(fields=["skills", "git_metrics", "contributions"])
+            self.assertEqual(loads.call_count, 0)
+
+            self.assertEqual(projects["git0"]["contributions"]["alice"]["commits"], 3)
+            self.assertEqual(projects["git0"]["git_metrics"]["lines_added_per_author"], {"alice": 40})
+            self.assertEqual(loads.call_count, 1)
+
+        self.assertEqual(root["db_aggregate"]["commits_per_author"], {"alice": 9})
+        self.assertIn("bob", projects["plain"]["contributions"])
+        self.assertEqual(json.loads(json.dumps(projects["git1"]))["git_metrics"]["commits_per_author"], {"alice": 3})
+        self.assertEqual(dict(projects["git2"])["git_metrics"]["commits_per_author"], {"alice": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
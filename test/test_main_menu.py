@@ -28,6 +28,7 @@ from main_menu import (
     _markdown_to_plain,
     _delete_resume,
 )
+from detect_roles import analyze_project_roles
 
 
 # Utility: create an in-memory temporary database
@@ -334,7 +335,10 @@ def test_handle_analyze_roles_with_per_project_data(monkeypatch, capsys):
     
     # Mock functions - return True for per-project question
     monkeypatch.setattr("main_menu.load_contributors_from_db", lambda: mock_contributors)
-    monkeypatch.setattr("main_menu.load_contributors_per_project_from_db", lambda: mock_per_project)
+    monkeypatch.setattr(
+        "main_menu.load_project_roles_from_db",
+        lambda: {name: analyze_project_roles(data) for name, data in mock_per_project.items()},
+    )
     monkeypatch.setattr("main_menu.ask_yes_no", lambda prompt: True)
 
     handle_analyze_roles()
@@ -364,7 +368,7 @@ def test_handle_analyze_roles_per_project_empty(monkeypatch, capsys):
     
     # Mock functions - return True for per-project but empty data
     monkeypatch.setattr("main_menu.load_contributors_from_db", lambda: mock_contributors)
-    monkeypatch.setattr("main_menu.load_contributors_per_project_from_db", lambda: {})
+    monkeypatch.setattr("main_menu.load_project_roles_from_db", lambda: {})
     monkeypatch.setattr("main_menu.ask_yes_no", lambda prompt: True)
 
     handle_analyze_roles()
@@ -0,0 +1,91 @@
+import base64
+import os
+import sys
+import tempfile
+import unittest
+from io import BytesIO
+
+# Allow importing from src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import portfolio_export
+from portfolio_export import ThumbnailCache, iter_portfolio_html, thumbnail_data_uri
+
+
+def _decode(uri):
+    header, payload = uri.split(",", 1)
+    return header, base64.b64decode(payload)
+
+
+class TestThumbnailDataUri(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        portfolio_export.thumbnail_cache.clear()
+
+    def tearDown(self):
+        portfolio_export.thumbnail_cache.clear()
+        self.tmpdir.cleanup()
+
+    def test_cached_by_path_and_mtime(self):
+        path = os.path.join(self.tmpdir.name, "thumb.svg")
+        with open(path, "wb") as fh:
+            fh.write(b"<svg/>")
+        self.assertEqual(_decode(thumbnail_data_uri(path)), ("data:image/svg+xml;base64", b"<svg/>"))
+        hits = portfolio_export.thumbnail_cache.hits
+        thumbnail_data_uri(path)
+        self.assertEqual(portfolio_export.thumbnail_cache.hits, hits + 1)
+
+        with open(path, "wb") as fh:
+            fh.write(b"<svg></svg>")
+        os.utime(path, ns=(0, 10**9))
+        self.assertEqual(_decode(thumbnail_data_uri(path))[1], b"<svg></svg>")
+        self.assertIsNone(thumbnail_data_uri(os.path.join(self.tmpdir.name, "missing.png")))
+        self.assertIsNone(thumbnail_data_uri(None))
+
+    @unittest.skipIf(portfolio_export._pillow_image() is None, "Pillow not installed")
+    def test_large_images_are_downscaled(self):
+        from PIL import Image
+
+        path = os.path.join(self.tmpdir.name, "thumb.png")
+        Image.effect_noise((800, 400), 64).convert("RGB").save(path)
+
+        header, data = _decode(thumbnail_data_uri(path, max_dimension=200))
+        self.assertEqual(header, "data:image/png;base64")
+        with Image.open(BytesIO(data)) as img:
+            self.assertEqual(img.size, (200, 100))
+        with open(path, "rb") as fh:
+            self.assertEqual(_decode(thumbnail_data_uri(path, max_dimension=0))[1], fh.read())
+
+    def test_cache_is_bounded_by_size(self):
+        cache = ThumbnailCache(max_bytes=10)
+        cache.put("a", "12345")
+        cache.put("b", "12345")
+        cache.put("c", "123")
+        self.assertEqual(cache.get("a"), (False, None))
+        self.assertEqual(cache.get("c"), (True, "123"))
+        cache.put("missing", None)
+        self.assertEqual(cache.get("missing"), (True, None))
+        self.assertEqual(len(cache), 3)
+
+
+class TestIterPortfolioHtml(unittest.TestCase):
+    def test_streams_sections_and_escapes_inline_data(self):
+        project = {
+            "id": 7,
+            "name": "Demo",
+            "is_featured": True,
+            "thumb": None,
+            "llm_summary": "A </script> summary",
+        }
+        chunks = list(iter_portfolio_html("Alice", "1 projects", [project], {"user": {}, "project": {}}, []))
+        self.assertGreater(len(chunks), 5)
+        html = b"".join(chunks).decode("utf-8")
+        self.assertTrue(html.startswith("<!DOCTYPE html>"))
+        self.assertEqual(html.count("</script>"), 1)
+        self.assertIn('"7":{"id": 7', html)
+        self.assertIn('const EXPORT_DISPLAY_NAME = "Alice";', html)
+        self.assertIn('id="heatmap-project-7"', html)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,266 @@
+"""EXPLAIN QUERY PLAN regression suite.
+
+Seeds a database, drives the read paths of api.py, rank_projects.py, db.py,
+inspect_db.py and detect_roles.py while tracing every SQL statement they issue,
+then runs EXPLAIN QUERY PLAN on each statement and fails if any of them falls
+back to a full SCAN of one of the large tables.
+"""
+
+import importlib
+import io
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import db as db_mod
+
+
+# Tables that grow with the number of scanned files; a full SCAN of any of
+# these on a hot path is a regression. files_full is the view that rebuilds
+# full file paths, so reads through it are held to the same standard.
+LARGE_TABLES = {"scans", "files", "files_full", "file_contributors", "file_languages"}
+
+# Statements that intentionally read a whole large table (global dashboards and
+# inspector listings). Matched as substrings of the whitespace-normalized SQL.
+ALLOWED_FULL_SCANS = (
+    # rank_projects(): one row per project across every scan
+    "COUNT(s.id) AS scans_count FROM scans s",
+    # detect_roles.load_contributors_per_project_from_db(): every file link, in one pass
+    "SELECT DISTINCT s.project_id, c.name, f.file_path, f.category, f.file_extension FROM scans s",
+    # inspect_db: newest files, walked backwards along the rowid and cut off by LIMIT
+    "FROM files_full ORDER BY id DESC LIMIT",
+    # inspect_db CLI: recently modified files listing
+    "FROM files_full ORDER BY (modified_at IS NULL), modified_at DESC",
+)
+
+_TABLE_ALIAS_RE = re.compile(
+    r"\b(?:FROM|JOIN)\s+(" + "|".join(sorted(LARGE_TABLES)) + r")\b(?:\s+(?:AS\s+)?(?!ON\b|WHERE\b|JOIN\b|LEFT\b|INNER\b|GROUP\b|ORDER\b|LIMIT\b)(\w+))?",
+    re.IGNORECASE,
+)
+_SCAN_RE = re.compile(r"^SCAN (\w+)(.*)$")
+_TRACED_PREFIXES = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+PROJECTS = 6
+FILES_PER_PROJECT = 60
+
+
+def _normalize(sql):
+    return " ".join(sql.split())
+
+
+def _large_table_aliases(sql):
+    """Map every alias (and bare name) used for a large table in sql to the table."""
+    aliases = {}
+    for match in _TABLE_ALIAS_RE.finditer(sql):
+        table = match.group(1).lower()
+        aliases[table] = table
+        if match.group(2):
+            aliases[match.group(2)] = table
+    if "files_full" in aliases:
+        # the view's own aliases show up in the plan once it is flattened
+        aliases.setdefault("f", "files")
+        aliases["files_full"] = "files"
+    return aliases
+
+
+def _full_scans(conn, sql):
+    """Return the large tables that EXPLAIN QUERY PLAN reports as full SCANs."""
+    aliases = _large_table_aliases(sql)
+    if not aliases:
+        return []
+    offenders = []
+    for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"):
+        match = _SCAN_RE.match(row[3])
+        if not match:
+            continue
+        target, rest = match.group(1), match.group(2)
+        if target in aliases and "INDEX" not in rest:
+            offenders.append(aliases[target])
+    return offenders
+
+
+class TestQueryPlans(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "file_data.db")
+        self._old_env = dict(os.environ)
+        os.environ["FILE_DATA_DB_PATH"] = self.db_path
+        os.environ["HOME"] = os.path.join(self.tmpdir.name, "home")
+        os.makedirs(os.environ["HOME"], exist_ok=True)
+
+        global db_mod
+        db_mod = importlib.reload(db_mod)
+        with redirect_stdout(io.StringIO()):
+            db_mod.init_db()
+        self.project_ids = self._seed()
+
+        self.statements = []
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self._old_env)
+        import gc
+        gc.collect()
+        self.tmpdir.cleanup()
+
+    def _seed(self):
+        project_ids = []
+        with db_mod.get_connection() as conn:
+            for lang in ("Python", "JavaScript", "Markdown"):
+                conn.execute("INSERT INTO languages (name) VALUES (?)", (lang,))
+            for skill in ("APIs", "Testing", "Databases"):
+                conn.execute("INSERT INTO skills (name) VALUES (?)", (skill,))
+            for name in ("alice", "bob", "carol"):
+                conn.execute("INSERT INTO contributors (name) VALUES (?)", (name,))
+
+            for p in range(PROJECTS):
+                name = f"project_{p}"
+                cur = conn.execute(
+                    "INSERT INTO projects (name, git_metrics_json, tech_json) VALUES (?, ?, ?)",
+                    (name, '{"commits_per_author": {"alice": 3}}', '{"frameworks": ["FastAPI"]}'),
+                )
+                project_id = cur.lastrowid
+                project_ids.append(project_id)
+                conn.execute(
+                    "INSERT INTO project_skills (project_id, skill_id) VALUES (?, ?)",
+                    (project_id, 1 + p % 3),
+                )
+                conn.execute(
+                    "INSERT INTO project_evidence (project_id, type, value) VALUES (?, ?, ?)",
+                    (project_id, "metric", "100 users"),
+                )
+                scan_id = conn.execute(
+                    "INSERT INTO scans (project, project_id, scanned_at) VALUES (?, ?, ?)",
+                    (name, project_id, f"2025-0{1 + p % 9}-01 00:00:00"),
+                ).lastrowid
+                for f in range(FILES_PER_PROJECT):
+                    ext = (".py", ".js", ".md")[f % 3]
+                    file_id = conn.execute(
+                        """
+                        INSERT INTO files (scan_id, file_name, file_path, file_extension, modified_at)
+                        VALUES (?, ?, ?, ?, ?)
+                        """,
+                        (scan_id, f"f{f}{ext}", f"/{name}/src/f{f}{ext}", ext, "2025-01-02 00:00:00"),
+                    ).lastrowid
+                    conn.execute(
+                        "INSERT INTO file_languages (file_id, language_id) VALUES (?, ?)",
+                        (file_id, 1 + f % 3),
+                    )
+                    conn.execute(
+                        "INSERT INTO file_contributors (file_id, contributor_id) VALUES (?, ?)",
+                        (file_id, 1 + f % 3),
+                    )
+            conn.commit()
+
+        db_mod.save_portfolio("alice", "Seed", included_project_ids=project_ids)
+        return project_ids
+
+    def _traced_connect(self):
+        real_connect = sqlite3.connect
+        statements = self.statements
+
+        def connect(*args, **kwargs):
+            conn = real_connect(*args, **kwargs)
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        return patch("sqlite3.connect", side_effect=connect)
+
+    def _exercise(self):
+        import api as api_mod
+        import detect_roles
+        import inspect_db
+        import rank_projects
+
+        api_mod = importlib.reload(api_mod)
+        client = TestClient(api_mod.app)
+        portfolio_id = db_mod.list_all_portfolios()[0]["id"]
+        project_id = self.project_ids[0]
+
+        with redirect_stdout(io.StringIO()):
+            for path in (
+                "/projects",
+                "/projects?limit=2&since=2000-01-01&fields=id,latest_scan_at",
+                f"/projects/{project_id}",
+                f"/projects/{project_id}/history",
+                f"/projects/{project_id}?include=contributors,languages",
+                f"/projects/{project_id}/roles",
+                f"/projects/{project_id}/rank",
+                "/skills",
+                "/contributors",
+                "/contributors?limit=1&name_prefix=a",
+                "/resumes?username=alice&limit=1",
+                "/portfolios/all?limit=1",
+                "/rank-projects",
+                "/rank-projects?mode=contributor&contributor_name=alice",
+                "/stats/dashboard",
+                f"/web/portfolio/{portfolio_id}/timeline",
+                f"/web/portfolio/{portfolio_id}/heatmap",
+                f"/web/portfolio/{portfolio_id}/heatmap/project?project_id={project_id}",
+                f"/web/portfolio/{portfolio_id}/showcase",
+                f"/web/portfolio/{portfolio_id}/bundle",
+                f"/web/portfolio/{portfolio_id}/export-html",
+                "/database/inspect",
+                "/database/inspect/scans?limit=2",
+                "/database/inspect/files?limit=2",
+                "/database/inspect/projects?limit=2",
+                "/database/inspect/contributors?limit=2",
+                "/database/inspect/skills_timeline?limit=2",
+                "/database/inspect/skills_timeline?format=ndjson",
+                "/search?q=main",
+            ):
+                client.get(path)
+            client.close()
+
+            rank_projects.rank_projects()
+            rank_projects.rank_projects_by_contributor("alice")
+            rank_projects.rank_projects_by_importance(mode="project")
+            rank_projects.rank_projects_by_importance(mode="contributor", contributor_name="alice")
+            detect_roles.load_contributors_per_project_from_db()
+            db_mod.load_projects_for_generation()
+            inspect_db.main(self.db_path)
+            db_mod.delete_project_by_id(self.project_ids[-1])
+
+    def test_no_full_scans_of_large_tables(self):
+        with self._traced_connect():
+            self._exercise()
+
+        checker = sqlite3.connect(self.db_path)
+        offenders = {}
+        unexplained = {}
+        try:
+            for raw in self.statements:
+                sql = _normalize(raw)
+                if not sql.upper().startswith(_TRACED_PREFIXES):
+                    continue
+                if any(allowed in sql for allowed in ALLOWED_FULL_SCANS):
+                    continue
+                try:
+                    tables = _full_scans(checker, sql)
+                except sqlite3.Error as exc:
+                    unexplained[sql] = str(exc)
+                    continue
+                if tables:
+                    offenders[sql] = sorted(set(tables))
+        finally:
+            checker.close()
+
+        self.assertTrue(self.statements, "no SQL statements were traced")
+        # a statement EXPLAIN cannot plan would otherwise pass unchecked
+        errors = "\n".join(f"- {error}: {sql}" for sql, error in unexplained.items())
+        self.assertEqual(unexplained, {}, f"statements that could not be explained:\n{errors}")
+        report = "\n".join(f"- {tables}: {sql}" for sql, tables in offenders.items())
+        self.assertEqual(offenders, {}, f"full table scans found:\n{report}")
+
+
+if __name__ == "__main__":
+    unittest.main()
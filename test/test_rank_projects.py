@@ -11,38 +11,17 @@ import pytest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
+import db as db_mod
 import rank_projects
 
 
 class TestRankProjects(unittest.TestCase):
     def setUp(self):
-        # Create an in-memory SQLite DB and create the scans table
+        # In-memory SQLite DB with the application schema
         self.conn = sqlite3.connect(':memory:')
         # Make rows behave like sqlite3.Row so code can use dict access
         self.conn.row_factory = sqlite3.Row
-        cur = self.conn.cursor()
-        cur.execute(
-            '''
-            CREATE TABLE scans (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                scanned_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                project TEXT,
-                notes TEXT
-            )
-            '''
-        )
-        # Create a minimal projects table so ranking SQL can left-join against it
-        cur.execute(
-            '''
-            CREATE TABLE projects (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE,
-                repo_url TEXT,
-                created_at TEXT
-            )
-            '''
-        )
-        self.conn.commit()
+        db_mod._ensure_schema(self.conn)
 
     def tearDown(self):
         try:
@@ -8,53 +8,22 @@ import pytest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
+import db as db_mod
 import rank_projects
+from db_stats import refresh_importance_scores
+
+
+def _insert_scan(cur, project):
+    cur.execute("INSERT OR IGNORE INTO projects (name) VALUES (?)", (project,))
+    cur.execute("INSERT INTO scans (project) VALUES (?)", (project,))
 
 
 class TestRankByContributor(unittest.TestCase):
     def setUp(self):
-        # create in-memory DB and required tables
+        # in-memory DB with the application schema
         self.conn = sqlite3.connect(':memory:')
         self.conn.row_factory = sqlite3.Row
-        cur = self.conn.cursor()
-        cur.execute(
-            '''
-            CREATE TABLE scans (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                scanned_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                project TEXT,
-                notes TEXT
-            )
-            '''
-        )
-        cur.execute(
-            '''
-            CREATE TABLE files (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                scan_id INTEGER NOT NULL,
-                file_name TEXT NOT NULL,
-                file_path TEXT NOT NULL
-            )
-            '''
-        )
-        cur.execute(
-            '''
-            CREATE TABLE contributors (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE
-            )
-            '''
-        )
-        cur.execute(
-            '''
-            CREATE TABLE file_contributors (
-                file_id INTEGER NOT NULL,
-                contributor_id INTEGER NOT NULL,
-                PRIMARY KEY (file_id, contributor_id)
-            )
-            '''
-        )
-        self.conn.commit()
+        db_mod._ensure_schema(self.conn)
 
     def tearDown(self):
         try:
@@ -65,8 +34,8 @@ class TestRankByContributor(unittest.TestCase):
     def test_rank_by_alice(self):
         cur = self.conn.cursor()
         # scans: proj-a (id 1), proj-b (id 2)
-        cur.execute("INSERT INTO scans (project) VALUES (?)", ('proj-a',))
-        cur.execute("INSERT INTO scans (project) VALUES (?)", ('proj-b',))
+        _insert_scan(cur, 'proj-a')
+        _insert_scan(cur, 'proj-b')
         # files: two files for proj-a, one file for proj-b
         cur.execute("INSERT INTO files (scan_id, file_name, file_path) VALUES (?,?,?)", (1, 'f1', 'f1'))
         cur.execute("INSERT INTO files (scan_id, file_name, file_path) VALUES (?,?,?)", (1, 'f2', 'f2'))
@@ -80,6 +49,7 @@ class TestRankByContributor(unittest.TestCase):
         cur.execute("INSERT INTO file_contributors (file_id, contributor_id) VALUES (?,?)", (2, 2))
         self.conn.commit()
 
+        refresh_importance_scores(self.conn)
         with patch('rank_projects.get_connection', return_value=self.conn):
             res = rank_projects.rank_projects_by_contributor('Alice')
 
@@ -95,11 +65,12 @@ class TestRankByContributor(unittest.TestCase):
     def test_contributor_with_no_files_returns_empty(self):
         cur = self.conn.cursor()
         # one project with files but no contributor links
-        cur.execute("INSERT INTO scans (project) VALUES (?)", ('solo-project',))
+        _insert_scan(cur, 'solo-project')
         cur.execute("INSERT INTO files (scan_id, file_name, file_path) VALUES (?,?,?)", (1, 'a', 'a'))
         cur.execute("INSERT INTO contributors (name) VALUES (?)", ('Charlie',))
         self.conn.commit()
 
+        refresh_importance_scores(self.conn)
         with patch('rank_projects.get_connection', return_value=self.conn):
             res = rank_projects.rank_projects_by_contributor('Charlie')
 
@@ -109,8 +80,8 @@ class TestRankByContributor(unittest.TestCase):
         cur = self.conn.cursor()
         # proj1: 2 files, contrib X -> 1 file (score 0.5)
         # proj2: 4 files, contrib X -> 2 files (score 0.5) -> should come before proj1
-        cur.execute("INSERT INTO scans (project) VALUES (?)", ('proj1',))
-        cur.execute("INSERT INTO scans (project) VALUES (?)", ('proj2',))
+        _insert_scan(cur, 'proj1')
+        _insert_scan(cur, 'proj2')
         # files for proj1 (scan_id 1)
         cur.execute("INSERT INTO files (scan_id, file_name, file_path) VALUES (?,?,?)", (1, 'p1f1', 'p1f1'))
         cur.execute("INSERT INTO files (scan_id, file_name, file_path) VALUES (?,?,?)", (1, 'p1f2', 'p1f2'))
@@ -127,6 +98,7 @@ class TestRankByContributor(unittest.TestCase):
         cur.execute("INSERT INTO file_contributors (file_id, contributor_id) VALUES (?,?)", (4, 1))
         self.conn.commit()
 
+        refresh_importance_scores(self.conn)
         with patch('rank_projects.get_connection', return_value=self.conn):
             res = rank_projects.rank_projects_by_contributor('Xavier')
 
@@ -138,7 +110,7 @@ class TestRankByContributor(unittest.TestCase):
         cur = self.conn.cursor()
         # create three projects and give contributor links to all
         for pname in ('a', 'b', 'c'):
-            cur.execute("INSERT INTO scans (project) VALUES (?)", (pname,))
+            _insert_scan(cur, pname)
             cur.execute("INSERT INTO files (scan_id, file_name, file_path) VALUES (?,?,?)", (cur.lastrowid, 'f', 'f'))
         cur.execute("INSERT INTO contributors (name) VALUES (?)", ('LimitUser',))
         # Link LimitUser to one file in each project (file ids 1..3)
@@ -147,6 +119,7 @@ class TestRankByContributor(unittest.TestCase):
         cur.execute("INSERT INTO file_contributors (file_id, contributor_id) VALUES (?,?)", (3, 1))
         self.conn.commit()
 
+        refresh_importance_scores(self.conn)
         with patch('rank_projects.get_connection', return_value=self.conn):
             res = rank_projects.rank_projects_by_contributor('LimitUser', limit=1)
 
@@ -154,12 +127,13 @@ class TestRankByContributor(unittest.TestCase):
 
     def test_exact_name_matching_is_case_sensitive(self):
         cur = self.conn.cursor()
-        cur.execute("INSERT INTO scans (project) VALUES (?)", ('pc',))
+        _insert_scan(cur, 'pc')
         cur.execute("INSERT INTO files (scan_id, file_name, file_path) VALUES (?,?,?)", (1, 'f', 'f'))
         cur.execute("INSERT INTO contributors (name) VALUES (?)", ('Alice',))
         cur.execute("INSERT INTO file_contributors (file_id, contributor_id) VALUES (?,?)", (1, 1))
         self.conn.commit()
 
+        refresh_importance_scores(self.conn)
         with patch('rank_projects.get_connection', return_value=self.conn):
             res_lower = rank_projects.rank_projects_by_contributor('alice')
             res_exact = rank_projects.rank_projects_by_contributor('Alice')
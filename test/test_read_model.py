@@ -0,0 +1,144 @@
+import os
+import sys
+import unittest
+
+# Allow importing from src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import db as db_mod
+from db_version import read_data_version
+from read_model import ReadModel, _PrefixIndex, read_model as shared_model
+from temp_db import TempDatabaseTestCase
+
+
+class TestPrefixIndex(unittest.TestCase):
+    def test_match_folds_ascii_case_like_sqlite(self):
+        index = _PrefixIndex([("Alpha", 1), ("alpine", 2), ("Beta", 3), (None, 4), ("Ärger", 5)])
+        self.assertEqual(sorted(index.match("AL")), [1, 2])
+        self.assertEqual(index.match("alph"), [1])
+        self.assertEqual(index.match("zzz"), [])
+        # LIKE only folds ASCII letters
+        self.assertEqual(index.match("ärger"), [])
+        self.assertEqual(index.match("Är"), [5])
+
+
+class TestReadModel(TempDatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        db_mod.save_scan("/p/alpha", [("/p/alpha/main.py", 1, None)], project="alpha")
+        db_mod.save_scan("/p/beta", [("/p/beta/app.js", 1, None)], project="beta")
+        self.model = ReadModel(enabled=True)
+
+    def tearDown(self):
+        shared_model.reset()
+        super().tearDown()
+
+    def _graph(self):
+        return self.model.graph(read_data_version(self.db_path), db_mod.get_connection)
+
+    def test_disabled_model_never_loads(self):
+        model = ReadModel(enabled=False)
+        self.assertIsNone(model.graph(read_data_version(self.db_path), db_mod.get_connection))
+        self.assertEqual(model.loads, 0)
+
+    def test_graph_is_reused_until_the_version_changes(self):
+        graph = self._graph()
+        self.assertEqual([p["name"] for p in graph.list_projects()], ["alpha", "beta"])
+        self.assertIs(self._graph(), graph)
+        self.assertEqual(self.model.loads, 1)
+
+        with db_mod.get_connection() as conn:
+            conn.execute("UPDATE projects SET custom_name = 'Gamma' WHERE name = 'beta'")
+            conn.commit()
+        reloaded = self._graph()
+        self.assertIsNot(reloaded, graph)
+        self.assertEqual(self.model.loads, 2)
+        self.assertEqual([p["name"] for p in reloaded.list_projects(name_prefix="gam")], ["beta"])
+
+    def test_list_projects_pages_by_id(self):
+        graph = self._graph()
+        first = graph.list_projects(limit=1)
+        self.assertEqual(len(first), 1)
+        rest = graph.list_projects(after=first[0]["id"])
+        self.assertEqual([p["name"] for p in rest], ["beta"])
+        self.assertEqual(graph.list_projects(after="x"), [])
+
+    def test_ranking_returns_copies(self):
+        graph = self._graph()
+        rows = graph.ranking("project")
+        self.assertTrue(rows)
+        rows[0]["score"] = "changed"
+        self.assertNotEqual(graph.ranking("project")[0].get("score"), "changed")
+        self.assertEqual(graph.ranking("contributor"), [])
+
+    def test_advance_carries_the_snapshot_over_a_matching_bump(self):
+        graph = self._graph()
+        before = graph.version
+        after = (before[0], before[1] + 1)
+        self.model.advance((before[0], before[1] - 1), after)
+        self.assertEqual(graph.version, before)
+        self.model.advance(before, after)
+        self.assertEqual(self.model.version, after)
+
+    def test_shared_model_stays_unloaded_until_used(self):
+        shared_model.reset()
+        loads = shared_model.loads
+        db_mod.save_scan("/p/delta", [("/p/delta/x.py", 1, None)], project="delta")
+        self.assertIsNone(shared_model.version)
+        self.assertEqual(shared_model.loads, loads)
+
+    def test_db_writes_apply_only_the_changed_projects(self):
+        shared_model.enabled = True
+        try:
+            shared_model.graph(read_data_version(self.db_path), db_mod.get_connection)
+            loads, deltas = shared_model.loads, shared_model.deltas
+
+            db_mod.save_scan(
+                "/p/gamma", [("/p/gamma/main.go", 1, None)], project="gamma",
+                contributors=["carol"], detected_skills=["Go"],
+            )
+            db_mod.save_scans([dict(scan_source="/p/alpha", files_found=[("/p/alpha/x.py", 1, None)], project="alpha")])
+            db_mod.set_project_display_name("beta", "Better Beta")
+            with db_mod.get_connection() as conn:
+                alpha_id = conn.execute("SELECT id FROM projects WHERE name = 'alpha'").fetchone()[0]
+            db_mod.delete_project_by_id(alpha_id)
+
+            self.assertEqual(shared_model.loads, loads)
+            self.assertEqual(shared_model.deltas, deltas + 4)
+            self.assertEqual(shared_model.version, read_data_version(self.db_path))
+            graph = shared_model.graph(read_data_version(self.db_path), db_mod.get_connection)
+            self.assertEqual([p["name"] for p in graph.list_projects()], ["beta", "gamma"])
+            self.assertEqual(graph.list_skills(name_prefix="g"), ["Go"])
+            self.assertEqual(graph.list_projects(name_prefix="better")[0]["name"], "beta")
+            self.assertTrue(shared_model.verify(db_mod.get_connection)["consistent"])
+        finally:
+            shared_model.enabled = None
+
+    def test_write_after_an_outside_change_reloads_everything(self):
+        shared_model.enabled = True
+        try:
+            shared_model.graph(read_data_version(self.db_path), db_mod.get_connection)
+            loads, deltas = shared_model.loads, shared_model.deltas
+            with db_mod.get_connection() as conn:
+                conn.execute("UPDATE projects SET custom_name = 'Outside' WHERE name = 'alpha'")
+                conn.commit()
+            db_mod.set_project_display_name("beta", "Better Beta")
+            self.assertEqual(shared_model.loads, loads + 1)
+            self.assertEqual(shared_model.deltas, deltas)
+            graph = shared_model.graph(read_data_version(self.db_path), db_mod.get_connection)
+            self.assertEqual(graph.list_projects(name_prefix="outside")[0]["name"], "alpha")
+        finally:
+            shared_model.enabled = None
+
+    def test_verify_reports_tampered_sections(self):
+        self._graph()
+        report = self.model.verify(db_mod.get_connection)
+        self.assertTrue(report["consistent"])
+        self.model._graph.skills.append("not-a-skill")
+        report = self.model.verify(db_mod.get_connection)
+        self.assertFalse(report["consistent"])
+        self.assertEqual(report["mismatches"], ["skills"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import asyncio
+import gzip
+import json
+import os
+import sys
+import unittest
+import zlib
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+from fastapi.testclient import TestClient
+
+# Allow importing from src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import response_encoding
+from response_encoding import CompressionMiddleware, FastJSONResponse, RawJSON, dumps_json, iter_json_object
+
+
+class TestDumpsJson(unittest.TestCase):
+    def test_matches_json_module_and_splices_raw_members(self):
+        payload = {"b": [1, 2.5, None, True], "a": "é", 3: {"nested": "x"}}
+        expected = json.loads(json.dumps(payload))
+        self.assertEqual(json.loads(dumps_json(payload)), expected)
+        with mock.patch.object(response_encoding, "orjson", None):
+            self.assertEqual(json.loads(dumps_json(payload)), expected)
+
+        raw = RawJSON('{"files_changed_per_author": {"alice": ["a.py"]}}')
+        body = dumps_json({"id": 1, "git_metrics": raw})
+        self.assertIn(b'"git_metrics":{"files_changed_per_author"', body)
+        self.assertEqual(json.loads(body)["git_metrics"]["files_changed_per_author"], {"alice": ["a.py"]})
+        # fragments below the top level are decoded instead of spliced
+        self.assertEqual(json.loads(dumps_json({"outer": {"inner": raw}}))["outer"]["inner"]["files_changed_per_author"], {"alice": ["a.py"]})
+
+    def test_iter_json_object_streams_members(self):
+        chunks = list(iter_json_object([("a", 1), ("b", {"c": [2]})]))
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(json.loads(b"".join(chunks)), {"a": 1, "b": {"c": [2]}})
+        self.assertEqual(b"".join(iter_json_object([])), b"{}")
+
+
+class TestCompressionMiddleware(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI(default_response_class=FastJSONResponse)
+        app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+        @app.get("/big")
+        def big():
+            return {"rows": ["x" * 10] * 100}
+
+        @app.get("/small")
+        def small():
+            return {"ok": True}
+
+        @app.get("/pdf")
+        def pdf():
+            return Response(b"%PDF" + b"0" * 500, media_type="application/pdf")
+
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.client.close()
+
+    def _raw(self, path):
+        response = self.client.get(path, headers={"Accept-Encoding": "gzip"})
+        return response, response.headers.get("content-encoding")
+
+    def test_only_large_text_responses_are_compressed(self):
+        response, encoding = self._raw("/big")
+        self.assertEqual(encoding, "gzip")
+        self.assertEqual(response.json(), {"rows": ["x" * 10] * 100})
+        self.assertEqual(self._raw("/small")[1], None)
+        self.assertEqual(self._raw("/pdf")[1], None)
+        self.assertEqual(self.client.get("/big", headers={"Accept-Encoding": "identity"}).headers.get("content-encoding"), None)
+
+    def test_streamed_chunks_are_flushed_as_they_arrive(self):
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+            await send({"type": "http.response.body", "body": b"line 1\n", "more_body": True})
+            await send({"type": "http.response.body", "body": b"line 2\n", "more_body": False})
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+        asyncio.run(CompressionMiddleware(app, minimum_size=100)(scope, None, send))
+
+        self.assertIn((b"content-encoding", b"gzip"), sent[0]["headers"])
+        chunks = [message["body"] for message in sent[1:]]
+        decompressor = zlib.decompressobj(31)
+        # the first chunk decodes on its own: nothing is held back for later chunks
+        self.assertEqual(decompressor.decompress(chunks[0]), b"line 1\n")
+        self.assertEqual(gzip.decompress(b"".join(chunks)), b"line 1\nline 2\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import sys
+import unittest
+
+# Allow importing from src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from resume_pdf import PdfArtifactCache, PdfRenderer, content_digest, render_resume_pdf
+
+
+class TestRenderResumePdf(unittest.TestCase):
+    def test_page_count_comes_from_the_render(self):
+        pdf_bytes, page_count = render_resume_pdf("# Alice\n\n## Summary\n- Built **APIs**\n")
+        self.assertTrue(pdf_bytes.startswith(b"%PDF"))
+        self.assertEqual(page_count, 1)
+
+        long_resume = "# Alice\n" + "\n".join(f"- Item {i}" for i in range(200))
+        self.assertGreater(render_resume_pdf(long_resume)[1], 1)
+
+
+class TestPdfArtifactCache(unittest.TestCase):
+    def test_lru_is_bounded_by_size(self):
+        cache = PdfArtifactCache(max_bytes=10)
+        cache.put(1, "a", b"12345", 1)
+        cache.put(2, "b", b"12345", 1)
+        self.assertEqual(cache.get(1, "a"), (b"12345", 1))
+        cache.put(3, "c", b"123", 1)
+        self.assertIsNone(cache.get(2, "b"))
+        self.assertEqual(cache.get(3, "c"), (b"123", 1))
+        cache.put(4, "d", b"x" * 11, 1)
+        self.assertIsNone(cache.get(4, "d"))
+        self.assertEqual(len(cache), 2)
+
+    def test_invalidate_drops_every_version_of_a_resume(self):
+        cache = PdfArtifactCache()
+        cache.put(1, "old", b"old", 1)
+        cache.put(1, "new", b"new", 2)
+        cache.put(2, "other", b"other", 1)
+        cache.invalidate(1)
+        self.assertIsNone(cache.get(1, "new"))
+        self.assertEqual(cache.get(2, "other"), (b"other", 1))
+        self.assertEqual(len(cache), 1)
+
+
+class TestPdfRenderer(unittest.TestCase):
+    def test_renders_in_worker_process_and_shares_inflight_renders(self):
+        renderer = PdfRenderer(max_workers=1)
+        markdown_text = "# Alice\n\n## Summary\nBuilt robust APIs.\n"
+        try:
+            first = renderer.submit(markdown_text)
+            second = renderer.submit(markdown_text, content_digest(markdown_text))
+            self.assertIs(first, second)
+            pdf_bytes, page_count = first.result(timeout=120)
+            self.assertTrue(pdf_bytes.startswith(b"%PDF"))
+            self.assertEqual(page_count, 1)
+        finally:
+            renderer.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -398,6 +398,51 @@ class TestScanWithCleanOutput(unittest.TestCase):
         self.assertIn('files_found', result)
         self.assertGreater(result['files_found'], 0)
 
+    # Multi-project scans report each project completed only once its save outcome is known
+    @patch('scan.output_project_info', None)
+    @patch('scan.ask_yes_no', return_value=True)
+    @patch('scan.identify_contributions', return_value=None)
+    @patch('scan.analyze_repo_path', return_value=None)
+    @patch('scan.detect_skills', return_value={'skills': ['Testing']})
+    @patch('scan.detect_languages_and_frameworks', return_value={
+        'languages': ['Python'], 'high_confidence': ['Python'],
+        'frameworks': [], 'high_confidence_frameworks': [],
+    })
+    def test_multi_project_reports_save_outcomes_before_each_prompt(self, *mocks):
+        for name in ("alpha", "beta"):
+            os.makedirs(os.path.join(self.test_dir, name))
+            with open(os.path.join(self.test_dir, name, "app.py"), "w") as f:
+                f.write("print('hello')")
+
+        events = []
+        saved_batches = []
+
+        def persist(records, listing_fallback=False):
+            self.assertTrue(listing_fallback)
+            saved_batches.append([record['project'] for record in records])
+            events.append(("saved", records[0]['project']))
+            # the second save fails
+            return [RuntimeError("disk full") if len(saved_batches) == 2 else 1 for record in records]
+
+        def on_progress(event):
+            if event["type"] in ("project_completed", "project_failed"):
+                events.append((event["type"], event["project_name"]))
+
+        buf = StringIO()
+        with patch('scan._persist_scans', side_effect=persist), redirect_stdout(buf):
+            result = scan_with_clean_output(self.test_dir, progress_callback=on_progress)
+
+        # the first project is saved before the prompt for the second, one project per batch
+        self.assertEqual(sorted(saved_batches), [["alpha"], ["beta"]])
+        first, second = saved_batches[0][0], saved_batches[1][0]
+        self.assertEqual(events, [
+            ("saved", first), ("project_completed", first),
+            ("saved", second), ("project_failed", second),
+        ])
+        self.assertTrue(result['partial_success'])
+        self.assertEqual(result['project_names'], [first])
+        self.assertEqual([p['project_name'] for p in result['failed_projects']], [second])
+
 
 if __name__ == "__main__":
     unittest.main()
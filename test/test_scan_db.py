@@ -169,7 +169,7 @@ class TestPersistedFilePathFormat(unittest.TestCase):
         list_files_in_directory(self.outer_zip, recursive=True, file_type=None, save_to_db=True)
         conn = get_connection()
         cur = conn.cursor()
-        cur.execute('SELECT file_path FROM files')
+        cur.execute('SELECT file_path FROM files_full')
         rows = [r[0] for r in cur.fetchall()]
         conn.close()
 
@@ -27,7 +27,8 @@ def _setup_in_memory_db():
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             scanned_at TEXT DEFAULT CURRENT_TIMESTAMP,
             project TEXT,
-            notes TEXT
+            notes TEXT,
+            project_id INTEGER
         );
         CREATE TABLE files (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -89,7 +90,7 @@ class TestGatherProjectInfoFromDB(unittest.TestCase):
             ),
         )
         project_id = cur.lastrowid
-        cur.execute("INSERT INTO scans (project) VALUES ('proj1')")
+        cur.execute("INSERT INTO scans (project, project_id) VALUES ('proj1', ?)", (project_id,))
         scan_id = cur.lastrowid
         cur.execute("INSERT INTO files (scan_id, file_name, file_path) VALUES (?, ?, ?)", (scan_id, 'a.py', '/tmp/a.py'))
         file_id = cur.lastrowid
@@ -124,7 +125,7 @@ class TestGatherProjectInfoFromDB(unittest.TestCase):
             ),
         )
         project_id = cur.lastrowid
-        cur.execute("INSERT INTO scans (project) VALUES ('proj2')")
+        cur.execute("INSERT INTO scans (project, project_id) VALUES ('proj2', ?)", (project_id,))
         scan_id = cur.lastrowid
         cur.execute("INSERT INTO files (scan_id, file_name, file_path) VALUES (?, ?, ?)", (scan_id, 'b.py', '/tmp/b.py'))
         file_id = cur.lastrowid
@@ -141,6 +142,30 @@ class TestGatherProjectInfoFromDB(unittest.TestCase):
         self.assertEqual(contrib['file_count'], 1)
         self.assertEqual(contrib['commits'], 5)
 
+    def test_batch_gather_returns_every_requested_project(self):
+        cur = self.conn.cursor()
+        for name, lang in (('projA', 'Python'), ('projB', 'Go')):
+            cur.execute(
+                "INSERT INTO projects (name, git_metrics_json, tech_json) VALUES (?, '{}', '{}')",
+                (name,),
+            )
+            project_id = cur.lastrowid
+            cur.execute("INSERT INTO scans (project, project_id) VALUES (?, ?)", (name, project_id))
+            scan_id = cur.lastrowid
+            cur.execute("INSERT INTO files (scan_id, file_name, file_path) VALUES (?, 'x', '/x')", (scan_id,))
+            file_id = cur.lastrowid
+            cur.execute("INSERT OR IGNORE INTO languages (name) VALUES (?)", (lang,))
+            cur.execute("SELECT id FROM languages WHERE name = ?", (lang,))
+            cur.execute("INSERT INTO file_languages (file_id, language_id) VALUES (?, ?)", (file_id, cur.fetchone()['id']))
+        self.conn.commit()
+
+        with patch('summarize_projects.get_connection', return_value=self.conn):
+            infos = summarize_projects.gather_projects_info_from_db(['projA', 'projB', 'missing'])
+
+        self.assertEqual(infos['projA']['languages'], ['Python'])
+        self.assertEqual(infos['projB']['languages'], ['Go'])
+        self.assertEqual(infos['missing']['languages'], [])
+
 
 class TestSummarizeTopRankedProjects(unittest.TestCase):
     def setUp(self):
@@ -162,7 +187,7 @@ class TestSummarizeTopRankedProjects(unittest.TestCase):
         mock_projects = [{'project': 'p1', 'contrib_files': 1, 'total_files': 1, 'score': 0.5}]
         with patch('summarize_projects.db_is_initialized', return_value=True):
             with patch('summarize_projects.rank_projects_by_contributor', return_value=mock_projects):
-                with patch('summarize_projects.gather_project_info_from_db', side_effect=Exception('boom')):
+                with patch('summarize_projects.gather_projects_info_from_db', side_effect=Exception('boom')):
                     result = summarize_projects.summarize_top_ranked_projects('UserX')
                     self.assertEqual(len(result), 1)
                     self.assertEqual(result[0]['project'], 'p1')
@@ -181,7 +206,7 @@ class TestSummarizeTopRankedProjects(unittest.TestCase):
         }
         with patch('summarize_projects.db_is_initialized', return_value=True):
             with patch('summarize_projects.rank_projects_by_contributor', return_value=mock_projects):
-                with patch('summarize_projects.gather_project_info_from_db', return_value=mock_info):
+                with patch('summarize_projects.gather_projects_info_from_db', return_value={'p2': mock_info}):
                     with patch('summarize_projects.generate_combined_summary', return_value=os.path.join(self.temp_dir, 'out.txt')) as mock_gen:
                         result = summarize_projects.summarize_top_ranked_projects('UserX')
                         self.assertEqual(len(result), 1)
@@ -195,7 +220,7 @@ class TestSummarizeTopRankedProjects(unittest.TestCase):
         ]
         with patch('summarize_projects.db_is_initialized', return_value=True):
             with patch('summarize_projects.rank_projects_by_contributor', return_value=mock_projects[:1]):
-                with patch('summarize_projects.gather_project_info_from_db', return_value={'projects_detected': 1}):
+                with patch('summarize_projects.gather_projects_info_from_db', return_value={'p1': {'projects_detected': 1}}):
                     with patch('summarize_projects.generate_combined_summary', return_value=os.path.join(self.temp_dir, 'out.txt')):
                         result = summarize_projects.summarize_top_ranked_projects('UserY', limit=1)
                         self.assertEqual(len(result), 1)
@@ -212,7 +237,7 @@ class TestSummarizeTopRankedProjects(unittest.TestCase):
         }
         with patch('summarize_projects.db_is_initialized', return_value=True):
             with patch('summarize_projects.rank_projects_by_contributor', return_value=mock_projects):
-                with patch('summarize_projects.gather_project_info_from_db', return_value=mock_info):
+                with patch('summarize_projects.gather_projects_info_from_db', return_value={'p3': mock_info}):
                     with patch('summarize_projects.generate_combined_summary') as mock_gen:
                         summarize_projects.summarize_top_ranked_projects('UserZ')
                         args, kwargs = mock_gen.call_args